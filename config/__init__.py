@@ -40,6 +40,16 @@ class Config:
     # Application configuration
     BASE_URL = os.environ.get("BASE_URL", "http://localhost")
 
+    # Disk cache of rendered print PDFs (set PRINT_CACHE_PATH to an empty string to disable)
+    PRINT_CACHE_PATH = os.environ.get(
+        "PRINT_CACHE_PATH", os.path.join(DATABASE_PATH, "print_cache")
+    )
+    PRINT_CACHE_MAX_BYTES = int(os.environ.get("PRINT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+    # Downtime processing runs in a background thread, committing a checkpoint per batch
+    DOWNTIME_JOBS_ASYNC = os.environ.get("DOWNTIME_JOBS_ASYNC", "true").lower() == "true"
+    DOWNTIME_JOB_BATCH_SIZE = int(os.environ.get("DOWNTIME_JOB_BATCH_SIZE", "25"))
+
     # Gmail configuration
     MAIL_SERVER = os.environ.get("MAIL_SERVER", "smtp.gmail.com")
     MAIL_PORT = int(os.environ.get("MAIL_PORT", "587"))
@@ -57,6 +67,8 @@ class TestConfig(Config):
     WTF_CSRF_ENABLED = False
     LOGIN_DISABLED = False
     SSL_ENABLED = False
+    PRINT_CACHE_PATH = None
+    DOWNTIME_JOBS_ASYNC = False
 
 
 # Try to import LocalConfig, but don't fail if local.py doesn't exist
@@ -0,0 +1,38 @@
+"""add_downtime_packs_period_status_index
+
+Revision ID: 3e8b6c0d4f19
+Revises: 5b9e3d1a7c42
+Create Date: 2026-10-19 18:02:47.511834
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3e8b6c0d4f19"
+down_revision = "5b9e3d1a7c42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    indexes = [index["name"] for index in inspector.get_indexes("downtime_packs")]
+    if "ix_downtime_packs_period_status" in indexes:
+        print("ix_downtime_packs_period_status index already exists, skipping creation")
+        return
+
+    op.create_index("ix_downtime_packs_period_status", "downtime_packs", ["period_id", "status"])
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    indexes = [index["name"] for index in inspector.get_indexes("downtime_packs")]
+    if "ix_downtime_packs_period_status" not in indexes:
+        print("ix_downtime_packs_period_status index does not exist, skipping removal")
+        return
+
+    op.drop_index("ix_downtime_packs_period_status", table_name="downtime_packs")
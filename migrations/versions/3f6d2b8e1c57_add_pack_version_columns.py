@@ -0,0 +1,53 @@
+"""add_pack_version_columns
+
+Revision ID: 3f6d2b8e1c57
+Revises: 8c1f2e7a9b34
+Create Date: 2026-10-19 14:21:09.381245
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f6d2b8e1c57"
+down_revision = "8c1f2e7a9b34"
+branch_labels = None
+depends_on = None
+
+PACK_TABLES = ("character", "group")
+
+
+def column_exists(table_name, column_name, connection):
+    insp = sa.inspect(connection)
+    return column_name in [col["name"] for col in insp.get_columns(table_name)]
+
+
+def upgrade():
+    conn = op.get_bind()
+    existing_tables = sa.inspect(conn).get_table_names()
+
+    for table_name in PACK_TABLES:
+        if table_name not in existing_tables:
+            continue
+        if column_exists(table_name, "pack_version", conn):
+            print(f"pack_version column already exists on {table_name}, skipping")
+            continue
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column("pack_version", sa.Integer(), nullable=False, server_default="0")
+            )
+
+
+def downgrade():
+    conn = op.get_bind()
+    existing_tables = sa.inspect(conn).get_table_names()
+
+    for table_name in PACK_TABLES:
+        if table_name not in existing_tables:
+            continue
+        if not column_exists(table_name, "pack_version", conn):
+            print(f"pack_version column does not exist on {table_name}, skipping removal")
+            continue
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column("pack_version")
@@ -0,0 +1,54 @@
+"""add_character_sheet_prints_table
+
+Revision ID: 476730479a93
+Revises: ead2c222c7b1
+Create Date: 2026-10-19 10:12:04.218311
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "476730479a93"
+down_revision = "ead2c222c7b1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "character_sheet_prints" in inspector.get_table_names():
+        print("character_sheet_prints table already exists, skipping creation")
+        return
+
+    op.create_table(
+        "character_sheet_prints",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("character_id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("printed_at", sa.DateTime(), nullable=False),
+        sa.Column("printed_by_user_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"]),
+        sa.ForeignKeyConstraint(["character_id"], ["character.id"]),
+        sa.ForeignKeyConstraint(["printed_by_user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_character_sheet_prints_event_character",
+        "character_sheet_prints",
+        ["event_id", "character_id"],
+    )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "character_sheet_prints" not in inspector.get_table_names():
+        print("character_sheet_prints table does not exist, skipping removal")
+        return
+
+    op.drop_index("ix_character_sheet_prints_event_character", table_name="character_sheet_prints")
+    op.drop_table("character_sheet_prints")
@@ -0,0 +1,46 @@
+"""add_condition_progression_runs
+
+Revision ID: 4a8d1e6c9b27
+Revises: 7c4f2b9e6d15
+Create Date: 2026-10-19 23:58:07.412906
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4a8d1e6c9b27"
+down_revision = "7c4f2b9e6d15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "condition_progression_runs" in inspector.get_table_names():
+        print("condition_progression_runs table already exists, skipping creation")
+        return
+
+    op.create_table(
+        "condition_progression_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("progressed_by_id", sa.Integer(), nullable=False),
+        sa.Column("progressed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"]),
+        sa.ForeignKeyConstraint(["progressed_by_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_id"),
+    )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "condition_progression_runs" not in inspector.get_table_names():
+        print("condition_progression_runs table does not exist, skipping removal")
+        return
+
+    op.drop_table("condition_progression_runs")
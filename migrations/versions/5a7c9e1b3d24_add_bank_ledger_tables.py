@@ -0,0 +1,113 @@
+"""add_bank_ledger_tables
+
+Revision ID: 5a7c9e1b3d24
+Revises: 8d2f4a6b1c73
+Create Date: 2026-10-19 21:14:07.382915
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5a7c9e1b3d24"
+down_revision = "8d2f4a6b1c73"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "bank_ledger_entries" in tables:
+        print("bank_ledger_entries table already exists, skipping creation")
+    else:
+        op.create_table(
+            "bank_ledger_entries",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column(
+                "account_type",
+                sa.Enum("character", "group", name="bankaccounttype", native_enum=False),
+                nullable=False,
+            ),
+            sa.Column("account_id", sa.Integer(), nullable=False),
+            sa.Column(
+                "entry_type",
+                sa.Enum(
+                    "deposit",
+                    "withdrawal",
+                    "transfer_in",
+                    "transfer_out",
+                    "adjustment",
+                    name="bankentrytype",
+                    native_enum=False,
+                ),
+                nullable=False,
+            ),
+            sa.Column("amount", sa.Integer(), nullable=False),
+            sa.Column("transfer_id", sa.String(length=32), nullable=True),
+            sa.Column("editor_user_id", sa.Integer(), nullable=False),
+            sa.Column("reason", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["editor_user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "ix_bank_ledger_entries_account",
+            "bank_ledger_entries",
+            ["account_type", "account_id", "id"],
+        )
+        op.create_index(
+            "ix_bank_ledger_entries_transfer_id", "bank_ledger_entries", ["transfer_id"]
+        )
+
+    if "bank_balance_snapshots" in tables:
+        print("bank_balance_snapshots table already exists, skipping creation")
+        return
+
+    op.create_table(
+        "bank_balance_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "account_type",
+            sa.Enum("character", "group", name="bankaccounttype", native_enum=False),
+            nullable=False,
+        ),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("balance", sa.Integer(), nullable=False),
+        sa.Column("ledger_entry_id", sa.Integer(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_bank_balance_snapshots_account",
+        "bank_balance_snapshots",
+        ["account_type", "account_id", "taken_at"],
+    )
+
+    # Existing balances become the opening snapshot each account's ledger starts from
+    for account_type, table in (("character", "character"), ("group", '"group"')):
+        op.execute(
+            "INSERT INTO bank_balance_snapshots "
+            "(account_type, account_id, balance, ledger_entry_id, taken_at) "
+            f"SELECT '{account_type}', id, bank_account, 0, CURRENT_TIMESTAMP FROM {table}"
+        )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "bank_balance_snapshots" in tables:
+        op.drop_index("ix_bank_balance_snapshots_account", table_name="bank_balance_snapshots")
+        op.drop_table("bank_balance_snapshots")
+    else:
+        print("bank_balance_snapshots table does not exist, skipping removal")
+
+    if "bank_ledger_entries" in tables:
+        op.drop_index("ix_bank_ledger_entries_transfer_id", table_name="bank_ledger_entries")
+        op.drop_index("ix_bank_ledger_entries_account", table_name="bank_ledger_entries")
+        op.drop_table("bank_ledger_entries")
+    else:
+        print("bank_ledger_entries table does not exist, skipping removal")
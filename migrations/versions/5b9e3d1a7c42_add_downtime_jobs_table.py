@@ -0,0 +1,66 @@
+"""add_downtime_jobs_table
+
+Revision ID: 5b9e3d1a7c42
+Revises: a7c4e91d2f06
+Create Date: 2026-10-19 17:21:09.348215
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b9e3d1a7c42"
+down_revision = "a7c4e91d2f06"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "downtime_jobs" in inspector.get_table_names():
+        print("downtime_jobs table already exists, skipping creation")
+        return
+
+    op.create_table(
+        "downtime_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("period_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "pending",
+                "running",
+                "failed",
+                "completed",
+                name="downtimejobstatus",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("seed", sa.Integer(), nullable=True),
+        sa.Column("started_by_user_id", sa.Integer(), nullable=False),
+        sa.Column("total_packs", sa.Integer(), nullable=False),
+        sa.Column("batch_size", sa.Integer(), nullable=True),
+        sa.Column("processed_pack_ids", sa.JSON(), nullable=False),
+        sa.Column("timings", sa.JSON(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["period_id"], ["downtime_periods.id"]),
+        sa.ForeignKeyConstraint(["started_by_user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("period_id"),
+    )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "downtime_jobs" not in inspector.get_table_names():
+        print("downtime_jobs table does not exist, skipping removal")
+        return
+
+    op.drop_table("downtime_jobs")
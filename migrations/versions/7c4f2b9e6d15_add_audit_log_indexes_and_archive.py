@@ -0,0 +1,75 @@
+"""add_audit_log_indexes_and_archive
+
+Revision ID: 7c4f2b9e6d15
+Revises: e3a91c5d7f02
+Create Date: 2026-10-19 23:31:42.185630
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c4f2b9e6d15"
+down_revision = "e3a91c5d7f02"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    (
+        "ix_character_audit_log_character_timestamp",
+        "character_audit_log",
+        ["character_id", "timestamp"],
+    ),
+    ("ix_group_audit_log_group_timestamp", "group_audit_log", ["group_id", "timestamp"]),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    for name, table, columns in INDEXES:
+        if name in {index["name"] for index in inspector.get_indexes(table)}:
+            print(f"{name} index already exists, skipping creation")
+            continue
+        op.create_index(name, table, columns)
+
+    if "audit_log_archives" in tables:
+        print("audit_log_archives table already exists, skipping creation")
+        return
+
+    op.create_table(
+        "audit_log_archives",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "owner_type",
+            sa.Enum("character", "group", name="auditlogownertype", native_enum=False),
+            nullable=False,
+        ),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("first_timestamp", sa.DateTime(), nullable=False),
+        sa.Column("last_timestamp", sa.DateTime(), nullable=False),
+        sa.Column("entries_data", sa.LargeBinary(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_audit_log_archives_owner", "audit_log_archives", ["owner_type", "owner_id"])
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "audit_log_archives" in tables:
+        op.drop_index("ix_audit_log_archives_owner", table_name="audit_log_archives")
+        op.drop_table("audit_log_archives")
+    else:
+        print("audit_log_archives table does not exist, skipping removal")
+
+    for name, table, _ in INDEXES:
+        if name not in {index["name"] for index in inspector.get_indexes(table)}:
+            print(f"{name} index does not exist, skipping removal")
+            continue
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,149 @@
+"""add_pack_entry_table
+
+Revision ID: 8c1f2e7a9b34
+Revises: 476730479a93
+Create Date: 2026-10-19 11:02:41.530127
+
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c1f2e7a9b34"
+down_revision = "476730479a93"
+branch_labels = None
+depends_on = None
+
+PACK_KINDS = (
+    ("item", "items"),
+    ("sample", "samples"),
+    ("exotic", "exotics"),
+    ("medicament", "medicaments"),
+)
+DOWNTIME_PACK_KINDS = (
+    ("item", "items"),
+    ("sample", "samples"),
+    ("exotic", "exotic_substances"),
+)
+REQUIRED_FLAGS = ("character_sheet", "character_id_badge")
+
+
+def _load(value):
+    if value is None:
+        return {}
+    if isinstance(value, (dict, list)):
+        return value
+    try:
+        return json.loads(value) or {}
+    except (TypeError, ValueError):
+        return {}
+
+
+def _ref_id(value):
+    if isinstance(value, dict):
+        value = value.get("id")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _pack_rows(owner_type, owner_id, data):
+    if not isinstance(data, dict):
+        return []
+    completion = data.get("completion") or {}
+    rows = [
+        (owner_type, owner_id, flag, None, 0, bool(completion.get(flag))) for flag in REQUIRED_FLAGS
+    ]
+    if (data.get("energy_chits") or 0) > 0:
+        rows.append(
+            (
+                owner_type,
+                owner_id,
+                "energy_chits",
+                None,
+                0,
+                bool(completion.get("energy_chits")),
+            )
+        )
+    for kind, attribute in PACK_KINDS:
+        for position, value in enumerate(data.get(attribute) or []):
+            ref_id = _ref_id(value)
+            if ref_id is not None:
+                completed = bool(completion.get(f"{kind}_{value}"))
+                rows.append((owner_type, owner_id, kind, ref_id, position, completed))
+    return rows
+
+
+def upgrade():
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    existing_tables = inspector.get_table_names()
+
+    if "pack_entry" in existing_tables:
+        print("pack_entry table already exists, skipping creation")
+        return
+
+    pack_entry = op.create_table(
+        "pack_entry",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "owner_type",
+            sa.Enum("character", "group", "downtime", name="packownertype", native_enum=False),
+            nullable=False,
+        ),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=30), nullable=False),
+        sa.Column("ref_id", sa.Integer(), nullable=True),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_pack_entry_owner", "pack_entry", ["owner_type", "owner_id"])
+    op.create_index("ix_pack_entry_kind_ref", "pack_entry", ["kind", "ref_id"])
+
+    # Backfill from the existing JSON pack columns
+    rows = []
+    if "character" in existing_tables:
+        columns = [col["name"] for col in inspector.get_columns("character")]
+        if "character_pack" in columns:
+            for owner_id, data in connection.execute(
+                sa.text('SELECT id, character_pack FROM "character"')
+            ):
+                rows += _pack_rows("character", owner_id, _load(data))
+    if "group" in existing_tables:
+        columns = [col["name"] for col in inspector.get_columns("group")]
+        if "group_pack" in columns:
+            for owner_id, data in connection.execute(sa.text('SELECT id, group_pack FROM "group"')):
+                rows += _pack_rows("group", owner_id, _load(data))
+    if "downtime_packs" in existing_tables:
+        result = connection.execute(
+            sa.text("SELECT id, items, samples, exotic_substances FROM downtime_packs")
+        )
+        for owner_id, items, samples, exotics in result:
+            contents = {"items": items, "samples": samples, "exotic_substances": exotics}
+            for kind, attribute in DOWNTIME_PACK_KINDS:
+                for position, value in enumerate(_load(contents[attribute]) or []):
+                    ref_id = _ref_id(value)
+                    if ref_id is not None:
+                        rows.append(("downtime", owner_id, kind, ref_id, position, False))
+
+    if rows:
+        keys = ("owner_type", "owner_id", "kind", "ref_id", "position", "completed")
+        op.bulk_insert(pack_entry, [dict(zip(keys, row)) for row in rows])
+    print(f"Created pack_entry table with {len(rows)} entries")
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "pack_entry" not in inspector.get_table_names():
+        print("pack_entry table does not exist, skipping removal")
+        return
+
+    op.drop_index("ix_pack_entry_kind_ref", table_name="pack_entry")
+    op.drop_index("ix_pack_entry_owner", table_name="pack_entry")
+    op.drop_table("pack_entry")
@@ -0,0 +1,50 @@
+"""add_character_stats_table
+
+Revision ID: 8d2f4a6b1c73
+Revises: 3e8b6c0d4f19
+Create Date: 2026-10-19 19:02:41.516308
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d2f4a6b1c73"
+down_revision = "3e8b6c0d4f19"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "character_stats" in inspector.get_table_names():
+        print("character_stats table already exists, skipping creation")
+        return
+
+    # Rows for existing characters are stored by scripts/backfill_character_stats.py
+    op.create_table(
+        "character_stats",
+        sa.Column("character_id", sa.Integer(), nullable=False),
+        sa.Column("total_skill_cost", sa.Integer(), nullable=False),
+        sa.Column("total_reputation", sa.Integer(), nullable=False),
+        sa.Column("engineering_slots", sa.Integer(), nullable=False),
+        sa.Column("engineering_mod_slots", sa.Integer(), nullable=False),
+        sa.Column("science_slots", sa.JSON(), nullable=False),
+        sa.Column("slot_sources", sa.JSON(), nullable=False),
+        sa.Column("sheet_values", sa.JSON(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["character_id"], ["character.id"]),
+        sa.PrimaryKeyConstraint("character_id"),
+    )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "character_stats" not in inspector.get_table_names():
+        print("character_stats table does not exist, skipping removal")
+        return
+
+    op.drop_table("character_stats")
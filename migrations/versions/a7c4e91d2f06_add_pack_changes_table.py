@@ -0,0 +1,58 @@
+"""add_pack_changes_table
+
+Revision ID: a7c4e91d2f06
+Revises: 3f6d2b8e1c57
+Create Date: 2026-10-19 15:07:44.912830
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7c4e91d2f06"
+down_revision = "3f6d2b8e1c57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "pack_changes" in inspector.get_table_names():
+        print("pack_changes table already exists, skipping creation")
+        return
+
+    op.create_table(
+        "pack_changes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "owner_type",
+            sa.Enum("character", "group", "downtime", name="packownertype", native_enum=False),
+            nullable=False,
+        ),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("changes", sa.JSON(), nullable=False),
+        sa.Column("replaced", sa.Boolean(), nullable=False),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("pack_version", sa.Integer(), nullable=False),
+        sa.Column("changed_by_user_id", sa.Integer(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"]),
+        sa.ForeignKeyConstraint(["changed_by_user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_pack_changes_event_cursor", "pack_changes", ["event_id", "id"])
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "pack_changes" not in inspector.get_table_names():
+        print("pack_changes table does not exist, skipping removal")
+        return
+
+    op.drop_index("ix_pack_changes_event_cursor", table_name="pack_changes")
+    op.drop_table("pack_changes")
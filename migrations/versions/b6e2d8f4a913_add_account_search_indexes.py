@@ -0,0 +1,48 @@
+"""add_account_search_indexes
+
+Revision ID: b6e2d8f4a913
+Revises: 5a7c9e1b3d24
+Create Date: 2026-10-19 22:03:51.904126
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b6e2d8f4a913"
+down_revision = "5a7c9e1b3d24"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_character_status_name", "character", ["status", sa.text("lower(name)")]),
+    ("ix_character_player_reference", "character", ["user_id", "character_id"]),
+    ("ix_group_name", "group", [sa.text("lower(name)")]),
+)
+
+
+def _index_names():
+    # The inspector skips expression indexes, so read them from the schema table
+    rows = op.get_bind().execute(sa.text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+    return {row[0] for row in rows}
+
+
+def upgrade():
+    existing = _index_names()
+
+    for name, table, columns in INDEXES:
+        if name in existing:
+            print(f"{name} index already exists, skipping creation")
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    existing = _index_names()
+
+    for name, table, _ in INDEXES:
+        if name not in existing:
+            print(f"{name} index does not exist, skipping removal")
+            continue
+        op.drop_index(name, table_name=table)
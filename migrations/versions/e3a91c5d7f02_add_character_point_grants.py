@@ -0,0 +1,84 @@
+"""add_character_point_grants
+
+Revision ID: e3a91c5d7f02
+Revises: b6e2d8f4a913
+Create Date: 2026-10-19 22:48:16.527304
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e3a91c5d7f02"
+down_revision = "b6e2d8f4a913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "character_point_grants" in tables:
+        print("character_point_grants table already exists, skipping creation")
+    else:
+        op.create_table(
+            "character_point_grants",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("event_id", sa.Integer(), nullable=False),
+            sa.Column("amounts", sa.Text(), nullable=False),
+            sa.Column("granted_by_id", sa.Integer(), nullable=False),
+            sa.Column("granted_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["event_id"], ["events.id"]),
+            sa.ForeignKeyConstraint(["granted_by_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("event_id"),
+        )
+
+    if "character_point_grant_entries" in tables:
+        print("character_point_grant_entries table already exists, skipping creation")
+        return
+
+    op.create_table(
+        "character_point_grant_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("grant_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("tickets", sa.Integer(), nullable=False),
+        sa.Column("points", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["grant_id"], ["character_point_grants.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_character_point_grant_entries_grant_id",
+        "character_point_grant_entries",
+        ["grant_id"],
+    )
+    op.create_index(
+        "ix_character_point_grant_entries_user_id",
+        "character_point_grant_entries",
+        ["user_id"],
+    )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "character_point_grant_entries" in tables:
+        op.drop_index(
+            "ix_character_point_grant_entries_user_id", table_name="character_point_grant_entries"
+        )
+        op.drop_index(
+            "ix_character_point_grant_entries_grant_id", table_name="character_point_grant_entries"
+        )
+        op.drop_table("character_point_grant_entries")
+    else:
+        print("character_point_grant_entries table does not exist, skipping removal")
+
+    if "character_point_grants" in tables:
+        op.drop_table("character_point_grants")
+    else:
+        print("character_point_grants table does not exist, skipping removal")
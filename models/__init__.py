@@ -27,6 +27,8 @@ from models.enums import (
 )
 from models.event import Event
 from models.extensions import db, login_manager, migrate
+from models.tools.audit_log_archive import AuditLogArchive
+from models.tools.bank_ledger import BankBalanceSnapshot, BankLedgerEntry
 from models.tools.character import (
     Character,
     CharacterAuditLog,
@@ -35,8 +37,13 @@ from models.tools.character import (
     CharacterSkill,
     CharacterTag,
 )
+from models.tools.character_point_grant import CharacterPointGrant, CharacterPointGrantEntry
+from models.tools.character_stats import CharacterStats
+from models.tools.condition_progression_run import ConditionProgressionRun
 from models.tools.group import Group, GroupInvite
 from models.tools.pack import Pack
+from models.tools.pack_change import PackChange
+from models.tools.pack_entry import PackEntry
 from models.tools.print_template import PrintTemplate
 from models.tools.user import User
 from models.wiki import WikiImage, WikiPage, WikiPageVersion, WikiSection, WikiTag
@@ -70,10 +77,13 @@ __all__ = [
     "login_manager",
     "migrate",
     "User",
+    "BankBalanceSnapshot",
+    "BankLedgerEntry",
     "Character",
     "CharacterStatus",
     "CharacterAuditLog",
     "CharacterSkill",
+    "CharacterStats",
     "Species",
     "Ability",
     "WikiPage",
@@ -85,6 +95,8 @@ __all__ = [
     "GroupInvite",
     "Sample",
     "Pack",
+    "PackChange",
+    "PackEntry",
     "PackExotic",
     "PackMessage",
     "PackDowntimeResult",
@@ -115,28 +115,36 @@ class Skill(db.Model):
 
     def character_meets_requirements(self, character):
         """Check if a character meets all requirements to learn this skill."""
+        return self.meets_requirements(
+            character.faction_id,
+            character.species_id,
+            {tag.id for tag in character.tags},
+            {skill.skill_id for skill in character.skills},
+        )
+
+    def meets_requirements(self, faction_id, species_id, tag_ids, skill_ids):
+        """Check the requirements against a character's faction, species, tag ids and skill
+        ids, for callers that already hold those values."""
+        # Requirement lists are stored as submitted by the skill form, so compare as strings
         # Check faction requirements
-        if self.required_factions_list and character.faction_id not in self.required_factions_list:
+        factions = {str(faction) for faction in self.required_factions_list}
+        if factions and str(faction_id) not in factions:
             return False
 
         # Check species requirements
-        if self.required_species_list and character.species_id not in self.required_species_list:
+        species = {str(species) for species in self.required_species_list}
+        if species and str(species_id) not in species:
             return False
 
         # Check tag requirements
         if self.required_tags_list:
-            character_tag_ids = {tag.id for tag in character.tags}
-            if not any(tag_id in character_tag_ids for tag_id in self.required_tags_list):
+            character_tags = {str(tag_id) for tag_id in tag_ids}
+            if not any(str(tag_id) in character_tags for tag_id in self.required_tags_list):
                 return False
 
         # Check skill prerequisites
-        if self.required_skill_id:
-            # Check if character has the required skill
-            has_prerequisite = any(
-                skill.skill_id == self.required_skill_id for skill in character.character_skills
-            )
-            if not has_prerequisite:
-                return False
+        if self.required_skill_id and self.required_skill_id not in skill_ids:
+            return False
 
         return True
 
@@ -139,6 +139,10 @@ class CharacterAuditAction(Enum):
     CONDITION_CHANGE = "condition_change"
     CYBERNETICS_CHANGE = "cybernetics_change"
 
+    @classmethod
+    def values(cls):
+        return [action.value for action in cls]
+
     @classmethod
     def descriptions(cls):
         return {
@@ -170,6 +174,10 @@ class GroupAuditAction(Enum):
     FUNDS_SET = "funds_set"
     DISBANDED = "disbanded"
 
+    @classmethod
+    def values(cls):
+        return [action.value for action in cls]
+
     @classmethod
     def descriptions(cls):
         return {
@@ -187,6 +195,53 @@ class GroupAuditAction(Enum):
         }
 
 
+class AuditLogOwnerType(Enum):
+    CHARACTER = "character"
+    GROUP = "group"
+
+    @classmethod
+    def values(cls):
+        return [type.value for type in cls]
+
+
+class BankAccountType(Enum):
+    CHARACTER = "character"
+    GROUP = "group"
+
+    @classmethod
+    def values(cls):
+        return [type.value for type in cls]
+
+    @classmethod
+    def descriptions(cls):
+        return {
+            cls.CHARACTER.value: "Character",
+            cls.GROUP.value: "Group",
+        }
+
+
+class BankEntryType(Enum):
+    DEPOSIT = "deposit"
+    WITHDRAWAL = "withdrawal"
+    TRANSFER_IN = "transfer_in"
+    TRANSFER_OUT = "transfer_out"
+    ADJUSTMENT = "adjustment"
+
+    @classmethod
+    def values(cls):
+        return [type.value for type in cls]
+
+    @classmethod
+    def descriptions(cls):
+        return {
+            cls.DEPOSIT.value: "Deposit",
+            cls.WITHDRAWAL.value: "Withdrawal",
+            cls.TRANSFER_IN.value: "Transfer In",
+            cls.TRANSFER_OUT.value: "Transfer Out",
+            cls.ADJUSTMENT.value: "Balance Adjustment",
+        }
+
+
 class GroupType(Enum):
     MILITARY = "military"
     SCIENTIFIC = "scientific"
@@ -297,6 +352,26 @@ class DowntimeTaskStatus(Enum):
         }
 
 
+class DowntimeJobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+    COMPLETED = "completed"
+
+    @classmethod
+    def values(cls):
+        return [status.value for status in cls]
+
+    @classmethod
+    def descriptions(cls):
+        return {
+            cls.PENDING.value: "Queued",
+            cls.RUNNING.value: "Processing",
+            cls.FAILED.value: "Failed",
+            cls.COMPLETED.value: "Completed",
+        }
+
+
 class EventType(Enum):
     MAINLINE = "mainline"
     SANCTIONED = "sanctioned"
@@ -359,3 +434,21 @@ class PrintTemplateType(Enum):
             cls.CONDITION_CARD.value: "Condition Card",
             cls.EXOTIC_SUBSTANCE_LABEL.value: "Exotic Substance Label",
         }
+
+
+class PackOwnerType(Enum):
+    CHARACTER = "character"
+    GROUP = "group"
+    DOWNTIME = "downtime"
+
+    @classmethod
+    def values(cls):
+        return [type.value for type in cls]
+
+    @classmethod
+    def descriptions(cls):
+        return {
+            cls.CHARACTER.value: "Character Pack",
+            cls.GROUP.value: "Group Pack",
+            cls.DOWNTIME.value: "Downtime Pack",
+        }
@@ -0,0 +1,46 @@
+import json
+import zlib
+
+from models.enums import AuditLogOwnerType
+from models.extensions import db
+
+
+class AuditLogArchive(db.Model):
+    """
+    A batch of a character's or group's audit log entries moved out of the live log.
+
+    The entries are stored as zlib-compressed JSON, one batch per owner per archive run, and
+    are only decompressed when someone asks to see them.
+    """
+
+    __tablename__ = "audit_log_archives"
+
+    id = db.Column(db.Integer, primary_key=True)
+    owner_type = db.Column(
+        db.Enum(
+            AuditLogOwnerType,
+            native_enum=False,
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=False,
+    )
+    owner_id = db.Column(db.Integer, nullable=False)
+    entry_count = db.Column(db.Integer, nullable=False)
+    first_timestamp = db.Column(db.DateTime, nullable=False)
+    last_timestamp = db.Column(db.DateTime, nullable=False)
+    entries_data = db.Column(db.LargeBinary, nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    __table_args__ = (db.Index("ix_audit_log_archives_owner", "owner_type", "owner_id"),)
+
+    @staticmethod
+    def compress(entries):
+        return zlib.compress(json.dumps(entries).encode("utf-8"))
+
+    @property
+    def entries(self):
+        """The archived entries, as dictionaries with timestamps in ISO format."""
+        return json.loads(zlib.decompress(self.entries_data).decode("utf-8"))
+
+    def __repr__(self):
+        return f"<AuditLogArchive {self.owner_type.value} {self.owner_id}: {self.entry_count}>"
@@ -0,0 +1,270 @@
+import uuid
+
+from sqlalchemy import event, func, insert, inspect, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models.enums import BankAccountType, BankEntryType
+from models.extensions import db
+
+# Each account's balance is snapshotted every this many ledger entries, so a past balance is
+# never more than this many entries away from a snapshot
+SNAPSHOT_INTERVAL = 100
+
+
+class BankLedgerEntry(db.Model):
+    """
+    One movement of funds into or out of a character or group bank account.
+
+    Entries are only ever added: a correction is a new entry, never an edit of an old one.
+    """
+
+    __tablename__ = "bank_ledger_entries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    account_type = db.Column(
+        db.Enum(
+            BankAccountType,
+            native_enum=False,
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=False,
+    )
+    account_id = db.Column(db.Integer, nullable=False)
+    entry_type = db.Column(
+        db.Enum(
+            BankEntryType,
+            native_enum=False,
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=False,
+    )
+    amount = db.Column(db.Integer, nullable=False)  # Positive into the account, negative out
+    transfer_id = db.Column(db.String(32), nullable=True, index=True)  # Both sides of a transfer
+    editor_user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    reason = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    editor = db.relationship("User")
+
+    __table_args__ = (
+        db.Index("ix_bank_ledger_entries_account", "account_type", "account_id", "id"),
+    )
+
+    def __repr__(self):
+        return f"<BankLedgerEntry {self.account_type.value} {self.account_id}: {self.amount}>"
+
+
+class BankBalanceSnapshot(db.Model):
+    """Balance of an account once every ledger entry up to ``ledger_entry_id`` was applied."""
+
+    __tablename__ = "bank_balance_snapshots"
+
+    id = db.Column(db.Integer, primary_key=True)
+    account_type = db.Column(
+        db.Enum(
+            BankAccountType,
+            native_enum=False,
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=False,
+    )
+    account_id = db.Column(db.Integer, nullable=False)
+    balance = db.Column(db.Integer, nullable=False)
+    ledger_entry_id = db.Column(db.Integer, nullable=False, default=0)
+    taken_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    __table_args__ = (
+        db.Index("ix_bank_balance_snapshots_account", "account_type", "account_id", "taken_at"),
+    )
+
+    def __repr__(self):
+        return f"<BankBalanceSnapshot {self.account_type.value} {self.account_id}: {self.balance}>"
+
+
+@event.listens_for(BankLedgerEntry, "before_update")
+@event.listens_for(BankLedgerEntry, "before_delete")
+def _append_only(mapper, connection, target):
+    raise ValueError("Bank ledger entries cannot be changed")
+
+
+def _account_type(account):
+    return BankAccountType(account.__table__.name)
+
+
+def _flush_account(account):
+    """Flush an account with unsaved changes, so statements on its row start from them."""
+    state = inspect(account)
+    if state.pending or state.modified:
+        db.session.flush()
+
+
+def _snapshot(account_type, account_id, balance, ledger_entry_id):
+    db.session.execute(
+        insert(BankBalanceSnapshot.__table__).values(
+            account_type=account_type,
+            account_id=account_id,
+            balance=balance,
+            ledger_entry_id=ledger_entry_id,
+        )
+    )
+
+
+def _record(account_type, account_id, balance, amount, **entry):
+    """Add a ledger entry for a change that left the account at ``balance``."""
+    snapshots = BankBalanceSnapshot.__table__.c
+    entries = BankLedgerEntry.__table__.c
+    covered = db.session.execute(
+        select(func.max(snapshots.ledger_entry_id)).where(
+            snapshots.account_type == account_type, snapshots.account_id == account_id
+        )
+    ).scalar()
+    if covered is None:
+        # Anything the account held before its first entry is its opening balance
+        _snapshot(account_type, account_id, balance - amount, 0)
+        covered = 0
+    since = db.session.execute(
+        select(func.count(entries.id)).where(
+            entries.account_type == account_type,
+            entries.account_id == account_id,
+            entries.id > covered,
+        )
+    ).scalar()
+
+    entry_id = db.session.execute(
+        insert(BankLedgerEntry.__table__).values(
+            account_type=account_type, account_id=account_id, amount=amount, **entry
+        )
+    ).inserted_primary_key[0]
+
+    if since + 1 >= SNAPSHOT_INTERVAL:
+        _snapshot(account_type, account_id, balance, entry_id)
+
+
+def post(account, amount, entry_type, editor_user_id, reason, transfer_id=None):
+    """
+    Move funds into (positive amount) or out of (negative amount) a character or group
+    account, recording the movement in the ledger.
+
+    The balance is changed by one UPDATE that, when taking funds out, only matches while the
+    balance still covers them. Concurrent withdrawals therefore cannot overdraw an account or
+    overwrite each other's changes, whatever balance they read beforehand.
+
+    Returns:
+        int: The account's new balance
+
+    Raises:
+        ValueError: If the account does not hold enough funds
+    """
+    _flush_account(account)
+    table = account.__table__
+    statement = update(table).where(table.c.id == account.id)
+    if amount < 0:
+        statement = statement.where(table.c.bank_account >= -amount)
+    balance = db.session.execute(
+        statement.values(bank_account=table.c.bank_account + amount).returning(table.c.bank_account)
+    ).scalar()
+    if balance is None:
+        raise ValueError("Not enough funds")
+
+    set_committed_value(account, "bank_account", balance)
+    _record(
+        _account_type(account),
+        account.id,
+        balance,
+        amount,
+        entry_type=entry_type,
+        editor_user_id=editor_user_id,
+        reason=reason,
+        transfer_id=transfer_id,
+    )
+    return balance
+
+
+def set_balance(account, balance, editor_user_id, reason):
+    """
+    Set an account's balance, recording the difference in the ledger.
+
+    Returns:
+        int: The balance the account held before
+    """
+    _flush_account(account)
+    table = account.__table__
+    while True:
+        old_balance = db.session.execute(
+            select(table.c.bank_account).where(table.c.id == account.id)
+        ).scalar_one()
+        if old_balance == balance:
+            break
+        # Only applies if nothing changed the balance since it was read; otherwise read again
+        result = db.session.execute(
+            update(table)
+            .where(table.c.id == account.id, table.c.bank_account == old_balance)
+            .values(bank_account=balance)
+        )
+        if result.rowcount:
+            _record(
+                _account_type(account),
+                account.id,
+                balance,
+                balance - old_balance,
+                entry_type=BankEntryType.ADJUSTMENT,
+                editor_user_id=editor_user_id,
+                reason=reason,
+            )
+            break
+
+    set_committed_value(account, "bank_account", balance)
+    return old_balance
+
+
+def transfer(source, target, amount, editor_user_id):
+    """
+    Move funds between two accounts in the current transaction.
+
+    Both ledger entries share a transfer id. Nothing is credited unless the debit succeeded.
+
+    Returns:
+        str: The transfer id
+
+    Raises:
+        ValueError: If the source account does not hold enough funds
+    """
+    transfer_id = uuid.uuid4().hex
+    source.remove_funds(amount, editor_user_id, f"Transfer to {target.name}", transfer_id)
+    target.add_funds(amount, editor_user_id, f"Transfer from {source.name}", transfer_id)
+    return transfer_id
+
+
+def balance_at(account, when):
+    """
+    The balance an account held at a point in time.
+
+    Starts from the account's latest snapshot taken by then and adds the entries made after
+    it, which are never more than ``SNAPSHOT_INTERVAL``.
+
+    Returns:
+        int: The balance, or None if the ledger does not cover the account at that time
+    """
+    account_type = _account_type(account)
+    snapshot = db.session.execute(
+        select(BankBalanceSnapshot)
+        .where(
+            BankBalanceSnapshot.account_type == account_type,
+            BankBalanceSnapshot.account_id == account.id,
+            BankBalanceSnapshot.taken_at <= when,
+        )
+        .order_by(BankBalanceSnapshot.ledger_entry_id.desc())
+        .limit(1)
+    ).scalar()
+    if snapshot is None:
+        return None
+
+    moved = db.session.execute(
+        select(func.coalesce(func.sum(BankLedgerEntry.amount), 0)).where(
+            BankLedgerEntry.account_type == account_type,
+            BankLedgerEntry.account_id == account.id,
+            BankLedgerEntry.id > snapshot.ledger_entry_id,
+            BankLedgerEntry.created_at <= when,
+        )
+    ).scalar()
+    return snapshot.balance + moved
@@ -3,9 +3,10 @@ from datetime import datetime, timezone
 from sqlalchemy import JSON
 
 from models.database.mods import Mod
-from models.enums import CharacterAuditAction, CharacterStatus, ScienceType
+from models.enums import AbilityType, BankEntryType, CharacterAuditAction, CharacterStatus
 from models.extensions import db
-from models.tools.pack import Pack
+from models.tools.bank_ledger import post, set_balance
+from models.tools.pack import Pack, PackOwnerMixin
 
 # Association table for many-to-many relationship between Character and CharacterTag
 character_tags = db.Table(
@@ -47,7 +48,9 @@ class CharacterSkill(db.Model):
         return f"<CharacterSkill {self.skill.name} (x{self.times_purchased})>"
 
 
-class Character(db.Model):
+class Character(PackOwnerMixin, db.Model):
+    pack_column = "character_pack"
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     character_id = db.Column(db.Integer, nullable=True)
@@ -62,6 +65,7 @@ class Character(db.Model):
     bank_account = db.Column(db.Integer, nullable=False, default=0)
     character_pack = db.Column(db.JSON, nullable=True)  # JSON data
     pack_complete = db.Column(db.Boolean, nullable=False, default=False)
+    pack_version = db.Column(db.Integer, nullable=False, default=0)  # Bumped on pack writes
     created_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
     updated_at = db.Column(
         db.DateTime, nullable=False, default=db.func.now(), onupdate=db.func.now()
@@ -82,20 +86,23 @@ class Character(db.Model):
     cybernetics_link = db.relationship("CharacterCybernetic", back_populates="character")
     downtime_packs = db.relationship("DowntimePack", back_populates="character")
     event_tickets = db.relationship("EventTicket", back_populates="character")
+    stats = db.relationship(
+        "CharacterStats", back_populates="character", uselist=False, cascade="all, delete-orphan"
+    )
 
-    @property
-    def pack(self):
-        try:
-            # character_pack is always JSON data (dict) since we control the data
-            pack = Pack(**self.character_pack)
-            return pack
-        except Exception:
-            return Pack()
-
-    @pack.setter
-    def pack(self, pack):
-        self.character_pack = pack.to_dict()
-        self.pack_complete = pack.is_complete()
+    # Account search on the bank page: name prefixes of active characters, player references
+    __table_args__ = (
+        db.Index("ix_character_status_name", status, db.func.lower(name)),
+        db.Index("ix_character_player_reference", user_id, character_id),
+    )
+
+    def _load_pack(self, raw):
+        # character_pack is always JSON data (dict) since we control the data
+        return Pack.from_dict(raw) if isinstance(raw, dict) else Pack()
+
+    def _dump_pack(self, pack):
+        # Keep any other data stored alongside the pack, such as message history
+        return {**(self.character_pack or {}), **pack.to_dict()}
 
     @classmethod
     def get_by_player_reference(cls, player_reference):
@@ -112,38 +119,20 @@ class Character(db.Model):
     def __repr__(self):
         return f"<Character {self.name}>"
 
+    @property
+    def derived_stats(self):
+        """Stats derived from skills, cybernetics, reputations and species, stored in
+        character_stats and rewritten whenever those change. Characters without a stored row
+        have them computed in memory, once per loaded instance."""
+        if self.stats is None and getattr(self, "computed_stats", None) is None:
+            from models.tools.character_stats import load_character_stats
+
+            load_character_stats([self])
+        return self.stats or self.computed_stats
+
     def get_total_skill_cost(self):
         """Calculate the total cost of all skills for this character."""
-        total_cost = 0
-        for character_skill in self.skills:
-            skill = character_skill.skill
-            if skill.cost_increases:
-                # For a skill with increasing cost, the cost of the nth purchase is
-                # base_cost + (n-1). We sum the cost for each purchase from 1 to
-                # times_purchased
-                for i in range(character_skill.times_purchased):
-                    purchase_cost = skill.base_cost + i
-                    # Apply species discounts
-                    for ability in self.species.abilities:
-                        if (
-                            ability.type == "skill_discounts"
-                            and str(skill.id) in ability.skill_discounts_dict
-                        ):
-                            discount = ability.skill_discounts_dict[str(skill.id)]
-                            purchase_cost = max(0, purchase_cost - discount)
-                    total_cost += purchase_cost
-            else:
-                purchase_cost = skill.base_cost
-                # Apply species discounts
-                for ability in self.species.abilities:
-                    if (
-                        ability.type == "skill_discounts"
-                        and str(skill.id) in ability.skill_discounts_dict
-                    ):
-                        discount = ability.skill_discounts_dict[str(skill.id)]
-                        purchase_cost = max(0, purchase_cost - discount)
-                total_cost += purchase_cost * character_skill.times_purchased
-        return total_cost
+        return self.derived_stats.total_skill_cost
 
     def get_faction_name(self):
         return self.faction.name if self.faction else None
@@ -186,8 +175,8 @@ class Character(db.Model):
                 base_cost += count  # Cost of the (N+1)th purchase
 
         # Apply species discounts if any
-        for ability in self.species.abilities:
-            if ability.type == "skill_discounts":
+        for ability in self.species.abilities if self.species else []:
+            if ability.type == AbilityType.SKILL_DISCOUNTS:
                 if str(skill.id) in ability.skill_discounts_dict:
                     discount = ability.skill_discounts_dict[str(skill.id)]
                     base_cost = max(0, base_cost - discount)
@@ -333,7 +322,7 @@ class Character(db.Model):
 
     def get_total_reputation(self):
         """Get the total reputation for the character."""
-        return sum(reputation.value for reputation in self.reputations)
+        return self.derived_stats.total_reputation
 
     def get_reputation(self, faction_id):
         """Get the character's reputation with a faction."""
@@ -377,90 +366,21 @@ class Character(db.Model):
         return [link.cybernetic for link in self.cybernetics_link]
 
     def get_available_science_slots(self, science_type=None):
-        """Get the available science slots for the character."""
-        skill_slots = 0
-        cybernetic_slots = 0
-        st_value = (
-            science_type.value
-            if science_type and isinstance(science_type, ScienceType)
-            else science_type
-        )
-
-        # Calculate slots from skills
-        for skill_link in self.skills:
-            skill = skill_link.skill
-            if not (skill.adds_science_downtime > 0 and skill.character_meets_requirements(self)):
-                continue
-
-            if st_value:
-                skill_st = skill.science_type
-                if st_value == ScienceType.GENERIC.value:
-                    if skill_st is None:
-                        skill_slots += skill.adds_science_downtime * skill_link.times_purchased
-                elif skill_st and skill_st.value == st_value:
-                    skill_slots += skill.adds_science_downtime * skill_link.times_purchased
-            else:
-                skill_slots += skill.adds_science_downtime * skill_link.times_purchased
-
-        # Calculate slots from cybernetics
-        for cyber_link in self.cybernetics_link:
-            cyber = cyber_link.cybernetic
-            if not cyber.adds_science_downtime > 0:
-                continue
-
-            if st_value:
-                cyber_st = cyber.science_type
-                if st_value == ScienceType.GENERIC.value:
-                    if cyber_st is None:
-                        cybernetic_slots += cyber.adds_science_downtime
-                elif cyber_st and cyber_st.value == st_value:
-                    cybernetic_slots += cyber.adds_science_downtime
-            else:
-                cybernetic_slots += cyber.adds_science_downtime
-
-        return skill_slots + cybernetic_slots
+        """Get the available science slots for the character, optionally of one type.
+        Slots without a science type count as generic."""
+        return self.derived_stats.get_science_slots(science_type)
 
     def get_available_engineering_slots(self):
         """Get the available engineering slots for the character."""
-        skill_slots = sum(
-            skill.skill.adds_engineering_downtime * skill.times_purchased
-            for skill in self.skills
-            if skill.skill.adds_engineering_downtime > 0
-            if skill.skill.character_meets_requirements(self)
-        )
-        cybernetic_slots = sum(
-            cyber.cybernetic.adds_engineering_downtime
-            for cyber in self.cybernetics_link
-            if cyber.cybernetic.adds_engineering_downtime > 0
-        )
-        return skill_slots + cybernetic_slots
+        return self.derived_stats.engineering_slots
 
     def get_available_engineering_mod_slots(self):
         """Get the available engineering mod slots for the character."""
-        skill_slots = sum(
-            skill.skill.adds_engineering_mods * skill.times_purchased
-            for skill in self.skills
-            if skill.skill.adds_engineering_mods > 0
-            if skill.skill.character_meets_requirements(self)
-        )
-        cybernetic_slots = sum(
-            cyber.cybernetic.adds_engineering_mods
-            for cyber in self.cybernetics_link
-            if cyber.cybernetic.adds_engineering_mods > 0
-        )
-        return skill_slots + cybernetic_slots
+        return self.derived_stats.engineering_mod_slots
 
     def get_character_sheet_values(self):
         """Get the character sheet values for the character."""
-        values = {}
-        for skill in self.skills:
-            if skill.skill.character_sheet_values_list:
-                for value in skill.skill.character_sheet_values_list:
-                    values[value["id"]] = {
-                        "name": value["description"],
-                        "value": value["value"],
-                    }
-        return values
+        return self.derived_stats.get_sheet_values()
 
     def get_factions_with_reputation(self):
         """Get the factions with a reputation for the character."""
@@ -473,25 +393,35 @@ class Character(db.Model):
     def can_afford(self, amount):
         return self.get_available_funds() >= amount
 
-    def remove_funds(self, amount, editor_user_id, reason):
-        """Remove funds from the character's bank account with audit logging."""
-        if not self.can_afford(amount):
-            raise ValueError("Not enough funds")
+    def remove_funds(self, amount, editor_user_id, reason, transfer_id=None):
+        """
+        Remove funds from the character's bank account with audit logging.
+
+        Whatever the character's own balance does not cover is taken from their group's,
+        except for transfers, which only ever move the account's own funds.
+        """
+        if transfer_id is None:
+            if not self.can_afford(amount):
+                raise ValueError("Not enough funds")
+            character_contribution = min(self.bank_account, amount)
+            entry_type = BankEntryType.WITHDRAWAL
+        else:
+            character_contribution = amount
+            entry_type = BankEntryType.TRANSFER_OUT
 
         # Calculate how much to take from character balance vs group balance
-        character_contribution = min(self.bank_account, amount)
         group_contribution = amount - character_contribution
 
-        # Deduct remaining from group balance
-        # Perform first to fail if group doesn't have enough funds
         if group_contribution > 0 and self.group:
-            self.group.remove_funds(
-                group_contribution, editor_user_id, f"Character {self.name} spent on: {reason}"
-            )
-
-        # Deduct from character balance
-        if character_contribution > 0:
-            self.bank_account -= character_contribution
+            # Both balances change or neither does
+            with db.session.begin_nested():
+                self.group.remove_funds(
+                    group_contribution, editor_user_id, f"Character {self.name} spent on: {reason}"
+                )
+                if character_contribution > 0:
+                    post(self, -character_contribution, entry_type, editor_user_id, reason)
+        elif character_contribution > 0:
+            post(self, -character_contribution, entry_type, editor_user_id, reason, transfer_id)
 
         # Create an audit log for the expenditure
         changes_parts = []
@@ -510,9 +440,10 @@ class Character(db.Model):
         )
         db.session.add(audit_log)
 
-    def add_funds(self, amount, editor_user_id, reason):
+    def add_funds(self, amount, editor_user_id, reason, transfer_id=None):
         """Add funds to the character's bank account with audit logging."""
-        self.bank_account += amount
+        entry_type = BankEntryType.TRANSFER_IN if transfer_id else BankEntryType.DEPOSIT
+        post(self, amount, entry_type, editor_user_id, reason, transfer_id)
 
         # Create an audit log for the addition
         audit_log = CharacterAuditLog(
@@ -525,8 +456,7 @@ class Character(db.Model):
 
     def set_funds(self, new_balance, editor_user_id, reason):
         """Set the character's bank account to a specific value with audit logging."""
-        old_balance = self.bank_account
-        self.bank_account = new_balance
+        old_balance = set_balance(self, new_balance, editor_user_id, reason)
         audit_log = CharacterAuditLog(
             character_id=self.id,
             editor_user_id=editor_user_id,
@@ -569,6 +499,10 @@ class CharacterAuditLog(db.Model):
     character = db.relationship("Character", back_populates="audit_logs")
     editor = db.relationship("User")
 
+    __table_args__ = (
+        db.Index("ix_character_audit_log_character_timestamp", "character_id", "timestamp"),
+    )
+
     def __repr__(self):
         return f"<CharacterAuditLog {self.action} by {self.editor.email}>"
 
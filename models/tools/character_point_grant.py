@@ -0,0 +1,55 @@
+import json
+
+from models.extensions import db
+
+
+class CharacterPointGrant(db.Model):
+    """
+    Character points awarded to the ticket holders of an event.
+
+    An event has at most one grant, so awarding its points a second time is refused.
+    """
+
+    __tablename__ = "character_point_grants"
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False, unique=True)
+    amounts = db.Column(db.Text, nullable=False)  # JSON: ticket type -> points per ticket
+    granted_by_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    granted_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    event = db.relationship("Event")
+    granted_by = db.relationship("User")
+    entries = db.relationship(
+        "CharacterPointGrantEntry",
+        back_populates="grant",
+        cascade="all, delete-orphan",
+        order_by="CharacterPointGrantEntry.id",
+    )
+
+    @property
+    def amounts_dict(self):
+        return json.loads(self.amounts or "{}")
+
+    def __repr__(self):
+        return f"<CharacterPointGrant event {self.event_id}>"
+
+
+class CharacterPointGrantEntry(db.Model):
+    """Points one user received from a grant, summed over the tickets they hold."""
+
+    __tablename__ = "character_point_grant_entries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    grant_id = db.Column(
+        db.Integer, db.ForeignKey("character_point_grants.id"), nullable=False, index=True
+    )
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    tickets = db.Column(db.Integer, nullable=False)
+    points = db.Column(db.Float, nullable=False)
+
+    grant = db.relationship("CharacterPointGrant", back_populates="entries")
+    user = db.relationship("User")
+
+    def __repr__(self):
+        return f"<CharacterPointGrantEntry user {self.user_id}: {self.points}>"
@@ -0,0 +1,331 @@
+import json
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models.database.cybernetic import CharacterCybernetic, Cybernetic
+from models.database.skills import Skill
+from models.database.species import Ability
+from models.enums import AbilityType, ScienceType
+from models.extensions import db
+from models.tools.character import Character, CharacterReputation, CharacterSkill, character_tags
+
+# Character columns whose changes alter which skills count or what they cost
+CHARACTER_INPUTS = ("species_id", "faction_id", "tags")
+
+
+class CharacterStats(db.Model):
+    """
+    Values derived from a character's skills, cybernetics, reputations and species.
+
+    Rows are rewritten by refresh_character_stats whenever one of those inputs changes, so
+    character sheets, downtime and print runs read them instead of walking the relationships.
+    """
+
+    __tablename__ = "character_stats"
+    character_id = db.Column(db.Integer, db.ForeignKey("character.id"), primary_key=True)
+    total_skill_cost = db.Column(db.Integer, nullable=False, default=0)
+    total_reputation = db.Column(db.Integer, nullable=False, default=0)
+    engineering_slots = db.Column(db.Integer, nullable=False, default=0)
+    engineering_mod_slots = db.Column(db.Integer, nullable=False, default=0)
+    science_slots = db.Column(db.JSON, nullable=False, default=dict)  # Science type -> slots
+    slot_sources = db.Column(db.JSON, nullable=False, default=dict)  # Slot kind -> sources
+    sheet_values = db.Column(db.JSON, nullable=False, default=list)
+    computed_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    character = db.relationship("Character", back_populates="stats")
+
+    def __repr__(self):
+        return f"<CharacterStats {self.character_id}>"
+
+    def get_science_slots(self, science_type=None):
+        if science_type is None:
+            return sum(self.science_slots.values())
+        if isinstance(science_type, ScienceType):
+            science_type = science_type.value
+        return self.science_slots.get(science_type, 0)
+
+    def get_sources(self, kind):
+        """Slot sources of a kind ("science" or "engineering"), one entry per slot."""
+        return [
+            {"source": source["source"], "type": source.get("type")}
+            for source in self.slot_sources.get(kind, [])
+            for _ in range(source["count"])
+        ]
+
+    def get_sheet_values(self):
+        return {
+            value["id"]: {"name": value["name"], "value": value["value"]}
+            for value in self.sheet_values
+        }
+
+
+def _discounted(cost, skill_id, discounts):
+    for discount in discounts:
+        if str(skill_id) in discount:
+            cost = max(0, cost - discount[str(skill_id)])
+    return cost
+
+
+def _science_type(value):
+    # Slots without a science type are generic
+    if value is None:
+        return ScienceType.GENERIC.value
+    return value.value if isinstance(value, ScienceType) else value
+
+
+def compute_character_stats(session, character_ids):
+    """
+    Derive the stats of each character from its stored skills, cybernetics, reputations and
+    species, with one query per input however many characters are given.
+
+    Returns:
+        dict: Character id -> column values for CharacterStats
+    """
+    character_ids = list(set(character_ids))
+    characters = {
+        row.id: row
+        for row in session.execute(
+            select(Character.id, Character.species_id, Character.faction_id).where(
+                Character.id.in_(character_ids)
+            )
+        )
+    }
+    tags = {character_id: set() for character_id in characters}
+    for character_id, tag_id in session.execute(
+        select(character_tags.c.character_id, character_tags.c.tag_id).where(
+            character_tags.c.character_id.in_(characters)
+        )
+    ):
+        tags[character_id].add(tag_id)
+
+    species_ids = {row.species_id for row in characters.values() if row.species_id}
+    discounts = {species_id: [] for species_id in species_ids}
+    for species_id, skill_discounts in session.execute(
+        select(Ability.species_id, Ability.skill_discounts).where(
+            Ability.species_id.in_(species_ids),
+            Ability.type == AbilityType.SKILL_DISCOUNTS,
+            Ability.skill_discounts.is_not(None),
+        )
+    ):
+        discounts[species_id].append(json.loads(skill_discounts))
+
+    skills = {character_id: [] for character_id in characters}
+    for row in session.execute(
+        select(CharacterSkill.character_id, CharacterSkill.times_purchased, Skill)
+        .join(Skill, CharacterSkill.skill_id == Skill.id)
+        .where(CharacterSkill.character_id.in_(characters))
+        .order_by(CharacterSkill.id)
+    ):
+        skills[row.character_id].append(row)
+
+    cybernetics = {character_id: [] for character_id in characters}
+    for row in session.execute(
+        select(CharacterCybernetic.character_id, Cybernetic)
+        .join(Cybernetic, CharacterCybernetic.cybernetic_id == Cybernetic.id)
+        .where(CharacterCybernetic.character_id.in_(characters))
+        .order_by(CharacterCybernetic.id)
+    ):
+        cybernetics[row.character_id].append(row)
+
+    reputations = dict(
+        session.execute(
+            select(CharacterReputation.character_id, db.func.sum(CharacterReputation.value))
+            .where(CharacterReputation.character_id.in_(characters))
+            .group_by(CharacterReputation.character_id)
+        ).all()
+    )
+
+    stats = {}
+    for character_id, character in characters.items():
+        character_discounts = discounts.get(character.species_id, [])
+        skill_ids = {row.Skill.id for row in skills[character_id]}
+        values = {
+            "total_skill_cost": 0,
+            "total_reputation": reputations.get(character_id) or 0,
+            "engineering_slots": 0,
+            "engineering_mod_slots": 0,
+            "science_slots": {},
+            "slot_sources": {"science": [], "engineering": []},
+            "sheet_values": [],
+        }
+
+        for row in skills[character_id]:
+            skill = row.Skill
+            times = row.times_purchased
+            values["total_skill_cost"] += sum(
+                _discounted(
+                    skill.base_cost + (i if skill.cost_increases else 0),
+                    skill.id,
+                    character_discounts,
+                )
+                for i in range(times)
+            )
+            for value in skill.character_sheet_values_list:
+                values["sheet_values"] = [
+                    entry for entry in values["sheet_values"] if entry["id"] != value["id"]
+                ] + [{"id": value["id"], "name": value["description"], "value": value["value"]}]
+
+            if not skill.meets_requirements(
+                character.faction_id, character.species_id, tags[character_id], skill_ids
+            ):
+                continue
+            source = f"Skill: {skill.name}"
+            if skill.adds_engineering_downtime and skill.adds_engineering_downtime > 0:
+                values["engineering_slots"] += skill.adds_engineering_downtime * times
+                values["slot_sources"]["engineering"].append({"source": source, "count": times})
+            if skill.adds_engineering_mods and skill.adds_engineering_mods > 0:
+                values["engineering_mod_slots"] += skill.adds_engineering_mods * times
+            if skill.adds_science_downtime and skill.adds_science_downtime > 0:
+                science_type = _science_type(skill.science_type)
+                values["science_slots"][science_type] = (
+                    values["science_slots"].get(science_type, 0)
+                    + skill.adds_science_downtime * times
+                )
+                values["slot_sources"]["science"].append(
+                    {"source": source, "type": science_type, "count": times}
+                )
+
+        for row in cybernetics[character_id]:
+            cybernetic = row.Cybernetic
+            source = f"Cybernetic: {cybernetic.name}"
+            if cybernetic.adds_engineering_downtime and cybernetic.adds_engineering_downtime > 0:
+                values["engineering_slots"] += cybernetic.adds_engineering_downtime
+                values["slot_sources"]["engineering"].append({"source": source, "count": 1})
+            if cybernetic.adds_engineering_mods and cybernetic.adds_engineering_mods > 0:
+                values["engineering_mod_slots"] += cybernetic.adds_engineering_mods
+            if cybernetic.adds_science_downtime and cybernetic.adds_science_downtime > 0:
+                science_type = _science_type(cybernetic.science_type)
+                values["science_slots"][science_type] = (
+                    values["science_slots"].get(science_type, 0) + cybernetic.adds_science_downtime
+                )
+                values["slot_sources"]["science"].append(
+                    {"source": source, "type": science_type, "count": 1}
+                )
+
+        stats[character_id] = values
+    return stats
+
+
+def refresh_character_stats(session, character_ids):
+    """Recompute and store the stats of the given characters."""
+    stats = compute_character_stats(session, character_ids)
+    connection = session.connection()
+    if not stats:
+        return
+    table = CharacterStats.__table__
+    connection.execute(table.delete().where(table.c.character_id.in_(stats)))
+    connection.execute(
+        table.insert(),
+        [dict(values, character_id=character_id) for character_id, values in stats.items()],
+    )
+
+
+def backfill_character_stats(session, batch_size=500):
+    """
+    Store the stats of every character that has no stored row yet, a batch at a time.
+
+    Returns:
+        int: Number of characters whose stats were stored
+    """
+    table = CharacterStats.__table__
+    unstored = select(Character.id).where(
+        ~select(table.c.character_id).where(table.c.character_id == Character.id).exists()
+    )
+    stored = 0
+    while True:
+        character_ids = session.execute(unstored.limit(batch_size)).scalars().all()
+        if not character_ids:
+            return stored
+        refresh_character_stats(session, character_ids)
+        session.commit()
+        stored += len(character_ids)
+
+
+def load_character_stats(characters):
+    """
+    Attach the stored stats of many characters with one query, for bulk reads such as print
+    runs. Characters without a stored row get their stats computed together in memory; reads
+    never store them, that is left to scripts/backfill_character_stats.py and to flushes that
+    change the character's inputs.
+    """
+    characters = [character for character in characters if character.id is not None]
+    ids = [character.id for character in characters]
+    if not ids:
+        return
+    stored = {
+        stats.character_id: stats
+        for stats in CharacterStats.query.filter(CharacterStats.character_id.in_(ids))
+    }
+    missing = [character_id for character_id in ids if character_id not in stored]
+    computed = {}
+    if missing:
+        computed = {
+            character_id: CharacterStats(character_id=character_id, **values)
+            for character_id, values in compute_character_stats(db.session, missing).items()
+        }
+    for character in characters:
+        set_committed_value(character, "stats", stored.get(character.id))
+        character.computed_stats = computed.get(character.id)
+
+
+def _changed_character_ids(session):
+    """Ids of characters whose stat inputs are added, changed or removed in this flush."""
+    character_ids = set()
+    skill_ids = set()
+    cybernetic_ids = set()
+    species_ids = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (CharacterSkill, CharacterCybernetic, CharacterReputation)):
+            if obj in session.new or obj in session.deleted or session.is_modified(obj):
+                character_ids.add(obj.character_id)
+        elif isinstance(obj, Character):
+            state = inspect(obj)
+            if obj in session.new or any(
+                state.attrs[attribute].history.has_changes() for attribute in CHARACTER_INPUTS
+            ):
+                character_ids.add(obj.id)
+        elif isinstance(obj, Skill) and obj not in session.new and session.is_modified(obj):
+            skill_ids.add(obj.id)
+        elif isinstance(obj, Cybernetic) and obj not in session.new and session.is_modified(obj):
+            cybernetic_ids.add(obj.id)
+        elif isinstance(obj, Ability):
+            species_ids.add(obj.species_id)
+
+    # Definition changes affect every character holding the skill, cybernetic or species
+    for character_column, column, parent_ids in (
+        (CharacterSkill.character_id, CharacterSkill.skill_id, skill_ids),
+        (CharacterCybernetic.character_id, CharacterCybernetic.cybernetic_id, cybernetic_ids),
+        (Character.id, Character.species_id, species_ids),
+    ):
+        if parent_ids:
+            character_ids.update(
+                session.execute(select(character_column).where(column.in_(parent_ids))).scalars()
+            )
+
+    deleted = {obj.id for obj in session.deleted if isinstance(obj, Character)}
+    return {character_id for character_id in character_ids if character_id} - deleted
+
+
+@event.listens_for(Session, "after_flush")
+def sync_character_stats(session, flush_context):
+    """Rewrite the stats of every character whose skills, cybernetics, reputations or
+    species changed in this flush."""
+    character_ids = _changed_character_ids(session)
+    if not character_ids:
+        return
+    refresh_character_stats(session, character_ids)
+    session.info.setdefault("refreshed_character_stats", set()).update(character_ids)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def expire_refreshed_character_stats(session, flush_context):
+    """Reload stats that were loaded before they were rewritten on their next access."""
+    for character_id in session.info.pop("refreshed_character_stats", ()):
+        for model, attributes in ((CharacterStats, None), (Character, ["stats"])):
+            key = inspect(model).identity_key_from_primary_key((character_id,))
+            obj = session.identity_map.get(key)
+            if obj is not None:
+                session.expire(obj, attributes)
@@ -0,0 +1,22 @@
+from models.extensions import db
+
+
+class ConditionProgressionRun(db.Model):
+    """
+    Record of an event's attendees having had their conditions progressed.
+
+    An event has at most one run, so conditions are never aged twice for the same event.
+    """
+
+    __tablename__ = "condition_progression_runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False, unique=True)
+    progressed_by_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    progressed_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    event = db.relationship("Event")
+    progressed_by = db.relationship("User")
+
+    def __repr__(self):
+        return f"<ConditionProgressionRun event {self.event_id}>"
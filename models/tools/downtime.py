@@ -1,10 +1,17 @@
+from datetime import datetime, timedelta, timezone
+
 from sqlalchemy import JSON, Column, ForeignKey, Integer
 from sqlalchemy.orm import relationship
 
-from models.enums import DowntimeStatus, DowntimeTaskStatus
+from models.enums import DowntimeJobStatus, DowntimeStatus, DowntimeTaskStatus
 from models.extensions import db
 
 
+def utcnow():
+    """Current UTC time as the naive datetime SQLite hands back."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class DowntimePeriod(db.Model):
     __tablename__ = "downtime_periods"
 
@@ -32,6 +39,7 @@ class DowntimePeriod(db.Model):
 
 class DowntimePack(db.Model):
     __tablename__ = "downtime_packs"
+    __table_args__ = (db.Index("ix_downtime_packs_period_status", "period_id", "status"),)
 
     id = Column(Integer, primary_key=True)
     period_id = Column(Integer, ForeignKey("downtime_periods.id"), nullable=False)
@@ -87,3 +95,88 @@ class DowntimePack(db.Model):
             "reputation": self.reputation,
             "review_data": self.review_data,
         }
+
+
+class DowntimeJob(db.Model):
+    """
+    Background run processing a downtime period.
+
+    Packs are processed in batches, and the ids of each batch are committed in the same
+    transaction as its results, so a job that fails or whose worker dies part way through can
+    be resumed without processing any pack twice. A running job updates ``heartbeat_at`` at
+    every checkpoint; one that has not done so within ``heartbeat_timeout``, which allows
+    ``PACK_TIMEOUT`` for each pack of its batches on top of ``HEARTBEAT_TIMEOUT``, is assumed
+    lost. Checkpoints only commit while the heartbeat is still the runner's own, so a runner
+    whose job was resumed elsewhere rolls its batch back instead of processing it twice.
+    """
+
+    __tablename__ = "downtime_jobs"
+
+    HEARTBEAT_TIMEOUT = timedelta(minutes=5)
+    PACK_TIMEOUT = timedelta(minutes=1)
+
+    id = Column(Integer, primary_key=True)
+    period_id = Column(Integer, ForeignKey("downtime_periods.id"), nullable=False, unique=True)
+    status = db.Column(
+        db.Enum(
+            DowntimeJobStatus,
+            native_enum=False,
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=False,
+        default=DowntimeJobStatus.PENDING,
+    )
+    seed = Column(Integer, nullable=True)
+    started_by_user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    total_packs = Column(Integer, nullable=False, default=0)
+    batch_size = Column(Integer, nullable=True)  # Packs per checkpoint of the current runner
+    processed_pack_ids = Column(JSON, nullable=False, default=list)
+    timings = Column(JSON, nullable=False, default=dict)  # Milliseconds per phase
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    period = relationship("DowntimePeriod", backref=db.backref("job", uselist=False))
+    started_by = relationship("User")
+
+    @property
+    def processed_count(self):
+        return len(self.processed_pack_ids or [])
+
+    @property
+    def progress_percent(self):
+        if not self.total_packs:
+            return 100 if self.status == DowntimeJobStatus.COMPLETED else 0
+        return int(self.processed_count * 100 / self.total_packs)
+
+    @property
+    def heartbeat_timeout(self):
+        """How long a running job may go between checkpoints, sized to its batches."""
+        return self.HEARTBEAT_TIMEOUT + self.PACK_TIMEOUT * (self.batch_size or 0)
+
+    def is_stale(self, now=None):
+        """Whether a running job has stopped checking in, e.g. because its worker was killed."""
+        if self.status != DowntimeJobStatus.RUNNING:
+            return False
+        last_seen = self.heartbeat_at or self.created_at
+        return last_seen is None or last_seen < (now or utcnow()) - self.heartbeat_timeout
+
+    @property
+    def can_resume(self):
+        return self.status == DowntimeJobStatus.FAILED or self.is_stale()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "period_id": self.period_id,
+            "status": self.status.value,
+            "total_packs": self.total_packs,
+            "processed_packs": self.processed_count,
+            "progress_percent": self.progress_percent,
+            "can_resume": self.can_resume,
+            "error": self.error,
+            "timings": self.timings or {},
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+        }
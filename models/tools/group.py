@@ -1,16 +1,21 @@
 from sqlalchemy import JSON
 
-from models.enums import GroupAuditAction
+from models.enums import BankEntryType, GroupAuditAction
 from models.extensions import db
+from models.tools.bank_ledger import post, set_balance
+from models.tools.pack import Pack, PackOwnerMixin
 
 
-class Group(db.Model):
+class Group(PackOwnerMixin, db.Model):
+    pack_column = "group_pack"
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     group_type_id = db.Column(db.Integer, db.ForeignKey("group_types.id"), nullable=False)
     bank_account = db.Column(db.Integer, nullable=False, default=0)
     group_pack = db.Column(db.String, nullable=True)  # JSON string
     pack_complete = db.Column(db.Boolean, nullable=False, default=False)
+    pack_version = db.Column(db.Integer, nullable=False, default=0)  # Bumped on pack writes
     created_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
     updated_at = db.Column(
         db.DateTime, nullable=False, default=db.func.now(), onupdate=db.func.now()
@@ -23,12 +28,16 @@ class Group(db.Model):
     samples = db.relationship("Sample", back_populates="group", lazy="dynamic")
     audit_logs = db.relationship("GroupAuditLog", back_populates="group")
 
+    # Account search on the bank page matches name prefixes
+    __table_args__ = (db.Index("ix_group_name", db.func.lower(name)),)
+
     def __repr__(self):
         return f"<Group {self.name}>"
 
-    def add_funds(self, amount, editor_user_id, reason):
+    def add_funds(self, amount, editor_user_id, reason, transfer_id=None):
         """Add funds to the group's bank account with audit logging."""
-        self.bank_account += amount
+        entry_type = BankEntryType.TRANSFER_IN if transfer_id else BankEntryType.DEPOSIT
+        post(self, amount, entry_type, editor_user_id, reason, transfer_id)
 
         # Create an audit log for the addition
         audit_log = GroupAuditLog(
@@ -39,12 +48,10 @@ class Group(db.Model):
         )
         db.session.add(audit_log)
 
-    def remove_funds(self, amount, editor_user_id, reason):
+    def remove_funds(self, amount, editor_user_id, reason, transfer_id=None):
         """Remove funds from the group's bank account with audit logging."""
-        if self.bank_account < amount:
-            raise ValueError("Not enough funds")
-
-        self.bank_account -= amount
+        entry_type = BankEntryType.TRANSFER_OUT if transfer_id else BankEntryType.WITHDRAWAL
+        post(self, -amount, entry_type, editor_user_id, reason, transfer_id)
 
         # Create an audit log for the removal
         audit_log = GroupAuditLog(
@@ -57,8 +64,7 @@ class Group(db.Model):
 
     def set_funds(self, new_balance, editor_user_id, reason):
         """Set the group's bank account to a specific value with audit logging."""
-        old_balance = self.bank_account
-        self.bank_account = new_balance
+        old_balance = set_balance(self, new_balance, editor_user_id, reason)
         audit_log = GroupAuditLog(
             group_id=self.id,
             editor_user_id=editor_user_id,
@@ -67,16 +73,11 @@ class Group(db.Model):
         )
         db.session.add(audit_log)
 
-    @property
-    def pack(self):
-        from models.tools.pack import Pack
+    def _load_pack(self, raw):
+        return Pack.from_json(raw)
 
-        return Pack.from_json(self.group_pack)
-
-    @pack.setter
-    def pack(self, pack):
-        self.group_pack = pack.to_json()
-        self.pack_complete = pack.is_complete()
+    def _dump_pack(self, pack):
+        return pack.to_json()
 
 
 class GroupInvite(db.Model):
@@ -118,5 +119,7 @@ class GroupAuditLog(db.Model):
     group = db.relationship("Group", back_populates="audit_logs")
     editor = db.relationship("User")
 
+    __table_args__ = (db.Index("ix_group_audit_log_group_timestamp", "group_id", "timestamp"),)
+
     def __repr__(self):
         return f"<GroupAuditLog {self.action} by {self.editor.email}>"
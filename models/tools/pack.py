@@ -1,7 +1,103 @@
 import json
-from dataclasses import dataclass, field
+import weakref
+from dataclasses import dataclass, field, fields
 from typing import Dict, List
 
+from sqlalchemy import event, inspect, update
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import flag_modified
+
+LIST_FIELDS = ("items", "samples", "exotics", "medicaments")
+
+
+class PackList(list):
+    """List that keeps a set for O(1) membership and reports mutations to its pack."""
+
+    def __init__(self, values=(), pack=None):
+        super().__init__(values)
+        self._pack = pack
+        self._rebuild()
+
+    def _rebuild(self):
+        try:
+            self._members = set(self)
+        except TypeError:
+            # Unhashable values fall back to list scans
+            self._members = None
+
+    def _changed(self):
+        self._rebuild()
+        if self._pack is not None:
+            self._pack._changed()
+
+    def __contains__(self, value):
+        if self._members is None:
+            return super().__contains__(value)
+        try:
+            return value in self._members
+        except TypeError:
+            return False
+
+    def append(self, value):
+        super().append(value)
+        if self._members is not None:
+            try:
+                self._members.add(value)
+            except TypeError:
+                self._members = None
+        if self._pack is not None:
+            self._pack._changed()
+
+    def _mutator(name):
+        def method(self, *args, **kwargs):
+            result = getattr(super(PackList, self), name)(*args, **kwargs)
+            self._changed()
+            return result
+
+        method.__name__ = name
+        return method
+
+    extend = _mutator("extend")
+    insert = _mutator("insert")
+    remove = _mutator("remove")
+    pop = _mutator("pop")
+    clear = _mutator("clear")
+    sort = _mutator("sort")
+    reverse = _mutator("reverse")
+    __setitem__ = _mutator("__setitem__")
+    __delitem__ = _mutator("__delitem__")
+    __iadd__ = _mutator("__iadd__")
+    __imul__ = _mutator("__imul__")
+    del _mutator
+
+
+class PackDict(dict):
+    """Dict that reports mutations to its pack."""
+
+    def __init__(self, values=(), pack=None):
+        super().__init__(values)
+        self._pack = pack
+
+    def _mutator(name):
+        def method(self, *args, **kwargs):
+            result = getattr(super(PackDict, self), name)(*args, **kwargs)
+            if self._pack is not None:
+                self._pack._changed()
+            return result
+
+        method.__name__ = name
+        return method
+
+    __setitem__ = _mutator("__setitem__")
+    __delitem__ = _mutator("__delitem__")
+    update = _mutator("update")
+    pop = _mutator("pop")
+    popitem = _mutator("popitem")
+    clear = _mutator("clear")
+    setdefault = _mutator("setdefault")
+    del _mutator
+
 
 @dataclass
 class Pack:
@@ -13,6 +109,36 @@ class Pack:
     completion: Dict[str, bool] = field(default_factory=dict)
     is_generated: bool = False
 
+    def __setattr__(self, name, value):
+        if name in LIST_FIELDS:
+            value = PackList(value or [], self)
+        elif name == "completion":
+            value = PackDict(value or {}, self)
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            self._changed()
+
+    def _changed(self) -> None:
+        """Mark the pack dirty and flag the owning column so the next flush writes it back."""
+        object.__setattr__(self, "_dirty", True)
+        owner_ref = self.__dict__.get("_owner")
+        owner = owner_ref() if owner_ref is not None else None
+        if owner is not None:
+            try:
+                flag_modified(owner, owner.pack_column)
+            except InvalidRequestError:
+                # Column was expired since the pack was loaded; the setter writes it back
+                pass
+
+    def _bind(self, owner) -> None:
+        """Attach the pack to the model instance it was loaded from, as a clean pack."""
+        object.__setattr__(self, "_owner", weakref.ref(owner))
+        object.__setattr__(self, "_dirty", False)
+
+    @property
+    def is_dirty(self) -> bool:
+        return self.__dict__.get("_dirty", False)
+
     def is_complete(self) -> bool:
         required_items = ["character_sheet", "character_id_badge"]
         required_items += [f"item_{item_id}" for item_id in self.items if self.has_item(item_id)]
@@ -119,10 +245,10 @@ class Pack:
                     clean_completion[str(key)] = bool(value)
 
             result = {
-                "items": self.items,
-                "samples": self.samples,
-                "exotics": self.exotics,
-                "medicaments": self.medicaments,
+                "items": list(self.items),
+                "samples": list(self.samples),
+                "exotics": list(self.exotics),
+                "medicaments": list(self.medicaments),
                 "energy_chits": self.energy_chits,
                 "completion": clean_completion,
                 "is_generated": self.is_generated,
@@ -143,18 +269,110 @@ class Pack:
     def to_json(self) -> str:
         return json.dumps(self.to_dict())
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Pack":
+        if not data:
+            return cls()
+        try:
+            # Ignore computed properties and unrelated keys stored alongside the pack
+            names = {f.name for f in fields(cls)}
+            return cls(**{key: value for key, value in data.items() if key in names})
+        except Exception:
+            # Return a default pack if there's an error
+            return cls()
+
     @classmethod
     def from_json(cls, data: str) -> "Pack":
         if not data:
             return cls()
         try:
-            d = json.loads(data)
-            # Filter out computed properties that are not constructor parameters
-            d.pop("is_completed", None)
-            is_generated = d.pop("is_generated", False)
-            pack = cls(**d)
-            pack.is_generated = is_generated
-            return pack
+            return cls.from_dict(json.loads(data))
         except Exception:
             # Return a default pack if there's an error
             return cls()
+
+
+class PackOwnerMixin:
+    """
+    Model mixin exposing a pack column as a Pack.
+
+    The Pack is deserialized once per loaded column value and cached on the instance. In-place
+    changes (e.g. ``group.pack.items.append(1)``) flag the column, and are serialized back
+    when the session flushes. Every stored change bumps the model's ``pack_version``.
+
+    Models define ``pack_column``, the name of the column holding the pack, along with
+    ``_load_pack(raw)`` and ``_dump_pack(pack)`` converting between its value and a Pack.
+    """
+
+    PACK_HOOKS = ("pack_column", "_load_pack", "_dump_pack")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [name for name in cls.PACK_HOOKS if getattr(cls, name, None) is None]
+        if missing:
+            raise TypeError(f"{cls.__name__} must define {', '.join(missing)} to hold a pack")
+
+    @property
+    def pack(self) -> Pack:
+        raw = getattr(self, self.pack_column)
+        cached = self.__dict__.get("_cached_pack")
+        if cached is not None and self.__dict__.get("_cached_pack_source") is raw:
+            return cached
+        pack = self._load_pack(raw)
+        self._cache_pack(pack, raw)
+        return pack
+
+    @pack.setter
+    def pack(self, pack: Pack):
+        raw = self._dump_pack(pack)
+        setattr(self, self.pack_column, raw)
+        self.pack_complete = pack.is_complete()
+        self._cache_pack(pack, raw)
+
+    def claim_pack_version(self, expected_version) -> bool:
+        """
+        Claim the next pack version if the stored pack is still at the expected version.
+
+        The conditional UPDATE holds the row's write lock until the transaction ends, so two
+        writers starting from the same version cannot both save. Returns False when the pack
+        was changed since the caller read it.
+        """
+        if self.pack_version != expected_version:
+            return False
+        table = type(self).__table__
+        result = object_session(self).execute(
+            update(table)
+            .where(table.c.id == self.id, table.c.pack_version == expected_version)
+            .values(pack_version=expected_version + 1)
+        )
+        if result.rowcount != 1:
+            return False
+        self.pack_version = expected_version + 1
+        return True
+
+    def _cache_pack(self, pack, raw):
+        pack._bind(self)
+        self.__dict__["_cached_pack"] = pack
+        self.__dict__["_cached_pack_source"] = raw
+
+
+@event.listens_for(Session, "before_flush")
+def write_back_mutated_packs(session, flush_context, instances):
+    """
+    Serialize packs that were changed in place since they were loaded or assigned, and bump
+    the pack version of every stored pack whose column changed.
+    """
+    for obj in list(session.dirty) + list(session.new):
+        if not isinstance(obj, PackOwnerMixin):
+            continue
+        pack = obj.__dict__.get("_cached_pack")
+        if pack is not None and pack.is_dirty:
+            obj.pack = pack
+        if obj in session.new:
+            continue
+        attrs = inspect(obj).attrs
+        if (
+            attrs[obj.pack_column].history.has_changes()
+            and not attrs.pack_version.history.has_changes()
+        ):
+            obj.pack_version = (obj.pack_version or 0) + 1
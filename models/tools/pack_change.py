@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+
+from models.enums import PackOwnerType
+from models.extensions import db
+
+
+class PackChange(db.Model):
+    """
+    Append-only log of pack changes for an event.
+
+    Most changes are completion deltas. Writes that rewrite a pack's contents, such as
+    generating group packs or clearing packs for downtime, are recorded as ``replaced``
+    changes whose ``changes`` hold the pack fields to replace.
+
+    Ids only ever increase, and SQLite serializes writers so they also commit in order. A
+    client that has seen changes up to some id can ask for everything after it and apply the
+    deltas in order.
+    """
+
+    __tablename__ = "pack_changes"
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False)
+    owner_type = db.Column(
+        db.Enum(
+            PackOwnerType,
+            native_enum=False,
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=False,
+    )
+    owner_id = db.Column(db.Integer, nullable=False)
+    changes = db.Column(db.JSON, nullable=False)  # Completion keys, or pack fields if replaced
+    replaced = db.Column(db.Boolean, nullable=False, default=False)
+    is_completed = db.Column(db.Boolean, nullable=False, default=False)
+    pack_version = db.Column(db.Integer, nullable=False)
+    changed_by_user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    timestamp = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.Index("ix_pack_changes_event_cursor", "event_id", "id"),
+        # Never reuse ids of deleted rows on SQLite, so cursors stay valid
+        {"sqlite_autoincrement": True},
+    )
+
+    # Most changes returned by a single feed request
+    FEED_LIMIT = 500
+
+    def __repr__(self):
+        return f"<PackChange {self.id} {self.owner_type.value}:{self.owner_id}>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "owner_type": self.owner_type.value,
+            "owner_id": self.owner_id,
+            "changes": self.changes,
+            "replaced": self.replaced,
+            "is_completed": self.is_completed,
+            "version": self.pack_version,
+        }
+
+    @classmethod
+    def record(cls, event_id, owner_type, owner, changes, user_id=None, replaced=False):
+        """
+        Add a change for a character or group pack to the current session.
+
+        The session is flushed first so the recorded version is the one being saved.
+        """
+        db.session.flush()
+        change = cls(
+            event_id=event_id,
+            owner_type=owner_type,
+            owner_id=owner.id,
+            changes=dict(changes),
+            is_completed=owner.pack.is_completed,
+            pack_version=owner.pack_version,
+            changed_by_user_id=user_id,
+            replaced=replaced,
+        )
+        db.session.add(change)
+        return change
+
+    @classmethod
+    def record_contents(cls, event_id, owner_type, owner, user_id=None):
+        """Add a change replacing the whole of a pack, for writes to more than its completion."""
+        return cls.record(
+            event_id, owner_type, owner, owner.pack.to_dict(), user_id=user_id, replaced=True
+        )
+
+    @classmethod
+    def latest_cursor(cls, event_id):
+        """Id of the newest change for an event, or 0 when there are none."""
+        return db.session.query(db.func.max(cls.id)).filter(cls.event_id == event_id).scalar() or 0
+
+    @classmethod
+    def since(cls, event_id, cursor, limit=FEED_LIMIT):
+        """Changes for an event after the given cursor, oldest first."""
+        return (
+            cls.query.filter(cls.event_id == event_id, cls.id > cursor)
+            .order_by(cls.id)
+            .limit(limit)
+            .all()
+        )
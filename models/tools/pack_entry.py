@@ -0,0 +1,217 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models.enums import PackOwnerType
+from models.extensions import db
+
+# Pack list attributes and the entry kind (and completion key prefix) they are stored under
+PACK_KINDS = (
+    ("item", "items"),
+    ("sample", "samples"),
+    ("exotic", "exotics"),
+    ("medicament", "medicaments"),
+)
+
+# Downtime pack JSON columns and their entry kinds
+DOWNTIME_PACK_KINDS = (
+    ("item", "items"),
+    ("sample", "samples"),
+    ("exotic", "exotic_substances"),
+)
+
+# Completion flags every character or group pack needs before it counts as complete
+REQUIRED_FLAGS = ("character_sheet", "character_id_badge")
+
+
+def _ref_id(value):
+    """Return the integer id of a pack list value, which may be an id, a string or a dict."""
+    if isinstance(value, dict):
+        value = value.get("id")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PackEntry(db.Model):
+    """One entry of a character, group or downtime pack, kept in sync with the pack JSON."""
+
+    __tablename__ = "pack_entry"
+
+    id = db.Column(db.Integer, primary_key=True)
+    owner_type = db.Column(
+        db.Enum(
+            PackOwnerType,
+            native_enum=False,
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=False,
+    )
+    owner_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(30), nullable=False)  # item, sample, exotic, medicament or a flag
+    ref_id = db.Column(db.Integer, nullable=True)  # Referenced id, None for completion flags
+    position = db.Column(db.Integer, nullable=False, default=0)  # Order within the pack list
+    completed = db.Column(db.Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        db.Index("ix_pack_entry_owner", "owner_type", "owner_id"),
+        db.Index("ix_pack_entry_kind_ref", "kind", "ref_id"),
+    )
+
+    def __repr__(self):
+        return f"<PackEntry {self.owner_type.value}:{self.owner_id} {self.kind} {self.ref_id}>"
+
+    @staticmethod
+    def rows_for_pack(pack):
+        """Build entry rows (without owner columns) for a Pack."""
+        rows = [
+            {
+                "kind": flag,
+                "ref_id": None,
+                "position": 0,
+                "completed": bool(pack.completion.get(flag)),
+            }
+            for flag in REQUIRED_FLAGS
+        ]
+        if pack.energy_chits > 0:
+            rows.append(
+                {
+                    "kind": "energy_chits",
+                    "ref_id": None,
+                    "position": 0,
+                    "completed": bool(pack.completion.get("energy_chits")),
+                }
+            )
+        for kind, attribute in PACK_KINDS:
+            for position, value in enumerate(getattr(pack, attribute) or []):
+                ref_id = _ref_id(value)
+                if ref_id is None:
+                    continue
+                rows.append(
+                    {
+                        "kind": kind,
+                        "ref_id": ref_id,
+                        "position": position,
+                        "completed": bool(pack.completion.get(f"{kind}_{value}")),
+                    }
+                )
+        return rows
+
+    @staticmethod
+    def rows_for_downtime_pack(downtime_pack):
+        """Build entry rows (without owner columns) for a DowntimePack's contents."""
+        rows = []
+        for kind, attribute in DOWNTIME_PACK_KINDS:
+            for position, value in enumerate(getattr(downtime_pack, attribute) or []):
+                ref_id = _ref_id(value)
+                if ref_id is not None:
+                    rows.append(
+                        {"kind": kind, "ref_id": ref_id, "position": position, "completed": False}
+                    )
+        return rows
+
+    @classmethod
+    def owners_of(cls, kind, ref_id, owner_type=None):
+        """Return (owner_type, owner_id) pairs of every pack holding the given entry."""
+        query = db.session.query(cls.owner_type, cls.owner_id).filter(
+            cls.kind == kind, cls.ref_id == ref_id
+        )
+        if owner_type is not None:
+            query = query.filter(cls.owner_type == owner_type)
+        return query.distinct().all()
+
+    @classmethod
+    def incomplete_counts(cls, event_id):
+        """
+        Count incomplete entries per pack for the characters attending an event and their groups.
+
+        Character and group packs are not tied to an event, so attendance comes from the event's
+        tickets.
+
+        Returns:
+            Dict mapping (owner_type, owner_id) to the number of entries not yet completed
+        """
+        from models.tools.character import Character
+        from models.tools.event_ticket import EventTicket
+
+        attendee_ids = db.session.query(EventTicket.character_id).filter(
+            EventTicket.event_id == event_id, EventTicket.character_id.isnot(None)
+        )
+        group_ids = db.session.query(Character.group_id).filter(
+            Character.id.in_(attendee_ids), Character.group_id.isnot(None)
+        )
+        rows = (
+            db.session.query(cls.owner_type, cls.owner_id, db.func.count(cls.id))
+            .filter(
+                cls.completed.is_(False),
+                db.or_(
+                    db.and_(
+                        cls.owner_type == PackOwnerType.CHARACTER, cls.owner_id.in_(attendee_ids)
+                    ),
+                    db.and_(cls.owner_type == PackOwnerType.GROUP, cls.owner_id.in_(group_ids)),
+                ),
+            )
+            .group_by(cls.owner_type, cls.owner_id)
+            .all()
+        )
+        return {(owner_type, owner_id): count for owner_type, owner_id, count in rows}
+
+
+def _pack_owner(obj):
+    """Return (owner_type, columns, row builder) for objects whose packs are indexed."""
+    from models.tools.character import Character
+    from models.tools.downtime import DowntimePack
+    from models.tools.group import Group
+
+    if isinstance(obj, Character):
+        return (
+            PackOwnerType.CHARACTER,
+            ("character_pack",),
+            lambda: PackEntry.rows_for_pack(obj.pack),
+        )
+    if isinstance(obj, Group):
+        return PackOwnerType.GROUP, ("group_pack",), lambda: PackEntry.rows_for_pack(obj.pack)
+    if isinstance(obj, DowntimePack):
+        columns = tuple(attribute for _, attribute in DOWNTIME_PACK_KINDS)
+        return (
+            PackOwnerType.DOWNTIME,
+            columns,
+            lambda: PackEntry.rows_for_downtime_pack(obj),
+        )
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def sync_pack_entries(session, flush_context):
+    """Rewrite the pack_entry rows of every pack whose JSON changed in this flush."""
+    table = PackEntry.__table__
+    connection = None
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        owner = _pack_owner(obj)
+        if owner is None:
+            continue
+        owner_type, columns, build_rows = owner
+        state = inspect(obj)
+        deleted = obj in session.deleted
+        if not (
+            deleted
+            or obj in session.new
+            or any(state.attrs[column].history.has_changes() for column in columns)
+        ):
+            continue
+
+        if connection is None:
+            connection = session.connection()
+        connection.execute(
+            table.delete().where(table.c.owner_type == owner_type, table.c.owner_id == obj.id)
+        )
+        if deleted:
+            continue
+
+        rows = build_rows()
+        if not rows:
+            continue
+        connection.execute(
+            table.insert(), [dict(row, owner_type=owner_type, owner_id=obj.id) for row in rows]
+        )
@@ -1,11 +1,37 @@
+import hashlib
 import re
 from datetime import datetime, timezone
 
-from flask import render_template_string
+from flask import current_app
 
 from models.enums import PrintTemplateType
 from models.extensions import db
 
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_BODY_CONTENT_RE = re.compile(r"<body[^>]*>(.*?)</body>", re.DOTALL | re.IGNORECASE)
+_BODY_SELECTOR_RE = re.compile(r"\bbody\b")
+
+# Compiled Jinja templates and scoped CSS, keyed by (template id, updated_at)
+_render_cache = {}
+
+
+def clear_render_cache(template_id=None):
+    """Drop cached renders for a template, or for every template if no id is given."""
+    if template_id is None:
+        _render_cache.clear()
+        return
+    for key in [key for key in _render_cache if key[0] == template_id]:
+        _render_cache.pop(key, None)
+
+
+def _needs_body_extraction(source):
+    """Whether rendered output of this source can contain comments or a <body> tag.
+
+    Variables are autoescaped, so only literal markup in the source can produce them.
+    """
+    return "<!--" in source or "<body" in source.lower()
+
 
 class PrintTemplate(db.Model):
     __tablename__ = "print_templates"
@@ -59,42 +85,144 @@ class PrintTemplate(db.Model):
         return f"<PrintTemplate {self.type_name} ({self.type})>"
 
     def remove_html_comments(self, html):
-        return re.sub(r"<!--.*?-->", "", html, flags=re.DOTALL)
+        return _HTML_COMMENT_RE.sub("", html)
 
     def remove_css_comments(self, css):
-        return re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+        return _CSS_COMMENT_RE.sub("", css)
 
     def extract_body_content(self, html):
         html = self.remove_html_comments(html)
-        match = re.search(r"<body[^>]*>(.*?)</body>", html, re.DOTALL | re.IGNORECASE)
+        match = _BODY_CONTENT_RE.search(html)
         if match:
             return match.group(1)
         return html
 
     def scope_template_css(self):
         css = self.remove_css_comments(self.css_styles)
-        css = re.sub(r"\bbody\b", ".template-content", css)
+        css = _BODY_SELECTOR_RE.sub(".template-content", css)
         css += (
             f"\n.template-content {{ width: {self.width_mm}mm; " f"height: {self.height_mm}mm; }}"
         )
         return css
 
-    def get_front_page_render(self, context):
-        if not self.front_html:
+    def get_compiled(self):
+        """
+        Get the compiled front/back templates and scoped CSS for this template.
+
+        Results are cached per (id, updated_at). The cached sources are compared as well,
+        so unsaved edits (e.g. previews) never render a stale version.
+        """
+        sources = (
+            self.front_html,
+            self.back_html,
+            self.has_back_side,
+            self.css_styles,
+            self.width_mm,
+            self.height_mm,
+        )
+        key = (self.id, self.updated_at)
+        compiled = _render_cache.get(key)
+        if compiled is not None and compiled["sources"] == sources:
+            return compiled
+
+        if self.id is not None:
+            clear_render_cache(self.id)
+
+        env = current_app.jinja_env
+        front = back = None
+        if self.front_html:
+            front = (
+                env.from_string(self.front_html),
+                _needs_body_extraction(self.front_html),
+            )
+        if self.back_html and self.has_back_side:
+            back = (
+                env.from_string(self.back_html),
+                _needs_body_extraction(self.back_html),
+            )
+
+        compiled = {
+            "sources": sources,
+            "front": front,
+            "back": back,
+            "css": self.scope_template_css(),
+        }
+        _render_cache[key] = compiled
+        return compiled
+
+    def _render_compiled(self, compiled_side, context):
+        if compiled_side is None:
             return ""
-        rendered = render_template_string(self.front_html, **context)
-        return self.extract_body_content(rendered)
+        template, needs_extraction = compiled_side
+        # Add the app's context processors (current_user, config, ...) as render_template does
+        context = dict(context)
+        current_app.update_template_context(context)
+        rendered = template.render(context)
+        if needs_extraction:
+            return self.extract_body_content(rendered)
+        return rendered
+
+    def get_front_page_render(self, context):
+        return self._render_compiled(self.get_compiled()["front"], context)
 
     def get_back_page_render(self, context):
-        if not self.back_html or not self.has_back_side:
-            return ""
-        rendered = render_template_string(self.back_html, **context)
-        return self.extract_body_content(rendered)
+        return self._render_compiled(self.get_compiled()["back"], context)
 
     def get_css_render(self):
-        css = self.remove_css_comments(self.css_styles)
-        css = re.sub(r"\bbody\b", ".template-content", css)
-        css += (
-            f"\n.template-content {{ width: {self.width_mm}mm; " f"height: {self.height_mm}mm; }}"
+        return self.get_compiled()["css"]
+
+
+class CharacterSheetPrint(db.Model):
+    """Content hash of a character sheet as included in an event print run."""
+
+    __tablename__ = "character_sheet_prints"
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False)
+    character_id = db.Column(db.Integer, db.ForeignKey("character.id"), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    printed_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    printed_by_user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_character_sheet_prints_event_character", "event_id", "character_id"),
+    )
+
+    character = db.relationship("Character")
+    printed_by = db.relationship("User")
+
+    @staticmethod
+    def hash_sheet(item):
+        """Hash the rendered output of a character sheet item."""
+        digest = hashlib.sha256()
+        for field in ("front_html", "back_html", "css"):
+            digest.update(b"\x00" + (item.get(field) or "").encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def latest_hashes(cls, event_id):
+        """Return {character_id: content_hash} of the most recent print for each character."""
+        latest = (
+            db.session.query(db.func.max(cls.id).label("id"))
+            .filter(cls.event_id == event_id)
+            .group_by(cls.character_id)
+            .subquery()
+        )
+        rows = db.session.query(cls.character_id, cls.content_hash).join(
+            latest, cls.id == latest.c.id
+        )
+        return {character_id: content_hash for character_id, content_hash in rows}
+
+    @classmethod
+    def last_run(cls, event_id):
+        """Return the records of the most recent print run for an event."""
+        printed_at = (
+            db.session.query(db.func.max(cls.printed_at)).filter(cls.event_id == event_id).scalar()
+        )
+        if printed_at is None:
+            return []
+        return (
+            cls.query.filter_by(event_id=event_id, printed_at=printed_at)
+            .order_by(cls.character_id)
+            .all()
         )
-        return css
@@ -227,9 +227,10 @@ class CharacterResearch(db.Model):
         """Get the current stage of the research, or None if complete."""
         if not self.current_stage_id:
             return None
-        return CharacterResearchStage.query.filter_by(
-            character_research_id=self.id, stage_id=self.current_stage_id
-        ).first()
+        return next(
+            (progress for progress in self.progress if progress.stage_id == self.current_stage_id),
+            None,
+        )
 
     def advance_stage(self):
         """Mark the current stage as complete and create the next stage if it exists."""
@@ -240,30 +241,27 @@ class CharacterResearch(db.Model):
         # Mark current stage as complete
         current_stage.stage_completed = True
 
-        # Find the next stage
-        next_stage = (
-            ResearchStage.query.filter(
-                ResearchStage.research_id == self.research_id,
-                ResearchStage.stage_number > current_stage.stage.stage_number,
-            )
-            .order_by(ResearchStage.stage_number)
-            .first()
+        # Find the next stage, stages are ordered by stage number
+        next_stage = next(
+            (
+                stage
+                for stage in self.research.stages
+                if stage.stage_number > current_stage.stage.stage_number
+            ),
+            None,
         )
 
         if next_stage:
-            # Create new stage progress
+            # Create new stage progress, with an entry for each of its requirements
             new_stage = CharacterResearchStage(
-                character_research_id=self.id, stage_id=next_stage.id
+                stage_id=next_stage.id,
+                stage=next_stage,
+                requirement_progress=[
+                    CharacterResearchStageRequirement(requirement_id=req.id, progress=0)
+                    for req in next_stage.unlock_requirements
+                ],
             )
-            db.session.add(new_stage)
-            db.session.flush()
-
-            # Create progress entries for new stage requirements
-            for req in next_stage.unlock_requirements:
-                req_progress = CharacterResearchStageRequirement(
-                    character_research_stage_id=new_stage.id, requirement_id=req.id
-                )
-                db.session.add(req_progress)
+            self.progress.append(new_stage)
 
             # Update current stage
             self.current_stage_id = next_stage.id
@@ -280,20 +278,21 @@ class CharacterResearch(db.Model):
             return None
 
         # Find the previous stage
-        prev_stage = (
-            ResearchStage.query.filter(
-                ResearchStage.research_id == self.research_id,
-                ResearchStage.stage_number < current_stage.stage.stage_number,
-            )
-            .order_by(ResearchStage.stage_number.desc())
-            .first()
+        prev_stage = next(
+            (
+                stage
+                for stage in reversed(self.research.stages)
+                if stage.stage_number < current_stage.stage.stage_number
+            ),
+            None,
         )
 
         if prev_stage:
             # Get the previous stage progress
-            prev_stage_progress = CharacterResearchStage.query.filter_by(
-                character_research_id=self.id, stage_id=prev_stage.id
-            ).first()
+            prev_stage_progress = next(
+                (progress for progress in self.progress if progress.stage_id == prev_stage.id),
+                None,
+            )
 
             if prev_stage_progress:
                 # Mark previous stage as incomplete
@@ -303,10 +302,8 @@ class CharacterResearch(db.Model):
                 for req_progress in prev_stage_progress.requirement_progress:
                     req_progress.progress = 0
 
-                # Delete current stage and its requirements
-                for req_progress in current_stage.requirement_progress:
-                    db.session.delete(req_progress)
-                db.session.delete(current_stage)
+                # Delete current stage, its requirements go with it
+                self.progress.remove(current_stage)
 
                 # Update current stage
                 self.current_stage_id = prev_stage.id
@@ -12,9 +12,9 @@ from models.database.item import Item, item_mods_applied
 from models.database.item_blueprint import ItemBlueprint, item_blueprint_mods
 from models.database.item_type import ItemType
 from models.database.mods import Mod
-from models.enums import PrintTemplateType, Role
+from models.enums import PackOwnerType, PrintTemplateType, Role
 from models.extensions import db
-from models.tools.downtime import DowntimePack
+from models.tools.pack_entry import PackEntry
 from models.tools.print_template import PrintTemplate
 from utils import generate_qr_code, generate_web_qr_code
 
@@ -338,9 +338,7 @@ def find_by_code():
         return jsonify({"error": "Item not found"}), 404
     # If requires_pack, check if item is in any DowntimePack's items list
     if requires_pack:
-        packs_with_item = DowntimePack.query.filter(
-            DowntimePack.items.contains([str(item.id)])
-        ).all()
+        packs_with_item = PackEntry.owners_of("item", item.id, PackOwnerType.DOWNTIME)
         if not packs_with_item:
             return jsonify({"error": "Item not found in any pack"}), 404
     return jsonify({"id": item.id, "name": blueprint.name, "full_code": item.full_code})
@@ -1,32 +1,38 @@
 import json
 import logging
-import random
 from datetime import datetime, timezone
 
 from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
-from models.database.exotic_substances import ExoticSubstance
 from models.database.global_settings import GlobalSettings
-from models.database.item import Item
-from models.database.item_blueprint import ItemBlueprint
-from models.database.medicaments import Medicament
-from models.database.sample import Sample
-from models.enums import CharacterStatus, EventType, Role, TicketType
+from models.enums import CharacterStatus, EventType, PackOwnerType, Role, TicketType
 from models.event import Event
 from models.extensions import db
 from models.tools.character import Character
+from models.tools.character_point_grant import CharacterPointGrant
+from models.tools.condition_progression_run import ConditionProgressionRun
 from models.tools.event_ticket import EventTicket
 from models.tools.group import Group
 from models.tools.pack import Pack
+from models.tools.pack_change import PackChange
 from models.tools.user import User
+from utils.character_point_grants import (
+    grant_event_character_points,
+    grant_report,
+    parse_amounts,
+    preview_character_points,
+)
+from utils.condition_progression import progress_event_conditions
 from utils.decorators import admin_required, user_admin_required
 from utils.email import (
     send_event_details_updated_notification,
     send_event_ticket_assigned_notification_to_user,
     send_new_event_notification_to_all,
 )
+from utils.group_pack_generator import GroupPackGenerator, generate_event_group_packs
 from utils.mask_email import mask_email
+from utils.pack_resolver import EventPackResolver
 
 events_bp = Blueprint("events", __name__)
 
@@ -472,70 +478,78 @@ def view_attendees(event_id):
     )
 
 
+@events_bp.route("/<int:event_id>/character-points", methods=["GET"])
+@login_required
+@user_admin_required
+def character_points(event_id):
+    """Preview character points per ticket type for the event, or report the grant made."""
+    event = Event.query.get_or_404(event_id)
+    grant = CharacterPointGrant.query.filter_by(event_id=event_id).first()
+    if grant:
+        return render_template(
+            "events/character_points.html",
+            event=event,
+            report=grant_report(grant),
+            TicketType=TicketType,
+        )
+
+    try:
+        amounts = parse_amounts(request.args)
+    except ValueError as e:
+        flash(str(e), "error")
+        amounts = {}
+    return render_template(
+        "events/character_points.html",
+        event=event,
+        preview=preview_character_points(event_id, amounts),
+        TicketType=TicketType,
+    )
+
+
+@events_bp.route("/<int:event_id>/character-points", methods=["POST"])
+@login_required
+@user_admin_required
+def grant_character_points(event_id):
+    """Award character points to every ticket holder of the event, once per event."""
+    _ = Event.query.get_or_404(event_id)
+
+    try:
+        report = grant_event_character_points(
+            event_id, parse_amounts(request.form), current_user.id
+        )
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("events.character_points", event_id=event_id, **request.form))
+
+    flash(
+        f"Granted {report['total_points']:g} character points to {report['total_users']} users",
+        "success",
+    )
+    return redirect(url_for("events.character_points", event_id=event_id))
+
+
 @events_bp.route("/<int:event_id>/packs", methods=["GET"])
 @login_required
 @admin_required
 def view_packs(event_id):
     event = Event.query.get_or_404(event_id)
 
-    # Get all characters with tickets for this event
-    character_tickets = (
-        EventTicket.query.filter_by(event_id=event_id)
-        .filter(EventTicket.character_id.isnot(None))
-        .all()
-    )
-    character_packs = []
+    # Read the change cursor first, so changes made while the page loads are replayed
+    changes_cursor = PackChange.latest_cursor(event_id)
 
-    for ticket in character_tickets:
-        character = Character.query.get(ticket.character_id)
-        if character:
-            pack = character.pack or Pack()
-            character_packs.append(
-                {
-                    "character": character,
-                    "ticket": ticket,
-                    "pack": pack,
-                    "user": character.user,
-                    "faction": character.faction,
-                }
-            )
+    # Load attendees, their packs and everything the packs reference in a few queries
+    resolver = EventPackResolver(event_id)
+    character_packs = list(resolver.character_packs)
 
     # Sort character packs: incomplete first, then by user name
     character_packs.sort(
         key=lambda x: (
             x["pack"].is_completed,  # False (incomplete) comes before True (complete)
-            x["user"].first_name + " " + x["user"].surname,
+            x["user"].first_name + " " + (x["user"].surname or ""),
         )
     )
 
-    # Get all groups with members who have tickets for this event
-    group_packs = []
-    groups_with_tickets = set()
-
-    for ticket in character_tickets:
-        character = Character.query.get(ticket.character_id)
-        if character and character.group:
-            groups_with_tickets.add(character.group.id)
-
-    for group_id in groups_with_tickets:
-        group = Group.query.get(group_id)
-        if group:
-            pack = group.pack or Pack()
-
-            # Get characters from this group attending the event
-            group_characters = []
-            for ticket in character_tickets:
-                character = Character.query.get(ticket.character_id)
-                if character and character.group_id == group_id:
-                    group_characters.append(
-                        {
-                            "user": character.user,
-                            "character": character,
-                            "species": character.species,
-                        }
-                    )
-
-            group_packs.append({"group": group, "pack": pack, "characters": group_characters})
+    group_packs = list(resolver.group_packs)
 
     # Sort group packs: incomplete first, then by group name
     group_packs.sort(
@@ -549,32 +563,21 @@ def view_packs(event_id):
     settings = GlobalSettings.query.first()
     character_income_ec = settings.character_income_ec if settings else 0
 
-    # Get all item blueprints, exotics, and medicaments for lookup
-    # Convert to dictionaries for JSON serialization
-    item_blueprints = {}
-    for bp in ItemBlueprint.query.all():
-        item_blueprints[bp.id] = {"name": bp.name, "full_code": bp.full_code}
-
-    # Get all items for lookup (to get item full_code)
-    items = {}
-    for item in Item.query.all():
-        items[item.id] = {
+    # Convert referenced catalogue entries to dictionaries for JSON serialization
+    item_blueprints = {
+        bp.id: {"name": bp.name, "full_code": bp.full_code}
+        for bp in resolver.item_blueprints.values()
+    }
+    items = {
+        item.id: {
             "blueprint_name": item.blueprint.name if item.blueprint else "Unknown",
             "full_code": item.full_code,
         }
-
-    exotic_substances = {}
-    for ex in ExoticSubstance.query.all():
-        exotic_substances[ex.id] = {"name": ex.name}
-
-    medicaments = {}
-    for med in Medicament.query.all():
-        medicaments[med.id] = {"name": med.name}
-
-    # Get all samples for lookup
-    samples = {}
-    for sample in Sample.query.all():
-        samples[sample.id] = {"name": sample.name}
+        for item in resolver.items.values()
+    }
+    exotic_substances = {ex.id: {"name": ex.name} for ex in resolver.exotics.values()}
+    medicaments = {med.id: {"name": med.name} for med in resolver.medicaments.values()}
+    samples = {sample.id: {"name": sample.name} for sample in resolver.samples.values()}
 
     return render_template(
         "events/packs.html",
@@ -587,6 +590,9 @@ def view_packs(event_id):
         medicaments=medicaments,
         samples=samples,
         character_income_ec=character_income_ec,
+        changes_cursor=changes_cursor,
+        conditions_progressed=ConditionProgressionRun.query.filter_by(event_id=event_id).count()
+        > 0,
     )
 
 
@@ -606,6 +612,9 @@ def update_character_pack(event_id, character_id):
     pack.completion = completion
     character.pack = pack  # This triggers the setter and updates character_pack
     logging.debug(f"[PACK UPDATE] After: {character.pack.completion}")
+    PackChange.record(
+        event_id, PackOwnerType.CHARACTER, character, pack.completion, user_id=current_user.id
+    )
     db.session.commit()
 
     return jsonify({"success": True, "is_completed": character.pack.is_completed})
@@ -619,135 +628,65 @@ def generate_group_pack(event_id, group_id):
     group = Group.query.get_or_404(group_id)
     _ = Event.query.get_or_404(event_id)
 
-    if not group.pack:
-        group.pack = Pack()
-
-    # Mark as generated
-    group.pack.is_generated = True
+    # Get characters from this group attending the event
+    group_characters = GroupPackGenerator.attending_characters(event_id, group_id).get(group_id)
 
-    # Get global settings
-    settings = GlobalSettings.query.first()
-    if not settings:
+    generator = GroupPackGenerator.load([group])
+    if not generator:
         flash("Global settings not found", "error")
         return jsonify({"success": False, "error": "Global settings not found"})
 
-    # Get characters from this group attending the event
-    group_characters = (
-        Character.query.filter_by(group_id=group_id)
-        .join(EventTicket)
-        .filter(EventTicket.event_id == event_id)
-        .all()
-    )
-
     if not group_characters:
         flash("No characters from this group are attending the event", "error")
         return jsonify({"success": False, "error": "No characters attending"})
 
-    # Calculate EC pool based on global settings and species abilities
-    ec_pool = 0
-    for character in group_characters:
-        # Base character income
-        character_ec = settings.character_income_ec
-
-        # Add species additional group income
-        if character.species:
-            for ability in character.species.abilities:
-                if ability.type == "group_income" and ability.additional_group_income:
-                    character_ec += ability.additional_group_income
-
-        ec_pool += character_ec
-
-    # Apply income distribution from group type
-    if group.group_type and group.group_type.income_distribution_dict:
-        distribution = group.group_type.income_distribution_dict
-
-        # Calculate budget for each category
-        items_budget = int(ec_pool * (distribution.get("items", 0) / 100))
-        exotics_budget = int(ec_pool * (distribution.get("exotics", 0) / 100))
-        medicaments_budget = int(ec_pool * (distribution.get("medicaments", 0) / 100))
-        chits_budget = int(ec_pool * (distribution.get("chits", 0) / 100))
-
-        # Add items randomly until budget is exhausted
-        if items_budget > 0 and group.group_type.income_items_list:
-            available_blueprints = ItemBlueprint.query.filter(
-                ItemBlueprint.id.in_(group.group_type.income_items_list),
-                ItemBlueprint.purchaseable,
-            ).all()
-
-            # Count the cost of existing items in the pack
-            for item in group.pack.items:
-                item_blueprint = ItemBlueprint.query.get(item)
-                if item_blueprint:
-                    item_cost = int(
-                        item_blueprint.base_cost * (1 - group.group_type.income_items_discount)
-                    )
-                    items_budget -= item_cost
+    generator.generate(group, group_characters)
+    PackChange.record_contents(event_id, PackOwnerType.GROUP, group, user_id=current_user.id)
+    db.session.commit()
+
+    return jsonify(
+        {
+            "success": True,
+            "pack": group.pack.to_dict(),
+            "is_completed": group.pack.is_completed,
+            "version": group.pack_version,
+        }
+    )
 
-            if available_blueprints and items_budget > 0:
-                # Shuffle blueprints for randomness
-                random.shuffle(available_blueprints)
 
-                for blueprint in available_blueprints:
-                    # Calculate cost with group type discount
-                    discounted_cost = int(
-                        blueprint.base_cost * (1 - group.group_type.income_items_discount)
-                    )
+@events_bp.route("/<int:event_id>/packs/groups/generate", methods=["POST"])
+@login_required
+@admin_required
+def generate_all_group_packs(event_id):
+    """Generate packs for every attending group in one transaction, optionally seeded."""
+    _ = Event.query.get_or_404(event_id)
 
-                    if discounted_cost <= items_budget:
-                        # Add item to pack
-                        group.pack.items.append(blueprint.id)
-                        items_budget -= discounted_cost
-                    else:
-                        # Can't afford this item, stop adding items
-                        break
-
-        # Clear exotics and add them randomly
-        group.pack.exotics = []
-        if exotics_budget > 0 and group.group_type.income_substances:
-            available_exotics = ExoticSubstance.query.all()
-
-            if available_exotics:
-                # Shuffle exotics for randomness
-                random.shuffle(available_exotics)
-
-                for exotic in available_exotics:
-                    exotic_cost = group.group_type.income_substance_cost
-
-                    if exotic_cost <= exotics_budget:
-                        # Add exotic to pack
-                        group.pack.exotics.append(exotic.id)
-                        exotics_budget -= exotic_cost
-                    else:
-                        # Can't afford this exotic, stop adding exotics
-                        break
-
-        # Clear medicaments and add them randomly
-        group.pack.medicaments = []
-        if medicaments_budget > 0 and group.group_type.income_medicaments:
-            available_medicaments = Medicament.query.all()
-
-            if available_medicaments:
-                # Shuffle medicaments for randomness
-                random.shuffle(available_medicaments)
-
-                for medicament in available_medicaments:
-                    medicament_cost = group.group_type.income_medicament_cost
-
-                    if medicament_cost <= medicaments_budget:
-                        # Add medicament to pack
-                        group.pack.medicaments.append(medicament.id)
-                        medicaments_budget -= medicament_cost
-                    else:
-                        # Can't afford this medicament, stop adding medicaments
-                        break
-
-        # Add remaining EC to the pack
-        remaining_ec = items_budget + exotics_budget + medicaments_budget + chits_budget
-        group.pack.energy_chits = remaining_ec
+    data = request.get_json(silent=True) or {}
+    seed = data.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+        return jsonify({"success": False, "error": "Seed must be an integer"}), 400
 
-    db.session.commit()
+    try:
+        summary = generate_event_group_packs(event_id, seed=seed, user_id=current_user.id)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)})
 
-    return jsonify({"success": True, "pack": group.pack.to_dict()})
+    return jsonify({"success": True, **summary})
+
+
+@events_bp.route("/<int:event_id>/conditions/progress", methods=["POST"])
+@login_required
+@admin_required
+def progress_conditions(event_id):
+    """Progress the conditions of every attending character, for events without downtime."""
+    _ = Event.query.get_or_404(event_id)
+
+    try:
+        summary = progress_event_conditions(event_id, current_user.id)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+
+    return jsonify({"success": True, **summary})
 
 
 @events_bp.route("/<int:event_id>/packs/group/<int:group_id>/update", methods=["POST"])
@@ -766,39 +705,180 @@ def update_group_pack(event_id, group_id):
         group.pack = Pack()
 
     group.pack.completion = completion
+    PackChange.record(
+        event_id, PackOwnerType.GROUP, group, group.pack.completion, user_id=current_user.id
+    )
     db.session.commit()
 
     return jsonify({"success": True, "is_completed": group.pack.is_completed})
 
 
+def _requested_pack_version(owner, data):
+    """Return the pack version the client last saw, from If-Match or a "version" field."""
+    if request.if_match.star_tag:
+        return owner.pack_version
+    for tag in request.if_match.as_set(include_weak=True):
+        try:
+            return int(tag)
+        except ValueError:
+            return -1
+    version = data.get("version")
+    return version if isinstance(version, int) and not isinstance(version, bool) else None
+
+
+def _pack_state_response(owner, keys=None, status=200, **extra):
+    """JSON pack completion state with the pack version as the ETag."""
+    completion = owner.pack.completion
+    if keys is not None:
+        completion = {key: completion.get(key, False) for key in keys}
+    response = jsonify(
+        {
+            "completion": dict(completion),
+            "is_completed": owner.pack.is_completed,
+            "version": owner.pack_version,
+            **extra,
+        }
+    )
+    response.status_code = status
+    response.set_etag(str(owner.pack_version))
+    return response
+
+
+def _patch_pack_completion(event_id, owner_type, owner, changes, data):
+    """
+    Apply completion deltas to a character or group pack under optimistic concurrency.
+
+    Only the given keys are changed. The request must name the pack version it was based on,
+    and is rejected with 412 and the current state if the pack has been saved since.
+    """
+    if (
+        not isinstance(changes, dict)
+        or not changes
+        or not all(
+            isinstance(key, str) and isinstance(value, bool) for key, value in changes.items()
+        )
+    ):
+        return jsonify({"success": False, "error": "Completion changes must be booleans"}), 400
+
+    expected_version = _requested_pack_version(owner, data)
+    if expected_version is None:
+        return jsonify({"success": False, "error": "Missing If-Match pack version"}), 428
+
+    if not owner.claim_pack_version(expected_version):
+        # Nothing was written; reload so the client gets the state it has to rebase on
+        db.session.refresh(owner)
+        return _pack_state_response(
+            owner, status=412, success=False, error="Pack was changed by someone else"
+        )
+
+    owner.pack.completion.update(changes)
+    PackChange.record(event_id, owner_type, owner, changes, user_id=current_user.id)
+    db.session.commit()
+
+    return _pack_state_response(owner, keys=changes, success=True)
+
+
+@events_bp.route("/<int:event_id>/packs/character/<int:character_id>/completion", methods=["PATCH"])
+@login_required
+@admin_required
+def patch_character_pack_completion(event_id, character_id):
+    """Set a single completion key on a character pack."""
+    character = Character.query.get_or_404(character_id)
+    data = request.get_json(silent=True) or {}
+    return _patch_pack_completion(
+        event_id, PackOwnerType.CHARACTER, character, {data.get("key"): data.get("completed")}, data
+    )
+
+
+@events_bp.route(
+    "/<int:event_id>/packs/character/<int:character_id>/completion/batch", methods=["PATCH"]
+)
+@login_required
+@admin_required
+def patch_character_pack_completion_batch(event_id, character_id):
+    """Set many completion keys on a character pack in one request."""
+    character = Character.query.get_or_404(character_id)
+    data = request.get_json(silent=True) or {}
+    return _patch_pack_completion(
+        event_id, PackOwnerType.CHARACTER, character, data.get("changes"), data
+    )
+
+
+@events_bp.route("/<int:event_id>/packs/group/<int:group_id>/completion", methods=["PATCH"])
+@login_required
+@admin_required
+def patch_group_pack_completion(event_id, group_id):
+    """Set a single completion key on a group pack."""
+    group = Group.query.get_or_404(group_id)
+    data = request.get_json(silent=True) or {}
+    return _patch_pack_completion(
+        event_id, PackOwnerType.GROUP, group, {data.get("key"): data.get("completed")}, data
+    )
+
+
+@events_bp.route("/<int:event_id>/packs/group/<int:group_id>/completion/batch", methods=["PATCH"])
+@login_required
+@admin_required
+def patch_group_pack_completion_batch(event_id, group_id):
+    """Set many completion keys on a group pack in one request."""
+    group = Group.query.get_or_404(group_id)
+    data = request.get_json(silent=True) or {}
+    return _patch_pack_completion(event_id, PackOwnerType.GROUP, group, data.get("changes"), data)
+
+
+@events_bp.route("/<int:event_id>/packs/changes", methods=["GET"])
+@login_required
+@admin_required
+def pack_changes(event_id):
+    """
+    Pack completion changes for an event after the ``since`` cursor.
+
+    Clients poll this with the cursor from their previous response and apply the deltas.
+    Each request is a single indexed range query that returns at once, so polling desks do
+    not hold a worker open between changes. Without ``since`` only the current cursor is
+    returned.
+    """
+    since = request.args.get("since", type=int)
+    if since is None:
+        changes = []
+        cursor = PackChange.latest_cursor(event_id)
+    else:
+        changes = PackChange.since(event_id, since)
+        cursor = changes[-1].id if changes else since
+
+    response = jsonify(
+        {
+            "cursor": cursor,
+            "changes": [change.to_dict() for change in changes],
+            "has_more": len(changes) == PackChange.FEED_LIMIT,
+        }
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
 @events_bp.route("/<int:event_id>/packs/print/character-sheets")
 @login_required
 @admin_required
 def print_character_sheets(event_id):
-    """Print character sheets for incomplete character packs."""
-    import base64
+    """Print character sheets for incomplete character packs.
 
+    With ?changed_only=true, every attendee's sheet is rendered and only those whose output
+    differs from the last print for this event are included, regardless of pack completion.
+    """
     from models.enums import PrintTemplateType
-    from models.tools.print_template import PrintTemplate
+    from models.tools.print_template import CharacterSheetPrint, PrintTemplate
     from utils.print_layout import PrintLayout
 
     event = Event.query.get_or_404(event_id)
+    changed_only = request.args.get("changed_only", "false").lower() == "true"
 
     # Get all characters with tickets for this event
-    character_tickets = (
-        EventTicket.query.filter_by(event_id=event_id)
-        .filter(EventTicket.character_id.isnot(None))
-        .all()
-    )
     characters_to_print = []
-
-    for ticket in character_tickets:
-        character = Character.query.get(ticket.character_id)
-        if character:
-            pack = character.pack or Pack()
-            # Only include characters whose character sheet is not marked as complete
-            if not pack.completion.get("character_sheet", False):
-                characters_to_print.append(character)
+    for entry in EventPackResolver(event_id).character_packs:
+        # Only include characters whose character sheet is not marked as complete
+        if changed_only or not entry["pack"].completion.get("character_sheet", False):
+            characters_to_print.append(entry["character"])
 
     if not characters_to_print:
         flash("No character sheets to print - all are marked as complete.", "info")
@@ -813,9 +893,38 @@ def print_character_sheets(event_id):
     # Generate PDF
     layout_manager = PrintLayout()
     try:
-        pdf = layout_manager.generate_character_sheets_pdf(characters_to_print, template)
+        items_to_print = layout_manager.render_character_sheet_items(characters_to_print, template)
+        sheets = [
+            (character, item, CharacterSheetPrint.hash_sheet(item))
+            for character, item in zip(characters_to_print, items_to_print)
+        ]
+
+        if changed_only:
+            last_hashes = CharacterSheetPrint.latest_hashes(event_id)
+            sheets = [sheet for sheet in sheets if last_hashes.get(sheet[0].id) != sheet[2]]
+            if not sheets:
+                flash("No character sheets have changed since the last print.", "info")
+                return redirect(url_for("events.view_packs", event_id=event_id))
+
+        pdf = layout_manager.generate_pdf(
+            [item for _, item, _ in sheets], template, template.has_back_side
+        )
         pdf.seek(0)
 
+        # Record what was included so later runs can print only changed sheets
+        printed_at = datetime.now()
+        for character, _, content_hash in sheets:
+            db.session.add(
+                CharacterSheetPrint(
+                    event_id=event_id,
+                    character_id=character.id,
+                    content_hash=content_hash,
+                    printed_at=printed_at,
+                    printed_by_user_id=current_user.id,
+                )
+            )
+        db.session.commit()
+
         # Return PDF for inline preview
         from flask import send_file
 
@@ -826,10 +935,41 @@ def print_character_sheets(event_id):
             download_name=f"character_sheets_event_{event.event_number}.pdf",
         )
     except Exception as e:
+        db.session.rollback()
         flash(f"Error generating PDF: {str(e)}", "error")
         return redirect(url_for("events.view_packs", event_id=event_id))
 
 
+@events_bp.route("/<int:event_id>/packs/print/character-sheets/manifest")
+@login_required
+@admin_required
+def character_sheets_print_manifest(event_id):
+    """List the character sheets included in the most recent print run for an event."""
+    from models.tools.print_template import CharacterSheetPrint
+
+    Event.query.get_or_404(event_id)
+    records = CharacterSheetPrint.last_run(event_id)
+
+    return jsonify(
+        {
+            "event_id": event_id,
+            "printed_at": records[0].printed_at.isoformat() if records else None,
+            "printed_by_user_id": records[0].printed_by_user_id if records else None,
+            "characters": [
+                {
+                    "character_id": record.character_id,
+                    "name": record.character.name,
+                    "player_reference": (
+                        f"{record.character.user_id}.{record.character.character_id}"
+                    ),
+                    "content_hash": record.content_hash,
+                }
+                for record in records
+            ],
+        }
+    )
+
+
 @events_bp.route("/<int:event_id>/packs/print/character-id-badges")
 @login_required
 @admin_required
@@ -842,20 +982,11 @@ def print_character_id_badges(event_id):
     event = Event.query.get_or_404(event_id)
 
     # Get all characters with tickets for this event
-    character_tickets = (
-        EventTicket.query.filter_by(event_id=event_id)
-        .filter(EventTicket.character_id.isnot(None))
-        .all()
-    )
     characters_to_print = []
-
-    for ticket in character_tickets:
-        character = Character.query.get(ticket.character_id)
-        if character:
-            pack = character.pack or Pack()
-            # Only include characters whose ID badge is not marked as complete
-            if not pack.completion.get("character_id_badge", False):
-                characters_to_print.append(character)
+    for entry in EventPackResolver(event_id).character_packs:
+        # Only include characters whose ID badge is not marked as complete
+        if not entry["pack"].completion.get("character_id_badge", False):
+            characters_to_print.append(entry["character"])
 
     if not characters_to_print:
         flash("No character ID badges to print - all are marked as complete.", "info")
@@ -892,52 +1023,14 @@ def print_character_id_badges(event_id):
 @admin_required
 def print_items(event_id):
     """Print items for incomplete character and group packs."""
-    from models.database.item_blueprint import ItemBlueprint
     from models.enums import PrintTemplateType
     from models.tools.print_template import PrintTemplate
     from utils.print_layout import PrintLayout
 
     event = Event.query.get_or_404(event_id)
 
-    # Get all characters with tickets for this event
-    character_tickets = (
-        EventTicket.query.filter_by(event_id=event_id)
-        .filter(EventTicket.character_id.isnot(None))
-        .all()
-    )
-    items_to_print = []
-
-    # Character items
-    for ticket in character_tickets:
-        character = Character.query.get(ticket.character_id)
-        if character:
-            pack = character.pack or Pack()
-            # Only include characters whose items are not marked as complete
-            if not pack.completion.get("items", False) and pack.items:
-                for item_id in pack.items:
-                    # Get the item blueprint
-                    item = Item.query.get(item_id)
-                    if item:
-                        items_to_print.append(item)
-
-    # Group items
-    groups_with_tickets = set()
-    for ticket in character_tickets:
-        character = Character.query.get(ticket.character_id)
-        if character and character.group:
-            groups_with_tickets.add(character.group.id)
-
-    for group_id in groups_with_tickets:
-        group = Group.query.get(group_id)
-        if group:
-            pack = group.pack or Pack()
-            # Only include groups whose items are not marked as complete
-            if not pack.completion.get("items", False) and pack.items:
-                for item_id in pack.items:
-                    # Get the item blueprint
-                    item = Item.query.get(item_id)
-                    if item:
-                        items_to_print.append(item)
+    # Items from character and group packs whose items are not marked as complete
+    items_to_print = EventPackResolver(event_id).incomplete("items")
 
     if not items_to_print:
         flash("No items to print - all are marked as complete.", "info")
@@ -974,50 +1067,14 @@ def print_items(event_id):
 @admin_required
 def print_medicaments(event_id):
     """Print medicaments for incomplete character and group packs."""
-    from models.database.medicaments import Medicament
     from models.enums import PrintTemplateType
     from models.tools.print_template import PrintTemplate
     from utils.print_layout import PrintLayout
 
     event = Event.query.get_or_404(event_id)
 
-    # Get all characters with tickets for this event
-    character_tickets = (
-        EventTicket.query.filter_by(event_id=event_id)
-        .filter(EventTicket.character_id.isnot(None))
-        .all()
-    )
-    medicaments_to_print = []
-
-    # Character medicaments
-    for ticket in character_tickets:
-        character = Character.query.get(ticket.character_id)
-        if character:
-            pack = character.pack or Pack()
-            # Only include characters whose medicaments are not marked as complete
-            if not pack.completion.get("medicaments", False) and pack.medicaments:
-                for medicament_id in pack.medicaments:
-                    medicament = Medicament.query.get(medicament_id)
-                    if medicament:
-                        medicaments_to_print.append(medicament)
-
-    # Group medicaments
-    groups_with_tickets = set()
-    for ticket in character_tickets:
-        character = Character.query.get(ticket.character_id)
-        if character and character.group:
-            groups_with_tickets.add(character.group.id)
-
-    for group_id in groups_with_tickets:
-        group = Group.query.get(group_id)
-        if group:
-            pack = group.pack or Pack()
-            # Only include groups whose medicaments are not marked as complete
-            if not pack.completion.get("medicaments", False) and pack.medicaments:
-                for medicament_id in pack.medicaments:
-                    medicament = Medicament.query.get(medicament_id)
-                    if medicament:
-                        medicaments_to_print.append(medicament)
+    # Medicaments from character and group packs whose medicaments are not marked as complete
+    medicaments_to_print = EventPackResolver(event_id).incomplete("medicaments")
 
     if not medicaments_to_print:
         flash("No medicaments to print - all are marked as complete.", "info")
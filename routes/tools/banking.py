@@ -1,8 +1,14 @@
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+import re
+import string
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
+from sqlalchemy import and_, func
+from sqlalchemy.orm import joinedload
 
 from models.enums import CharacterStatus
 from models.extensions import db
+from models.tools import bank_ledger
 from models.tools.character import Character
 from models.tools.group import Group
 from utils.decorators import email_verified_required, user_admin_required
@@ -10,36 +16,112 @@ from utils.decorators import email_verified_required, user_admin_required
 banking_bp = Blueprint("banking", __name__)
 
 
-@banking_bp.route("/")
+# Most accounts returned by one account search
+ACCOUNT_SEARCH_LIMIT = 20
+
+# Player references ("user_id.character_id"), or just the user id part of one
+PLAYER_REFERENCE = re.compile(r"^(\d+)(?:\.(\d*))?$")
+
+# SQLite's lower() only folds A-Z, so search terms are folded the same way
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _starts_with(column, prefix):
+    """Case-insensitive prefix match written as a range, so the lower(name) indexes serve it."""
+    lowered = func.lower(column)
+    prefix = prefix.translate(ASCII_LOWER)
+    return and_(lowered >= prefix, lowered < prefix + chr(0x10FFFF))
+
+
+def _character_option(character, with_balance):
+    reference = f"{character.user_id}.{character.character_id or 0}"
+    option = {"id": f"character_{character.id}", "text": f"{character.name} ({reference})"}
+    if with_balance:
+        option["balance"] = character.bank_account
+    return option
+
+
+def _group_option(group, with_balance):
+    option = {"id": f"group_{group.id}", "text": f"{group.name} (Group)"}
+    if with_balance:
+        option["balance"] = group.bank_account
+    return option
+
+
+@banking_bp.route("/accounts/search")
 @login_required
 @email_verified_required
-def bank():
-    # --- Data for Transfer Target Dropdown (always all active accounts) ---
-    all_characters = Character.query.filter_by(status=CharacterStatus.ACTIVE.value).all()
-    all_groups = Group.query.all()
-    target_accounts = []
-    for char in all_characters:
-        target_accounts.append(
-            {"type": "character", "id": char.id, "name": f"{char.name} (Character)"}
+def search_accounts():
+    """
+    Accounts whose character or group name starts with the search term, or characters whose
+    player reference matches it, in select2's format. Balances are only included for admins.
+    """
+    term = request.args.get("q", "").strip()
+    account_type = request.args.get("type")
+    if not term:
+        return jsonify({"results": []})
+
+    with_balance = current_user.has_role("user_admin")
+    results = []
+    if account_type in (None, "", "character"):
+        characters = Character.query.filter(
+            Character.status == CharacterStatus.ACTIVE.value
+        ).order_by(Character.name, Character.id)
+        match = PLAYER_REFERENCE.match(term)
+        if match:
+            user_id, character_id = match.groups()
+            by_reference = characters.filter(Character.user_id == int(user_id))
+            if character_id:
+                by_reference = by_reference.filter(Character.character_id == int(character_id))
+            results += [
+                _character_option(character, with_balance)
+                for character in by_reference.limit(ACCOUNT_SEARCH_LIMIT)
+            ]
+        else:
+            results += [
+                _character_option(character, with_balance)
+                for character in characters.filter(_starts_with(Character.name, term)).limit(
+                    ACCOUNT_SEARCH_LIMIT
+                )
+            ]
+    if account_type in (None, "", "group") and len(results) < ACCOUNT_SEARCH_LIMIT:
+        groups = (
+            Group.query.filter(_starts_with(Group.name, term))
+            .order_by(Group.name, Group.id)
+            .limit(ACCOUNT_SEARCH_LIMIT - len(results))
         )
-    for group in all_groups:
-        target_accounts.append({"type": "group", "id": group.id, "name": f"{group.name} (Group)"})
+        results += [_group_option(group, with_balance) for group in groups]
+
+    return jsonify({"results": results})
 
+
+@banking_bp.route("/")
+@login_required
+@email_verified_required
+def bank():
+    # Transfer targets, and every account for admins, are found through search_accounts, so
+    # the page only lists the user's own accounts and any an admin picked
     # --- Logic for Admins ---
     if current_user.has_role("user_admin"):
-        source_accounts = target_accounts  # Admins can source from any account
+        character_id = request.args.get("character_id", type=int)
+        group_id = request.args.get("group_id", type=int)
+        selected_character = db.session.get(Character, character_id) if character_id else None
+        selected_group = db.session.get(Group, group_id) if group_id else None
         return render_template(
             "banking/bank.html",
-            characters_for_select=all_characters,
-            groups_for_select=all_groups,
-            source_accounts=source_accounts,
-            target_accounts=target_accounts,
+            characters_for_select=[selected_character] if selected_character else [],
+            groups_for_select=[selected_group] if selected_group else [],
+            selected_character=selected_character,
+            selected_group=selected_group,
+            source_accounts=[],
         )
 
     # --- Logic for non-admins ---
-    user_characters = Character.query.filter_by(
-        user_id=current_user.id, status=CharacterStatus.ACTIVE.value
-    ).all()
+    user_characters = (
+        Character.query.filter_by(user_id=current_user.id, status=CharacterStatus.ACTIVE.value)
+        .options(joinedload(Character.group))
+        .all()
+    )
 
     if not user_characters:
         flash("You need an active character to access banking", "error")
@@ -73,7 +155,6 @@ def bank():
             characters_for_select=user_characters,
             groups_for_select=user_groups,
             source_accounts=source_accounts,
-            target_accounts=target_accounts,
         )
 
     # --- Single active character ---
@@ -86,7 +167,6 @@ def bank():
         active_character_group=single_character.group,
         show_source_dropdown=show_source_dropdown,
         source_accounts=source_accounts,
-        target_accounts=target_accounts,
     )
 
 
@@ -153,45 +233,31 @@ def transfer():
         if not current_user.has_role("user_admin") and source.user_id != current_user.id:
             flash("You do not have access to this account", "error")
             return redirect(url_for("banking.bank"))
-        source_name = source.name
     else:
         source = Group.query.get_or_404(source_id)
         if not current_user.has_role("user_admin"):
-            active_character = Character.query.filter_by(
-                user_id=current_user.id, status=CharacterStatus.ACTIVE.value
+            # Any of the user's active characters in the group, as offered by the bank page
+            member = Character.query.filter_by(
+                user_id=current_user.id, status=CharacterStatus.ACTIVE.value, group_id=source.id
             ).first()
-            if not active_character or active_character.group_id != source.id:
+            if not member:
                 flash("You do not have access to this account", "error")
                 return redirect(url_for("banking.bank"))
-        source_name = source.name
-
-    # Check if source has enough money
-    if source.bank_account < amount:
-        flash("Insufficient funds", "error")
-        return redirect(url_for("banking.bank"))
 
     # Get target account
     if target_type == "character":
         target = Character.query.get_or_404(target_id)
-        target_name = target.name
     else:
         target = Group.query.get_or_404(target_id)
-        target_name = target.name
 
-    # Perform transfer using centralized methods
-    if source_type == "character":
-        # Remove funds from source character
-        source.remove_funds(amount, current_user.id, f"Transfer to {target_name}")
-    else:
-        # Source is a group
-        source.remove_funds(amount, current_user.id, f"Transfer to {target_name}")
-
-    if target_type == "character":
-        # Add funds to target character
-        target.add_funds(amount, current_user.id, f"Transfer from {source_name}")
-    else:
-        # Add funds to target group
-        target.add_funds(amount, current_user.id, f"Transfer from {source_name}")
+    # The debit only applies while the source still holds the funds, however many transfers
+    # from the account run at once
+    try:
+        bank_ledger.transfer(source, target, amount, current_user.id)
+    except ValueError:
+        db.session.rollback()
+        flash("Insufficient funds", "error")
+        return redirect(url_for("banking.bank"))
 
     db.session.commit()
 
@@ -11,6 +11,7 @@ from utils.decorators import (
     email_verified_required,
     user_admin_required,
 )
+from utils.skill_planner import SkillPlanner
 
 character_skills_bp = Blueprint("character_skills", __name__)
 
@@ -145,6 +146,23 @@ def get_skill_cost(character_id):
     )
 
 
+@character_skills_bp.route("/characters/<int:character_id>/skills/plan", methods=["POST"])
+@login_required
+@email_verified_required
+@character_owner_or_user_admin_required
+def plan_skills(character_id):
+    """Evaluate a list of skill purchases without making them."""
+    character = Character.query.get_or_404(character_id)
+
+    skill_ids = (request.get_json(silent=True) or {}).get("skill_ids")
+    if not isinstance(skill_ids, list) or not all(
+        isinstance(skill_id, int) and not isinstance(skill_id, bool) for skill_id in skill_ids
+    ):
+        return jsonify({"error": "skill_ids must be a list of skill IDs"}), 400
+
+    return jsonify(SkillPlanner(character).plan(skill_ids))
+
+
 @character_skills_bp.route("/characters/<int:character_id>/skills/purchase", methods=["POST"])
 @login_required
 @email_verified_required
@@ -7,7 +7,7 @@ from models.database.conditions import Condition
 from models.database.cybernetic import CharacterCybernetic, Cybernetic
 from models.database.faction import Faction
 from models.database.species import Species
-from models.enums import CharacterAuditAction, PrintTemplateType, Role
+from models.enums import AuditLogOwnerType, CharacterAuditAction, PrintTemplateType, Role
 from models.extensions import db
 from models.tools.character import (
     Character,
@@ -21,6 +21,13 @@ from models.tools.print_template import PrintTemplate
 from models.tools.research import CharacterResearch
 from models.tools.user import User
 from utils import generate_qr_code, generate_web_qr_code
+from utils.audit_log import (
+    archived_page,
+    audit_log_page,
+    delete_archives,
+    has_archive,
+    parse_actions,
+)
 from utils.decorators import (
     character_owner_or_user_admin_required,
     email_verified_required,
@@ -381,8 +388,9 @@ def edit_post(character_id):
             if cyber:
                 cybernetic_changes.append(f"Cybernetic removed: {cyber.name}")
 
-        # Remove all current
-        CharacterCybernetic.query.filter_by(character_id=character.id).delete()
+        # Remove all current, through the session so the character's stats are refreshed
+        for link in character.cybernetics_link:
+            db.session.delete(link)
         # Add new
         for cid in selected_cyber_ids:
             db.session.add(CharacterCybernetic(character_id=character.id, cybernetic_id=cid))
@@ -572,6 +580,7 @@ def delete_character(character_id):
         return redirect(url_for("characters.character_list"))
     for audit_log in CharacterAuditLog.query.filter_by(character_id=character.id).all():
         db.session.delete(audit_log)
+    delete_archives(AuditLogOwnerType.CHARACTER, character.id)
     db.session.delete(character)
     db.session.commit()
     flash("Character deleted.", "success")
@@ -754,15 +763,20 @@ def create_for_player_post(user_id):
 def audit_log(character_id):
     character = Character.query.get_or_404(character_id)
 
-    audit_logs = (
-        CharacterAuditLog.query.filter_by(character_id=character_id)
-        .order_by(CharacterAuditLog.timestamp.desc())
-        .all()
+    owner_type = AuditLogOwnerType.CHARACTER
+    actions = parse_actions(owner_type, request.args.getlist("action"))
+    archived = request.args.get("archived") == "1"
+    page = (archived_page if archived else audit_log_page)(
+        owner_type, character_id, actions, before=request.args.get("before", type=int)
     )
     return render_template(
         "characters/audit_log.html",
         character=character,
-        audit_logs=audit_logs,
+        audit_logs=page["entries"],
+        next_cursor=page["next_cursor"],
+        selected_actions=[action.value for action in actions],
+        archived=archived,
+        has_archive=has_archive(owner_type, character_id),
         CharacterAuditAction=CharacterAuditAction,
     )
 
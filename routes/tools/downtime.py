@@ -1,8 +1,8 @@
 import json
-import secrets
 
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
+from sqlalchemy.orm import contains_eager
 
 from models.database.conditions import Condition
 from models.database.cybernetic import CharacterCybernetic, Cybernetic
@@ -11,9 +11,9 @@ from models.database.faction import Faction
 from models.database.item import Item
 from models.database.item_blueprint import ItemBlueprint
 from models.database.item_type import ItemType
-from models.database.mods import Mod
 from models.database.sample import Sample, SampleTag
 from models.enums import (
+    DowntimeJobStatus,
     DowntimeStatus,
     DowntimeTaskStatus,
     EventType,
@@ -23,48 +23,30 @@ from models.enums import (
 from models.event import Event
 from models.extensions import db
 from models.tools.character import Character, CharacterCondition
-from models.tools.downtime import DowntimePack, DowntimePeriod
-from models.tools.event_ticket import EventTicket
-from models.tools.group import Group
-from models.tools.research import (
-    CharacterResearch,
-    CharacterResearchStage,
-    Research,
-    ResearchStage,
-    ResearchStageRequirement,
-)
+from models.tools.downtime import DowntimeJob, DowntimePack, DowntimePeriod
 from utils.decorators import character_owner_or_downtime_team_required, downtime_team_required
-from utils.email import send_downtime_completed_notification, send_downtime_pack_enter_notification
+from utils.downtime import pack_search_query, pack_status_counts, start_downtime_period
+from utils.downtime_processor import (
+    preview_downtime_period,
+    queue_downtime_job,
+    resume_downtime_job,
+    start_downtime_job,
+)
+from utils.downtime_wizard import CATALOGS, WIZARD_STEPS, catalog_etag, step_data
+from utils.email import send_downtime_pack_enter_notification
 
 bp = Blueprint("downtime", __name__)
 
+PACKS_PER_PAGE = 50
+
 
 def get_available_science_slots_with_sources(character, science_type=None):
     """Get available science slots with their sources."""
-    slots = []
-
-    # Get slots from skills
-    for skill in character.skills:
-        if skill.skill.adds_science_downtime > 0:
-            if science_type is None or skill.skill.science_type == science_type:
-                for _ in range(skill.times_purchased):
-                    slots.append(
-                        {
-                            "source": f"Skill: {skill.skill.name}",
-                            "type": skill.skill.science_type,
-                        }
-                    )
-
-    # Get slots from cybernetics
-    for cybernetic in character.cybernetics_link:
-        if cybernetic.cybernetic.adds_science_downtime > 0:
-            if science_type is None or cybernetic.cybernetic.science_type == science_type:
-                slots.append(
-                    {
-                        "source": f"Cybernetic: {cybernetic.cybernetic.name}",
-                        "type": cybernetic.cybernetic.science_type,
-                    }
-                )
+    slots = [
+        {"source": slot["source"], "type": ScienceType(slot["type"])}
+        for slot in character.derived_stats.get_sources("science")
+        if science_type is None or slot["type"] == science_type.value
+    ]
 
     # Get slots from research teams in current downtime pack
     current_pack = next(
@@ -91,20 +73,9 @@ def get_available_science_slots_with_sources(character, science_type=None):
 
 def get_available_engineering_slots_with_sources(character):
     """Get available engineering slots with their sources."""
-    slots = []
-
-    # Get slots from skills
-    for skill in character.skills:
-        if skill.skill.adds_engineering_downtime > 0:
-            for _ in range(skill.times_purchased):
-                slots.append({"source": f"Skill: {skill.skill.name}"})
-
-    # Get slots from cybernetics
-    for cybernetic in character.cybernetics_link:
-        if cybernetic.cybernetic.adds_engineering_downtime > 0:
-            slots.append({"source": f"Cybernetic: {cybernetic.cybernetic.name}"})
-
-    return slots
+    return [
+        {"source": slot["source"]} for slot in character.derived_stats.get_sources("engineering")
+    ]
 
 
 @bp.route("/")
@@ -124,18 +95,22 @@ def index():
 
     # For downtime team users
     if current_user.has_role("downtime_team"):
-        # Get all packs and group them by status
-        packs_by_status = {}
-        for pack in active_period.packs:
-            if pack.status.value not in packs_by_status:
-                packs_by_status[pack.status.value] = []
-            packs_by_status[pack.status.value].append(pack)
-
-        # Get the first status that has entries
-        default_status = next(
-            (status for status in DowntimeTaskStatus if status.value in packs_by_status),
-            None,
-        )
+        status_counts = pack_status_counts(active_period.id)
+
+        # Default to the first status that has entries
+        status = request.args.get("status")
+        if status not in status_counts:
+            status = next((s.value for s in DowntimeTaskStatus if s.value in status_counts), None)
+
+        search = request.args.get("q", "").strip()
+        packs = None
+        if status:
+            packs = db.paginate(
+                pack_search_query(active_period.id, DowntimeTaskStatus(status), search),
+                page=request.args.get("page", 1, type=int),
+                per_page=PACKS_PER_PAGE,
+                error_out=False,
+            )
 
         return render_template(
             "downtime/index.html",
@@ -143,19 +118,29 @@ def index():
             DowntimeStatus=DowntimeStatus,
             DowntimeTaskStatus=DowntimeTaskStatus,
             EventType=EventType,
-            packs_by_status=packs_by_status,
-            default_status=default_status.value if default_status else None,
+            status_counts=status_counts,
+            total_packs=sum(status_counts.values()),
+            selected_status=status,
+            search=search,
+            packs=packs,
+            job=active_period.job,
+            DowntimeJobStatus=DowntimeJobStatus,
         )
 
     # For regular users
     else:
         # Get user's characters that are in enter_downtime state
-        user_packs = [
-            pack
-            for pack in active_period.packs
-            if pack.character.user_id == current_user.id
-            and pack.status == DowntimeTaskStatus.ENTER_DOWNTIME
-        ]
+        user_packs = (
+            DowntimePack.query.join(DowntimePack.character)
+            .filter(
+                DowntimePack.period_id == active_period.id,
+                DowntimePack.status == DowntimeTaskStatus.ENTER_DOWNTIME,
+                Character.user_id == current_user.id,
+            )
+            .options(contains_eager(DowntimePack.character))
+            .order_by(Character.name)
+            .all()
+        )
 
         # If user has one character in enter_downtime state, redirect to enter downtime
         if len(user_packs) == 1:
@@ -198,41 +183,15 @@ def start_downtime():
 
     event = Event.query.get_or_404(event_id)
 
-    period = DowntimePeriod(status=DowntimeStatus.PENDING, event_id=event.id)
-    db.session.add(period)
-
-    # Clear all character packs
-    for character in Character.query.all():
-        pack = character.pack
-        pack.items.clear()
-        pack.samples.clear()
-        pack.exotics.clear()
-        pack.medicaments.clear()
-        pack.energy_chits = 0
-        pack.completion.clear()
-        character.pack = pack
-
-    # Clear all group packs
-    for group in Group.query.all():
-        pack = group.pack
-        pack.items.clear()
-        pack.samples.clear()
-        pack.exotics.clear()
-        pack.medicaments.clear()
-        pack.energy_chits = 0
-        pack.completion.clear()
-        group.pack = pack
-
-    for character in EventTicket.query.filter_by(event_id=event_id).all():
-        pack = DowntimePack(
-            period_id=period.id,
-            character_id=character.id,
-            status=DowntimeTaskStatus.ENTER_PACK,
-        )
-        db.session.add(pack)
-
+    _, report = start_downtime_period(event)
     db.session.commit()
-    flash("New downtime period started successfully.", "success")
+    flash(
+        "New downtime period started successfully. "
+        f"Cleared {report['characters_reset']} character and {report['groups_reset']} group "
+        f"packs and created {report['downtime_packs']} downtime packs "
+        f"in {report['elapsed_ms']} ms.",
+        "success",
+    )
     return redirect(url_for("downtime.index"))
 
 
@@ -406,150 +365,67 @@ def enter_downtime(period_id, character_id):
         )
         return redirect(url_for("downtime.index"))
 
-    # Bank balances
-    bank_balance = character.bank_account
-    group_bank_balance = character.group.bank_account if character.group else None
-
-    # Get all mods: known + available
-    known_mod_ids = [mod_id for mod_id in character.known_modifications]
-    available_mods = Mod.query.filter(~Mod.id.in_(known_mod_ids)).order_by(Mod.name).all()
-    known_mods = Mod.query.filter(Mod.id.in_(known_mod_ids)).order_by(Mod.name).all()
-    all_mods = known_mods + available_mods
-
-    # Items from own and group downtime packs
-    pack_items = [db.session.get(Item, item_id) for item_id in pack.items]
-    group_items = []
-    if character.group:
-        group_packs = DowntimePack.query.filter(
-            DowntimePack.period_id == period_id,
-            DowntimePack.character_id.in_(
-                [c.id for c in character.group.members if c.id != character.id]
-            ),
-        ).all()
-        for pack in group_packs:
-            group_items.extend(pack.items)
-
-    # Get all item blueprints (for purchase step)
-    blueprints = ItemBlueprint.query.order_by(ItemBlueprint.name).all()
-    blueprints_data = [
-        {"id": bp.id, "name": bp.name, "base_cost": bp.base_cost} for bp in blueprints
-    ]
-
-    if character.group:
-        available_samples = character.group.samples.order_by(Sample.name).all()
-    else:
-        available_samples = (
-            Sample.query.filter(Sample.id.in_(pack.samples)).order_by(Sample.name).all()
-            if pack.samples
-            else []
-        )
-
-    # Research projects for science step
-    my_projects = CharacterResearch.query.filter_by(character_id=character.id).all()
-    group_projects = []
-    group_members = []
-    if character.group:
-        group_member_ids = [c.id for c in character.group.members]
-        group_projects = CharacterResearch.query.filter(
-            CharacterResearch.character_id.in_(group_member_ids)
-        ).all()
-        group_members = [c for c in character.group.members if c.id != character.id]
-
-    # Convert CharacterResearch objects to dictionaries
-    my_projects = [
-        {
-            "research_id": cr.research.public_id,
-            "project_name": cr.research.project_name,
-            "character_name": cr.character.name if cr.character else None,
-        }
-        for cr in my_projects
-    ]
-    group_projects = [
-        {
-            "research_id": cr.research.public_id,
-            "project_name": cr.research.project_name,
-            "character_name": cr.character.name if cr.character else None,
-        }
-        for cr in group_projects
-    ]
-    pack_items = [
-        {
-            "id": item.id,
-            "name": item.blueprint.name,
-            "type": item.blueprint.item_type.id,
-            "full_code": item.full_code,
-        }
-        for item in pack_items
-    ]
-    group_items = [
-        {
-            "id": item.id,
-            "name": item.blueprint.name,
-            "type": item.blueprint.item_type.id,
-            "full_code": item.full_code,
-        }
-        for item in group_items
-    ]
-    available_samples = [
-        {
-            "id": sample.id,
-            "name": sample.name,
-            "type": sample.type.value,
-            "tags": [tag.name for tag in sample.tags],
-            "is_researched": sample.is_researched,
-        }
-        for sample in available_samples
-    ]
-    pack_exotics = [
-        {
-            "id": exotic["id"],
-            "name": db.session.get(ExoticSubstance, exotic["id"]).name,
-            "amount": exotic["amount"],
-        }
-        for exotic in pack.exotic_substances
-    ]
-
-    # Get existing downtime activities
-    pack_purchases = pack.purchases or []
-    pack_modifications = pack.modifications or []
-    pack_engineering = pack.engineering or []
-    pack_science = pack.science or []
-    pack_research = pack.research or []
-    pack_reputation = pack.reputation or []
-
-    # Get available slots with their sources
-    science_slots = get_available_science_slots_with_sources(character)
-    engineering_slots = get_available_engineering_slots_with_sources(character)
-
+    # Only what lays out the steps is rendered, each step loads its own data when opened
     return render_template(
         "downtime/enter_downtime.html",
         character=character,
         pack=pack,
-        bank_balance=bank_balance,
-        group_bank_balance=group_bank_balance,
-        all_mods=all_mods,
-        pack_items=pack_items,
-        group_items=group_items,
-        blueprints_data=blueprints_data,
-        available_samples=available_samples,
-        my_projects=my_projects,
-        group_projects=group_projects,
-        group_members=group_members,
-        pack_purchases=pack_purchases,
-        pack_modifications=pack_modifications,
-        pack_engineering=pack_engineering,
-        pack_science=pack_science,
-        pack_research=pack_research,
-        pack_reputation=pack_reputation,
-        pack_exotics=pack_exotics,
-        science_slots=science_slots,
-        engineering_slots=engineering_slots,
+        bank_balance=character.bank_account,
+        group_bank_balance=character.group.bank_account if character.group else None,
+        has_reputation=any(reputation.value > 0 for reputation in character.reputations),
+        pack_purchases=pack.purchases or [],
+        pack_modifications=pack.modifications or [],
+        pack_engineering=pack.engineering or [],
+        pack_science=pack.science or [],
+        pack_research=pack.research or [],
+        pack_reputation=pack.reputation or [],
+        science_slots=get_available_science_slots_with_sources(character),
+        engineering_slots=get_available_engineering_slots_with_sources(character),
         DowntimeTaskStatus=DowntimeTaskStatus,
         ResearchRequirementType=ResearchRequirementType,
         ScienceType=ScienceType,
     )
 
 
+@bp.route("/enter-downtime/<int:period_id>/<int:character_id>/steps/<step>", methods=["GET"])
+@login_required
+@character_owner_or_downtime_team_required
+def enter_downtime_step(period_id, character_id, step):
+    """Data for one step of the downtime activity entry page."""
+    if step not in WIZARD_STEPS:
+        return jsonify({"error": "Unknown step"}), 404
+
+    character = Character.query.get_or_404(character_id)
+    pack = DowntimePack.query.filter_by(
+        period_id=period_id, character_id=character_id
+    ).first_or_404()
+    if pack.status != DowntimeTaskStatus.ENTER_DOWNTIME:
+        return (
+            jsonify(
+                {"error": "This pack is not in the correct state for entering downtime activities."}
+            ),
+            409,
+        )
+
+    response = jsonify(step_data(step, character, pack))
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+@bp.route("/catalogs/<name>", methods=["GET"])
+@login_required
+def downtime_catalog(name):
+    """Blueprints or modifications for the downtime entry page, revalidated by ETag."""
+    if name not in CATALOGS:
+        return jsonify({"error": "Unknown catalog"}), 404
+
+    payload = CATALOGS[name]()
+    response = jsonify(payload)
+    response.set_etag(catalog_etag(payload))
+    response.headers["Cache-Control"] = "private, max-age=300"
+    return response.make_conditional(request)
+
+
 @bp.route("/enter-downtime/<int:period_id>/<int:character_id>", methods=["POST"])
 @login_required
 @character_owner_or_downtime_team_required
@@ -715,643 +591,81 @@ def manual_review_post(period_id, character_id):
     return redirect(url_for("downtime.index"))
 
 
+def _processable_period_error(period):
+    """Reason a downtime period cannot be processed, or None if it can."""
+    if not period.event:
+        return "This downtime period is not associated with an event."
+    if period.status == DowntimeStatus.COMPLETED:
+        return "This downtime period has already been processed."
+    if period.job is not None:
+        return "This downtime period is already being processed."
+    if not all(pack.status == DowntimeTaskStatus.COMPLETED for pack in period.packs):
+        return "Cannot process downtime - not all packs are complete."
+    return None
+
+
 @bp.route("/process/<int:period_id>", methods=["POST"])
 @login_required
 @downtime_team_required
 def process_downtime(period_id):
-    """Process a completed downtime period."""
+    """Start processing a completed downtime period in the background."""
     period = DowntimePeriod.query.get_or_404(period_id)
-    if not period.event:
-        flash("This downtime period is not associated with an event.", "error")
-        return redirect(url_for("downtime.index"))
-
-    # Verify all packs are in completed state
-    if not all(pack.status == DowntimeTaskStatus.COMPLETED for pack in period.packs):
-        flash("Cannot process downtime - not all packs are complete.", "error")
+    error = _processable_period_error(period)
+    if error:
+        flash(error, "error")
         return redirect(url_for("downtime.index"))
 
-    packs = DowntimePack.query.filter_by(period_id=period_id).all()
-
-    # Initialize downtime results for all packs
-    for pack in packs:
-        # Initialize the character's pack as a structured object
-        character_pack = pack.character.pack
-
-        # Ensure the pack has the necessary structure
-        if not character_pack.downtime_results:
-            character_pack.downtime_results = {}
-
-        # Initialize downtime results for this specific pack
-        if str(pack.id) not in character_pack.downtime_results:
-            character_pack.downtime_results[str(pack.id)] = []
-
-        # Update the character's pack
-        pack.character.pack = character_pack
-
-    # Process modifications
-    for pack in packs:
-        for modification in pack.modifications:
-            if modification["type"] == "learning":
-                mod = db.session.get(Mod, modification["mod_id"])
-                if mod:
-                    pack.character.known_modifications.append(modification["mod_id"])
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id), f"Learned mod: {mod.name}"
-                    )
-            elif modification["type"] == "forgetting":
-                mod = db.session.get(Mod, modification["mod_id"])
-                if mod:
-                    pack.character.known_modifications.remove(modification["mod_id"])
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id), f"Forgot modification: {mod.name}"
-                    )
-
-    # Process purchases
-    for pack in packs:
-        for purchase in pack.purchases:
-            blueprint = db.session.get(ItemBlueprint, purchase["blueprint_id"])
-            if pack.character.can_afford(blueprint.base_cost):
-                pack.character.remove_funds(
-                    blueprint.base_cost, current_user.id, f"Purchase: {blueprint.name}"
-                )
-                new_item = Item(
-                    character_id=pack.character.id,
-                    blueprint_id=blueprint.id,
-                    full_code=blueprint.full_code,
-                    expiry=period.event.event_number + 4,
-                )
-                pack.items.append(new_item)
-                pack.character.pack.add_downtime_result(
-                    str(pack.id), f"Purchased: {blueprint.name}"
-                )
-                for engineering in pack.engineering:
-                    if engineering.source == "own" and engineering.blueprint_id == blueprint.id:
-                        engineering.item_id = new_item.id
-                        engineering.blueprint_id = None
-                        break
-            else:
-                pack.character.pack.add_downtime_result(
-                    str(pack.id), f"Could not purchase {blueprint.name} - insufficient funds"
-                )
-
-    # Process engineering maintenance
-    for pack in packs:
-        for engineering in pack.engineering:
-            if engineering.action == "maintain":
-                item = db.session.get(Item, engineering.item_id)
-                if item and pack.character.can_afford(item.get_maintenance_cost()):
-                    pack.character.remove_funds(
-                        item.get_maintenance_cost(), current_user.id, f"Maintenance: {item.name}"
-                    )
-                    item.expiry = period.event.event_number + 4
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id), f"Maintained {item.name} - new expiry: E{item.expiry}"
-                    )
-                elif not pack.character.can_afford(item.get_maintenance_cost()):
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id), f"Could not maintain {item.name} - insufficient funds"
-                    )
-
-    # Process engineering modifications
-    for pack in packs:
-        for engineering in pack.engineering:
-            if engineering.action == "modify":
-                item = db.session.get(Item, engineering.item_id)
-                mod = db.session.get(Mod, engineering.mod_id)
-                if (
-                    item
-                    and mod
-                    and pack.character.can_afford(item.get_modification_cost(engineering.mods))
-                    and pack.character.known_modifications.contains(mod)
-                ):
-                    pack.character.remove_funds(
-                        item.get_modification_cost(engineering.mods),
-                        current_user.id,
-                        f"Modification: {mod.name} on {item.name}",
-                    )
-                    item.mods_applied.append(mod)
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id), f"Applied {mod.name} to {item.name}"
-                    )
-                elif not pack.character.can_afford(item.get_modification_cost(engineering.mods)):
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id),
-                        f"Could not apply {mod.name} to {item.name} - insufficient funds",
-                    )
-                elif not pack.character.known_modifications.contains(mod):
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id),
-                        f"Could not apply {mod.name} to {item.name} - "
-                        f"character does not know the modification",
-                    )
-
-    # Process science
-    for pack in packs:
-        for science in pack.science:
-            if science.action == "synthesize":
-                science_type = science.get("science_type", ScienceType.GENERIC)
-
-                query = ExoticSubstance.query
-                if science_type != ScienceType.GENERIC:
-                    query = query.filter_by(type=science_type)
-
-                exotics = query.all()
-                if exotics:
-                    exotic = secrets.choice(exotics)
-
-                    # Add the exotic to the character's pack
-                    if not pack.exotic_substances:
-                        pack.exotic_substances = []
-                    pack.exotic_substances.append(
-                        {
-                            "id": exotic.id,
-                            "name": exotic.name,
-                            "type": exotic.type.value,
-                        }
-                    )
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id), f"Synthesized {exotic.name}"
-                    )
-
-            elif science.action == "research_sample":
-                sample_id = science.get("sample_id")
-                if sample_id:
-                    sample = db.session.get(Sample, sample_id)
-                    if sample and not sample.is_researched:
-                        sample.is_researched = True
-                        pack.character.pack.add_downtime_result(
-                            str(pack.id), f"Researched sample: {sample.name}"
-                        )
-                    elif sample.is_researched:
-                        pack.character.pack.add_downtime_result(
-                            str(pack.id), f"Sample {sample.name} already researched"
-                        )
-
-            elif science.action == "research_project":
-                project_id = science.get("project_id")
-                research_for_id = science.get("research_for_id")
-                science_type = science.get("science_type", ScienceType.GENERIC)
-
-                if project_id and research_for_id:
-                    research_for_character = Character.get_by_player_reference(research_for_id)
-
-                    # Get the target character's research
-                    target_research = CharacterResearch.query.filter_by(
-                        research_id=Research.query.filter_by(public_id=project_id).first().id,
-                        character_id=research_for_character.id,
-                    ).first()
-
-                    if target_research and not target_research.is_complete():
-                        current_stage = target_research.get_current_stage()
-                        if current_stage:
-                            # Find the first matching requirement based on science type
-                            made_progress = False
-                            for req_progress in current_stage.requirement_progress:
-                                if (
-                                    req_progress.requirement.requirement_type
-                                    == ResearchRequirementType.SCIENCE
-                                    and req_progress.requirement.science_type == science_type
-                                    and req_progress.progress < req_progress.requirement.amount
-                                ):
-                                    req_progress.progress += 1
-                                    pack.character.pack.add_downtime_result(
-                                        str(pack.id),
-                                        f"Made progress on "
-                                        f"{target_research.research.project_name}",
-                                    )
-                                    made_progress = True
-                                    break
-                            if not made_progress:
-                                pack.character.pack.add_downtime_result(
-                                    str(pack.id),
-                                    f"Failed to make progress on "
-                                    f"{target_research.research.project_name} for "
-                                    f"{target_research.character.name}",
-                                )
-                        else:
-                            pack.character.pack.add_downtime_result(
-                                str(pack.id),
-                                f"No current stage for "
-                                f"{target_research.research.project_name} for "
-                                f"{target_research.character.name}",
-                            )
-                    elif target_research.is_complete():
-                        pack.character.pack.add_downtime_result(
-                            str(pack.id),
-                            f"Research already complete for "
-                            f"{target_research.research.project_name} for "
-                            f"{target_research.character.name}",
-                        )
-                    else:
-                        pack.character.pack.add_downtime_result(
-                            str(pack.id), f"No research found for {project_id}"
-                        )
-
-            elif science.action == "teach_invention":
-                project_id = science.get("project_id")
-                teach_to_id = science.get("teach_to_id")
-
-                if project_id and teach_to_id:
-                    teach_to_character = Character.get_by_player_reference(teach_to_id)
-
-                    # Get the teaching character's research
-                    teaching_research = CharacterResearch.query.filter_by(
-                        research_id=Research.query.filter_by(public_id=project_id).first().id,
-                        character_id=pack.character.id,
-                    ).first()
-
-                    # Get the target character's research
-                    target_research = CharacterResearch.query.filter_by(
-                        research_id=Research.query.filter_by(public_id=project_id).first().id,
-                        character_id=teach_to_character.id,
-                    ).first()
-
-                    if not target_research:
-                        target_research = teaching_research.assign_character(teach_to_id)
-
-                    if teaching_research and target_research and not target_research.is_complete():
-                        target_current_stage = target_research.get_current_stage()
-                        if target_current_stage:
-                            # Check if teaching character has completed this stage
-                            teaching_stage = CharacterResearchStage.query.filter_by(
-                                character_research_id=teaching_research.id,
-                                stage_id=target_current_stage.stage_id,
-                                stage_completed=True,
-                            ).first()
-
-                            if teaching_stage:
-                                # Mark all requirements as complete
-                                for req_progress in target_current_stage.requirement_progress:
-                                    req_progress.progress = req_progress.requirement.amount
-
-                                # Mark stage as completed
-                                target_current_stage.stage_completed = True
-                                pack.character.pack.add_downtime_result(
-                                    str(pack.id),
-                                    f"Successfully taught "
-                                    f"{target_research.research.project_name} to "
-                                    f"{target_research.character.name}",
-                                )
-                            else:
-                                pack.character.pack.add_downtime_result(
-                                    str(pack.id),
-                                    f"Failed to teach "
-                                    f"{target_research.research.project_name} to "
-                                    f"{target_research.character.name} - no stages to teach",
-                                )
-                    else:
-                        pack.character.pack.add_downtime_result(
-                            str(pack.id),
-                            f"Failed to teach "
-                            f"{target_research.research.project_name} for "
-                            f"{target_research.character.name} - target has completed this project",
-                        )
-
-        for research in pack.research:
-            project_id = research.get("project_id")
-            support_target = research.get("support_target")
-            support_target_id = research.get("support_target_id")
-
-            if project_id:
-                # Get the target character's research
-                research_character = None
-                target_research = None
-                if support_target == "self":
-                    research_character = pack.character
-                    target_research = CharacterResearch.query.filter_by(
-                        research_id=Research.query.filter_by(public_id=project_id).first().id,
-                        character_id=pack.character.id,
-                    ).first()
-                elif support_target == "group" or support_target == "other":
-                    research_character = Character.get_by_player_reference(support_target_id)
-                    target_research = CharacterResearch.query.filter_by(
-                        research_id=Research.query.filter_by(public_id=project_id).first().id,
-                        character_id=research_character.id,
-                    ).first()
-
-                if target_research and not target_research.is_complete():
-                    current_stage = target_research.get_current_stage()
-                    if current_stage:
-                        # Process contributed exotics
-                        if research.get("contributed_exotics"):
-                            for exotic in research.get("contributed_exotics"):
-                                exotic_id = exotic.get("id")
-                                quantity = exotic.get("quantity", 0)
-                                if exotic_id and quantity > 0:
-                                    substance = db.session.get(ExoticSubstance, exotic_id)
-                                    # Find matching requirement
-                                    for req_progress in current_stage.requirement_progress:
-                                        if (
-                                            req_progress.requirement.requirement_type
-                                            == ResearchRequirementType.EXOTIC
-                                            and req_progress.requirement.exotic_substance_id
-                                            == substance.id
-                                            and req_progress.progress
-                                            < req_progress.requirement.amount
-                                        ):
-                                            # Add progress
-                                            req_progress.progress += quantity
-                                            # Remove from pack
-                                            for pack_exotic in pack.exotic_substances:
-                                                if pack_exotic.get("id") == exotic_id:
-                                                    pack_exotic["quantity"] -= quantity
-                                                    if pack_exotic.get("quantity", 0) <= 0:
-                                                        pack.exotic_substances.remove(pack_exotic)
-                                                    break
-                                            pack.character.pack.add_downtime_result(
-                                                str(pack.id),
-                                                f"Contributed {quantity} {substance.name} to "
-                                                f"{target_research.research.project_name} "
-                                                f"for {research_character.name}",
-                                            )
-                                            break
-
-                        # Process contributed items
-                        if research.get("contributed_items"):
-                            for item_id in research.get("contributed_items"):
-                                if item_id:
-                                    item = db.session.get(Item, item_id)
-                                    # Find matching requirement
-                                    for req_progress in current_stage.requirement_progress:
-                                        if (
-                                            req_progress.requirement.requirement_type
-                                            == ResearchRequirementType.ITEM
-                                            and req_progress.requirement.item_type
-                                            == item.blueprint.item_type.id
-                                            and req_progress.progress
-                                            < req_progress.requirement.amount
-                                        ):
-                                            # Add progress
-                                            req_progress.progress += 1
-                                            # Remove from pack
-                                            for pack_item in pack.items:
-                                                if pack_item.get("id") == item_id:
-                                                    pack.items.remove(pack_item)
-                                                    break
-                                            pack.character.pack.add_downtime_result(
-                                                str(pack.id),
-                                                f"Contributed {item.blueprint.name} to "
-                                                f"{target_research.research.project_name} "
-                                                f"for {research_character.name}",
-                                            )
-                                            break
-
-                        # Process contributed samples
-                        if research.get("contributed_samples"):
-                            for sample_id in research.get("contributed_samples"):
-                                if sample_id:
-                                    sample = db.session.get(Sample, sample_id)
-                                    # Find matching requirement
-                                    for req_progress in current_stage.requirement_progress:
-                                        if (
-                                            req_progress.requirement.requirement_type
-                                            == ResearchRequirementType.SAMPLE
-                                            and req_progress.requirement.sample_tag == sample.tag
-                                            and req_progress.progress
-                                            < req_progress.requirement.amount
-                                        ):
-                                            # Add progress
-                                            req_progress.progress += 1
-                                            # Remove from pack
-                                            for pack_sample in pack.samples:
-                                                if pack_sample.get("id") == sample_id:
-                                                    pack.samples.remove(pack_sample)
-                                                    break
-                                            pack.character.pack.add_downtime_result(
-                                                str(pack.id),
-                                                f"Contributed {sample.name} to "
-                                                f"{target_research.research.project_name} "
-                                                f"for {research_character.name}",
-                                            )
-                                            break
-
-    # Process manual entries
-    for pack in packs:
-        for manual in pack.manual_entries:
-            if manual.get("type") == "invention_theory":
-                if manual.get("review_status") == "approved":
-                    if manual.get("invention_type") == "new":
-                        # Create new research project
-                        new_research = Research(
-                            project_name=manual.get("invention_name"),
-                            description=manual.get("invention_description"),
-                            created_by=pack.character.id,
-                        )
-                        db.session.add(new_research)
-                        db.session.flush()  # Get the ID
-
-                        # Create stages and requirements
-                        stages_data = json.loads(manual.get("stages_json", "[]"))
-                        for stage_data in stages_data:
-                            stage = ResearchStage(
-                                research_id=new_research.id,
-                                stage_number=stage_data["stage_number"],
-                                name=stage_data["name"],
-                                description=stage_data["description"],
-                            )
-                            db.session.add(stage)
-                            db.session.flush()  # Get the ID
-
-                            # Create requirements
-                            for req_data in stage_data["unlock_requirements"]:
-                                requirement = ResearchStageRequirement(
-                                    stage_id=stage.id,
-                                    requirement_type=req_data["requirement_type"],
-                                    amount=req_data["amount"],
-                                )
-
-                                # Set type-specific fields
-                                if req_data["requirement_type"] == "science":
-                                    requirement.science_type = req_data["science_type"]
-                                elif req_data["requirement_type"] == "item":
-                                    requirement.item_type = req_data["item_type"]
-                                elif req_data["requirement_type"] == "exotic":
-                                    requirement.exotic_substance_id = req_data["exotic_type"]
-                                elif req_data["requirement_type"] == "sample":
-                                    requirement.sample_tag = req_data["sample_tag"]
-                                    requirement.requires_researched = req_data.get(
-                                        "requires_researched", False
-                                    )
-
-                                db.session.add(requirement)
-
-                        # Assign character to the research
-                        new_research.assign_character(pack.character.id)
-                        pack.character.pack.add_downtime_result(
-                            str(pack.id), f"New project confirmed: {new_research.project_name}"
-                        )
-
-                    elif manual.get("invention_type") == "improve":
-                        # Get the existing research project
-                        existing_research = Research.query.filter_by(
-                            id=manual.get("existing_invention")
-                        ).first()
-
-                        if existing_research:
-                            # Get character's research
-                            char_research = CharacterResearch.query.filter_by(
-                                research_id=existing_research.id,
-                                character_id=pack.character.id,
-                            ).first()
-
-                            if char_research:
-                                # Verify all previous stages are complete
-                                all_complete = True
-                                for stage in char_research.stages:
-                                    if not stage.stage_completed:
-                                        all_complete = False
-                                        break
-
-                                if all_complete:
-                                    # Create new stage
-                                    stages_data = json.loads(manual.get("stages_json", "[]"))
-                                    if stages_data:
-                                        new_stage_data = stages_data[
-                                            0
-                                        ]  # Only use first stage for improvement
-                                        new_stage = ResearchStage(
-                                            research_id=existing_research.id,
-                                            stage_number=len(existing_research.stages) + 1,
-                                            name=new_stage_data["name"],
-                                            description=new_stage_data["description"],
-                                        )
-                                        db.session.add(new_stage)
-                                        db.session.flush()
-
-                                        # Create requirements
-                                        for req_data in new_stage_data["unlock_requirements"]:
-                                            requirement = ResearchStageRequirement(
-                                                stage_id=new_stage.id,
-                                                requirement_type=req_data["requirement_type"],
-                                                amount=req_data["amount"],
-                                            )
-
-                                            # Set type-specific fields
-                                            if req_data["requirement_type"] == "science":
-                                                requirement.science_type = req_data["science_type"]
-                                            elif req_data["requirement_type"] == "item":
-                                                requirement.item_type = req_data["item_type"]
-                                            elif req_data["requirement_type"] == "exotic":
-                                                requirement.exotic_substance_id = req_data[
-                                                    "exotic_type"
-                                                ]
-                                            elif req_data["requirement_type"] == "sample":
-                                                requirement.sample_tag = req_data["sample_tag"]
-                                                requirement.requires_researched = req_data.get(
-                                                    "requires_researched", False
-                                                )
-
-                                            db.session.add(requirement)
-
-                                        # Create character's stage
-                                        char_stage = CharacterResearchStage(
-                                            character_research_id=char_research.id,
-                                            stage_id=new_stage.id,
-                                        )
-                                        db.session.add(char_stage)
-
-                                        # Set as current stage
-                                        char_research.current_stage_id = new_stage.id
-
-                                        pack.character.pack.add_downtime_result(
-                                            str(pack.id),
-                                            f"Improved {existing_research.project_name}",
-                                        )
-                elif manual.get("review_status") == "declined":
-                    # Add decline reason to character's pack
-                    pack.character.pack.add_message(
-                        "invention_declined",
-                        f"Invention '{manual.get('invention_name')}' was declined: "
-                        f"{manual.get('invention_response')}",
-                    )
-            elif manual.get("type") == "reputation_response":
-                # Add reputation response to character's pack
-                pack.character.pack.add_message(
-                    "reputation_response",
-                    f"Reputation response for {manual.get('faction_name')}: "
-                    f"{manual.get('response')}",
-                )
-
-    # Process all research stages
-    for pack in packs:
-        # Get all research for this character
-        character_research = CharacterResearch.query.filter_by(character_id=pack.character.id).all()
-
-        for research in character_research:
-            current_stage = research.get_current_stage()
-            if current_stage:
-                # If all requirements are met, mark the stage as complete
-                if current_stage.meets_requirements():
-                    current_stage.stage_completed = True
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id),
-                        f"Completed stage '{current_stage.name}' of "
-                        f"{research.research.project_name}",
-                    )
-
-                # If the stage is complete (whether just now or previously), advance to next stage
-                if current_stage.stage_completed:
-                    next_stage = research.advance_stage()
-                    if next_stage:
-                        pack.character.pack.add_downtime_result(
-                            str(pack.id),
-                            f"Advanced to stage '{next_stage.name}' in "
-                            f"{research.research.project_name}",
-                        )
-                    else:
-                        pack.character.pack.add_downtime_result(
-                            str(pack.id),
-                            f"Completed all stages of {research.research.project_name}",
-                        )
+    job = queue_downtime_job(period, current_user.id, seed=request.form.get("seed", type=int))
+    start_downtime_job(job)
+    flash(
+        f"Downtime processing started for {job.total_packs} packs. "
+        "Players will be emailed once every pack has been processed.",
+        "success",
+    )
+    return redirect(url_for("downtime.index"))
 
-    # Process all character conditions
-    for pack in packs:
-        # Get all active conditions for this character
-        active_conditions = pack.character.active_conditions
-
-        for condition in active_conditions:
-            # Progress the condition
-            result = condition.progress_condition()
-
-            if result["progressed"]:
-                # Add to downtime results using structured pack
-                pack.character.pack.add_downtime_result(str(pack.id), result["message"])
-
-                if result["completed"]:
-                    # TODO: Implement condition conclusion system
-                    # For now, we'll just log that the condition has concluded
-                    pack.character.pack.add_downtime_result(
-                        str(pack.id),
-                        f"TODO: Implement conclusion system for " f"{condition.condition.name}",
-                    )
-            else:
-                # Log any errors
-                pack.character.pack.add_downtime_result(str(pack.id), f"Error: {result['message']}")
 
-    # Add items to character's pack
-    for pack in packs:
-        # Get the character's pack as a structured object
-        character_pack = pack.character.pack
+@bp.route("/process/<int:period_id>/dry-run", methods=["POST"])
+@login_required
+@downtime_team_required
+def process_downtime_dry_run(period_id):
+    """Report what processing a downtime period would do, without committing anything."""
+    period = DowntimePeriod.query.get_or_404(period_id)
+    error = _processable_period_error(period)
+    if error:
+        return jsonify({"success": False, "error": error}), 400
 
-        if pack.items:
-            for item in pack.items:
-                character_pack.add_item(item["id"])
+    data = request.get_json(silent=True) or {}
+    seed = data.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+        return jsonify({"success": False, "error": "Seed must be an integer"}), 400
 
-        if pack.exotic_substances:
-            for exotic in pack.exotic_substances:
-                character_pack.add_exotic(exotic["id"], exotic["quantity"])
+    report = preview_downtime_period(period, current_user.id, seed=seed)
+    return jsonify({"success": True, **report})
 
-        if pack.samples:
-            for sample in pack.samples:
-                character_pack.add_sample(sample["id"])
 
-        # Update the character's pack
-        pack.character.pack = character_pack
+@bp.route("/jobs/<int:job_id>", methods=["GET"])
+@login_required
+@downtime_team_required
+def downtime_job_status(job_id):
+    """Progress of a downtime processing job."""
+    job = DowntimeJob.query.get_or_404(job_id)
+    return jsonify(job.to_dict())
 
-        send_downtime_completed_notification(pack.character.user, pack, pack.character)
 
-    period.status = DowntimeStatus.COMPLETED
+@bp.route("/jobs/<int:job_id>/resume", methods=["POST"])
+@login_required
+@downtime_team_required
+def resume_downtime_job_route(job_id):
+    """Resume a failed or stalled downtime processing job from its last checkpoint."""
+    job = DowntimeJob.query.get_or_404(job_id)
+    if not resume_downtime_job(job):
+        flash("This downtime job cannot be resumed.", "error")
+        return redirect(url_for("downtime.index"))
 
-    db.session.commit()
-    flash("Downtime period processed successfully.", "success")
+    start_downtime_job(job)
+    flash(
+        f"Downtime processing resumed with {job.total_packs - job.processed_count} packs left.",
+        "success",
+    )
     return redirect(url_for("downtime.index"))
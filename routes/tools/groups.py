@@ -3,10 +3,23 @@ from flask_login import current_user, login_required
 
 from models.database.group_type import GroupType
 from models.database.sample import Sample
-from models.enums import CharacterAuditAction, CharacterStatus, GroupAuditAction, Role
+from models.enums import (
+    AuditLogOwnerType,
+    CharacterAuditAction,
+    CharacterStatus,
+    GroupAuditAction,
+    Role,
+)
 from models.extensions import db
 from models.tools.character import Character, CharacterAuditLog
 from models.tools.group import Group, GroupAuditLog, GroupInvite
+from utils.audit_log import (
+    archived_page,
+    audit_log_page,
+    delete_archives,
+    has_archive,
+    parse_actions,
+)
 from utils.decorators import (
     email_verified_required,
     has_active_character_required,
@@ -388,6 +401,7 @@ def disband_group_post(group_id):
 
     # Delete all audit logs for this group
     GroupAuditLog.query.filter_by(group_id=group_id).delete()
+    delete_archives(AuditLogOwnerType.GROUP, group_id)
 
     # Delete the group
     db.session.delete(group)
@@ -653,15 +667,20 @@ def group_audit_log(group_id):
     if not user_has_access:
         abort(403)
 
-    audit_logs = (
-        GroupAuditLog.query.filter_by(group_id=group_id)
-        .order_by(GroupAuditLog.timestamp.desc())
-        .all()
+    owner_type = AuditLogOwnerType.GROUP
+    actions = parse_actions(owner_type, request.args.getlist("action"))
+    archived = request.args.get("archived") == "1"
+    page = (archived_page if archived else audit_log_page)(
+        owner_type, group_id, actions, before=request.args.get("before", type=int)
     )
 
     return render_template(
         "groups/audit_log.html",
         group=group,
-        audit_logs=audit_logs,
+        audit_logs=page["entries"],
+        next_cursor=page["next_cursor"],
+        selected_actions=[action.value for action in actions],
+        archived=archived,
+        has_archive=has_archive(owner_type, group_id),
         GroupAuditAction=GroupAuditAction,
     )
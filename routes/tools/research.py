@@ -2,6 +2,7 @@ import json
 
 from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
+from sqlalchemy.orm import joinedload
 
 from models.database.exotic_substances import ExoticSubstance
 from models.database.item import Item
@@ -20,9 +21,12 @@ from models.tools.research import (
     ResearchStageRequirement,
 )
 from utils.decorators import rules_team_required
+from utils.research_progress import overview_query, progress_overview
 
 research_bp = Blueprint("research", __name__)
 
+ASSIGNMENTS_PER_PAGE = 50
+
 
 def research_to_dict(project):
     """Convert a Research project to a dictionary format for API responses"""
@@ -38,7 +42,7 @@ def research_to_dict(project):
                 "current_stage_id": cr.current_stage_id,
                 "character_research_id": cr.id,
             }
-            for cr in project.character_research
+            for cr in project.character_research.options(joinedload(CharacterResearch.character))
         ],
     }
 
@@ -64,6 +68,30 @@ def research_list():
     return render_template("research/list.html", researches=researches)
 
 
+@research_bp.route("/overview")
+@login_required
+@rules_team_required
+def research_overview():
+    """Progress of every character on every research project."""
+    science_type = request.args.get("science_type")
+    if science_type not in ScienceType.values():
+        science_type = None
+
+    assignments = db.paginate(
+        overview_query(science_type),
+        page=request.args.get("page", 1, type=int),
+        per_page=ASSIGNMENTS_PER_PAGE,
+        error_out=False,
+    )
+    return render_template(
+        "research/overview.html",
+        assignments=assignments,
+        progress=progress_overview(assignments.items),
+        selected_science_type=science_type,
+        ScienceType=ScienceType,
+    )
+
+
 @research_bp.route("/create", methods=["GET"])
 @login_required
 @rules_team_required
@@ -569,8 +597,21 @@ def edit_progress(research_id, character_id):
     # Get the current stage progress
     current_stage = character_research.get_current_stage()
 
-    item_types = {str(item.id): item.name for item in ItemType.query.all()}
-    exotics = {substance.id: substance.name for substance in ExoticSubstance.query.all()}
+    # Only look up the names the current stage's requirements refer to
+    requirements = (
+        [req_progress.requirement for req_progress in current_stage.requirement_progress]
+        if current_stage
+        else []
+    )
+    item_type_ids = {int(req.item_type) for req in requirements if str(req.item_type).isdigit()}
+    exotic_ids = {req.exotic_substance_id for req in requirements if req.exotic_substance_id}
+    item_types = {
+        str(item.id): item.name for item in ItemType.query.filter(ItemType.id.in_(item_type_ids))
+    }
+    exotics = {
+        substance.id: substance.name
+        for substance in ExoticSubstance.query.filter(ExoticSubstance.id.in_(exotic_ids))
+    }
     return render_template(
         "research/edit_progress.html",
         research=character_research.research,
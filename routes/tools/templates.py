@@ -12,7 +12,7 @@ from models.enums import PrintTemplateType
 from models.extensions import db
 from models.tools.character import Character
 from models.tools.event_ticket import EventTicket
-from models.tools.print_template import PrintTemplate
+from models.tools.print_template import PrintTemplate, clear_render_cache
 from models.tools.samples.character import get_sample_character
 from models.tools.samples.condition import get_sample_condition
 from models.tools.samples.exotic import get_sample_exotic_substance
@@ -20,6 +20,7 @@ from models.tools.samples.item import get_sample_item
 from models.tools.samples.medicament import get_sample_medicament
 from utils import generate_qr_code, generate_web_qr_code
 from utils.decorators import admin_required
+from utils.pdf_cache import get_pdf_cache
 from utils.print_layout import PrintLayout
 
 templates_bp = Blueprint("templates", __name__)
@@ -72,6 +73,7 @@ def template_edit_post(template_id):
     template.css_styles = request.form.get("css_styles", "")
     template.updated_at = datetime.now()
     db.session.commit()
+    clear_render_cache(template.id)
     flash("Template updated successfully.", "success")
     return redirect(url_for("templates.template_list"))
 
@@ -145,7 +147,7 @@ def print_item_sheet(type, id):
         flash("Access denied. Admin role required.", "error")
         return jsonify({"error": "Access denied"}), 403
 
-    layout_manager = PrintLayout()
+    layout_manager = PrintLayout(pdf_cache=get_pdf_cache())
     try:
         if type == "characters":
             # Get character and generate PDF
@@ -559,8 +561,10 @@ def template_layout(template_id):
         template.margin_right_mm = data.get("margin_right_mm", 10.0)
         template.gap_horizontal_mm = data.get("gap_horizontal_mm", 2.0)
         template.gap_vertical_mm = data.get("gap_vertical_mm", 2.0)
+        template.updated_at = datetime.now()
 
         db.session.commit()
+        clear_render_cache(template.id)
         return jsonify({"success": True})
 
     return render_template(
@@ -568,12 +572,23 @@ def template_layout(template_id):
     )
 
 
+@templates_bp.route("/print/cache-stats")
+@login_required
+@admin_required
+def print_cache_stats():
+    """Report hit rate and disk usage of the rendered PDF cache."""
+    cache = get_pdf_cache()
+    if cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **cache.stats()})
+
+
 @templates_bp.route("/print/exotics-sheet", methods=["POST"])
 @login_required
 @admin_required
 def print_exotics_sheet():
     """Generate PDF for exotic substances."""
-    layout_manager = PrintLayout()
+    layout_manager = PrintLayout(pdf_cache=get_pdf_cache())
     try:
         # Get exotic substance IDs from request
         data = request.get_json()
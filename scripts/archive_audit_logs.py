@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Script to move old character and group audit log entries into the compressed archive.
+
+Entries from before the last N events are archived. They stay viewable from each
+character's and group's audit log page.
+"""
+
+import argparse
+import os
+import sys
+
+# Add the project root to the Python path BEFORE any other imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# flake8: noqa: E402
+from app import create_app
+from utils.audit_log import archive_audit_logs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive audit log entries older than N events")
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=5,
+        help="Number of most recent events whose audit history stays in the live logs",
+    )
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        try:
+            summary = archive_audit_logs(args.events)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        if summary["cutoff"] is None:
+            print(f"Fewer than {args.events} events have started, nothing to archive")
+            return
+
+        print(f"Archiving entries from before {summary['cutoff']:%Y-%m-%d}")
+        print(f"Character entries archived: {summary['character_entries']}")
+        print(f"Group entries archived: {summary['group_entries']}")
+        print(f"Archived {summary['total_entries']} entries in {summary['total_archives']} batches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Script to store the derived stats of characters created before the character_stats table.
+
+Run once after upgrading past the add_character_stats_table migration. Characters without a
+stored row still work, but have their stats recomputed on every read until this is run.
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path BEFORE any other imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# flake8: noqa: E402
+from app import create_app
+from models.extensions import db
+from models.tools.character_stats import backfill_character_stats
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        stored = backfill_character_stats(db.session)
+        print(f"Stored stats for {stored} characters")
+
+
+if __name__ == "__main__":
+    main()
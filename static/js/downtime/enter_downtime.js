@@ -25,19 +25,69 @@ function getNumeric(val) {
     return Number(val) || 0;
 }
 
-// Helper function to get JSON data from hidden inputs
-function getJsonData(elementId) {
-    const element = document.getElementById(elementId);
-    if (!element) {
-        console.error(`Element with id ${elementId} not found`);
-        return null;
+// Each step fetches its own data the first time it is shown. Step scripts register a
+// loader here that fills in the step once its data and any catalogs it uses arrive.
+const stepLoaders = {};
+const stepRequests = {};
+const loadedSteps = {};
+const catalogRequests = {};
+
+function loadCatalog(name) {
+    if (!catalogRequests[name]) {
+        const url = $('#downtime-form').data('catalog-url').replace('__name__', name);
+        catalogRequests[name] = $.getJSON(url);
+    }
+    return catalogRequests[name];
+}
+
+function loadStep(step) {
+    if (!stepRequests[step]) {
+        const url = $('#downtime-form').data('step-url').replace('__step__', step);
+        stepRequests[step] = $.getJSON(url).then(function(data) {
+            const catalogs = {};
+            return $.when(...data.catalogs.map(function(name) {
+                return loadCatalog(name).then(function(catalog) {
+                    catalogs[name] = catalog;
+                });
+            })).then(function() {
+                if (stepLoaders[step]) {
+                    stepLoaders[step](data, catalogs);
+                }
+                loadedSteps[step] = true;
+                return data;
+            });
+        });
+    }
+    return stepRequests[step];
+}
+
+// Fill a select with options and select the value saved with the pack, if any
+function fillSelect($select, options) {
+    $select.find('option').not('[value=""], [data-purchased], [data-saved]').remove();
+    options.forEach(function(option) {
+        $select.append($('<option>').val(option.value).text(option.text));
+    });
+    const selected = $select.data('selected');
+    if (selected !== undefined && selected !== '') {
+        $select.val(String(selected));
     }
-    try {
-        return JSON.parse(element.value);
-    } catch (e) {
-        console.error(`Error parsing JSON from ${elementId}:`, e);
-        return null;
+    $select.trigger('change.select2');
+}
+
+// A step that was never opened keeps the entries already saved with the pack
+function keepSavedEntries(attribute, name) {
+    const $form = $('#downtime-form');
+    let saved = $form.data(attribute) || [];
+    if (typeof saved === 'string') {
+        try {
+            saved = JSON.parse(saved || '[]');
+        } catch (e) {
+            saved = [];
+        }
     }
+    saved.forEach(function(entry) {
+        $('<input>').attr({type: 'hidden', name: name, value: JSON.stringify(entry)}).appendTo($form);
+    });
 }
 
 function validate() {
@@ -1,4 +1,4 @@
- $('.eng-item-own-select, .eng-item-group-select').select2({
+$('.eng-item-own-select, .eng-item-group-select').select2({
     width: '100%',
     placeholder: 'Select an item',
     allowClear: true,
@@ -11,6 +11,28 @@ $('.eng-mod-select').select2({
     theme: 'bootstrap4'
 });
 
+function itemOptions(items) {
+    return items.map(item => ({value: item.id, text: `${item.name} (${item.full_code})`}));
+}
+
+stepLoaders['engineering'] = function(data, catalogs) {
+    $('.eng-item-own-select').each(function() {
+        fillSelect($(this), itemOptions(data.pack_items));
+    });
+    $('.eng-item-group-select').each(function() {
+        fillSelect($(this), itemOptions(data.group_items));
+    });
+    $('.eng-mod-select').each(function() {
+        fillSelect($(this), catalogs.mods.map(mod => ({value: mod.id, text: mod.name})));
+    });
+    syncPurchasedBlueprintsToPack();
+
+    // Show the maintain/modify fields and costs for the saved actions
+    $('.eng-action-select').each(function() {
+        $(this).trigger('change');
+    });
+};
+
 // Show/hide maintain/modify rows based on action
 $('.eng-action-select').on('change', function() {
     var slot = $(this).data('slot');
@@ -252,6 +274,11 @@ function afterEngCostUpdate() {
 $('#downtime-form').on('submit', function() {
     // Remove previous engineering[] hidden inputs
     $('input[name="engineering[]"]').remove();
+    if (!loadedSteps['engineering']) {
+        keepSavedEntries('pack-engineering', 'engineering[]');
+        $('.eng-slot-card').find('select, input').prop('disabled', true);
+        return;
+    }
 
     // For each engineering slot
     $('.eng-slot-card').each(function(slot) {
@@ -298,9 +325,3 @@ $('#downtime-form').on('submit', function() {
     });
 });
 
-$(document).ready(function() {
-    // Ensure correct show/hide of maintain/modify fields on load
-    $('.eng-action-select').each(function() {
-        $(this).trigger('change');
-    });
-});
@@ -1,14 +1,58 @@
-$(document).ready(function() {
+// Known modifications can be forgotten, and each free slot can learn a new one
+stepLoaders['modifications'] = function(data, catalogs) {
+    let saved = $('#downtime-form').data('pack-modifications') || [];
+    if (typeof saved === 'string') {
+        saved = JSON.parse(saved || '[]');
+    }
+    const knownIds = data.known_mod_ids.map(String);
+    const forgetting = saved.filter(m => m.type === 'forgetting').map(m => String(m.mod_id));
+    const learning = saved.filter(m => m.type === 'learning');
+    const $list = $('#modifications-list').empty();
+
+    catalogs.mods.filter(mod => knownIds.includes(String(mod.id))).forEach(function(mod) {
+        const $row = $(`
+            <li class="form-group d-flex align-items-center">
+                <input type="text" class="form-control" disabled>
+                <div class="mod-forget-group">
+                    <input type="checkbox" class="form-check-input" id="forget_mod_${mod.id}" name="forget_mods[]" value="${mod.id}">
+                    <label class="form-check-label" for="forget_mod_${mod.id}">Forget</label>
+                </div>
+            </li>`);
+        $row.find('input[type="text"]').val(mod.name);
+        $row.find('input[type="checkbox"]').prop('checked', forgetting.includes(String(mod.id)));
+        $list.append($row);
+    });
+
+    for (let i = 0; i < data.learning_slots; i++) {
+        const $select = $('<select class="form-control select2 mod-select" name="mod_learning[]"><option value="">Select a modification</option></select>');
+        catalogs.mods.forEach(function(mod) {
+            $('<option>').val(mod.id).text(mod.name)
+                .prop('disabled', knownIds.includes(String(mod.id)))
+                .appendTo($select);
+        });
+        if (learning.length > i) {
+            $select.val(String(learning[i].mod_id));
+        }
+        $('<li class="form-group">').append($select).appendTo($list);
+    }
+
     // Initialize Select2 for all modification selects
-    $('.mod-select').select2({
+    $list.find('.mod-select').select2({
         width: '100%',
         placeholder: 'Select a modification',
         allowClear: true,
         theme: 'bootstrap4'
     });
+};
 
+$(document).ready(function() {
     // On form submit, ensure all .mod-select values are included
     $('#downtime-form').on('submit', function(e) {
+        if (!loadedSteps['modifications']) {
+            keepSavedEntries('pack-modifications', 'modifications[]');
+            return;
+        }
+
         // Remove any previous modifications[] hidden inputs
         $('input[name="modifications[]"]').remove();
 
@@ -1,5 +1,5 @@
 let purchaseRows = [];
-const blueprints = JSON.parse($('#blueprints-data').val());
+let blueprints = [];
 
 // Load existing purchases from the pack data
 function loadExistingPurchases() {
@@ -31,14 +31,21 @@ $('#purchase-blueprints-list').on('click', '.remove-blueprint-row', function() {
     dirtyStep('purchase');
 });
 
-// Initialize with one row if the list exists
-if ($('#purchase-blueprints-list').length) {
+// Initialize with one row once the blueprint catalog has loaded
+stepLoaders['purchase'] = function(data, catalogs) {
+    blueprints = catalogs.blueprints;
     loadExistingPurchases();
     if (purchaseRows.length === 0) {
         purchaseRows = [{blueprint_id: ''}];
     }
     renderPurchaseRows();
-}
+};
+
+$('#downtime-form').on('submit', function() {
+    if (!loadedSteps['purchase']) {
+        keepSavedEntries('pack-purchases', 'purchases[]');
+    }
+});
 
 function renderPurchaseRows() {
     const $list = $('#purchase-blueprints-list');
@@ -1,5 +1,10 @@
 // Reputation Step JS
-$(document).ready(function() {
+stepLoaders['reputation'] = function(data) {
+    const $select = $('#reputation-faction-select');
+    data.factions.forEach(function(faction) {
+        $('<option>').val(faction.id).text(faction.name).appendTo($select);
+    });
+
     // --- Reputation Step: Load saved data ---
     let packReputation = $('#downtime-form').data('pack-reputation');
     if (typeof packReputation === 'string') {
@@ -23,12 +28,16 @@ $(document).ready(function() {
             }
         }
     }
-});
+};
 
 // Save reputation step on form submit
 $('#downtime-form').on('submit', function() {
     // Remove any previous reputation hidden inputs
     $('input[name="reputation"], input[name="reputation[]"]').remove();
+    if (!loadedSteps['reputation']) {
+        keepSavedEntries('pack-reputation', 'reputation[]');
+        return;
+    }
     const factionId = $('#reputation-faction-select').val();
     const question = $('#reputation-question').val();
     if (factionId && question) {
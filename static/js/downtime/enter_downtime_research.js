@@ -1,22 +1,24 @@
 let researchCardCount = 0;
 
-// Parse project data from hidden fields
+// Filled in from the research step's data when it is first shown
 let myProjects = [];
 let groupProjects = [];
-try {
-    myProjects = JSON.parse($('#my-projects-data').val() || '[]');
-    groupProjects = JSON.parse($('#group-projects-data').val() || '[]');
-} catch (e) {
-    console.error('Failed to parse project data:', e);
-}
+let groupMembers = [];
+let packItems = [];
+let availableSamples = [];
+let packExotics = [];
 
 let currentCharacterId = $('#current-character-id').val();
 
-const packItems = getJsonData('pack-items-json');
-const availableSamples = getJsonData('available-samples-json');
-const packExotics = getJsonData('pack-exotics-json');
-
-initResearchCards();
+stepLoaders['research'] = function(data) {
+    myProjects = data.my_projects;
+    groupProjects = data.group_projects;
+    groupMembers = data.group_members;
+    packItems = data.pack_items;
+    availableSamples = data.samples;
+    packExotics = data.exotics;
+    initResearchCards();
+};
 
 function initResearchCards() {
     let packResearch = $('#downtime-form').data('pack-research');
@@ -127,7 +129,7 @@ function addResearchProjectCard() {
     const cardId = 'research-card-' + researchCardCount;
     const myProjectOptions = getProjectOptions(myProjects || []);
     const groupProjectOptions = getProjectOptions(groupProjects || []);
-    const groupMemberOptions = getGroupMemberOptions(window.GROUP_MEMBERS || []);
+    const groupMemberOptions = getGroupMemberOptions(groupMembers);
     const cardHtml = `
     <div class="card mb-3 research-assist-card" id="${cardId}">
         <div class="card-body">
@@ -491,6 +493,10 @@ function collectResearchData() {
 $('#downtime-form').on('submit', function() {
     // Remove any previous research hidden inputs
     $('input[name="research"], input[name="research[]"]').remove();
+    if (!loadedSteps['research']) {
+        keepSavedEntries('pack-research', 'research[]');
+        return;
+    }
     const researchData = collectResearchData();
     $('<input>').attr({
         type: 'hidden',
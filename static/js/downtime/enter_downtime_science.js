@@ -21,6 +21,34 @@ $('.science-teach-to-group-select').select2({
     theme: 'bootstrap4'
 });
 
+stepLoaders['science'] = function(data) {
+    const projectOptions = data.my_projects.map(p => ({value: p.research_id, text: p.project_name}));
+    const memberOptions = data.group_members.map(m => ({value: m.id, text: m.name}));
+    $('select.science-sample-select').each(function() {
+        fillSelect($(this), data.samples.map(sample => ({value: sample.id, text: sample.name})));
+    });
+    $('select.science-project-select[data-project-source="my"]').each(function() {
+        fillSelect($(this), projectOptions);
+    });
+    $('select.science-project-select[data-project-source="group"]').each(function() {
+        fillSelect($(this), data.group_projects.map(p => ({
+            value: p.research_id,
+            text: `${p.project_name} (${p.character_name})`
+        })));
+    });
+    $('select.science-teach-project-select').each(function() {
+        fillSelect($(this), projectOptions);
+    });
+    $('select.science-research-for-group-select, select.science-teach-to-group-select').each(function() {
+        fillSelect($(this), memberOptions);
+    });
+    if (!data.group_members.length) {
+        $('.btn-toggle-project-source .btn[data-project-source="group"]').hide();
+        $('.btn-toggle-research-for .btn[data-research-for="group"]').hide();
+    }
+    initScienceSlots();
+};
+
 function initScienceSlots() {
     $('.science-action-select').each(function() {
         toggleScienceFields($(this));
@@ -448,6 +476,11 @@ function validateScienceStep() {
 $('#downtime-form').on('submit', function() {
     // Remove previous science[] hidden inputs
     $('input[name="science[]"]').remove();
+    if (!loadedSteps['science']) {
+        keepSavedEntries('pack-science', 'science[]');
+        $('.science-slot-card').find('select, input, textarea').prop('disabled', true);
+        return;
+    }
 
     // For each science slot
     $('.science-slot-card').each(function(slot) {
@@ -45,6 +45,7 @@ function showStep(stepIndex) {
     $('#downtime-steps-list .nav-link').removeClass('active');
     $('#downtime-steps-list .nav-link[data-step="' + steps[stepIndex] + '"]').addClass('active');
     currentStep = stepIndex;
+    loadStep(steps[stepIndex]);
     if (!visitedSteps[steps[stepIndex]]) {
         visitedSteps[steps[stepIndex]] = true;
     }
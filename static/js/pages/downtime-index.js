@@ -1,18 +1,10 @@
 document.addEventListener('DOMContentLoaded', function() {
     const statusFilter = document.getElementById('status-filter');
-    const statusRows = document.querySelectorAll('.status-row');
 
     if (statusFilter) {
+        // Switching status keeps the search and goes back to the first page
         statusFilter.addEventListener('change', function() {
-            const selectedStatus = this.value;
-
-            statusRows.forEach(row => {
-                if (row.dataset.status === selectedStatus) {
-                    row.style.display = '';
-                } else {
-                    row.style.display = 'none';
-                }
-            });
+            this.form.submit();
         });
     }
 });
@@ -48,3 +40,33 @@ $(document).ready(function() {
         select.trigger('change');
     });
 });
+
+document.addEventListener('DOMContentLoaded', function() {
+    const jobPanel = document.getElementById('downtime-job');
+    if (!jobPanel || !['pending', 'running'].includes(jobPanel.dataset.status)) {
+        return;
+    }
+
+    const progressBar = document.getElementById('downtime-job-progress');
+    const count = document.getElementById('downtime-job-count');
+
+    // Poll the job until it finishes, then reload to show the results or the resume button
+    const poll = function() {
+        fetch(jobPanel.dataset.statusUrl)
+            .then(response => response.json())
+            .then(job => {
+                progressBar.style.width = `${job.progress_percent}%`;
+                progressBar.setAttribute('aria-valuenow', job.progress_percent);
+                progressBar.textContent = `${job.progress_percent}%`;
+                count.textContent = `${job.processed_packs} of ${job.total_packs}`;
+
+                if (job.status === 'completed' || job.status === 'failed' || job.can_resume) {
+                    window.location.reload();
+                } else {
+                    setTimeout(poll, 3000);
+                }
+            })
+            .catch(() => setTimeout(poll, 3000));
+    };
+    setTimeout(poll, 3000);
+});
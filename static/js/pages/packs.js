@@ -3,7 +3,12 @@
 document.addEventListener('DOMContentLoaded', function() {
     let currentCharacterId = null;
     let currentGroupId = null;
+    let currentCompletion = {};
+    let currentPackVersion = null;
+    let currentOwner = null;
     let currentEventId = document.getElementById('event-id-data').getAttribute('data-event-id');
+    let changesCursor = parseInt(document.getElementById('event-id-data').getAttribute('data-changes-cursor') || '0', 10);
+    const CHANGES_POLL_INTERVAL = 5000;
 
     // Load lookup data from data attributes
     const lookupDataElement = document.getElementById('lookup-data');
@@ -21,6 +26,12 @@ document.addEventListener('DOMContentLoaded', function() {
         bootstrap.Modal.getInstance(document.getElementById('printModal')).hide();
     };
 
+    window.printChangedCharacterSheets = function() {
+        const url = `/events/${currentEventId}/packs/print/character-sheets?changed_only=true`;
+        window.open(url, '_blank');
+        bootstrap.Modal.getInstance(document.getElementById('printModal')).hide();
+    };
+
     window.printCharacterIdBadges = function() {
         const url = `/events/${currentEventId}/packs/print/character-id-badges`;
         window.open(url, '_blank');
@@ -41,6 +52,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
     window.viewCharacterPack = function(button) {
         currentCharacterId = button.getAttribute('data-character-id');
+        currentOwner = `character-${currentCharacterId}`;
         const packDataElement = document.getElementById(`pack-data-${currentCharacterId}`);
         if (!packDataElement) return;
         const packData = packDataElement.getAttribute('data-pack');
@@ -51,6 +63,8 @@ document.addEventListener('DOMContentLoaded', function() {
         if (!packData) return;
         let packDataObj;
         try { packDataObj = JSON.parse(packData); } catch (e) { return; }
+        currentCompletion = packDataObj.completion || {};
+        currentPackVersion = packDataElement.getAttribute('data-pack-version');
         // Update modal title
         const modalTitle = document.querySelector('#characterPackModal .modal-title');
         modalTitle.textContent = `${userName}, ${characterName}, ${userId}.${characterId}`;
@@ -175,6 +189,7 @@ document.addEventListener('DOMContentLoaded', function() {
     window.viewGroupPack = function(button) {
         const groupId = button.getAttribute('data-group-id');
         currentGroupId = groupId;
+        currentOwner = `group-${groupId}`;
         const packDataElement = document.getElementById(`group-pack-data-${groupId}`);
         if (!packDataElement) return;
         const packData = packDataElement.getAttribute('data-pack');
@@ -182,6 +197,8 @@ document.addEventListener('DOMContentLoaded', function() {
         if (!packData || !charactersData) return;
         let packDataObj, characters;
         try { packDataObj = JSON.parse(packData); characters = JSON.parse(charactersData); } catch (e) { return; }
+        currentCompletion = packDataObj.completion || {};
+        currentPackVersion = packDataElement.getAttribute('data-pack-version');
         let content = '<div class="mb-3">' +
             '<h6>Group Members Attending</h6>' +
             '<ul class="list-group">';
@@ -287,6 +304,52 @@ document.addEventListener('DOMContentLoaded', function() {
         new bootstrap.Modal(document.getElementById('groupPackModal')).show();
     };
 
+    window.generateAllGroupPacks = function() {
+        if (!confirm('Generate pack contents for every group attending this event?')) return;
+        fetch(`/events/${currentEventId}/packs/groups/generate`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({})
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                alert(`Generated ${data.total_groups} group packs for ${data.total_characters} characters ` +
+                      `(${data.total_items_added} items, ${data.total_energy_chits} EC). Seed: ${data.seed}`);
+                location.reload();
+            } else {
+                alert(data.error || 'Failed to generate group packs');
+            }
+        })
+        .catch(error => {
+            alert('Failed to generate group packs');
+        });
+    };
+
+    window.progressConditions = function() {
+        if (!confirm('Progress the conditions of every character attending this event by one event?')) return;
+        fetch(`/events/${currentEventId}/conditions/progress`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                alert(`Progressed ${data.total_conditions} conditions for ${data.total_characters} characters ` +
+                      `(${data.total_completed} concluded, ${data.total_errors} errors)`);
+            } else {
+                alert(data.error || 'Failed to progress conditions');
+            }
+        })
+        .catch(error => {
+            alert('Failed to progress conditions');
+        });
+    };
+
     window.generateGroupPack = function() {
         fetch(`/events/${currentEventId}/packs/group/${currentGroupId}/generate`, {
             method: 'POST',
@@ -297,11 +360,7 @@ document.addEventListener('DOMContentLoaded', function() {
         .then(response => response.json())
         .then(data => {
             if (data.success) {
-                const button = document.querySelector(`[data-group-id="${currentGroupId}"]`);
-                if (button) {
-                    button.setAttribute('data-pack-data', JSON.stringify(data.pack));
-                    viewGroupPack(button);
-                }
+                applyPackChange('group', currentGroupId, data.pack, data.is_completed, data.version, true);
             }
         })
         .catch(error => {
@@ -309,6 +368,114 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     };
 
+    // Apply a completion delta from this or another desk to the page without reloading.
+    // Replaced changes carry pack fields (contents and completion) that overwrite the pack's.
+    function applyPackChange(ownerType, ownerId, changes, isCompleted, version, replaced) {
+        const owner = `${ownerType}-${ownerId}`;
+        const elementId = ownerType === 'character' ? `pack-data-${ownerId}` : `group-pack-data-${ownerId}`;
+        const packDataElement = document.getElementById(elementId);
+        if (!packDataElement) return;
+        const knownVersion = parseInt(packDataElement.getAttribute('data-pack-version') || '0', 10);
+        if (version <= knownVersion) return;
+
+        let packDataObj;
+        try { packDataObj = JSON.parse(packDataElement.getAttribute('data-pack')); } catch (e) { return; }
+        if (replaced) {
+            Object.assign(packDataObj, changes);
+        } else {
+            packDataObj.completion = Object.assign(packDataObj.completion || {}, changes);
+        }
+        packDataElement.setAttribute('data-pack', JSON.stringify(packDataObj));
+        packDataElement.setAttribute('data-pack-version', version);
+
+        const statusCell = document.querySelector(`[data-pack-status="${owner}"]`);
+        if (statusCell) {
+            statusCell.innerHTML = isCompleted
+                ? '<i class="fas fa-check text-success"></i>'
+                : '<i class="fas fa-times text-danger"></i>';
+        }
+
+        // Redraw an open modal for a replaced pack, whose contents may have changed
+        if (replaced) {
+            const button = document.querySelector(`button[data-${ownerType}-id="${ownerId}"]`);
+            if (currentOwner === owner && button) {
+                (ownerType === 'character' ? window.viewCharacterPack : window.viewGroupPack)(button);
+            }
+            return;
+        }
+
+        // Update an open modal for the same pack, keeping any ticks not yet saved here
+        if (currentOwner === owner) {
+            const container = document.getElementById(ownerType === 'character' ? 'characterPackContent' : 'groupPackContent');
+            Object.keys(changes).forEach(function(key) {
+                const checkbox = container.querySelector(`input[id="${key}"]`);
+                if (checkbox && checkbox.checked === !!currentCompletion[key]) {
+                    checkbox.checked = changes[key];
+                }
+                currentCompletion[key] = changes[key];
+            });
+            currentPackVersion = version;
+        }
+    }
+
+    function pollPackChanges() {
+        if (document.hidden) {
+            setTimeout(pollPackChanges, CHANGES_POLL_INTERVAL);
+            return;
+        }
+        fetch(`/events/${currentEventId}/packs/changes?since=${changesCursor}`)
+        .then(response => response.json())
+        .then(data => {
+            data.changes.forEach(function(change) {
+                applyPackChange(change.owner_type, change.owner_id, change.changes, change.is_completed, change.version, change.replaced);
+            });
+            changesCursor = data.cursor;
+            setTimeout(pollPackChanges, data.has_more ? 0 : CHANGES_POLL_INTERVAL);
+        })
+        .catch(error => {
+            setTimeout(pollPackChanges, CHANGES_POLL_INTERVAL);
+        });
+    }
+    setTimeout(pollPackChanges, CHANGES_POLL_INTERVAL);
+
+    // Send only the ticks that changed since the modal was opened, against the pack version
+    // they were based on. If another desk saved the pack in the meantime, take its state and
+    // send the same ticks again on top of it; only a second conflict is reported.
+    function patchCompletion(ownerType, ownerId, url, completion, retried) {
+        const changes = {};
+        Object.keys(completion).forEach(function(key) {
+            if (completion[key] !== !!currentCompletion[key]) {
+                changes[key] = completion[key];
+            }
+        });
+        if (Object.keys(changes).length === 0) {
+            return Promise.resolve({ success: true });
+        }
+        return fetch(url, {
+            method: 'PATCH',
+            headers: {
+                'Content-Type': 'application/json',
+                'If-Match': `"${currentPackVersion}"`
+            },
+            body: JSON.stringify({ changes })
+        })
+        .then(response => {
+            if (response.status !== 412) {
+                return response.json();
+            }
+            return response.json().then(data => {
+                if (retried) {
+                    alert('This pack keeps being updated at another desk. Please try saving again.');
+                    return { success: false, conflict: true };
+                }
+                applyPackChange(ownerType, ownerId, data.completion, data.is_completed, data.version);
+                currentPackVersion = data.version;
+                // Re-send only the ticks made here; ones the other desk already made drop out
+                return patchCompletion(ownerType, ownerId, url, changes, true);
+            });
+        });
+    }
+
     window.saveCharacterPack = function() {
         const completion = {};
         completion.energy_chits = document.getElementById('energy_chits')?.checked || false;
@@ -326,18 +493,14 @@ document.addEventListener('DOMContentLoaded', function() {
         document.querySelectorAll('input[id^="medicament_"]').forEach(function(checkbox) {
             completion[checkbox.id] = checkbox.checked;
         });
-        fetch(`/events/${currentEventId}/packs/character/${currentCharacterId}/update`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ completion })
-        })
-        .then(response => response.json())
+        patchCompletion('character', currentCharacterId, `/events/${currentEventId}/packs/character/${currentCharacterId}/completion/batch`, completion)
         .then(data => {
             if (data.success) {
-                location.reload();
-            } else {
+                if (data.version !== undefined) {
+                    applyPackChange('character', currentCharacterId, data.completion, data.is_completed, data.version);
+                }
+                bootstrap.Modal.getInstance(document.getElementById('characterPackModal')).hide();
+            } else if (!data.conflict) {
                 alert('Failed to save pack progress');
             }
         })
@@ -361,18 +524,13 @@ document.addEventListener('DOMContentLoaded', function() {
         document.querySelectorAll('#groupPackContent input[id^="medicament_"]').forEach(function(checkbox) {
             completion[checkbox.id] = checkbox.checked;
         });
-        fetch(`/events/${currentEventId}/packs/group/${currentGroupId}/update`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ completion: completion })
-        })
-        .then(response => response.json())
+        patchCompletion('group', currentGroupId, `/events/${currentEventId}/packs/group/${currentGroupId}/completion/batch`, completion)
         .then(data => {
             if (data.success) {
+                if (data.version !== undefined) {
+                    applyPackChange('group', currentGroupId, data.completion, data.is_completed, data.version);
+                }
                 bootstrap.Modal.getInstance(document.getElementById('groupPackModal')).hide();
-                location.reload();
             }
         })
         .catch(error => {
@@ -0,0 +1,15 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Filter as soon as a science type is picked
+    var filter = document.getElementById('science-type-filter');
+    if (filter) {
+        filter.addEventListener('change', function() {
+            filter.form.submit();
+        });
+    }
+
+    // Initialize progress bars
+    document.querySelectorAll('.progress-bar').forEach(function(bar) {
+        var percent = parseInt(bar.getAttribute('data-progress'));
+        bar.style.width = percent + '%';
+    });
+});
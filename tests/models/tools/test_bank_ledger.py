@@ -0,0 +1,153 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from models.database.group_type import GroupType
+from models.enums import BankAccountType, BankEntryType
+from models.extensions import db
+from models.tools import bank_ledger
+from models.tools.bank_ledger import BankBalanceSnapshot, BankLedgerEntry, balance_at
+from models.tools.group import Group
+from models.tools.user import User
+
+
+def _entries(account_type, account_id):
+    return (
+        BankLedgerEntry.query.filter_by(account_type=account_type, account_id=account_id)
+        .order_by(BankLedgerEntry.id)
+        .all()
+    )
+
+
+def test_funds_are_recorded_in_the_ledger(db_session, character_with_group, admin_user):
+    """Test deposits, split withdrawals, transfers and adjustments each add typed entries."""
+    character = character_with_group
+    group = character.group
+    character.bank_account = 20
+    db_session.commit()
+
+    character.add_funds(30, admin_user.id, "Salvage")
+    character.remove_funds(60, admin_user.id, "Medkit")
+    assert (character.bank_account, group.bank_account) == (0, 490)
+
+    transfer_id = bank_ledger.transfer(group, character, 90, admin_user.id)
+    group.set_funds(1000, admin_user.id, "Correction")
+    db_session.commit()
+
+    character_entries = _entries(BankAccountType.CHARACTER, character.id)
+    assert [(e.entry_type, e.amount) for e in character_entries] == [
+        (BankEntryType.DEPOSIT, 30),
+        (BankEntryType.WITHDRAWAL, -50),
+        (BankEntryType.TRANSFER_IN, 90),
+    ]
+    assert [(e.entry_type, e.amount) for e in _entries(BankAccountType.GROUP, group.id)] == [
+        (BankEntryType.WITHDRAWAL, -10),
+        (BankEntryType.TRANSFER_OUT, -90),
+        (BankEntryType.ADJUSTMENT, 600),
+    ]
+    assert BankLedgerEntry.query.filter_by(transfer_id=transfer_id).count() == 2
+
+    # Balances written before the first entry became the opening snapshots
+    opening = BankBalanceSnapshot.query.filter_by(
+        account_type=BankAccountType.CHARACTER, account_id=character.id
+    ).one()
+    assert (opening.balance, opening.ledger_entry_id) == (20, 0)
+    later = datetime.now() + timedelta(days=1)
+    assert balance_at(character, later) == 90
+    assert balance_at(group, later) == 1000
+    assert balance_at(group, datetime.now() - timedelta(days=1)) is None
+
+    with pytest.raises(ValueError, match="cannot be changed"):
+        character_entries[0].amount = 1
+        db_session.flush()
+
+
+def test_failed_withdrawals_change_nothing(db_session, character_with_group, admin_user):
+    """Test a withdrawal the balance no longer covers is refused without a ledger entry."""
+    group = character_with_group.group
+    # Another session spent the funds after this one read the balance
+    db_session.execute(Group.__table__.update().values(bank_account=5))
+
+    with pytest.raises(ValueError, match="Not enough funds"):
+        group.remove_funds(100, admin_user.id, "Stale read")
+
+    assert _entries(BankAccountType.GROUP, group.id) == []
+    db_session.refresh(group)
+    assert group.bank_account == 5
+
+
+def test_snapshots_bound_historical_balances(db_session, group, admin_user, monkeypatch):
+    """Test a snapshot is taken every SNAPSHOT_INTERVAL entries and past balances use it."""
+    monkeypatch.setattr(bank_ledger, "SNAPSHOT_INTERVAL", 3)
+    for _ in range(7):
+        group.add_funds(10, admin_user.id, "Income")
+    db_session.commit()
+
+    snapshots = (
+        BankBalanceSnapshot.query.filter_by(account_type=BankAccountType.GROUP, account_id=group.id)
+        .order_by(BankBalanceSnapshot.id)
+        .all()
+    )
+    assert [snapshot.balance for snapshot in snapshots] == [500, 530, 560]
+    assert balance_at(group, datetime.now() + timedelta(days=1)) == 570
+
+
+def test_parallel_transfers_never_overdraw(app, tmp_path):
+    """Test many concurrent transfers between a few accounts never overdraw or lose funds."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'bank.db'}", connect_args={"timeout": 30})
+    db.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+    original_session, db.session = db.session, session
+    try:
+        group_type = GroupType(name="Crew", description="-", income_distribution="{}")
+        user = User(email="banker@example.com", first_name="Banker")
+        session.add_all([group_type, user])
+        session.flush()
+        groups = [
+            Group(name=f"Crew {i}", group_type_id=group_type.id, bank_account=100) for i in range(4)
+        ]
+        session.add_all(groups)
+        session.commit()
+        ids, user_id = [group.id for group in groups], user.id
+        session.remove()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            for _ in range(25):
+                source_id, target_id = rng.sample(ids, 2)
+                source, target = session.get(Group, source_id), session.get(Group, target_id)
+                try:
+                    bank_ledger.transfer(source, target, rng.randint(1, 60), user_id)
+                    session.commit()
+                except ValueError:
+                    session.rollback()
+            session.remove()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(worker, range(16)))
+
+        balances = dict(session.execute(select(Group.id, Group.bank_account)).all())
+        assert all(balance >= 0 for balance in balances.values())
+        assert sum(balances.values()) == 400
+
+        entries = BankLedgerEntry.__table__.c
+        for group_id, balance in balances.items():
+            moved = session.execute(
+                select(func.coalesce(func.sum(entries.amount), 0)).where(
+                    entries.account_type == BankAccountType.GROUP, entries.account_id == group_id
+                )
+            ).scalar()
+            assert 100 + moved == balance
+        # Every committed transfer has both of its sides, and refused ones left nothing
+        sides = session.execute(
+            select(func.count(), func.sum(entries.amount)).group_by(entries.transfer_id)
+        ).all()
+        assert sides and all(row == (2, 0) for row in sides)
+    finally:
+        session.remove()
+        db.session = original_session
+        engine.dispose()
@@ -167,3 +167,25 @@ class TestCharacterPack:
         assert new_pack.items == [1]
         assert new_pack.energy_chits == 25
         assert new_pack.completion["character_sheet"] is True
+
+    def test_character_pack_in_place_mutation_keeps_other_keys(self, db, new_user, species):
+        """Test in-place pack changes persist and keep unrelated data in character_pack."""
+        character = Character(
+            name="Test Character",
+            user_id=new_user.id,
+            species_id=species.id,
+            status="active",
+            character_pack={"items": [1], "messages": [{"id": 1}]},
+        )
+        db.session.add(character)
+        db.session.commit()
+
+        # Unrelated keys no longer prevent the pack from loading
+        assert character.pack.items == [1]
+        character.pack.add_item(2)
+        db.session.commit()
+
+        db.session.expire(character)
+        assert character.character_pack["items"] == [1, 2]
+        assert character.character_pack["messages"] == [{"id": 1}]
+        assert character.pack.items == [1, 2]
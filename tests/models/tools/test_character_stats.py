@@ -0,0 +1,124 @@
+from models.database.cybernetic import CharacterCybernetic, Cybernetic
+from models.database.skills import Skill
+from models.database.species import Ability
+from models.enums import AbilityType, ScienceType
+from models.tools.character import CharacterReputation, CharacterSkill, CharacterTag
+from models.tools.character_stats import (
+    CharacterStats,
+    backfill_character_stats,
+    load_character_stats,
+)
+
+
+def test_stats_follow_skills_cybernetics_and_reputations(db_session, character, new_user, faction):
+    """Test stored stats are rewritten as soon as their inputs are flushed."""
+    assert db_session.get(CharacterStats, character.id) is not None
+    assert character.get_total_skill_cost() == 0
+
+    skill = Skill(
+        name="Life Science",
+        base_cost=2,
+        cost_increases=True,
+        can_purchase_multiple=True,
+        adds_science_downtime=1,
+        science_type=ScienceType.LIFE,
+        character_sheet_values='[{"id": "hp", "description": "Hits", "value": 2}]',
+    )
+    cybernetic = Cybernetic(
+        name="Wrench Arm", neural_shock_value=1, adds_engineering_downtime=2, wiki_slug="wrench"
+    )
+    db_session.add_all([skill, cybernetic])
+    db_session.flush()
+    db_session.add_all(
+        [
+            CharacterSkill(
+                character_id=character.id,
+                skill_id=skill.id,
+                times_purchased=2,
+                purchased_by_user_id=new_user.id,
+            ),
+            CharacterCybernetic(character_id=character.id, cybernetic_id=cybernetic.id),
+            CharacterReputation(character_id=character.id, faction_id=faction.id, value=3),
+        ]
+    )
+    db_session.flush()
+
+    assert character.get_total_skill_cost() == 2 + 3
+    assert character.get_total_reputation() == 3
+    assert character.get_available_science_slots() == 2
+    assert character.get_available_science_slots(ScienceType.LIFE) == 2
+    assert character.get_available_engineering_slots() == 2
+    assert character.get_character_sheet_values() == {"hp": {"name": "Hits", "value": 2}}
+    assert character.derived_stats.get_sources("engineering") == [
+        {"source": "Cybernetic: Wrench Arm", "type": None}
+    ]
+
+    # Changing a skill definition updates every character holding it
+    skill.base_cost = 4
+    db_session.commit()
+    assert character.get_total_skill_cost() == 4 + 5
+
+
+def test_stats_apply_species_discounts_and_requirements(db_session, character, new_user):
+    """Test species discounts and skill requirements are applied when stats are derived."""
+    skill = Skill(name="Tinkering", base_cost=3, adds_engineering_mods=1)
+    tag = CharacterTag(name="Tinkerer")
+    db_session.add_all([skill, tag])
+    db_session.flush()
+    skill.required_tags_list = [tag.id]
+    db_session.add(
+        CharacterSkill(
+            character_id=character.id, skill_id=skill.id, purchased_by_user_id=new_user.id
+        )
+    )
+    db_session.commit()
+
+    assert character.get_total_skill_cost() == 3
+    assert character.get_available_engineering_mod_slots() == 0
+
+    ability = Ability(
+        species_id=character.species_id,
+        name="Nimble Fingers",
+        description="Cheaper tinkering",
+        type=AbilityType.SKILL_DISCOUNTS,
+        skill_discounts=f'{{"{skill.id}": 2}}',
+    )
+    character.tags.append(tag)
+    db_session.add(ability)
+    db_session.commit()
+
+    assert character.get_total_skill_cost() == 1
+    assert character.get_available_engineering_mod_slots() == 1
+
+
+def test_load_character_stats_computes_missing_rows(db_session, character, character_with_group):
+    """Test bulk loading attaches stored stats and computes the missing ones without storing."""
+    db_session.execute(
+        CharacterStats.__table__.delete().where(
+            CharacterStats.__table__.c.character_id == character.id
+        )
+    )
+    db_session.expire_all()
+
+    load_character_stats([character, character_with_group])
+
+    assert "stats" in character.__dict__
+    assert character.stats is None
+    assert character.derived_stats.total_skill_cost == 0
+    assert character_with_group.stats.character_id == character_with_group.id
+    db_session.flush()
+    assert db_session.get(CharacterStats, character.id) is None
+
+
+def test_backfill_stores_missing_rows(db_session, character, character_with_group):
+    """Test the backfill stores stats only for characters without a row."""
+    db_session.execute(
+        CharacterStats.__table__.delete().where(
+            CharacterStats.__table__.c.character_id == character.id
+        )
+    )
+    db_session.commit()
+
+    assert backfill_character_stats(db_session, batch_size=1) == 1
+    assert db_session.get(CharacterStats, character.id) is not None
+    assert backfill_character_stats(db_session) == 0
@@ -240,3 +240,26 @@ class TestGroupPack:
         assert pack.energy_chits == 0
         assert pack.completion == {}
         assert pack.is_generated is False
+
+    def test_group_pack_in_place_mutation_persisted(self, db, group):
+        """Test in-place pack changes are written back on flush without reassigning."""
+        group.pack = Pack(items=[1])
+        db.session.commit()
+
+        assert group.pack is group.pack
+        group.pack.items.append(2)
+        group.pack.completion["character_sheet"] = True
+        db.session.commit()
+
+        db.session.expire(group)
+        pack = group.pack
+        assert pack.items == [1, 2]
+        assert pack.completion == {"character_sheet": True}
+
+    def test_group_pack_read_does_not_write(self, db, group):
+        """Test reading a pack leaves the group clean."""
+        group.pack = Pack(items=[1])
+        db.session.commit()
+
+        assert group.pack.has_item(1)
+        assert group not in db.session.dirty
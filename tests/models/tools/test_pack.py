@@ -1,6 +1,6 @@
 import pytest
 
-from models.tools.pack import Pack
+from models.tools.pack import Pack, PackOwnerMixin
 
 
 class TestPack:
@@ -268,3 +268,59 @@ class TestPack:
         assert pack.energy_chits == 0
         assert pack.completion == {}
         assert pack.is_generated is False
+
+    def test_pack_membership_preserves_order(self):
+        """Test set-backed membership keeps list order and follows every mutation."""
+        pack = Pack(items=[3, 1, 2])
+        assert pack.items == [3, 1, 2]
+        assert pack.has_item(1)
+
+        pack.items.remove(1)
+        pack.items.insert(0, 5)
+        pack.items += [7]
+        assert pack.items == [5, 3, 2, 7]
+        assert not pack.has_item(1)
+        assert pack.has_item(5)
+        assert pack.has_item(7)
+
+        pack.items[0] = 9
+        assert not pack.has_item(5)
+        assert pack.has_item(9)
+        assert pack.to_dict()["items"] == [9, 3, 2, 7]
+        assert type(pack.to_dict()["items"]) is list
+
+    def test_pack_tracks_mutations(self):
+        """Test in-place changes to lists and completion mark the pack dirty."""
+        pack = Pack.from_dict({"items": [1], "messages": ["ignored"]})
+        assert pack.items == [1]
+
+        object.__setattr__(pack, "_dirty", False)
+        assert not pack.is_dirty
+        pack.items.append(2)
+        assert pack.is_dirty
+
+        object.__setattr__(pack, "_dirty", False)
+        pack.completion["character_sheet"] = True
+        assert pack.is_dirty
+
+        object.__setattr__(pack, "_dirty", False)
+        pack.energy_chits = 3
+        assert pack.is_dirty
+
+    def test_pack_does_not_alias_source_lists(self):
+        """Test a pack copies the lists it is built from."""
+        items = [1, 2]
+        pack = Pack(items=items)
+        pack.items.append(3)
+        assert items == [1, 2]
+
+
+def test_pack_owner_must_define_hooks():
+    """Test a pack owner missing a conversion hook fails when the class is defined."""
+    with pytest.raises(TypeError, match="_dump_pack"):
+
+        class MissingDump(PackOwnerMixin):
+            pack_column = "pack_data"
+
+            def _load_pack(self, raw):
+                return Pack()
@@ -0,0 +1,70 @@
+from models.enums import PackOwnerType
+from models.tools.pack import Pack
+from models.tools.pack_change import PackChange
+
+
+def test_pack_change_record_and_since(db, character, group, event):
+    """Changes are returned after a cursor in order, with the version being saved."""
+    assert PackChange.latest_cursor(event.id) == 0
+
+    character.pack = Pack(completion={"item_1": True})
+    first = PackChange.record(event.id, PackOwnerType.CHARACTER, character, {"item_1": True})
+    group.pack.completion["energy_chits"] = True
+    second = PackChange.record(event.id, PackOwnerType.GROUP, group, {"energy_chits": True})
+    db.session.commit()
+
+    assert first.pack_version == character.pack_version == 1
+    assert second.pack_version == group.pack_version == 1
+    assert PackChange.latest_cursor(event.id) == second.id
+    assert PackChange.since(event.id, 0) == [first, second]
+    assert PackChange.since(event.id, first.id) == [second]
+    assert PackChange.since(event.id, second.id) == []
+    assert second.to_dict() == {
+        "id": second.id,
+        "owner_type": "group",
+        "owner_id": group.id,
+        "changes": {"energy_chits": True},
+        "replaced": False,
+        "is_completed": False,
+        "version": 1,
+    }
+
+
+def test_pack_change_record_contents(db, group, event):
+    """Writes beyond completion are recorded with the whole pack, to replace the client's."""
+    group.pack = Pack(items=[5], energy_chits=10, is_generated=True)
+    change = PackChange.record_contents(event.id, PackOwnerType.GROUP, group)
+    db.session.commit()
+
+    assert change.replaced is True
+    assert change.changes == group.pack.to_dict()
+    assert change.pack_version == group.pack_version
+
+
+def test_pack_change_feed_is_per_event(db, character, event):
+    """Cursors for one event do not see changes from another."""
+    from datetime import datetime, timedelta
+
+    from models.event import Event
+
+    other = Event(
+        event_number="TEST998",
+        name="Other Event",
+        event_type="mainline",
+        early_booking_deadline=datetime.now() + timedelta(days=50),
+        booking_deadline=datetime.now() + timedelta(days=55),
+        start_date=datetime.now() + timedelta(days=60),
+        end_date=datetime.now() + timedelta(days=62),
+        location="Elsewhere",
+        standard_ticket_price=50.00,
+        early_booking_ticket_price=45.00,
+        child_ticket_price_12_15=25.00,
+        child_ticket_price_7_11=15.00,
+        child_ticket_price_under_7=0.00,
+    )
+    db.session.add(other)
+    PackChange.record(event.id, PackOwnerType.CHARACTER, character, {"item_1": True})
+    db.session.commit()
+
+    assert PackChange.since(other.id, 0) == []
+    assert PackChange.latest_cursor(other.id) == 0
@@ -0,0 +1,77 @@
+from models.enums import PackOwnerType, TicketType
+from models.tools.event_ticket import EventTicket
+from models.tools.pack import Pack
+from models.tools.pack_entry import PackEntry
+
+
+class TestPackEntry:
+    """Test the normalized pack_entry index kept in sync with pack JSON."""
+
+    def test_character_pack_entries_synced(self, db, character):
+        """Test setting a character pack writes one entry per pack member and flag."""
+        pack = Pack(items=[3, 1], medicaments=[7], energy_chits=5)
+        pack.set_completion("item_3", True)
+        character.pack = pack
+        db.session.commit()
+
+        entries = PackEntry.query.filter_by(
+            owner_type=PackOwnerType.CHARACTER, owner_id=character.id
+        ).all()
+        by_key = {(entry.kind, entry.ref_id): entry for entry in entries}
+        assert set(by_key) == {
+            ("character_sheet", None),
+            ("character_id_badge", None),
+            ("energy_chits", None),
+            ("item", 3),
+            ("item", 1),
+            ("medicament", 7),
+        }
+        assert by_key[("item", 3)].completed is True
+        assert by_key[("item", 3)].position == 0
+        assert by_key[("item", 1)].position == 1
+
+        # Replacing the pack replaces its entries
+        character.pack = Pack(items=[1])
+        db.session.commit()
+        assert PackEntry.owners_of("item", 3) == []
+        assert PackEntry.owners_of("item", 1) == [(PackOwnerType.CHARACTER, character.id)]
+
+    def test_group_pack_entries_synced(self, db, group):
+        """Test group packs are indexed from the JSON string column."""
+        group.pack = Pack(exotics=[4])
+        db.session.commit()
+
+        assert PackEntry.owners_of("exotic", 4) == [(PackOwnerType.GROUP, group.id)]
+
+    def test_downtime_pack_entries_synced(self, db, downtime_pack):
+        """Test downtime pack contents are indexed under the downtime owner type."""
+        downtime_pack.items = ["12", "13"]
+        downtime_pack.exotic_substances = [{"id": "2", "amount": 3}]
+        db.session.commit()
+
+        assert PackEntry.owners_of("item", 12, PackOwnerType.DOWNTIME) == [
+            (PackOwnerType.DOWNTIME, downtime_pack.id)
+        ]
+        assert PackEntry.owners_of("exotic", 2) == [(PackOwnerType.DOWNTIME, downtime_pack.id)]
+        assert PackEntry.owners_of("item", 12, PackOwnerType.CHARACTER) == []
+
+    def test_incomplete_counts_for_event(self, db, event, character, admin_user):
+        """Test incomplete entries are counted per attending pack in one query."""
+        pack = Pack(items=[1, 2])
+        pack.set_completion("character_sheet", True)
+        pack.set_completion("item_1", True)
+        character.pack = pack
+        db.session.add(
+            EventTicket(
+                event_id=event.id,
+                character_id=character.id,
+                user_id=character.user_id,
+                ticket_type=TicketType.ADULT,
+                price_paid=50.0,
+                assigned_by_id=admin_user.id,
+            )
+        )
+        db.session.commit()
+
+        # Remaining: character_id_badge and item_2
+        assert PackEntry.incomplete_counts(event.id) == {(PackOwnerType.CHARACTER, character.id): 2}
@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from models.enums import PrintTemplateType
-from models.tools.print_template import PrintTemplate
+from models.tools.print_template import PrintTemplate, _render_cache, clear_render_cache
 
 
 def test_print_template_methods(db, new_user):
@@ -72,3 +74,83 @@ def test_print_template_methods(db, new_user):
     assert "/* comment */" not in scoped_css
     assert f"width: {template.width_mm}mm" in scoped_css
     assert f"height: {template.height_mm}mm" in scoped_css
+
+
+def _make_template(user_id, **overrides):
+    values = dict(
+        type=PrintTemplateType.ITEM_CARD,
+        type_name="Test Item Card",
+        front_html="<h1>{{ item.name }}</h1>",
+        back_html="<body><p>{{ item.description }}</p></body><!-- back -->",
+        css_styles="body { color: red; }",
+        has_back_side=True,
+        created_by_user_id=user_id,
+    )
+    values.update(overrides)
+    return PrintTemplate(**values)
+
+
+def test_print_template_compiles_once(db, new_user):
+    """Rendering many items reuses the same compiled templates and scoped CSS."""
+    clear_render_cache()
+    template = _make_template(new_user.id)
+
+    compiled = template.get_compiled()
+    assert template.get_compiled() is compiled
+
+    first = template.get_front_page_render({"item": {"name": "First"}})
+    second = template.get_front_page_render({"item": {"name": "Second"}})
+    assert first == "<h1>First</h1>"
+    assert second == "<h1>Second</h1>"
+    assert template.get_compiled() is compiled
+
+    # Back side still has its body extracted and comments removed
+    back = template.get_back_page_render({"item": {"description": "Desc"}})
+    assert back == "<p>Desc</p>"
+    assert template.get_css_render() is compiled["css"]
+
+
+def test_print_template_cache_invalidation(db, new_user):
+    """Edits to the template source or its updated_at produce a fresh compile."""
+    clear_render_cache()
+    template = _make_template(new_user.id)
+    db.session.add(template)
+    db.session.commit()
+
+    compiled = template.get_compiled()
+    assert template.get_front_page_render({"item": {"name": "A"}}) == "<h1>A</h1>"
+
+    # Unsaved edits (e.g. previews) are never served from a stale cache entry
+    template.front_html = "<h2>{{ item.name }}</h2>"
+    assert template.get_front_page_render({"item": {"name": "A"}}) == "<h2>A</h2>"
+    assert template.get_compiled() is not compiled
+
+    # Saving a new version replaces the old cache entry for this template
+    template.updated_at = datetime(2030, 1, 1)
+    db.session.commit()
+    recompiled = template.get_compiled()
+    assert [key for key in _render_cache if key[0] == template.id] == [
+        (template.id, template.updated_at)
+    ]
+
+    clear_render_cache(template.id)
+    assert template.get_compiled() is not recompiled
+
+    # Layout changes update the scoped CSS
+    template.width_mm = 50.0
+    assert "width: 50.0mm" in template.get_css_render()
+
+
+def test_print_template_render_has_app_context(app, db, new_user):
+    """Compiled templates still see the app's template context, such as config and the user."""
+    clear_render_cache()
+    template = _make_template(new_user.id)
+    template.front_html = (
+        "{{ item.name }} {{ config.TESTING }} {{ current_user.is_authenticated }} "
+        "{{ has_research_projects() }}"
+    )
+
+    with app.test_request_context():
+        rendered = template.get_front_page_render({"item": {"name": "Card"}})
+
+    assert rendered == "Card True False False"
@@ -79,3 +79,50 @@ def test_new_research_with_stages(db, character):
         stage_data["unlock_requirements"][0]["requirement_type"]
         == ResearchRequirementType.SCIENCE.value
     )
+
+
+def test_advance_and_regress_stage(db, character):
+    """Test stages are advanced and regressed through the loaded progress."""
+    research = Research(project_name="Staged Project", type=ResearchType.ARTEFACT)
+    for number in (1, 2):
+        research.stages.append(
+            ResearchStage(
+                stage_number=number,
+                name=f"Stage {number}",
+                unlock_requirements=[
+                    ResearchStageRequirement(
+                        requirement_type=ResearchRequirementType.SCIENCE,
+                        science_type=ScienceType.LIFE,
+                        amount=2,
+                    )
+                ],
+            )
+        )
+    db.session.add(research)
+    db.session.commit()
+    character_research = research.assign_character(character.id)
+    db.session.commit()
+    first, second = research.stages
+
+    character_research.get_current_stage().requirement_progress[0].progress = 2
+    new_stage = character_research.advance_stage()
+    db.session.commit()
+
+    assert character_research.current_stage_id == second.id
+    assert character_research.get_current_stage() is new_stage
+    assert [r.requirement_id for r in new_stage.requirement_progress] == [
+        second.unlock_requirements[0].id
+    ]
+
+    previous = character_research.regress_stage()
+    db.session.commit()
+
+    assert character_research.current_stage_id == first.id
+    assert previous.stage_completed is False
+    assert previous.requirement_progress[0].progress == 0
+    assert [p.stage_id for p in character_research.progress] == [first.id]
+
+    character_research.advance_stage()
+    character_research.advance_stage()
+    db.session.commit()
+    assert character_research.is_complete()
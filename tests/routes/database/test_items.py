@@ -293,3 +293,15 @@ def test_items_view_authorized(test_client, rules_team_user, item, print_templat
 def test_items_view_not_found(test_client, db):
     response = test_client.get("/db/items/99999/view")
     assert response.status_code == 404
+
+
+def test_items_find_by_code_requires_pack(test_client, item, downtime_pack, db):
+    url = f"/db/items/find_by_code?full_code={item.full_code}&requires_pack=true"
+    response = test_client.get(url)
+    assert response.status_code == 404
+    assert b"Item not found in any pack" in response.data
+
+    downtime_pack.items = [str(item.id)]
+    db.session.commit()
+    response = test_client.get(url)
+    assert response.status_code == 200
@@ -945,3 +945,334 @@ def test_purchase_conflicting_adult_and_crew_tickets(test_client, db, npc_user_w
     user_tickets = EventTicket.query.filter_by(user_id=user.id, event_id=event.id).all()
     assert len(user_tickets) == 1
     assert user_tickets[0].ticket_type == TicketType.CREW
+
+
+def test_print_changed_character_sheets(test_client, admin_user, npc_user_with_chars, event):
+    """
+    GIVEN character sheets that were printed for an event
+    WHEN printing with changed_only=true
+    THEN only characters whose rendered sheet changed are included and the manifest records them
+    """
+    from io import BytesIO
+
+    from models.enums import PrintTemplateType
+    from models.extensions import db
+    from models.tools.print_template import CharacterSheetPrint, PrintTemplate
+
+    user, char1, char2 = npc_user_with_chars
+    for character in (char1, char2):
+        db.session.add(
+            EventTicket(
+                event_id=event.id,
+                character_id=character.id,
+                user_id=user.id,
+                ticket_type=TicketType.ADULT,
+                price_paid=50.0,
+                assigned_by_id=admin_user.id,
+            )
+        )
+    db.session.add(
+        PrintTemplate(
+            type=PrintTemplateType.CHARACTER_SHEET,
+            type_name="Character Sheet",
+            front_html="<h1>{{ character.name }}</h1>",
+            created_by_user_id=admin_user.id,
+        )
+    )
+    db.session.commit()
+
+    with test_client.session_transaction() as session:
+        session["_user_id"] = admin_user.id
+        session["_fresh"] = True
+
+    url = f"/events/{event.id}/packs/print/character-sheets"
+    with patch(
+        "utils.print_layout.PrintLayout.generate_pdf", side_effect=lambda *a: BytesIO(b"%PDF")
+    ) as mock_generate:
+        response = test_client.get(url)
+        assert response.status_code == 200
+        assert len(mock_generate.call_args.args[0]) == 2
+
+        # Nothing changed since the full print
+        response = test_client.get(f"{url}?changed_only=true")
+        assert response.status_code == 302
+        assert mock_generate.call_count == 1
+
+        char2.name = "Renamed Character"
+        db.session.commit()
+        response = test_client.get(f"{url}?changed_only=true")
+        assert response.status_code == 200
+        printed_items = mock_generate.call_args.args[0]
+        assert [item["front_html"] for item in printed_items] == ["<h1>Renamed Character</h1>"]
+
+    assert CharacterSheetPrint.query.filter_by(event_id=event.id).count() == 3
+
+    manifest = test_client.get(f"{url}/manifest").get_json()
+    assert [entry["character_id"] for entry in manifest["characters"]] == [char2.id]
+    assert manifest["printed_by_user_id"] == admin_user.id
+
+
+def test_patch_character_pack_completion(test_client, admin_user, character, event):
+    """
+    GIVEN a character pack at a known version
+    WHEN completion deltas are patched with If-Match
+    THEN only the given keys change, the version advances and stale writes are rejected
+    """
+    from models.extensions import db
+    from models.tools.pack import Pack
+
+    character.pack = Pack(items=[1, 2], completion={"item_1": True})
+    db.session.commit()
+    version = character.pack_version
+
+    with test_client.session_transaction() as session:
+        session["_user_id"] = admin_user.id
+        session["_fresh"] = True
+
+    url = f"/events/{event.id}/packs/character/{character.id}/completion"
+    response = test_client.patch(
+        url, json={"key": "item_2", "completed": True}, headers={"If-Match": f'"{version}"'}
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["completion"] == {"item_2": True}
+    assert data["version"] == version + 1
+    assert response.headers["ETag"] == f'"{version + 1}"'
+
+    # A second desk still holding the old version is refused with the current state
+    response = test_client.patch(
+        url, json={"key": "item_1", "completed": False}, headers={"If-Match": f'"{version}"'}
+    )
+    assert response.status_code == 412
+    assert response.get_json()["completion"] == {"item_1": True, "item_2": True}
+
+    response = test_client.patch(
+        f"{url}/batch",
+        json={"changes": {"character_sheet": True, "character_id_badge": True}},
+        headers={"If-Match": response.headers["ETag"]},
+    )
+    assert response.status_code == 200
+    assert response.get_json()["is_completed"] is True
+
+    db.session.expire(character)
+    assert character.pack.completion == {
+        "item_1": True,
+        "item_2": True,
+        "character_sheet": True,
+        "character_id_badge": True,
+    }
+    assert character.pack_version == version + 2
+
+    assert test_client.patch(url, json={"key": "item_1", "completed": True}).status_code == 428
+    response = test_client.patch(
+        url, json={"key": "item_1", "completed": "yes", "version": version + 2}
+    )
+    assert response.status_code == 400
+
+
+def test_patch_group_pack_completion_batch(test_client, admin_user, group, event):
+    """
+    GIVEN a group pack
+    WHEN a batch of completion deltas is patched with the version in the body
+    THEN the changes are applied together and the stored pack keeps its other flags
+    """
+    from models.extensions import db
+    from models.tools.pack import Pack
+
+    group.pack = Pack(items=[1], completion={"energy_chits": True})
+    db.session.commit()
+
+    with test_client.session_transaction() as session:
+        session["_user_id"] = admin_user.id
+        session["_fresh"] = True
+
+    response = test_client.patch(
+        f"/events/{event.id}/packs/group/{group.id}/completion/batch",
+        json={"changes": {"item_1": True}, "version": group.pack_version},
+    )
+    assert response.status_code == 200
+    assert response.get_json()["completion"] == {"item_1": True}
+
+    db.session.expire(group)
+    assert group.pack.completion == {"energy_chits": True, "item_1": True}
+
+
+def test_pack_changes_feed(test_client, admin_user, character, event):
+    """
+    GIVEN a packs page loaded at some cursor
+    WHEN another desk patches a pack
+    THEN polling the change feed from that cursor returns just that delta and a new cursor
+    """
+    from models.extensions import db
+    from models.tools.pack import Pack
+
+    character.pack = Pack(items=[1])
+    db.session.commit()
+
+    with test_client.session_transaction() as session:
+        session["_user_id"] = admin_user.id
+        session["_fresh"] = True
+
+    feed_url = f"/events/{event.id}/packs/changes"
+    cursor = test_client.get(feed_url).get_json()["cursor"]
+
+    response = test_client.patch(
+        f"/events/{event.id}/packs/character/{character.id}/completion",
+        json={"key": "item_1", "completed": True, "version": character.pack_version},
+    )
+    assert response.status_code == 200
+
+    response = test_client.get(f"{feed_url}?since={cursor}")
+    assert response.headers["Cache-Control"] == "no-store"
+    data = response.get_json()
+    assert [change["changes"] for change in data["changes"]] == [{"item_1": True}]
+    assert data["changes"][0]["owner_type"] == "character"
+    assert data["changes"][0]["owner_id"] == character.id
+    assert data["cursor"] == data["changes"][0]["id"]
+    assert data["has_more"] is False
+
+    data = test_client.get(f"{feed_url}?since={data['cursor']}").get_json()
+    assert data["changes"] == []
+
+
+def test_generate_all_group_packs(test_client, admin_user, character_with_group, event):
+    """
+    GIVEN a group with a character attending an event
+    WHEN an admin generates all group packs with a seed
+    THEN every attending group is generated and a summary is returned
+    """
+    from models.database.global_settings import GlobalSettings
+    from models.extensions import db
+
+    db.session.add(GlobalSettings(character_income_ec=30, group_income_contribution=30))
+    db.session.add(
+        EventTicket(
+            event_id=event.id,
+            character_id=character_with_group.id,
+            user_id=character_with_group.user_id,
+            ticket_type=TicketType.ADULT,
+            price_paid=50.0,
+            assigned_by_id=admin_user.id,
+        )
+    )
+    db.session.commit()
+
+    with test_client.session_transaction() as session:
+        session["_user_id"] = admin_user.id
+        session["_fresh"] = True
+
+    url = f"/events/{event.id}/packs/groups/generate"
+    assert test_client.post(url, json={"seed": "abc"}).status_code == 400
+
+    data = test_client.post(url, json={"seed": 3}).get_json()
+    assert data["success"] is True
+    assert data["seed"] == 3
+    assert [row["group_id"] for row in data["groups"]] == [character_with_group.group_id]
+    # The fixture group type puts half the pool into items it has none of, so it all becomes EC
+    assert data["groups"][0]["energy_chits"] == 30
+
+    db.session.expire(character_with_group.group)
+    assert character_with_group.group.pack.is_generated is True
+
+    # Other desks are sent the generated pack through the changes feed
+    feed = test_client.get(f"/events/{event.id}/packs/changes?since=0").get_json()
+    assert [(change["owner_type"], change["owner_id"]) for change in feed["changes"]] == [
+        ("group", character_with_group.group_id)
+    ]
+    assert feed["changes"][0]["replaced"] is True
+    assert feed["changes"][0]["changes"]["is_generated"] is True
+    assert feed["changes"][0]["version"] == character_with_group.group.pack_version
+
+
+def test_progress_conditions(test_client, admin_user, character, condition, event):
+    """
+    GIVEN a character with a condition attending an event without downtime
+    WHEN an admin progresses the event's conditions, then tries again
+    THEN the condition loses one event, the second run is refused and the button is hidden
+    """
+    from models.database.conditions import ConditionStage
+    from models.extensions import db
+    from models.tools.character import CharacterCondition
+
+    condition.stages = [
+        ConditionStage(stage_number=1, rp_effect="-", diagnosis="-", cure="-", duration=3)
+    ]
+    db.session.add(
+        CharacterCondition(
+            character_id=character.id,
+            condition_id=condition.id,
+            current_stage=1,
+            current_duration=3,
+        )
+    )
+    db.session.add(
+        EventTicket(
+            event_id=event.id,
+            character_id=character.id,
+            user_id=character.user_id,
+            ticket_type=TicketType.ADULT,
+            price_paid=50.0,
+            assigned_by_id=admin_user.id,
+        )
+    )
+    db.session.commit()
+
+    with test_client.session_transaction() as session:
+        session["_user_id"] = admin_user.id
+        session["_fresh"] = True
+
+    data = test_client.post(f"/events/{event.id}/conditions/progress").get_json()
+    assert data["success"] is True
+    assert data["total_conditions"] == 1
+    assert data["conditions"][0]["current_duration"] == 2
+
+    response = test_client.post(f"/events/{event.id}/conditions/progress")
+    assert response.status_code == 409
+    assert response.get_json()["success"] is False
+
+    page = test_client.get(f"/events/{event.id}/packs")
+    assert page.status_code == 200
+    assert b"progressConditions()" not in page.data
+
+
+def test_grant_character_points(test_client, admin_user, character, event):
+    """
+    GIVEN an event with a ticket holder
+    WHEN a user admin previews and then grants character points per ticket type
+    THEN the preview lists the holder and the grant raises their points once
+    """
+    from models.extensions import db
+
+    admin_user.add_role("user_admin")
+    db.session.add(
+        EventTicket(
+            event_id=event.id,
+            character_id=character.id,
+            user_id=character.user_id,
+            ticket_type=TicketType.ADULT,
+            price_paid=50.0,
+            assigned_by_id=admin_user.id,
+        )
+    )
+    db.session.commit()
+    before = character.user.character_points
+
+    with test_client.session_transaction() as session:
+        session["_user_id"] = admin_user.id
+        session["_fresh"] = True
+
+    response = test_client.get(f"/events/{event.id}/character-points?adult=2")
+    assert response.status_code == 200
+    assert b"2.0 character points for 1 users" in response.data
+
+    response = test_client.post(f"/events/{event.id}/character-points", data={"adult": "2"})
+    assert response.status_code == 302
+    db.session.expire_all()
+    assert character.user.character_points == before + 2
+
+    test_client.post(f"/events/{event.id}/character-points", data={"adult": "2"})
+    db.session.expire_all()
+    assert character.user.character_points == before + 2
+
+    response = test_client.get(f"/events/{event.id}/character-points")
+    assert b"Granted 2.0 character points to 1 users" in response.data
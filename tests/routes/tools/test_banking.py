@@ -41,14 +41,15 @@ class TestBankingAccess:
             assert character_with_faction.name.encode() in response.data
 
     def test_bank_admin_user(self, test_client, user_admin, character_with_faction, group):
-        """Test bank page access for admin user."""
+        """Test bank page access for admin user, with accounts searched for rather than listed."""
         with test_client as c:
             with c.session_transaction() as sess:
                 sess["_user_id"] = user_admin.id
             response = c.get("/banking/")
             assert response.status_code == 200
-            assert character_with_faction.name.encode() in response.data
-            assert group.name.encode() in response.data
+            assert character_with_faction.name.encode() not in response.data
+            assert group.name.encode() not in response.data
+            assert b"/banking/accounts/search" in response.data
 
     def test_bank_admin_user_with_selected_accounts(
         self, test_client, user_admin, character_with_faction, group
@@ -394,7 +395,7 @@ def test_banking_page_for_multi_char_user(test_client, db, npc_user_with_chars,
     db.session.commit()
 
     response = test_client.get("/banking/")
-    assert b"Not Your Char" in response.data  # It should be in the target list
+    assert b"Not Your Char" not in response.data  # Transfer targets are searched for
     soup = BeautifulSoup(response.data, "html.parser")
     source_options = [opt.text for opt in soup.select("#source_account_select option")]
     assert "Not Your Char (Character)" not in source_options
@@ -430,3 +431,81 @@ def test_transfer_between_own_characters(test_client, db, npc_user_with_chars):
 
     assert char1.bank_account == 850
     assert char2.bank_account == 650
+
+
+class TestAccountSearch:
+    def _search(self, client, user, **params):
+        with client.session_transaction() as sess:
+            sess["_user_id"] = user.id
+        return client.get("/banking/accounts/search", query_string=params).get_json()["results"]
+
+    def test_search_matches_name_prefixes(self, test_client, regular_user, character_with_group):
+        """Test characters and groups are matched by name prefix, without balances for players."""
+        group = character_with_group.group
+        character_with_group.name = "Test Pilot"
+        inactive = Character(
+            name="Test Retired",
+            user_id=regular_user.id,
+            status=CharacterStatus.RETIRED.value,
+            species_id=character_with_group.species_id,
+        )
+        db.session.add(inactive)
+        db.session.commit()
+
+        results = self._search(test_client, regular_user, q="tEsT")
+        assert [result["id"] for result in results] == [
+            f"character_{character_with_group.id}",
+            f"group_{group.id}",
+        ]
+        assert "balance" not in results[0]
+        assert self._search(test_client, regular_user, q="pilot") == []
+        assert self._search(test_client, regular_user, q="test", type="group") == [
+            {"id": f"group_{group.id}", "text": f"{group.name} (Group)"}
+        ]
+
+    def test_search_folds_only_ascii_case(self, test_client, regular_user, character):
+        """Test non-ASCII letters in the term are kept as typed, matching SQLite's lower()."""
+        character.name = "Élan Vital"
+        db.session.commit()
+
+        results = self._search(test_client, regular_user, q="ÉLAN")
+        assert [result["id"] for result in results] == [f"character_{character.id}"]
+
+    def test_search_includes_balances_for_admins(
+        self, test_client, user_admin, character_with_faction
+    ):
+        """Test admins see the balance of every account they search for."""
+        results = self._search(test_client, user_admin, q=character_with_faction.name)
+        assert results[0]["balance"] == character_with_faction.bank_account
+
+    def test_search_matches_player_references(self, test_client, regular_user, npc_user_with_chars):
+        """Test characters are found by full player reference or by the user id part of one."""
+        user, char1, char2 = npc_user_with_chars
+        char1.character_id, char2.character_id = 1, 2
+        db.session.commit()
+
+        results = self._search(test_client, regular_user, q=f"{user.id}.{char2.character_id}")
+        assert [result["id"] for result in results] == [f"character_{char2.id}"]
+        assert results[0]["text"] == f"{char2.name} ({user.id}.{char2.character_id})"
+
+        results = self._search(test_client, regular_user, q=f"{user.id}.")
+        assert {result["id"] for result in results} == {
+            f"character_{char1.id}",
+            f"character_{char2.id}",
+        }
+
+    def test_search_results_are_capped(self, test_client, regular_user, monkeypatch):
+        """Test no more than ACCOUNT_SEARCH_LIMIT accounts are returned."""
+        from routes.tools import banking
+
+        monkeypatch.setattr(banking, "ACCOUNT_SEARCH_LIMIT", 2)
+        for i in range(3):
+            db.session.add(
+                Character(
+                    name=f"Capped {i}", user_id=regular_user.id, status=CharacterStatus.ACTIVE.value
+                )
+            )
+        db.session.commit()
+
+        results = self._search(test_client, regular_user, q="capped")
+        assert [result["text"].split(" (")[0] for result in results] == ["Capped 0", "Capped 1"]
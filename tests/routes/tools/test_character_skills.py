@@ -109,6 +109,26 @@ class TestCharacterSkills:
         assert data["can_purchase"] is False
         assert "only be purchased once" in data["reason"]
 
+    def test_plan_skills(self, test_client, regular_user, character_with_faction, skill):
+        login_user(test_client, regular_user)
+        response = test_client.post(
+            self.url(character_with_faction.id, "/plan"), json={"skill_ids": [skill.id]}
+        )
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["valid"] is True
+        assert data["total_cost"] == skill.base_cost
+        assert data["steps"] == [
+            {"skill_id": skill.id, "name": skill.name, "rank": 1, "cost": skill.base_cost}
+        ]
+
+    def test_plan_skills_invalid_body(self, test_client, regular_user, character_with_faction):
+        login_user(test_client, regular_user)
+        response = test_client.post(
+            self.url(character_with_faction.id, "/plan"), json={"skill_ids": ["1"]}
+        )
+        assert response.status_code == 400
+
     def test_purchase_skill_success(self, test_client, regular_user, character_with_faction, skill):
         login_user(test_client, regular_user)
         response = test_client.post(
@@ -218,3 +218,87 @@ def test_admin_bypasses_species_faction_validation(test_client, db):
 
     assert response.status_code == 200
     assert b"Character created successfully!" in response.data
+
+
+def test_removing_last_cybernetic_refreshes_stats(
+    test_client, authenticated_user, character, faction, db
+):
+    """
+    GIVEN a character whose only cybernetic adds engineering downtime
+    WHEN a user admin unticks every cybernetic on the edit page
+    THEN the character's stored stats no longer count the cybernetic's slots
+    """
+    from models.database.cybernetic import CharacterCybernetic, Cybernetic
+
+    authenticated_user.add_role(Role.USER_ADMIN.value)
+    cybernetic = Cybernetic(
+        name="Wrench Arm", neural_shock_value=1, adds_engineering_downtime=2, wiki_slug="wrench"
+    )
+    db.session.add(cybernetic)
+    character.faction_id = faction.id
+    db.session.flush()
+    db.session.add(CharacterCybernetic(character_id=character.id, cybernetic_id=cybernetic.id))
+    db.session.commit()
+    assert character.get_available_engineering_slots() == 2
+
+    response = test_client.post(
+        f"/characters/{character.id}/edit",
+        data={
+            "name": character.name,
+            "faction": str(faction.id),
+            "species_id": str(character.species_id),
+        },
+    )
+
+    assert response.status_code == 302
+    db.session.expire_all()
+    assert CharacterCybernetic.query.filter_by(character_id=character.id).count() == 0
+    assert character.get_available_engineering_slots() == 0
+
+
+def test_audit_log_filters_and_pages(test_client, authenticated_user, character, db):
+    """
+    GIVEN a character with more audit log entries than fit on a page
+    WHEN its owner views the audit log, filtered by action and then the next page
+    THEN only matching entries are shown and the next page continues after the first
+    """
+    from datetime import datetime, timedelta
+
+    from models.enums import CharacterAuditAction
+    from models.tools.character import CharacterAuditLog
+    from utils.audit_log import AUDIT_LOG_PAGE_SIZE
+
+    for number in range(AUDIT_LOG_PAGE_SIZE + 1):
+        db.session.add(
+            CharacterAuditLog(
+                character_id=character.id,
+                editor_user_id=authenticated_user.id,
+                timestamp=datetime.now() - timedelta(hours=number + 1),
+                action=CharacterAuditAction.FUNDS_ADDED,
+                changes=f"Deposit #{number}#",
+            )
+        )
+    db.session.add(
+        CharacterAuditLog(
+            character_id=character.id,
+            editor_user_id=authenticated_user.id,
+            action=CharacterAuditAction.EDIT,
+            changes="Renamed",
+        )
+    )
+    db.session.commit()
+
+    url = f"/characters/{character.id}/audit-log?action=funds_added"
+    first = test_client.get(url)
+    assert first.status_code == 200
+    assert b"Deposit #0#" in first.data
+    assert f"Deposit #{AUDIT_LOG_PAGE_SIZE}#".encode() not in first.data
+    assert b"Renamed" not in first.data
+
+    last_shown = f"Deposit #{AUDIT_LOG_PAGE_SIZE - 1}#"
+    cursor = CharacterAuditLog.query.filter_by(changes=last_shown).one().id
+    assert f"before={cursor}".encode() in first.data
+
+    older = test_client.get(f"{url}&before={cursor}")
+    assert f"Deposit #{AUDIT_LOG_PAGE_SIZE}#".encode() in older.data
+    assert b"Deposit #0#" not in older.data
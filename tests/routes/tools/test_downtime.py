@@ -3,10 +3,12 @@ from datetime import datetime, timedelta
 
 import pytest
 
-from models.enums import DowntimeStatus, DowntimeTaskStatus, EventType
+from models.enums import DowntimeJobStatus, DowntimeStatus, DowntimeTaskStatus, EventType
 from models.extensions import db
-from models.tools.downtime import DowntimePeriod
+from models.tools.character import Character
+from models.tools.downtime import DowntimeJob, DowntimePack, DowntimePeriod
 from models.tools.event_ticket import EventTicket
+from utils.downtime_processor import queue_downtime_job
 
 
 @pytest.fixture
@@ -477,6 +479,76 @@ def test_enter_downtime_post_large_data(
     assert response.status_code == 302  # Should redirect on success with confirm_complete=True
 
 
+def test_enter_downtime_is_a_light_shell(
+    test_client, downtime_pack_enter_downtime, regular_user, item_blueprint, db
+):
+    login_user(test_client, regular_user)
+    response = test_client.get(
+        f"/downtime/enter-downtime/{downtime_pack_enter_downtime.period_id}/"
+        f"{downtime_pack_enter_downtime.character_id}"
+    )
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "steps/__step__" in html
+    # Catalogs are fetched by the steps that use them
+    assert item_blueprint.name not in html
+
+
+def test_enter_downtime_step(test_client, downtime_pack_enter_downtime, regular_user, item, db):
+    downtime_pack_enter_downtime.items = [item.id]
+    db.session.commit()
+
+    login_user(test_client, regular_user)
+    url = (
+        f"/downtime/enter-downtime/{downtime_pack_enter_downtime.period_id}/"
+        f"{downtime_pack_enter_downtime.character_id}/steps"
+    )
+    response = test_client.get(f"{url}/engineering")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-store"
+    data = response.get_json()
+    assert data["catalogs"] == ["mods"]
+    assert [entry["id"] for entry in data["pack_items"]] == [item.id]
+
+    assert test_client.get(f"{url}/cooking").status_code == 404
+
+
+def test_enter_downtime_step_rejects_other_characters(
+    test_client, downtime_pack_enter_downtime, other_user, db
+):
+    login_user(test_client, other_user)
+    response = test_client.get(
+        f"/downtime/enter-downtime/{downtime_pack_enter_downtime.period_id}/"
+        f"{downtime_pack_enter_downtime.character_id}/steps/purchase"
+    )
+    assert response.status_code == 403
+
+
+def test_enter_downtime_step_wrong_status(test_client, downtime_pack, new_user, db):
+    downtime_pack.status = DowntimeTaskStatus.ENTER_PACK
+    db.session.commit()
+    login_user(test_client, new_user)
+    response = test_client.get(
+        f"/downtime/enter-downtime/{downtime_pack.period_id}/"
+        f"{downtime_pack.character_id}/steps/purchase"
+    )
+    assert response.status_code == 409
+
+
+def test_downtime_catalog_revalidates_with_etag(test_client, regular_user, item_blueprint, db):
+    login_user(test_client, regular_user)
+    response = test_client.get("/downtime/catalogs/blueprints")
+    assert response.status_code == 200
+    assert [blueprint["id"] for blueprint in response.get_json()] == [item_blueprint.id]
+    assert "max-age" in response.headers["Cache-Control"]
+
+    etag = response.headers["ETag"]
+    response = test_client.get("/downtime/catalogs/blueprints", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    assert test_client.get("/downtime/catalogs/recipes").status_code == 404
+
+
 def make_pack_manual_review(db, downtime_pack_enter_downtime):
     downtime_pack_enter_downtime.status = DowntimeTaskStatus.MANUAL_REVIEW
     db.session.commit()
@@ -762,6 +834,166 @@ def test_process_downtime_missing_period(test_client, downtime_team_user):
     assert response.status_code == 404
 
 
+def test_process_downtime_dry_run(
+    test_client, downtime_team_user, event, downtime_period, downtime_pack, db
+):
+    downtime_period.event_id = event.id
+    downtime_pack.status = DowntimeTaskStatus.COMPLETED
+    db.session.commit()
+
+    login_user(test_client, downtime_team_user)
+    response = test_client.post(f"/downtime/process/{downtime_period.id}/dry-run", json={"seed": 4})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["dry_run"] is True
+    assert data["seed"] == 4
+    assert [pack["pack_id"] for pack in data["packs"]] == [downtime_pack.id]
+    assert "science" in data["timings"]
+
+    # Nothing is committed by a dry run
+    db.session.refresh(downtime_period)
+    assert downtime_period.status == DowntimeStatus.PENDING
+
+
+def test_process_downtime_dry_run_rejects_processed_period(
+    test_client, downtime_team_user, event, downtime_period, downtime_pack, db
+):
+    downtime_period.event_id = event.id
+    make_period_completed(db, downtime_period, downtime_pack)
+
+    login_user(test_client, downtime_team_user)
+    response = test_client.post(f"/downtime/process/{downtime_period.id}/dry-run")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "This downtime period has already been processed."
+
+
+def test_process_downtime_with_event(
+    test_client, downtime_team_user, event, downtime_period, downtime_pack, db
+):
+    downtime_period.event_id = event.id
+    downtime_pack.status = DowntimeTaskStatus.COMPLETED
+    db.session.commit()
+
+    login_user(test_client, downtime_team_user)
+    response = test_client.post(f"/downtime/process/{downtime_period.id}")
+    assert response.status_code == 302
+
+    db.session.refresh(downtime_period)
+    assert downtime_period.status == DowntimeStatus.COMPLETED
+    assert str(downtime_pack.id) in downtime_pack.character.character_pack["downtime_results"]
+
+
+def test_process_downtime_twice_is_rejected(
+    test_client, downtime_team_user, event, downtime_period, downtime_pack, db
+):
+    downtime_period.event_id = event.id
+    downtime_pack.status = DowntimeTaskStatus.COMPLETED
+    db.session.commit()
+    queue_downtime_job(downtime_period, downtime_team_user.id)
+
+    login_user(test_client, downtime_team_user)
+    response = test_client.post(f"/downtime/process/{downtime_period.id}/dry-run")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "This downtime period is already being processed."
+
+
+def test_downtime_job_status(
+    test_client, downtime_team_user, event, downtime_period, downtime_pack, db
+):
+    downtime_period.event_id = event.id
+    downtime_pack.status = DowntimeTaskStatus.COMPLETED
+    db.session.commit()
+
+    login_user(test_client, downtime_team_user)
+    test_client.post(f"/downtime/process/{downtime_period.id}")
+    job = DowntimeJob.query.filter_by(period_id=downtime_period.id).one()
+
+    response = test_client.get(f"/downtime/jobs/{job.id}")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["status"] == "completed"
+    assert data["processed_packs"] == data["total_packs"] == 1
+    assert data["progress_percent"] == 100
+    assert data["can_resume"] is False
+
+
+def test_downtime_job_status_unauthorized(
+    test_client, regular_user, downtime_team_user, downtime_period, db
+):
+    job = queue_downtime_job(downtime_period, downtime_team_user.id)
+
+    login_user(test_client, regular_user)
+    response = test_client.get(f"/downtime/jobs/{job.id}")
+    assert response.status_code == 403
+
+
+def test_resume_downtime_job_requires_failed_job(
+    test_client, downtime_team_user, downtime_period, db
+):
+    job = queue_downtime_job(downtime_period, downtime_team_user.id)
+
+    login_user(test_client, downtime_team_user)
+    response = test_client.post(f"/downtime/jobs/{job.id}/resume", follow_redirects=True)
+    assert b"This downtime job cannot be resumed." in response.data
+
+
+def test_resume_downtime_job(
+    test_client, downtime_team_user, event, downtime_period, downtime_pack, db
+):
+    downtime_period.event_id = event.id
+    downtime_pack.status = DowntimeTaskStatus.COMPLETED
+    db.session.commit()
+    job = queue_downtime_job(downtime_period, downtime_team_user.id)
+    job.status = DowntimeJobStatus.FAILED
+    job.error = "RuntimeError: boom"
+    db.session.commit()
+
+    login_user(test_client, downtime_team_user)
+    response = test_client.post(f"/downtime/jobs/{job.id}/resume")
+    assert response.status_code == 302
+
+    db.session.refresh(job)
+    assert job.status == DowntimeJobStatus.COMPLETED
+    assert job.error is None
+    db.session.refresh(downtime_period)
+    assert downtime_period.status == DowntimeStatus.COMPLETED
+
+
+def test_index_paginates_and_searches_packs(
+    test_client, downtime_team_user, downtime_period, downtime_pack, db, monkeypatch
+):
+    monkeypatch.setattr("routes.tools.downtime.PACKS_PER_PAGE", 1)
+    character = downtime_pack.character
+    other = Character(user_id=character.user_id, character_id=2, name="Zara Vex", status="active")
+    db.session.add(other)
+    db.session.flush()
+    db.session.add(
+        DowntimePack(
+            period_id=downtime_period.id,
+            character_id=other.id,
+            status=downtime_pack.status,
+        )
+    )
+    db.session.commit()
+
+    login_user(test_client, downtime_team_user)
+    response = test_client.get("/downtime/")
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "2 packs in this period" in html
+    assert character.name in html
+    assert "Zara Vex" not in html
+    assert "page=2" in html
+
+    response = test_client.get("/downtime/?q=zara")
+    html = response.get_data(as_text=True)
+    assert "Zara Vex" in html
+    assert character.name not in html
+
+    response = test_client.get(f"/downtime/?q={character.user_id}.2")
+    assert "Zara Vex" in response.get_data(as_text=True)
+
+
 def test_full_downtime_process(
     test_client, db, downtime_team_user, regular_user, downtime_period, downtime_pack
 ):
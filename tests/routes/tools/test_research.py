@@ -134,6 +134,26 @@ class TestResearchAssignees:
         assert response.status_code == 200
 
 
+class TestResearchOverview:
+    def test_overview_forbidden(self, test_client, regular_user):
+        login_user(test_client, regular_user)
+        response = test_client.get("/research/overview")
+        assert response.status_code == 403
+
+    def test_overview(
+        self,
+        test_client,
+        user_rules_team,
+        research_project_with_stage,
+        character_research_with_stage,
+    ):
+        login_user(test_client, user_rules_team)
+        response = test_client.get("/research/overview?science_type=bogus")
+        assert response.status_code == 200
+        assert research_project_with_stage.project_name.encode() in response.data
+        assert b"1 assignments" in response.data
+
+
 class TestResearchProjectInfo:
     def test_project_info_forbidden(
         self,
@@ -374,3 +374,20 @@ class TestTemplatesRoutes:
         assert template.width_mm == 100
         assert template.height_mm == 50
         assert template.is_landscape is True
+
+    def test_print_cache_stats(self, test_client, admin_user, db, app, tmp_path):
+        self.login_admin(test_client, admin_user)
+        resp = test_client.get("/templates/print/cache-stats")
+        assert resp.status_code == 200
+        assert resp.get_json() == {"enabled": False}
+
+        app.config["PRINT_CACHE_PATH"] = str(tmp_path)
+        try:
+            resp = test_client.get("/templates/print/cache-stats")
+            data = resp.get_json()
+            assert data["enabled"] is True
+            assert data["hits"] == 0
+            assert data["entries"] == 0
+        finally:
+            app.config["PRINT_CACHE_PATH"] = None
+            app.extensions.pop("pdf_cache", None)
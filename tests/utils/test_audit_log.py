@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.enums import AuditLogOwnerType, CharacterAuditAction, GroupAuditAction
+from models.event import Event
+from models.tools.audit_log_archive import AuditLogArchive
+from models.tools.character import CharacterAuditLog
+from models.tools.group import GroupAuditLog
+from utils.audit_log import archive_audit_logs, archived_page, audit_log_page, parse_actions
+
+CHARACTER = AuditLogOwnerType.CHARACTER
+
+
+def _log(db_session, character, editor, days_ago, action=CharacterAuditAction.EDIT):
+    entry = CharacterAuditLog(
+        character_id=character.id,
+        editor_user_id=editor.id,
+        timestamp=datetime.now() - timedelta(days=days_ago),
+        action=action,
+        changes=f"{days_ago} days ago",
+    )
+    db_session.add(entry)
+    return entry
+
+
+def _event(db_session, number, days_ago):
+    start = datetime.now() - timedelta(days=days_ago)
+    db_session.add(
+        Event(
+            event_number=number,
+            name=f"Event {number}",
+            event_type="mainline",
+            early_booking_deadline=start,
+            booking_deadline=start,
+            start_date=start,
+            end_date=start + timedelta(days=2),
+            location="Test Location",
+            standard_ticket_price=50.0,
+            early_booking_ticket_price=45.0,
+            child_ticket_price_12_15=25.0,
+            child_ticket_price_7_11=15.0,
+            child_ticket_price_under_7=0.0,
+        )
+    )
+
+
+def _walk(page_function, *args, limit):
+    """Every entry of a log, following the pages' cursors."""
+    changes, before = [], None
+    while True:
+        page = page_function(*args, before=before, limit=limit)
+        changes.append([entry.changes for entry in page["entries"]])
+        before = page["next_cursor"]
+        if before is None:
+            return changes
+
+
+def test_pages_follow_cursor_newest_first(db_session, character, admin_user):
+    """Test keyset pages cover the log once, newest first, including equal timestamps."""
+    entries = [_log(db_session, character, admin_user, days_ago) for days_ago in (1, 2, 3, 4, 5)]
+    same_time = _log(db_session, character, admin_user, 3)
+    same_time.timestamp, same_time.changes = entries[2].timestamp, "3 days ago too"
+    db_session.commit()
+
+    pages = _walk(audit_log_page, CHARACTER, character.id, (), limit=2)
+
+    assert sum(pages, []) == [
+        "1 days ago",
+        "2 days ago",
+        "3 days ago too",
+        "3 days ago",
+        "4 days ago",
+        "5 days ago",
+    ]
+    assert [len(page) for page in pages] == [2, 2, 2]
+
+
+def test_pages_filter_by_action(db_session, character, admin_user):
+    """Test only the selected actions are listed, and unknown action values are ignored."""
+    _log(db_session, character, admin_user, 1, CharacterAuditAction.FUNDS_ADDED)
+    _log(db_session, character, admin_user, 2)
+    _log(db_session, character, admin_user, 3, CharacterAuditAction.SKILL_CHANGE)
+    db_session.commit()
+
+    actions = parse_actions(CHARACTER, ["funds_added", "skill_change", "unknown"])
+    page = audit_log_page(CHARACTER, character.id, actions)
+
+    assert actions == [CharacterAuditAction.FUNDS_ADDED, CharacterAuditAction.SKILL_CHANGE]
+    assert [entry.changes for entry in page["entries"]] == ["1 days ago", "3 days ago"]
+    assert parse_actions(AuditLogOwnerType.GROUP, ["funds_withdrawn"]) == [
+        GroupAuditAction.FUNDS_WITHDRAWN
+    ]
+
+
+def test_archive_moves_entries_older_than_events(db_session, character, group, admin_user):
+    """Test entries from before the last N events are archived and stay readable."""
+    _event(db_session, "OLD", 60)
+    _event(db_session, "RECENT", 10)
+    _event(db_session, "FUTURE", -10)
+    for days_ago in (90, 70, 30, 5):
+        _log(db_session, character, admin_user, days_ago)
+    _log(db_session, character, admin_user, 80, CharacterAuditAction.FUNDS_ADDED)
+    db_session.add(
+        GroupAuditLog(
+            group_id=group.id,
+            editor_user_id=admin_user.id,
+            timestamp=datetime.now() - timedelta(days=20),
+            action=GroupAuditAction.FUNDS_ADDED,
+        )
+    )
+    db_session.commit()
+
+    summary = archive_audit_logs(1)
+
+    assert summary["character_entries"] == 4
+    assert summary["group_entries"] == 1
+    assert summary["total_archives"] == 2
+    live = audit_log_page(CHARACTER, character.id)
+    assert [entry.changes for entry in live["entries"]] == ["5 days ago"]
+
+    archived = _walk(archived_page, CHARACTER, character.id, (), limit=2)
+    assert sum(archived, []) == ["30 days ago", "70 days ago", "80 days ago", "90 days ago"]
+    filtered = archived_page(CHARACTER, character.id, [CharacterAuditAction.FUNDS_ADDED])
+    assert filtered["entries"][0].action == CharacterAuditAction.FUNDS_ADDED
+    assert filtered["entries"][0].editor.id == admin_user.id
+
+    # Archiving again finds nothing old enough and adds no batches
+    assert archive_audit_logs(1)["total_entries"] == 0
+    assert AuditLogArchive.query.filter_by(owner_type=CHARACTER).count() == 1
+
+
+def test_archive_keeps_everything_without_enough_events(db_session, character, admin_user):
+    """Test nothing is archived until N events have started."""
+    _log(db_session, character, admin_user, 400)
+    db_session.commit()
+
+    assert archive_audit_logs(3) == {"cutoff": None, "total_entries": 0, "total_archives": 0}
+    assert CharacterAuditLog.query.count() == 1
+    with pytest.raises(ValueError):
+        archive_audit_logs(0)
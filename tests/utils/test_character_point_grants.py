@@ -0,0 +1,104 @@
+import pytest
+
+from models.enums import TicketType
+from models.tools.character_point_grant import CharacterPointGrant, CharacterPointGrantEntry
+from models.tools.event_ticket import EventTicket
+from models.tools.user import User
+from utils.character_point_grants import (
+    grant_event_character_points,
+    parse_amounts,
+    preview_character_points,
+)
+
+
+def _ticket(event, user, ticket_type, assigned_by, character=None):
+    return EventTicket(
+        event_id=event.id,
+        user_id=user.id,
+        character_id=character.id if character else None,
+        ticket_type=ticket_type,
+        price_paid=0.0,
+        assigned_by_id=assigned_by.id,
+    )
+
+
+@pytest.fixture
+def crew_user(db_session):
+    user = User(email="crew@example.com", first_name="Crew", surname="Member", character_points=2)
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def tickets(db_session, event, character, crew_user, admin_user):
+    db_session.add_all(
+        [
+            _ticket(event, character.user, TicketType.ADULT, admin_user, character),
+            _ticket(event, character.user, TicketType.CHILD_7_11, admin_user),
+            _ticket(event, crew_user, TicketType.CREW, admin_user),
+        ]
+    )
+    db_session.commit()
+
+
+def test_parse_amounts():
+    """Test blank and zero amounts are dropped and invalid ones rejected."""
+    assert parse_amounts({"adult": "3", "crew": "1.5", "child_7_11": "", "child_12_15": "0"}) == {
+        "adult": 3.0,
+        "crew": 1.5,
+    }
+    with pytest.raises(ValueError, match="number"):
+        parse_amounts({"adult": "lots"})
+    with pytest.raises(ValueError, match="negative"):
+        parse_amounts({"adult": "-1"})
+
+
+def test_preview_sums_tickets_per_user_without_saving(
+    db_session, event, tickets, character, crew_user
+):
+    """Test the preview awards each ticket its type's points and changes nothing."""
+    preview = preview_character_points(event.id, {"adult": 3.0, "child_7_11": 1.0, "crew": 2.0})
+
+    rows = {row["user_id"]: row for row in preview["users"]}
+    assert rows[character.user_id]["tickets"] == 2
+    assert rows[character.user_id]["points"] == 4.0
+    assert rows[crew_user.id]["new_points"] == 4.0
+    assert preview["total_points"] == 6.0
+    assert preview["total_tickets"] == 3
+
+    # Holders whose tickets earn nothing are left out
+    preview = preview_character_points(event.id, {"crew": 2.0})
+    assert [row["user_id"] for row in preview["users"]] == [crew_user.id]
+    assert CharacterPointGrant.query.count() == 0
+
+
+def test_grant_awards_points_once(db_session, event, tickets, character, crew_user, admin_user):
+    """Test the grant raises every holder's points, records entries and cannot be repeated."""
+    player = character.user
+    before = player.character_points
+
+    report = grant_event_character_points(event.id, {"adult": 3.0, "crew": 2.0}, admin_user.id)
+
+    assert report["total_users"] == 2
+    assert report["total_points"] == 5.0
+    assert report["amounts"] == {"adult": 3.0, "crew": 2.0}
+    db_session.expire_all()
+    assert player.character_points == before + 3.0
+    assert crew_user.character_points == 4.0
+    entries = {entry.user_id: entry for entry in CharacterPointGrantEntry.query}
+    assert entries[player.id].tickets == 2
+    assert entries[crew_user.id].points == 2.0
+
+    with pytest.raises(ValueError, match="already granted"):
+        grant_event_character_points(event.id, {"adult": 3.0}, admin_user.id)
+    db_session.expire_all()
+    assert crew_user.character_points == 4.0
+    assert CharacterPointGrantEntry.query.count() == 2
+
+
+def test_grant_requires_amounts(db_session, event, tickets, admin_user):
+    """Test a grant without any points is refused and not recorded."""
+    with pytest.raises(ValueError, match="No character points"):
+        grant_event_character_points(event.id, {}, admin_user.id)
+    assert CharacterPointGrant.query.count() == 0
@@ -0,0 +1,142 @@
+import pytest
+
+from models.database.conditions import ConditionStage
+from models.enums import CharacterAuditAction, DowntimeStatus, TicketType
+from models.tools.character import CharacterAuditLog, CharacterCondition
+from models.tools.condition_progression_run import ConditionProgressionRun
+from models.tools.downtime import DowntimePeriod
+from models.tools.event_ticket import EventTicket
+from utils.condition_progression import ConditionProgression, progress_event_conditions
+
+
+def _stages(condition, *durations):
+    condition.stages = [
+        ConditionStage(stage_number=number, rp_effect="-", diagnosis="-", cure="-", duration=d)
+        for number, d in enumerate(durations, start=1)
+    ]
+
+
+def test_progress_advances_concludes_and_writes_in_bulk(
+    db_session, character, character_with_group, condition, admin_user
+):
+    """Test conditions count down, move to the next stage or conclude, and are written back."""
+    _stages(condition, 1, 3)
+    counting = CharacterCondition(
+        character_id=character.id, condition_id=condition.id, current_stage=1, current_duration=2
+    )
+    advancing = CharacterCondition(
+        character_id=character_with_group.id,
+        condition_id=condition.id,
+        current_stage=1,
+        current_duration=1,
+    )
+    db_session.add_all([counting, advancing])
+    db_session.commit()
+
+    progression, loaded = ConditionProgression.for_characters(
+        [character.id, character_with_group.id], admin_user.id
+    )
+    outcomes = [progression.progress(cc) for cc in loaded]
+
+    assert [outcome["message"] for outcome in outcomes] == [
+        f"Condition {condition.name} stage 1 has 1 events remaining",
+        f"Condition {condition.name} progressed to stage 2",
+    ]
+    # Progress is kept aside rather than left for the session to flush
+    assert not db_session.dirty
+
+    progression.write()
+    db_session.commit()
+    db_session.expire_all()
+    assert (counting.current_stage, counting.current_duration) == (1, 1)
+    assert (advancing.current_stage, advancing.current_duration) == (2, 3)
+    audit = CharacterAuditLog.query.filter_by(character_id=character_with_group.id).one()
+    assert audit.action == CharacterAuditAction.CONDITION_CHANGE
+    assert audit.editor_user_id == admin_user.id
+
+    advancing.current_stage, advancing.current_duration = 2, 1
+    counting.current_stage = 5
+    db_session.commit()
+    progression, loaded = ConditionProgression.for_characters(
+        [character.id, character_with_group.id], admin_user.id
+    )
+    outcomes = [progression.progress(cc) for cc in loaded]
+    assert outcomes[0] == {
+        "progressed": False,
+        "message": f"Invalid stage 5 for condition {condition.name}",
+        "completed": False,
+    }
+    assert outcomes[1]["completed"] is True
+    progression.write()
+    db_session.expire_all()
+    assert (advancing.current_stage, advancing.current_duration) == (None, 0)
+
+
+def test_progress_event_conditions(db_session, character, condition, event, admin_user):
+    """Test an event's attendees are progressed, unless the event has a downtime period."""
+    _stages(condition, 2)
+    db_session.add_all(
+        [
+            CharacterCondition(
+                character_id=character.id,
+                condition_id=condition.id,
+                current_stage=1,
+                current_duration=2,
+            ),
+            EventTicket(
+                event_id=event.id,
+                character_id=character.id,
+                user_id=character.user_id,
+                ticket_type=TicketType.ADULT,
+                price_paid=50.0,
+                assigned_by_id=admin_user.id,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    summary = progress_event_conditions(event.id, admin_user.id)
+
+    assert summary["total_conditions"] == 1
+    assert summary["total_characters"] == 1
+    assert summary["conditions"][0]["current_duration"] == 1
+    db_session.expire_all()
+    assert character.active_conditions[0].current_duration == 1
+
+    db_session.add(DowntimePeriod(status=DowntimeStatus.PENDING, event_id=event.id))
+    db_session.commit()
+    with pytest.raises(ValueError):
+        progress_event_conditions(event.id, admin_user.id)
+
+
+def test_progress_event_conditions_only_once(db_session, character, condition, event, admin_user):
+    """Test a second progression of the same event is refused and leaves conditions alone."""
+    _stages(condition, 3)
+    db_session.add_all(
+        [
+            CharacterCondition(
+                character_id=character.id,
+                condition_id=condition.id,
+                current_stage=1,
+                current_duration=3,
+            ),
+            EventTicket(
+                event_id=event.id,
+                character_id=character.id,
+                user_id=character.user_id,
+                ticket_type=TicketType.ADULT,
+                price_paid=50.0,
+                assigned_by_id=admin_user.id,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    progress_event_conditions(event.id, admin_user.id)
+    with pytest.raises(ValueError, match="already progressed"):
+        progress_event_conditions(event.id, admin_user.id)
+
+    db_session.expire_all()
+    assert character.active_conditions[0].current_duration == 2
+    run = ConditionProgressionRun.query.filter_by(event_id=event.id).one()
+    assert run.progressed_by_id == admin_user.id
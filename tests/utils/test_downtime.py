@@ -0,0 +1,156 @@
+from models.enums import DowntimeStatus, DowntimeTaskStatus, PackOwnerType, TicketType
+from models.extensions import db
+from models.tools.character import Character
+from models.tools.downtime import DowntimePack, DowntimePeriod
+from models.tools.event_ticket import EventTicket
+from models.tools.pack import Pack
+from models.tools.pack_change import PackChange
+from models.tools.pack_entry import PackEntry
+from utils.downtime import pack_search_query, pack_status_counts, start_downtime_period
+
+
+def test_start_downtime_period_resets_packs_and_creates_downtime_packs(
+    db_session, event, character, character_with_group, admin_user
+):
+    """Test non-empty packs are cleared in SQL and ticket holders get downtime packs."""
+    character.pack = Pack(items=[1, 2], energy_chits=5, completion={"item_1": True})
+    character.character_pack = {**character.character_pack, "messages": [{"id": 3}]}
+    group = character_with_group.group
+    group.pack = Pack(exotics=[4], is_generated=True)
+    empty = Character(
+        user_id=character.user_id, name="Empty Pack", status="active", character_pack=None
+    )
+    db_session.add(empty)
+    db_session.commit()
+    character_version = character.pack_version
+
+    # Character tickets, plus a second ticket for the same character and a crew ticket
+    for character_id in (character_with_group.id, character.id, character.id, None):
+        db_session.add(
+            EventTicket(
+                event_id=event.id,
+                character_id=character_id,
+                user_id=character.user_id,
+                ticket_type=TicketType.ADULT if character_id else TicketType.CREW,
+                price_paid=0.0,
+                assigned_by_id=admin_user.id,
+            )
+        )
+    db_session.commit()
+
+    period, report = start_downtime_period(event)
+    db_session.commit()
+
+    assert period.status == DowntimeStatus.PENDING
+    assert report["characters_reset"] == 1
+    assert report["groups_reset"] == 1
+    assert report["downtime_packs"] == 2
+    assert report["elapsed_ms"] >= 0
+
+    assert character.pack.to_dict() == Pack().to_dict()
+    assert character.character_pack["messages"] == [{"id": 3}]
+    assert character.pack_version == character_version + 1
+    assert character.pack_complete is False
+    assert group.pack.exotics == []
+    assert group.pack.is_generated is True
+    assert empty.character_pack is None
+
+    entries = PackEntry.query.filter_by(
+        owner_type=PackOwnerType.CHARACTER, owner_id=character.id
+    ).all()
+    assert {entry.kind for entry in entries} == {"character_sheet", "character_id_badge"}
+    assert not any(entry.completed for entry in entries)
+
+    downtime_packs = DowntimePack.query.filter_by(period_id=period.id).all()
+    assert sorted(pack.character_id for pack in downtime_packs) == sorted(
+        [character.id, character_with_group.id]
+    )
+    assert all(pack.status == DowntimeTaskStatus.ENTER_PACK for pack in downtime_packs)
+    assert downtime_packs[0].items == []
+
+    # Desks showing the event's packs are sent the cleared packs
+    changes = {
+        (change.owner_type, change.owner_id): change for change in PackChange.since(event.id, 0)
+    }
+    assert set(changes) == {
+        (PackOwnerType.CHARACTER, character.id),
+        (PackOwnerType.GROUP, group.id),
+    }
+    cleared = changes[(PackOwnerType.CHARACTER, character.id)]
+    assert cleared.replaced is True
+    assert cleared.pack_version == character.pack_version
+    assert cleared.is_completed is False
+    assert cleared.changes == {
+        "items": [],
+        "samples": [],
+        "exotics": [],
+        "medicaments": [],
+        "energy_chits": 0,
+        "completion": {},
+    }
+
+
+def test_start_downtime_period_skips_invalid_pack_json(db_session, event, group):
+    """Test unparseable pack JSON is left alone rather than failing the reset."""
+    group.group_pack = "invalid json"
+    db_session.commit()
+
+    _, report = start_downtime_period(event)
+    db_session.commit()
+
+    assert report["groups_reset"] == 0
+    assert group.group_pack == "invalid json"
+
+
+def test_pack_status_counts_and_search(db_session, new_user, regular_user):
+    """Test packs are counted per status and searched by name or player reference."""
+    period = DowntimePeriod(status=DowntimeStatus.PENDING)
+    other_period = DowntimePeriod(status=DowntimeStatus.PENDING)
+    db_session.add_all([period, other_period])
+    db_session.flush()
+    characters = []
+    for number, name in enumerate(["Zed", "Alice", "Bob"], start=1):
+        character = Character(user_id=new_user.id, character_id=number, name=name, status="active")
+        db_session.add(character)
+        characters.append(character)
+    other_character = Character(
+        user_id=regular_user.id, character_id=1, name="Alicia", status="active"
+    )
+    db_session.add(other_character)
+    db_session.flush()
+    for character in [*characters, other_character]:
+        db_session.add(
+            DowntimePack(
+                period_id=period.id,
+                character_id=character.id,
+                status=(
+                    DowntimeTaskStatus.MANUAL_REVIEW
+                    if character.name == "Bob"
+                    else DowntimeTaskStatus.ENTER_DOWNTIME
+                ),
+            )
+        )
+    db_session.add(
+        DowntimePack(
+            period_id=other_period.id,
+            character_id=characters[0].id,
+            status=DowntimeTaskStatus.ENTER_DOWNTIME,
+        )
+    )
+    db_session.commit()
+
+    assert pack_status_counts(period.id) == {"enter_downtime": 3, "manual_review": 1}
+
+    def names(search=None):
+        query = pack_search_query(period.id, DowntimeTaskStatus.ENTER_DOWNTIME, search)
+        return [pack.character.name for pack in db.session.scalars(query)]
+
+    assert names() == ["Alice", "Alicia", "Zed"]
+    assert names("ali") == ["Alice", "Alicia"]
+    assert names(f"{new_user.id}.1") == ["Zed"]
+    assert names(f"{new_user.id}.") == ["Alice", "Zed"]
+    assert names(f"{regular_user.id}") == ["Alicia"]
+    assert names("nobody") == []
+    # LIKE wildcards in the search match themselves
+    assert names("%") == []
+    assert names("_") == []
@@ -0,0 +1,471 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from models.database.conditions import ConditionStage
+from models.database.item import Item
+from models.database.mods import Mod
+from models.enums import (
+    DowntimeJobStatus,
+    DowntimeStatus,
+    DowntimeTaskStatus,
+    ResearchRequirementType,
+    ResearchType,
+    ScienceType,
+)
+from models.tools.character import Character, CharacterCondition
+from models.tools.downtime import DowntimeJob, DowntimePack, DowntimePeriod, utcnow
+from models.tools.research import (
+    CharacterResearch,
+    CharacterResearchStage,
+    CharacterResearchStageRequirement,
+    Research,
+    ResearchStage,
+    ResearchStageRequirement,
+)
+from utils.downtime_processor import (
+    PHASES,
+    DowntimeProcessor,
+    preview_downtime_period,
+    queue_downtime_job,
+    resume_downtime_job,
+    run_downtime_job,
+)
+
+
+@pytest.fixture
+def db_session(db):
+    """
+    Session whose rollbacks only undo work since its last commit.
+
+    The job runner rolls back a failed batch, which would otherwise discard the fixtures.
+    """
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+    )
+    db.session = session
+
+    yield session
+
+    session.remove()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def sent_emails(monkeypatch):
+    """Downtime result emails, recorded instead of sent."""
+    sent = []
+    monkeypatch.setattr(
+        "utils.downtime_processor.send_downtime_completed_notification",
+        lambda user, pack, character: sent.append(pack.id),
+    )
+    return sent
+
+
+@pytest.fixture
+def processing_period(
+    db_session, event, character, admin_user, item, item_blueprint, exotic_substance, condition
+):
+    """A period with one completed pack using every kind of downtime activity."""
+    character.bank_account = 100
+    mod = Mod(name="Overclocked", wiki_slug="overclocked")
+    db_session.add(mod)
+
+    # Research with a science stage the pack completes, and a second stage to advance to
+    research = Research(project_name="Warp Theory", type=ResearchType.INVENTION)
+    first = ResearchStage(stage_number=1, name="Foundations")
+    first.unlock_requirements = [
+        ResearchStageRequirement(
+            requirement_type=ResearchRequirementType.SCIENCE,
+            science_type=ScienceType.GENERIC,
+            amount=1,
+        ),
+        ResearchStageRequirement(
+            requirement_type=ResearchRequirementType.EXOTIC,
+            exotic_substance_id=exotic_substance.id,
+            amount=2,
+        ),
+    ]
+    research.stages = [first, ResearchStage(stage_number=2, name="Prototype")]
+    db_session.add(research)
+    db_session.flush()
+    progress = CharacterResearchStage(
+        stage_id=first.id,
+        requirement_progress=[
+            CharacterResearchStageRequirement(requirement_id=req.id, progress=0)
+            for req in first.unlock_requirements
+        ],
+    )
+    db_session.add(
+        CharacterResearch(
+            character_id=character.id,
+            research_id=research.id,
+            current_stage_id=first.id,
+            progress=[progress],
+        )
+    )
+
+    condition.stages = [
+        ConditionStage(stage_number=1, rp_effect="-", diagnosis="-", cure="-", duration=2)
+    ]
+    db_session.add(
+        CharacterCondition(
+            character_id=character.id,
+            condition_id=condition.id,
+            current_stage=1,
+            current_duration=2,
+        )
+    )
+
+    period = DowntimePeriod(status=DowntimeStatus.PENDING, event_id=event.id)
+    db_session.add(period)
+    db_session.flush()
+    db_session.add(
+        DowntimePack(
+            period_id=period.id,
+            character_id=character.id,
+            status=DowntimeTaskStatus.COMPLETED,
+            items=[str(item.id)],
+            exotic_substances=[{"id": str(exotic_substance.id), "amount": 3}],
+            modifications=[{"mod_id": str(mod.id), "type": "learning"}],
+            purchases=[{"blueprint_id": item_blueprint.id, "name": item_blueprint.name}],
+            engineering=[
+                {"action": "maintain", "source": "own", "item_id": str(item.id)},
+                {
+                    "action": "modify",
+                    "source": "own",
+                    "blueprint_id": str(item_blueprint.id),
+                    "mod_id": str(mod.id),
+                },
+            ],
+            science=[
+                {"action": "synthesize", "science_type": "generic"},
+                {
+                    "action": "research_project",
+                    "project_id": research.public_id,
+                    "science_type": "generic",
+                },
+                {"action": "theorise", "theorise_name": "Hover Boots"},
+            ],
+            research=[
+                {
+                    "project_id": research.public_id,
+                    "support_target": "self",
+                    "contributed_exotics": [{"id": exotic_substance.id, "quantity": 2}],
+                }
+            ],
+            review_data={"invention_review": "decline", "invention_response": "Too silly"},
+        )
+    )
+    db_session.commit()
+    return period
+
+
+def add_completed_pack(db_session, period, new_user, name):
+    other = Character(user_id=new_user.id, name=name, status="active")
+    db_session.add(other)
+    db_session.flush()
+    pack = DowntimePack(
+        period_id=period.id, character_id=other.id, status=DowntimeTaskStatus.COMPLETED
+    )
+    db_session.add(pack)
+    db_session.commit()
+    return pack
+
+
+def test_downtime_job_runs_every_phase(
+    db_session,
+    processing_period,
+    character,
+    admin_user,
+    item,
+    item_blueprint,
+    exotic_substance,
+    sent_emails,
+):
+    """Test each phase is applied and the results land in the character's pack."""
+    job = queue_downtime_job(processing_period, admin_user.id, seed=3)
+    assert job.status == DowntimeJobStatus.PENDING
+    assert job.total_packs == 1
+
+    job = run_downtime_job(job.id)
+
+    assert job.status == DowntimeJobStatus.COMPLETED
+    assert job.progress_percent == 100
+    assert set(job.timings) == {"preload", *PHASES, "flush"}
+    assert processing_period.status == DowntimeStatus.COMPLETED
+    pack_id = processing_period.packs[0].id
+    assert sent_emails == [pack_id]
+
+    results = character.character_pack["downtime_results"]
+    assert list(results) == [str(pack_id)]
+    assert [result["phase"] for result in results[str(pack_id)]] == [
+        "modifications",
+        "purchases",
+        "engineering",
+        "engineering",
+        "science",
+        "science",
+        "research",
+        "research",
+        "research",
+        "conditions",
+    ]
+
+    db_session.expire_all()
+    purchased = Item.query.filter(Item.blueprint_id == item_blueprint.id, Item.id != item.id).one()
+    assert purchased.item_id == 2
+    assert purchased.expiry == 1003
+    assert item.expiry == 1003
+    assert len(purchased.mods_applied) == 1
+    # Purchase 10, maintenance 1 and modification 5
+    assert character.bank_account == 84
+
+    character_research = CharacterResearch.query.filter_by(character_id=character.id).one()
+    assert character_research.current_stage.name == "Prototype"
+    assert character.active_conditions[0].current_duration == 1
+
+    pack = character.pack
+    assert sorted(pack.items) == sorted([item.id, purchased.id])
+    # One left over from the pack, plus the synthesized substance
+    assert pack.exotics == [exotic_substance.id, exotic_substance.id]
+    assert character.character_pack["messages"] == [
+        {"type": "invention_declined", "message": "Invention 'Hover Boots' was declined: Too silly"}
+    ]
+
+
+def test_queue_downtime_job_rejects_second_job(db_session, processing_period, admin_user):
+    """Test a period can only be queued for processing once."""
+    queue_downtime_job(processing_period, admin_user.id)
+
+    with pytest.raises(ValueError):
+        queue_downtime_job(processing_period, admin_user.id)
+
+
+def test_dry_run_commits_nothing_and_matches_real_run(
+    db_session, processing_period, character, admin_user, item_blueprint, sent_emails
+):
+    """Test a dry run reports the same results as the real run without writing them."""
+    items_before = Item.query.count()
+
+    preview = preview_downtime_period(processing_period, admin_user.id, seed=5)
+
+    assert preview["dry_run"] is True
+    assert set(preview["timings"]) == {"preload", *PHASES, "flush"}
+    assert Item.query.count() == items_before
+    db_session.refresh(processing_period)
+    db_session.refresh(character)
+    assert processing_period.status == DowntimeStatus.PENDING
+    assert character.bank_account == 100
+    assert "downtime_results" not in (character.character_pack or {})
+    assert sent_emails == []
+
+    job = queue_downtime_job(processing_period, admin_user.id, seed=5)
+    run_downtime_job(job.id)
+    results = character.character_pack["downtime_results"]
+    assert [results[str(pack["pack_id"])] for pack in preview["packs"]] == [
+        pack["results"] for pack in preview["packs"]
+    ]
+
+
+def test_dry_run_leaves_loaded_objects_unchanged(
+    db_session, processing_period, character, admin_user, sent_emails
+):
+    """Test objects loaded before a dry run read their stored values afterwards."""
+    requirements = CharacterResearchStageRequirement.query.order_by(
+        CharacterResearchStageRequirement.id
+    ).all()
+    condition = CharacterCondition.query.filter_by(character_id=character.id).one()
+
+    preview_downtime_period(processing_period, admin_user.id, seed=5)
+
+    assert [requirement.progress for requirement in requirements] == [0, 0]
+    assert condition.current_duration == 2
+
+
+def test_downtime_job_checkpoints_each_batch(
+    db_session, processing_period, new_user, admin_user, sent_emails, monkeypatch
+):
+    """Test every batch commits its pack ids together with a heartbeat."""
+    second = add_completed_pack(db_session, processing_period, new_user, "Second")
+    checkpoints = []
+    original_run = DowntimeProcessor.run
+
+    def run(self):
+        job = DowntimeJob.query.filter_by(period_id=processing_period.id).one()
+        checkpoints.append(list(job.processed_pack_ids))
+        return original_run(self)
+
+    monkeypatch.setattr(DowntimeProcessor, "run", run)
+
+    job = queue_downtime_job(processing_period, admin_user.id, seed=1)
+    job = run_downtime_job(job.id, batch_size=1)
+
+    first_id = processing_period.packs[0].id
+    assert checkpoints == [[], [first_id]]
+    assert job.processed_pack_ids == [first_id, second.id]
+    assert job.heartbeat_at is not None
+    assert sorted(sent_emails) == sorted([first_id, second.id])
+
+
+def test_failed_downtime_job_resumes_from_checkpoint(
+    db_session, processing_period, character, new_user, admin_user, sent_emails, monkeypatch
+):
+    """Test a failure keeps earlier batches, emails nobody, and resuming finishes the rest."""
+    second = add_completed_pack(db_session, processing_period, new_user, "Second")
+    first_id = processing_period.packs[0].id
+    original_conditions = DowntimeProcessor._phase_conditions
+
+    def failing_conditions(self):
+        if any(state.pack.id == second.id for state in self.states):
+            raise RuntimeError("Condition data is corrupt")
+        return original_conditions(self)
+
+    monkeypatch.setattr(DowntimeProcessor, "_phase_conditions", failing_conditions)
+
+    job = queue_downtime_job(processing_period, admin_user.id, seed=2)
+    job = run_downtime_job(job.id, batch_size=1)
+
+    assert job.status == DowntimeJobStatus.FAILED
+    assert job.error == "RuntimeError: Condition data is corrupt"
+    assert job.processed_pack_ids == [first_id]
+    assert job.can_resume
+    assert processing_period.status == DowntimeStatus.PENDING
+    assert sent_emails == []
+    # The first pack's results were committed and are not applied again on resume
+    assert list(character.character_pack["downtime_results"]) == [str(first_id)]
+    bank_account = character.bank_account
+
+    monkeypatch.setattr(DowntimeProcessor, "_phase_conditions", original_conditions)
+    assert resume_downtime_job(job)
+    assert job.status == DowntimeJobStatus.PENDING
+    job = run_downtime_job(job.id, batch_size=1)
+
+    assert job.status == DowntimeJobStatus.COMPLETED
+    assert job.error is None
+    assert job.processed_pack_ids == [first_id, second.id]
+    assert processing_period.status == DowntimeStatus.COMPLETED
+    assert character.bank_account == bank_account
+    assert sorted(sent_emails) == sorted([first_id, second.id])
+
+
+def test_running_downtime_job_is_only_resumable_once_stale(
+    db_session, processing_period, admin_user
+):
+    """Test a running job cannot be resumed or run twice until its heartbeat times out."""
+    job = queue_downtime_job(processing_period, admin_user.id)
+    job.status = DowntimeJobStatus.RUNNING
+    job.heartbeat_at = utcnow()
+    db_session.commit()
+
+    assert not job.can_resume
+    assert not resume_downtime_job(job)
+    assert run_downtime_job(job.id) is None
+
+    job.heartbeat_at = utcnow() - DowntimeJob.HEARTBEAT_TIMEOUT - timedelta(seconds=1)
+    db_session.commit()
+
+    assert job.is_stale()
+    assert resume_downtime_job(job)
+    assert run_downtime_job(job.id).status == DowntimeJobStatus.COMPLETED
+
+
+def test_downtime_job_timeout_is_sized_to_its_batches(db_session, processing_period, admin_user):
+    """Test a runner is only seen as stale once its batch has had time for every pack."""
+    job = queue_downtime_job(processing_period, admin_user.id)
+    job.status = DowntimeJobStatus.RUNNING
+    job.batch_size = 25
+    job.heartbeat_at = utcnow() - DowntimeJob.HEARTBEAT_TIMEOUT - timedelta(minutes=1)
+    db_session.commit()
+
+    assert job.heartbeat_timeout == DowntimeJob.HEARTBEAT_TIMEOUT + DowntimeJob.PACK_TIMEOUT * 25
+    assert not job.is_stale()
+    assert job.is_stale(now=utcnow() + DowntimeJob.PACK_TIMEOUT * 25)
+
+
+def test_downtime_job_taken_over_mid_batch_rolls_back(
+    db_session, processing_period, character, new_user, admin_user, sent_emails, monkeypatch
+):
+    """Test a runner whose job was resumed elsewhere discards its batch instead of committing."""
+    add_completed_pack(db_session, processing_period, new_user, "Second")
+    bank_account = character.bank_account
+    original_run = DowntimeProcessor.run
+
+    def run(self):
+        report = original_run(self)
+        # Another runner resumes the job as stale and claims it while this batch is running
+        DowntimeJob.query.filter_by(period_id=processing_period.id).update(
+            {"heartbeat_at": utcnow() + timedelta(seconds=1)}
+        )
+        return report
+
+    monkeypatch.setattr(DowntimeProcessor, "run", run)
+
+    job = queue_downtime_job(processing_period, admin_user.id, seed=1)
+    assert run_downtime_job(job.id, batch_size=1) is None
+
+    db_session.expire_all()
+    assert job.status == DowntimeJobStatus.RUNNING
+    assert job.processed_pack_ids == []
+    assert character.bank_account == bank_account
+    assert "downtime_results" not in (character.character_pack or {})
+    assert processing_period.status == DowntimeStatus.PENDING
+    assert sent_emails == []
+
+
+def test_phases_run_on_preloaded_state(db_session, processing_period, admin_user):
+    """Test no phase goes back to the database once everything has been preloaded."""
+    from sqlalchemy import event as sa_event
+
+    processor = DowntimeProcessor(processing_period, admin_user.id, seed=1)
+    processor.load()
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    sa_event.listen(engine, "before_cursor_execute", count)
+    try:
+        for name in PHASES:
+            processor.phase = name
+            getattr(processor, f"_phase_{name}")()
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", count)
+
+    assert statements == []
+
+
+def test_approved_invention_creates_research(
+    db_session, processing_period, character, admin_user, sent_emails
+):
+    """Test an approved theory becomes a new research project assigned to the character."""
+    pack = processing_period.packs[0]
+    pack.review_data = {
+        "invention_review": "approve",
+        "invention_type": "new",
+        "invention_name": "Hover Boots",
+        "invention_description": "Boots that hover",
+        "stages_json": (
+            '[{"stage_number": 1, "name": "Lift", "unlock_requirements": '
+            '[{"requirement_type": "science", "science_type": "etheric", "amount": 2}]}]'
+        ),
+    }
+    db_session.commit()
+
+    job = queue_downtime_job(processing_period, admin_user.id)
+    run_downtime_job(job.id)
+
+    research = Research.query.filter_by(project_name="Hover Boots").one()
+    assert research.type == ResearchType.INVENTION
+    assert [stage.name for stage in research.stages] == ["Lift"]
+    character_research = CharacterResearch.query.filter_by(research_id=research.id).one()
+    assert character_research.character_id == character.id
+    assert character_research.current_stage_id == research.stages[0].id
+    results = character.character_pack["downtime_results"][str(pack.id)]
+    assert {"phase": "manual_entries", "message": "New project confirmed: Hover Boots"} in results
@@ -0,0 +1,197 @@
+import pytest
+from sqlalchemy import event as sa_event
+
+from models.database.item import Item
+from models.enums import CharacterStatus, DowntimeTaskStatus
+from models.tools.character import Character, CharacterReputation
+from models.tools.downtime import DowntimePack
+from models.tools.research import CharacterResearch
+from utils.downtime_wizard import (
+    WIZARD_STEPS,
+    blueprint_catalog,
+    catalog_etag,
+    mod_catalog,
+    step_data,
+)
+
+
+@pytest.fixture
+def group_pack(db_session, character_with_group, downtime_period, item, exotic_substance):
+    """A downtime pack for a grouped character, and a second group member with a pack."""
+    member = Character(
+        user_id=character_with_group.user_id,
+        name="Another Member",
+        status=CharacterStatus.ACTIVE.value,
+        group_id=character_with_group.group_id,
+    )
+    db_session.add(member)
+    db_session.flush()
+    member_item = Item(blueprint_id=item.blueprint_id, item_id=2)
+    db_session.add(member_item)
+    db_session.flush()
+    db_session.add(
+        DowntimePack(
+            period_id=downtime_period.id,
+            character_id=member.id,
+            status=DowntimeTaskStatus.ENTER_DOWNTIME,
+            items=[member_item.id],
+        )
+    )
+    pack = DowntimePack(
+        period_id=downtime_period.id,
+        character_id=character_with_group.id,
+        status=DowntimeTaskStatus.ENTER_DOWNTIME,
+        items=[item.id],
+        exotic_substances=[{"id": exotic_substance.id, "amount": 2}],
+    )
+    db_session.add(pack)
+    db_session.commit()
+    return pack
+
+
+def count_queries(db_session, callback):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    sa_event.listen(engine, "before_cursor_execute", count)
+    try:
+        result = callback()
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", count)
+    return result, len(statements)
+
+
+def test_catalogs(db_session, item_blueprint, mod):
+    """Test catalogs list every blueprint and mod, with an ETag that follows the content."""
+    blueprints = blueprint_catalog()
+    assert blueprints == [
+        {
+            "id": item_blueprint.id,
+            "name": item_blueprint.name,
+            "base_cost": item_blueprint.base_cost,
+        }
+    ]
+    assert mod_catalog() == [{"id": mod.id, "name": mod.name}]
+
+    etag = catalog_etag(blueprints)
+    assert catalog_etag(blueprint_catalog()) == etag
+    item_blueprint.base_cost += 1
+    db_session.commit()
+    assert catalog_etag(blueprint_catalog()) != etag
+
+
+def test_engineering_step_loads_own_and_group_items(
+    db_session, group_pack, character_with_group, item
+):
+    """Test engineering lists the character's items and the rest of the group's pack items."""
+    data = step_data("engineering", character_with_group, group_pack)
+
+    assert data["catalogs"] == ["mods"]
+    assert data["pack_items"] == [
+        {
+            "id": item.id,
+            "name": item.blueprint.name,
+            "type": item.blueprint.item_type.id,
+            "full_code": item.full_code,
+        }
+    ]
+    assert [entry["full_code"] for entry in data["group_items"]] == [
+        f"{item.blueprint.full_code}-002"
+    ]
+
+
+def test_step_queries_do_not_grow_with_pack_size(
+    db_session, group_pack, character_with_group, item
+):
+    """Test items are loaded in batches rather than one query each."""
+    db_session.expire_all()
+    _, queries = count_queries(
+        db_session, lambda: step_data("engineering", character_with_group, group_pack)
+    )
+
+    for number in range(3, 13):
+        extra = Item(blueprint_id=item.blueprint_id, item_id=number)
+        db_session.add(extra)
+        db_session.flush()
+        group_pack.items = group_pack.items + [extra.id]
+    db_session.commit()
+    db_session.expire_all()
+
+    data, more_queries = count_queries(
+        db_session, lambda: step_data("engineering", character_with_group, group_pack)
+    )
+    assert len(data["pack_items"]) == 11
+    assert more_queries == queries
+
+
+def test_research_steps_load_projects_members_and_exotics(
+    db_session, group_pack, character_with_group, research_project, exotic_substance
+):
+    """Test science and research list the group's projects, members and the pack's exotics."""
+    member = Character.query.filter_by(name="Another Member").one()
+    db_session.add(CharacterResearch(character_id=member.id, research_id=research_project.id))
+    db_session.commit()
+
+    science = step_data("science", character_with_group, group_pack)
+    assert science["my_projects"] == []
+    assert science["group_projects"] == [
+        {
+            "research_id": research_project.public_id,
+            "project_name": research_project.project_name,
+            "character_name": "Another Member",
+        }
+    ]
+    assert science["group_members"] == [
+        {"id": member.id, "user_id": member.user_id, "name": "Another Member"}
+    ]
+
+    research = step_data("research", character_with_group, group_pack)
+    assert research["exotics"] == [
+        {"id": exotic_substance.id, "name": exotic_substance.name, "amount": 2}
+    ]
+    assert len(research["pack_items"]) == 1
+
+
+def test_research_step_skips_malformed_exotics(
+    db_session, group_pack, character_with_group, exotic_substance
+):
+    """Test exotic entries without a usable id are left out instead of failing the step."""
+    group_pack.exotic_substances = [
+        {"amount": 1},
+        {"id": "not a number", "amount": 1},
+        "stray",
+        {"id": str(exotic_substance.id)},
+    ]
+    db_session.commit()
+
+    research = step_data("research", character_with_group, group_pack)
+    assert research["exotics"] == [
+        {"id": str(exotic_substance.id), "name": exotic_substance.name, "amount": None}
+    ]
+
+
+def test_reputation_step_lists_factions_with_reputation(
+    db_session, downtime_pack_enter_downtime, character_with_faction, faction
+):
+    """Test only factions the character has positive reputation with are offered."""
+    character = character_with_faction
+    assert step_data("reputation", character, downtime_pack_enter_downtime)["factions"] == []
+
+    db_session.add(CharacterReputation(character_id=character.id, faction_id=faction.id, value=2))
+    db_session.commit()
+    assert step_data("reputation", character, downtime_pack_enter_downtime)["factions"] == [
+        {"id": faction.id, "name": faction.name}
+    ]
+
+
+def test_every_step_has_data(db_session, downtime_pack_enter_downtime, character_with_faction):
+    """Test each wizard step returns data, and unknown steps are rejected."""
+    for step in WIZARD_STEPS:
+        data = step_data(step, character_with_faction, downtime_pack_enter_downtime)
+        assert "catalogs" in data
+
+    with pytest.raises(KeyError):
+        step_data("cooking", character_with_faction, downtime_pack_enter_downtime)
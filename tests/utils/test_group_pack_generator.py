@@ -0,0 +1,138 @@
+import pytest
+
+from models.database.exotic_substances import ExoticSubstance
+from models.database.global_settings import GlobalSettings
+from models.database.item_blueprint import ItemBlueprint
+from models.database.species import Ability
+from models.enums import AbilityType, ScienceType, TicketType
+from models.tools.character import Character
+from models.tools.event_ticket import EventTicket
+from models.tools.pack import Pack
+from utils.group_pack_generator import GroupPackGenerator, generate_event_group_packs
+
+
+@pytest.fixture
+def attending_group(db_session, event, group, character_with_group, species, admin_user, item_type):
+    """A group with two attending characters and a catalogue to draw income from."""
+    db_session.add(GlobalSettings(character_income_ec=30, group_income_contribution=30))
+    db_session.add(
+        Ability(
+            species_id=species.id,
+            name="Traders",
+            description="Extra group income",
+            type=AbilityType.GROUP_INCOME,
+            additional_group_income=10,
+        )
+    )
+    second = Character(
+        user_id=character_with_group.user_id,
+        name="Second Group Character",
+        status="active",
+        species_id=species.id,
+        group_id=group.id,
+    )
+    db_session.add(second)
+    blueprints = [
+        ItemBlueprint(
+            name=f"Income Blueprint {index}",
+            item_type_id=item_type.id,
+            blueprint_id=100 + index,
+            base_cost=4,
+            purchaseable=True,
+        )
+        for index in range(6)
+    ]
+    db_session.add_all(blueprints)
+    db_session.add_all(
+        ExoticSubstance(
+            name=f"Income Substance {index}",
+            type=ScienceType.GENERIC.value,
+            wiki_slug=f"income-substance-{index}",
+        )
+        for index in range(5)
+    )
+    db_session.commit()
+
+    group.group_type.income_items_list = [bp.id for bp in blueprints]
+    group.group_type.income_substances = True
+    group.group_type.income_substance_cost = 5
+    group.group_type.income_distribution_dict = {"items": 50, "exotics": 25, "chits": 25}
+    for character in (character_with_group, second):
+        db_session.add(
+            EventTicket(
+                event_id=event.id,
+                character_id=character.id,
+                user_id=character.user_id,
+                ticket_type=TicketType.ADULT,
+                price_paid=50.0,
+                assigned_by_id=admin_user.id,
+            )
+        )
+    db_session.commit()
+    return group
+
+
+def test_generate_event_group_packs_summary(db_session, event, attending_group):
+    """Test every attending group is generated in one pass with a summary of the result."""
+    summary = generate_event_group_packs(event.id, seed=42)
+
+    assert summary["seed"] == 42
+    assert summary["total_groups"] == 1
+    assert summary["total_characters"] == 2
+    row = summary["groups"][0]
+    # 30 EC per character plus 10 from the species group income ability
+    assert row["ec_pool"] == 80
+    # 40 EC of items at 2 EC each after the group discount, but only 6 blueprints to draw
+    assert row["items_added"] == 6
+    assert row["exotics"] == 4
+
+    db_session.expire(attending_group)
+    pack = attending_group.pack
+    assert pack.is_generated is True
+    assert len(pack.items) == 6
+    assert len(pack.exotics) == 4
+    assert pack.energy_chits == row["energy_chits"] == 28 + 0 + 20
+    assert summary["total_energy_chits"] == pack.energy_chits
+
+
+def test_generate_event_group_packs_is_reproducible(db_session, event, attending_group):
+    """Test the same seed draws the same allocation."""
+    attending_group.group_type.income_distribution_dict = {"exotics": 100}
+    db_session.commit()
+
+    generate_event_group_packs(event.id, seed=7)
+    first = list(attending_group.pack.exotics)
+
+    attending_group.pack = Pack()
+    db_session.commit()
+    generate_event_group_packs(event.id, seed=7)
+    assert attending_group.pack.exotics == first
+
+
+def test_generator_shares_preloaded_catalogues(db_session, event, attending_group):
+    """Test catalogues are loaded once and generation does not query them again."""
+    from sqlalchemy import event as sa_event
+
+    characters = GroupPackGenerator.attending_characters(event.id)
+    generator = GroupPackGenerator.load([attending_group], seed=1)
+    db_session.flush()
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    sa_event.listen(engine, "before_cursor_execute", count)
+    try:
+        generator.generate(attending_group, characters[attending_group.id])
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", count)
+
+    assert statements == []
+
+
+def test_generate_event_group_packs_requires_settings(db_session, event):
+    """Test a missing global settings row is reported before anything is generated."""
+    with pytest.raises(ValueError):
+        generate_event_group_packs(event.id)
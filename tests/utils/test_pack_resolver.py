@@ -0,0 +1,80 @@
+from models.enums import TicketType
+from models.tools.event_ticket import EventTicket
+from models.tools.pack import Pack
+from utils.pack_resolver import EventPackResolver
+
+
+def _add_ticket(db_session, event, character, assigned_by):
+    ticket = EventTicket(
+        event_id=event.id,
+        character_id=character.id,
+        user_id=character.user_id,
+        ticket_type=TicketType.ADULT,
+        price_paid=50.0,
+        assigned_by_id=assigned_by.id,
+    )
+    db_session.add(ticket)
+    db_session.commit()
+    return ticket
+
+
+def test_resolver_loads_attendee_and_group_packs(
+    db_session, event, character, character_with_group, item, medicament, admin_user
+):
+    """Test attendees and groups are resolved with only referenced catalogue entries."""
+    pack = Pack()
+    pack.add_item(item.id)
+    pack.add_medicament(medicament.id)
+    character.pack = pack
+    group = character_with_group.group
+    group_pack = Pack()
+    group_pack.add_medicament(medicament.id)
+    group.group_pack = group_pack.to_json()
+    db_session.commit()
+
+    _add_ticket(db_session, event, character, admin_user)
+    _add_ticket(db_session, event, character_with_group, admin_user)
+
+    resolver = EventPackResolver(event.id)
+
+    assert {entry["character"].id for entry in resolver.character_packs} == {
+        character.id,
+        character_with_group.id,
+    }
+    assert [entry["group"].id for entry in resolver.group_packs] == [group.id]
+    assert resolver.group_packs[0]["characters"][0]["character"]["name"] == "Group Character"
+    assert set(resolver.items) == {item.id}
+    assert resolver.items[item.id].blueprint is not None
+    assert set(resolver.medicaments) == {medicament.id}
+    assert resolver.exotics == {}
+    assert resolver.samples == {}
+
+
+def test_resolver_incomplete_skips_completed_packs(
+    db_session, event, character, item, medicament, admin_user
+):
+    """Test only packs without the completion flag contribute printable objects."""
+    pack = Pack()
+    pack.add_item(item.id)
+    pack.add_medicament(medicament.id)
+    pack.set_completion("medicaments", True)
+    character.pack = pack
+    db_session.commit()
+    _add_ticket(db_session, event, character, admin_user)
+
+    resolver = EventPackResolver(event.id)
+
+    assert resolver.incomplete("items") == [item]
+    assert resolver.incomplete("medicaments") == []
+
+
+def test_view_packs_with_group_attendee(
+    test_client, db_session, event, character_with_group, admin_user
+):
+    """Test the packs page renders when a group member is attending."""
+    _add_ticket(db_session, event, character_with_group, admin_user)
+
+    response = test_client.get(f"/events/{event.id}/packs")
+
+    assert response.status_code == 200
+    assert b"Group Character" in response.data
@@ -0,0 +1,108 @@
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utils.pdf_cache import PdfCache, pdf_cache_key
+from utils.print_layout import PrintLayout
+
+
+@pytest.fixture
+def template():
+    """Create a stand-in PrintTemplate with layout settings."""
+    return SimpleNamespace(
+        id=1,
+        updated_at="2025-01-01 00:00:00",
+        width_mm=85.6,
+        height_mm=53.98,
+        is_landscape=False,
+        has_back_side=False,
+        items_per_row=2,
+        items_per_column=3,
+        margin_top_mm=10.0,
+        margin_bottom_mm=10.0,
+        margin_left_mm=10.0,
+        margin_right_mm=10.0,
+        gap_horizontal_mm=2.0,
+        gap_vertical_mm=2.0,
+        type="item_card",
+    )
+
+
+@pytest.fixture
+def items():
+    return [{"width_mm": 85.6, "height_mm": 53.98, "front_html": "<p>A</p>", "css": "p {}"}]
+
+
+def test_cache_key_changes_with_inputs(template, items):
+    """Test the key covers template version, layout settings and item HTML."""
+    key = pdf_cache_key(template, items, False)
+    assert key == pdf_cache_key(template, [dict(items[0])], False)
+    assert key != pdf_cache_key(template, items, True)
+
+    changed_items = [dict(items[0], front_html="<p>B</p>")]
+    assert key != pdf_cache_key(template, changed_items, False)
+
+    template.margin_top_mm = 12.0
+    assert key != pdf_cache_key(template, items, False)
+    template.margin_top_mm = 10.0
+
+    template.updated_at = "2025-02-01 00:00:00"
+    assert key != pdf_cache_key(template, items, False)
+
+
+def test_cache_hit_and_miss(tmp_path):
+    """Test cached bytes are returned and hit rates are reported."""
+    cache = PdfCache(str(tmp_path))
+    assert cache.get("abc") is None
+    cache.put("abc", b"%PDF-1.4 data")
+    assert cache.get("abc") == b"%PDF-1.4 data"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["entries"] == 1
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test the cache stays within its size bound by dropping the oldest entries."""
+    cache = PdfCache(str(tmp_path), max_bytes=25)
+    cache.put("first", b"x" * 10)
+    cache.put("second", b"y" * 10)
+
+    # Make "first" the most recently used entry
+    past = time.time() - 60
+    os.utime(os.path.join(str(tmp_path), "second.pdf"), (past, past))
+    assert cache.get("first") is not None
+
+    cache.put("third", b"z" * 10)
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+    assert cache.stats()["size_bytes"] <= 25
+
+
+@patch("utils.print_layout.HTML")
+@patch("utils.print_layout.PrintTemplate")
+def test_generate_pdf_uses_cache(mock_print_template, mock_html, tmp_path, template, items):
+    """Test a repeated print job is served from the cache without rendering."""
+    mock_print_template.query.filter_by.return_value.first.return_value = template
+
+    def write_pdf(target=None, **kwargs):
+        target.write(b"%PDF-1.4 rendered")
+
+    mock_html.return_value = MagicMock(write_pdf=MagicMock(side_effect=write_pdf))
+    layout = PrintLayout(pdf_cache=PdfCache(str(tmp_path)))
+
+    first = layout.generate_pdf(items, template)
+    second = layout.generate_pdf(items, template)
+
+    assert first.read() == second.read() == b"%PDF-1.4 rendered"
+    mock_html.assert_called_once()
+    assert layout.pdf_cache.stats()["hits"] == 1
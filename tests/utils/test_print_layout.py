@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from models.enums import PrintTemplateType
-from utils.print_layout import PrintLayout
+from utils.print_layout import PrintLayout, _cached_url_fetcher
 
 
 @pytest.fixture
@@ -248,3 +248,52 @@ def test_generate_print_html_no_items(print_layout):
     """Test HTML generation with no items."""
     with pytest.raises(ValueError, match="No items provided for layout calculation"):
         print_layout._generate_print_html([], PrintTemplateType.ITEM_CARD)
+
+
+@patch("utils.print_layout.PrintTemplate")
+def test_generate_print_html_emits_stylesheet_once(
+    mock_print_template, print_layout, mock_template
+):
+    """Test shared stylesheets are emitted once rather than once per item."""
+    mock_print_template.query.filter_by.return_value.first.return_value = mock_template
+    layout = print_layout.calculate_layout(85.6, 53.98, mock_template)
+    css = ".item-card { color: #123456; }"
+    pages = [
+        [
+            {
+                "width_mm": 85.6,
+                "height_mm": 53.98,
+                "html": f"<div>Item {page}-{idx}</div>",
+                "css": css,
+                "position": position,
+                "layout": layout,
+            }
+            for idx, position in enumerate(layout["positions"])
+        ]
+        for page in range(3)
+    ]
+
+    html = print_layout._generate_print_html(pages, PrintTemplateType.ITEM_CARD)
+
+    assert html.count(css) == 1
+    assert html.count("width: 85.6mm; height: 53.98mm;") == 1
+    assert html.count('class="item item-size-0"') == 18
+    assert html.index(css) < html.index("</head>")
+
+
+@patch("utils.print_layout.HTML")
+@patch("utils.print_layout.PrintTemplate")
+def test_generate_pdf_reuses_render_resources(
+    mock_print_template, mock_html, print_layout, mock_template
+):
+    """Test font configuration and image cache are shared between renders."""
+    mock_print_template.query.filter_by.return_value.first.return_value = mock_template
+    items = [{"width_mm": 85.6, "height_mm": 53.98, "front_html": "<div>Item</div>"}]
+
+    print_layout.generate_pdf(items, mock_template)
+    print_layout.generate_pdf(items, mock_template)
+
+    first_call, second_call = mock_html.return_value.write_pdf.call_args_list
+    assert first_call.kwargs["font_config"] is second_call.kwargs["font_config"]
+    assert first_call.kwargs["cache"] is second_call.kwargs["cache"]
+    assert mock_html.call_args.kwargs["url_fetcher"] is _cached_url_fetcher
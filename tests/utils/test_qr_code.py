@@ -0,0 +1,46 @@
+import base64
+
+import pytest
+
+from utils import _render_qr_code, generate_qr_code, generate_web_qr_code
+
+
+def test_generate_qr_code_png():
+    """Test PNG QR codes are returned as data URLs."""
+    result = generate_qr_code("https://example.com/items/1")
+    assert result.startswith("data:image/png;base64,")
+    assert base64.b64decode(result.split(",", 1)[1]).startswith(b"\x89PNG")
+
+
+def test_generate_qr_code_svg():
+    """Test SVG QR codes are returned as vector data URLs."""
+    result = generate_qr_code("https://example.com/items/1", format="svg")
+    assert result.startswith("data:image/svg+xml;base64,")
+    assert b"<svg" in base64.b64decode(result.split(",", 1)[1])
+
+
+def test_generate_qr_code_is_memoized():
+    """Test identical codes are only rendered once."""
+    _render_qr_code.cache_clear()
+
+    first = generate_qr_code("ITEM-0001", size=3)
+    second = generate_qr_code("ITEM-0001", size=3)
+    generate_qr_code("ITEM-0001", size=4)
+
+    assert first == second
+    info = _render_qr_code.cache_info()
+    assert info.hits == 1
+    assert info.misses == 2
+
+
+def test_generate_qr_code_invalid_format():
+    """Test unsupported formats are rejected."""
+    with pytest.raises(ValueError, match="Unsupported QR code format"):
+        generate_qr_code("data", format="gif")
+
+
+def test_generate_web_qr_code_svg(app):
+    """Test web QR codes resolve the route and support SVG output."""
+    with app.test_request_context():
+        result = generate_web_qr_code("index", format="svg")
+    assert result.startswith("data:image/svg+xml;base64,")
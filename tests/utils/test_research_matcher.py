@@ -0,0 +1,79 @@
+from models.database.sample import Sample, SampleTag
+from models.enums import ResearchRequirementType, ResearchType, ScienceType
+from models.tools.research import (
+    CharacterResearchStageRequirement,
+    Research,
+    ResearchStage,
+    ResearchStageRequirement,
+)
+from utils.research_matcher import RequirementMatcher, sample_keys, science_keys
+
+
+def test_matcher_fills_requirements_in_stage_order_and_writes_in_bulk(db_session, character):
+    """Test contributions fill the first open matching requirement and are written back."""
+    research = Research(project_name="Matched Project", type=ResearchType.ARTEFACT)
+    research.stages.append(
+        ResearchStage(
+            stage_number=1,
+            name="Stage 1",
+            unlock_requirements=[
+                ResearchStageRequirement(
+                    requirement_type=ResearchRequirementType.SAMPLE,
+                    sample_tag="blood",
+                    requires_researched=True,
+                    amount=1,
+                ),
+                ResearchStageRequirement(
+                    requirement_type=ResearchRequirementType.SCIENCE,
+                    science_type=ScienceType.LIFE,
+                    amount=2,
+                ),
+                ResearchStageRequirement(
+                    requirement_type=ResearchRequirementType.SAMPLE,
+                    sample_tag="blood",
+                    amount=1,
+                ),
+            ],
+        )
+    )
+    db_session.add(research)
+    db_session.commit()
+    character_research = research.assign_character(character.id)
+    db_session.commit()
+    progress = character_research.get_current_stage()
+    researched, life, unresearched = progress.requirement_progress
+
+    tag = SampleTag(name="blood")
+    fresh = Sample(name="Fresh", type=ScienceType.LIFE, tags=[tag])
+    studied = Sample(name="Studied", type=ScienceType.LIFE, tags=[tag], is_researched=True)
+    db_session.add_all([fresh, studied])
+    db_session.commit()
+
+    matcher = RequirementMatcher()
+    assert matcher.match(progress, sample_keys(fresh)) is unresearched
+    assert matcher.match(progress, sample_keys(studied)) is researched
+    matcher.add(researched, 1)
+    assert matcher.match(progress, sample_keys(studied)) is unresearched
+
+    for _ in range(3):
+        requirement_progress = matcher.match(progress, science_keys(ScienceType.LIFE))
+        if requirement_progress is not None:
+            matcher.add(requirement_progress, 1)
+    assert matcher.match(progress, science_keys(ScienceType.CORPOREAL)) is None
+
+    # Stored rows are changed by the bulk write, not by the session's own flush
+    assert not db_session.dirty
+    matcher.write()
+    db_session.expire_all()
+    stored = {
+        row.requirement_id: row.progress
+        for row in CharacterResearchStageRequirement.query.filter_by(
+            character_research_stage_id=progress.id
+        )
+    }
+    assert stored == {
+        researched.requirement_id: 1,
+        life.requirement_id: 2,
+        unresearched.requirement_id: 0,
+    }
+    assert progress.meets_requirements() is False
@@ -0,0 +1,89 @@
+from models.enums import ResearchRequirementType, ResearchType, ScienceType
+from models.extensions import db
+from models.tools.research import Research, ResearchStage, ResearchStageRequirement
+from utils.research_progress import overview_query, progress_overview
+
+
+def _project(name, *stages):
+    research = Research(project_name=name, type=ResearchType.ARTEFACT)
+    for number, requirements in enumerate(stages, start=1):
+        research.stages.append(
+            ResearchStage(
+                stage_number=number, name=f"Stage {number}", unlock_requirements=requirements
+            )
+        )
+    db.session.add(research)
+    return research
+
+
+def test_progress_overview_aggregates_current_stages(
+    db_session, character, character_with_group, exotic_substance, item_type
+):
+    """Test assignments are listed with stage, percent and unmet requirements, and filtered."""
+    life = _project(
+        "Life Project",
+        [
+            ResearchStageRequirement(
+                requirement_type=ResearchRequirementType.SCIENCE,
+                science_type=ScienceType.LIFE,
+                amount=3,
+            ),
+            ResearchStageRequirement(
+                requirement_type=ResearchRequirementType.EXOTIC,
+                exotic_substance_id=exotic_substance.id,
+                amount=1,
+            ),
+        ],
+        [
+            ResearchStageRequirement(
+                requirement_type=ResearchRequirementType.ITEM,
+                item_type=str(item_type.id),
+                amount=2,
+            )
+        ],
+    )
+    sample = _project(
+        "Sample Project",
+        [
+            ResearchStageRequirement(
+                requirement_type=ResearchRequirementType.SAMPLE,
+                sample_tag="blood",
+                requires_researched=True,
+                amount=1,
+            )
+        ],
+    )
+    db_session.commit()
+    started = life.assign_character(character.id)
+    finished = life.assign_character(character_with_group.id)
+    other = sample.assign_character(character.id)
+    db_session.commit()
+
+    started.get_current_stage().requirement_progress[0].progress = 5
+    finished.advance_stage()
+    finished.advance_stage()
+    db_session.commit()
+
+    assignments = db.session.scalars(overview_query()).unique().all()
+    assert [(a.research.project_name, a.character.name) for a in assignments] == [
+        ("Life Project", character_with_group.name),
+        ("Life Project", character.name),
+        ("Sample Project", character.name),
+    ]
+
+    overview = progress_overview(assignments)
+    assert overview[started.id] == {
+        "stage_number": 1,
+        "stage_count": 2,
+        "percent": 75,
+        "blocking": [{"label": f"Exotic: {exotic_substance.name}", "progress": 0, "amount": 1}],
+    }
+    assert overview[finished.id]["stage_number"] is None
+    assert overview[finished.id]["percent"] == 100
+    assert overview[finished.id]["blocking"] == []
+    assert overview[other.id]["blocking"] == [
+        {"label": "Researched sample: blood", "progress": 0, "amount": 1}
+    ]
+
+    filtered = db.session.scalars(overview_query(ScienceType.LIFE.value)).unique().all()
+    assert {a.research_id for a in filtered} == {life.id}
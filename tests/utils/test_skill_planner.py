@@ -0,0 +1,90 @@
+from models.database.skills import Skill
+from models.database.species import Ability
+from models.enums import AbilityType, CharacterStatus
+from models.tools.character import CharacterSkill
+from utils.skill_planner import SkillPlanner
+
+
+def _skill(db_session, name, base_cost, **kwargs):
+    skill = Skill(name=name, base_cost=base_cost, skill_type="General", **kwargs)
+    db_session.add(skill)
+    db_session.flush()
+    return skill
+
+
+def test_plan_orders_prerequisites_and_applies_discounts(db_session, character, new_user):
+    """Test a plan is ordered cheapest first within prerequisites, with discounted costs."""
+    basics = _skill(db_session, "Basics", 4)
+    advanced = _skill(db_session, "Advanced", 1, required_skill_id=basics.id)
+    mastery = _skill(db_session, "Mastery", 2, required_skill_id=advanced.id)
+    climbing = _skill(db_session, "Climbing", 2, can_purchase_multiple=True, cost_increases=True)
+    db_session.add(
+        Ability(
+            species_id=character.species_id,
+            name="Sure Footed",
+            description="Cheaper climbing",
+            type=AbilityType.SKILL_DISCOUNTS,
+            skill_discounts=f'{{"{climbing.id}": 1}}',
+        )
+    )
+    new_user.character_points = 3
+    db_session.commit()
+
+    plan = SkillPlanner(character).plan([advanced.id, climbing.id, basics.id, climbing.id])
+
+    assert [(step["name"], step["rank"], step["cost"]) for step in plan["steps"]] == [
+        ("Climbing", 1, 1),
+        ("Climbing", 2, 2),
+        ("Basics", 1, 4),
+        ("Advanced", 1, 1),
+    ]
+    assert plan["total_cost"] == 8
+    assert plan["base_cp_used"] == 8
+    assert plan["user_cp_used"] == 0
+    assert plan["base_cp_remaining"] == 2
+    assert plan["user_cp_remaining"] == 3
+    assert plan["unlocks"] == [
+        {
+            "skill_id": basics.id,
+            "name": "Basics",
+            "unlocks": [{"skill_id": advanced.id, "name": "Advanced"}],
+        },
+        {
+            "skill_id": advanced.id,
+            "name": "Advanced",
+            "unlocks": [{"skill_id": mastery.id, "name": "Mastery"}],
+        },
+    ]
+    assert plan["errors"] == []
+    assert plan["valid"] is True
+
+
+def test_plan_reports_invalid_purchases_and_user_points(db_session, character, new_user, faction):
+    """Test unreachable, repeated and restricted skills are reported, and CP overspend."""
+    owned = _skill(db_session, "Owned", 6)
+    prerequisite = _skill(db_session, "Prerequisite", 1)
+    locked = _skill(db_session, "Locked", 1, required_skill_id=prerequisite.id)
+    restricted = _skill(db_session, "Restricted", 1, required_factions=f'["{faction.id + 1}"]')
+    expensive = _skill(db_session, "Expensive", 7)
+    db_session.add(
+        CharacterSkill(
+            character_id=character.id, skill_id=owned.id, purchased_by_user_id=new_user.id
+        )
+    )
+    character.status = CharacterStatus.ACTIVE.value
+    new_user.character_points = 2
+    db_session.commit()
+
+    plan = SkillPlanner(character).plan([owned.id, locked.id, restricted.id, expensive.id, 999999])
+
+    assert {error["skill_id"]: error["reason"] for error in plan["errors"]} == {
+        owned.id: "This skill can only be purchased once",
+        restricted.id: "Faction, species or tag requirements not met",
+        999999: "Unknown skill",
+        locked.id: "Requires Prerequisite",
+    }
+    assert plan["total_cost"] == 7
+    assert plan["user_cp_used"] == 3
+    assert plan["user_cp_remaining"] == -1
+    assert plan["can_afford"] is False
+    assert plan["valid"] is False
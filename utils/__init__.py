@@ -2,24 +2,19 @@
 
 import base64
 import logging
+from functools import lru_cache
 from io import BytesIO
 
 import qrcode
+import qrcode.image.svg
 from flask import url_for
 
+QR_CODE_CACHE_SIZE = 2048
 
-def generate_qr_code(data, size=10, border=2):
-    """
-    Generate a QR code and return it as a base64 encoded data URL
-
-    Args:
-        data: The data to encode in the QR code (usually a URL)
-        size: The size of each QR code module in pixels (default: 10)
-        border: The border width in modules (default: 2)
 
-    Returns:
-        Base64 encoded data URL for the QR code image
-    """
+@lru_cache(maxsize=QR_CODE_CACHE_SIZE)
+def _render_qr_code(data, size, border, format):
+    """Render a QR code to a data URL. Results are memoized per (data, size, border, format)."""
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
@@ -29,23 +24,53 @@ def generate_qr_code(data, size=10, border=2):
     qr.add_data(data)
     qr.make(fit=True)
 
-    img = qr.make_image(fill_color="black", back_color="white")
+    buffer = BytesIO()
+    if format == "svg":
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+        img.save(buffer)
+        mime_type = "image/svg+xml"
+    else:
+        img = qr.make_image(fill_color="black", back_color="white")
+        img.save(buffer, format="PNG")
+        mime_type = "image/png"
 
     # Convert to base64
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    buffer.seek(0)
     img_str = base64.b64encode(buffer.getvalue()).decode()
 
-    return f"data:image/png;base64,{img_str}"
+    return f"data:{mime_type};base64,{img_str}"
+
+
+def generate_qr_code(data, size=10, border=2, format="png"):
+    """
+    Generate a QR code and return it as a base64 encoded data URL
+
+    Identical codes are only rendered once per process, so batch card runs only pay
+    for unique codes.
+
+    Args:
+        data: The data to encode in the QR code (usually a URL)
+        size: The size of each QR code module in pixels (default: 10)
+        border: The border width in modules (default: 2)
+        format: "png" for a raster image or "svg" for a vector image (default: "png")
+
+    Returns:
+        Base64 encoded data URL for the QR code image
+    """
+    format = (format or "png").lower()
+    if format not in ("png", "svg"):
+        raise ValueError(f"Unsupported QR code format: {format}")
+    if not isinstance(data, (str, bytes)):
+        data = str(data)
+    return _render_qr_code(data, size, border, format)
 
 
-def generate_web_qr_code(route_name, **kwargs):
+def generate_web_qr_code(route_name, format="png", **kwargs):
     """
     Generate a QR code for a web route
 
     Args:
         route_name: The Flask route name
+        format: "png" or "svg" (default: "png")
         **kwargs: URL parameters for the route
 
     Returns:
@@ -53,6 +78,6 @@ def generate_web_qr_code(route_name, **kwargs):
     """
     try:
         url = url_for(route_name, **kwargs, _external=True)
-        return generate_qr_code(url)
+        return generate_qr_code(url, format=format)
     except Exception:
         logging.exception("Error generating QR code")
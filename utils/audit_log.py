@@ -0,0 +1,224 @@
+from datetime import datetime
+from itertools import groupby
+from types import SimpleNamespace
+
+from sqlalchemy import delete, exists, insert, select, tuple_
+from sqlalchemy.orm import joinedload
+
+from models.enums import AuditLogOwnerType, CharacterAuditAction, GroupAuditAction
+from models.event import Event
+from models.extensions import db
+from models.tools.audit_log_archive import AuditLogArchive
+from models.tools.character import CharacterAuditLog
+from models.tools.group import GroupAuditLog
+from models.tools.user import User
+
+AUDIT_LOG_PAGE_SIZE = 50
+
+# Rows read from a live log per round trip while archiving
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def _log(owner_type):
+    """The audit log model, its owner column and its action enum for an owner type."""
+    if owner_type == AuditLogOwnerType.CHARACTER:
+        return CharacterAuditLog, CharacterAuditLog.character_id, CharacterAuditAction
+    return GroupAuditLog, GroupAuditLog.group_id, GroupAuditAction
+
+
+def parse_actions(owner_type, values):
+    """The actions among the given action values that the owner type's log records."""
+    action_enum = _log(owner_type)[2]
+    return [action_enum(value) for value in values if value in action_enum.values()]
+
+
+def audit_log_page(owner_type, owner_id, actions=(), before=None, limit=AUDIT_LOG_PAGE_SIZE):
+    """
+    A page of an owner's live audit log, newest first.
+
+    Pages are keyed on (timestamp, id) rather than an offset: the next page starts after the
+    entry id in ``before``, so each page is one range scan of the owner's timestamp index
+    however far back it is.
+
+    Returns:
+        dict: Contains 'entries' and 'next_cursor', the id to pass as ``before`` for the next
+        page or None on the last page
+    """
+    model, owner_column, _ = _log(owner_type)
+    query = (
+        select(model)
+        .options(joinedload(model.editor))
+        .where(owner_column == owner_id)
+        .order_by(model.timestamp.desc(), model.id.desc())
+        .limit(limit + 1)
+    )
+    if actions:
+        query = query.where(model.action.in_(actions))
+    if before is not None:
+        # Compared against the stored timestamp, so both sides share one storage format
+        after = select(model.timestamp).where(model.id == before).scalar_subquery()
+        query = query.where(tuple_(model.timestamp, model.id) < tuple_(after, before))
+
+    entries = db.session.execute(query).scalars().all()
+    return _page(entries, limit)
+
+
+def _page(entries, limit):
+    if len(entries) > limit:
+        return {"entries": entries[:limit], "next_cursor": entries[limit - 1].id}
+    return {"entries": entries, "next_cursor": None}
+
+
+def has_archive(owner_type, owner_id):
+    return db.session.execute(
+        select(
+            exists().where(
+                AuditLogArchive.owner_type == owner_type, AuditLogArchive.owner_id == owner_id
+            )
+        )
+    ).scalar()
+
+
+def archived_page(owner_type, owner_id, actions=(), before=None, limit=AUDIT_LOG_PAGE_SIZE):
+    """
+    A page of an owner's archived audit log entries, newest first, in the same form as
+    ``audit_log_page``. The owner's archive batches are decompressed for each request.
+    """
+    action_enum = _log(owner_type)[2]
+    wanted = {action.value for action in actions}
+    entries = [
+        entry
+        for archive in AuditLogArchive.query.filter_by(owner_type=owner_type, owner_id=owner_id)
+        for entry in archive.entries
+        if not wanted or entry["action"] in wanted
+    ]
+    for entry in entries:
+        entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+    entries.sort(key=lambda entry: (entry["timestamp"], entry["id"]), reverse=True)
+
+    if before is not None:
+        positions = [position for position, entry in enumerate(entries) if entry["id"] == before]
+        entries = entries[positions[0] + 1 :] if positions else []
+    entries = entries[: limit + 1]
+
+    editor_ids = {entry["editor_user_id"] for entry in entries}
+    editors = (
+        {user.id: user for user in User.query.filter(User.id.in_(editor_ids))} if editor_ids else {}
+    )
+    return _page(
+        [
+            SimpleNamespace(
+                **{
+                    **entry,
+                    "action": action_enum(entry["action"]),
+                    "editor": editors.get(entry["editor_user_id"]),
+                }
+            )
+            for entry in entries
+        ],
+        limit,
+    )
+
+
+def archive_cutoff(events):
+    """
+    Start of the ``events``-th most recent event to have started. Entries before it are
+    older than the last ``events`` events.
+
+    Returns:
+        datetime: The cutoff, or None if fewer events have started
+    """
+    if events < 1:
+        raise ValueError("At least one event of history must stay in the live audit logs")
+    return db.session.execute(
+        select(Event.start_date)
+        .where(Event.start_date <= datetime.now())
+        .order_by(Event.start_date.desc())
+        .offset(events - 1)
+        .limit(1)
+    ).scalar()
+
+
+def _archive_entries(owner_type, cutoff):
+    """Move one owner type's entries from before the cutoff into archive batches."""
+    model, owner_column, _ = _log(owner_type)
+    table = model.__table__
+    owner = table.c[owner_column.key]
+    rows = db.session.execute(
+        select(table)
+        .where(table.c.timestamp < cutoff)
+        .order_by(owner, table.c.timestamp, table.c.id)
+        .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+    )
+
+    batches = []
+    last_id = 0
+    for owner_id, owner_rows in groupby(rows, key=lambda row: row._mapping[owner]):
+        entries = []
+        for row in owner_rows:
+            entries.append(
+                {
+                    "id": row.id,
+                    "editor_user_id": row.editor_user_id,
+                    "timestamp": row.timestamp.isoformat(),
+                    "action": row.action.value,
+                    "changes": row.changes,
+                }
+            )
+            last_id = max(last_id, row.id)
+        batches.append(
+            {
+                "owner_type": owner_type,
+                "owner_id": owner_id,
+                "entry_count": len(entries),
+                "first_timestamp": datetime.fromisoformat(entries[0]["timestamp"]),
+                "last_timestamp": datetime.fromisoformat(entries[-1]["timestamp"]),
+                "entries_data": AuditLogArchive.compress(entries),
+            }
+        )
+
+    if batches:
+        db.session.execute(insert(AuditLogArchive.__table__), batches)
+        # Entries written while archiving have later ids and are left in place
+        db.session.execute(delete(table).where(table.c.timestamp < cutoff, table.c.id <= last_id))
+    return batches
+
+
+def archive_audit_logs(events):
+    """
+    Move character and group audit log entries older than the last ``events`` events into
+    compressed archive batches, in one transaction.
+
+    Returns:
+        dict: The cutoff used and how many entries and batches were archived per owner type
+
+    Raises:
+        ValueError: If ``events`` is less than one
+    """
+    cutoff = archive_cutoff(events)
+    summary = {"cutoff": cutoff, "total_entries": 0, "total_archives": 0}
+    if cutoff is None:
+        return summary
+
+    try:
+        for owner_type in AuditLogOwnerType:
+            batches = _archive_entries(owner_type, cutoff)
+            entries = sum(batch["entry_count"] for batch in batches)
+            summary[f"{owner_type.value}_entries"] = entries
+            summary["total_entries"] += entries
+            summary["total_archives"] += len(batches)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return summary
+
+
+def delete_archives(owner_type, owner_id):
+    """Remove an owner's archived entries, for when the owner itself is removed."""
+    db.session.execute(
+        delete(AuditLogArchive).where(
+            AuditLogArchive.owner_type == owner_type, AuditLogArchive.owner_id == owner_id
+        )
+    )
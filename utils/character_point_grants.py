@@ -0,0 +1,191 @@
+import json
+
+from sqlalchemy import case, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+
+from models.enums import TicketType
+from models.extensions import db
+from models.tools.character_point_grant import CharacterPointGrant, CharacterPointGrantEntry
+from models.tools.event_ticket import EventTicket
+from models.tools.user import User
+
+
+def parse_amounts(values):
+    """
+    Points per ticket for each ticket type, from a mapping of ticket type values to numbers or
+    form strings. Blank and zero amounts are left out.
+
+    Raises:
+        ValueError: If an amount is not a number or is negative
+    """
+    amounts = {}
+    for ticket_type in TicketType:
+        value = values.get(ticket_type.value)
+        if value is None or str(value).strip() == "":
+            continue
+        try:
+            points = float(value)
+        except (TypeError, ValueError):
+            raise ValueError("Character points must be a number")
+        if points < 0:
+            raise ValueError("Character points cannot be negative")
+        if points:
+            amounts[ticket_type.value] = points
+    return amounts
+
+
+def _awards(event_id, amounts):
+    """Tickets and points per ticket holder of the event, for holders earning any points."""
+    points = case(
+        *[
+            (EventTicket.ticket_type == TicketType(ticket_type), amount)
+            for ticket_type, amount in amounts.items()
+        ],
+        else_=0.0,
+    )
+    return (
+        select(EventTicket.user_id, func.count(EventTicket.id), func.sum(points))
+        .where(EventTicket.event_id == event_id)
+        .group_by(EventTicket.user_id)
+        .having(func.sum(points) > 0)
+    )
+
+
+def _full_name(first_name, surname):
+    return f"{first_name} {surname or ''}".strip()
+
+
+def preview_character_points(event_id, amounts):
+    """
+    What granting the amounts to the event's ticket holders would award, without saving.
+
+    Returns:
+        dict: A row per ticket holder with their current and new character points, and totals
+    """
+    rows = []
+    if amounts:
+        awards = _awards(event_id, amounts).subquery()
+        user_id, tickets, points = awards.c
+        for row in db.session.execute(
+            select(user_id, User.first_name, User.surname, User.character_points, tickets, points)
+            .join(User, User.id == user_id)
+            .order_by(User.first_name, User.surname, User.id)
+        ):
+            rows.append(
+                {
+                    "user_id": row[0],
+                    "name": _full_name(row[1], row[2]),
+                    "current_points": row[3],
+                    "tickets": row[4],
+                    "points": row[5],
+                    "new_points": row[3] + row[5],
+                }
+            )
+
+    return {
+        "event_id": event_id,
+        "amounts": amounts,
+        "users": rows,
+        "total_users": len(rows),
+        "total_tickets": sum(row["tickets"] for row in rows),
+        "total_points": sum(row["points"] for row in rows),
+    }
+
+
+def grant_report(grant):
+    """The users a grant awarded points to, with totals."""
+    rows = [
+        {
+            "user_id": user_id,
+            "name": _full_name(first_name, surname),
+            "tickets": tickets,
+            "points": points,
+        }
+        for user_id, first_name, surname, tickets, points in db.session.execute(
+            select(
+                CharacterPointGrantEntry.user_id,
+                User.first_name,
+                User.surname,
+                CharacterPointGrantEntry.tickets,
+                CharacterPointGrantEntry.points,
+            )
+            .join(User, User.id == CharacterPointGrantEntry.user_id)
+            .where(CharacterPointGrantEntry.grant_id == grant.id)
+            .order_by(User.first_name, User.surname, User.id)
+        )
+    ]
+    return {
+        "event_id": grant.event_id,
+        "grant_id": grant.id,
+        "granted_at": grant.granted_at.isoformat() if grant.granted_at else None,
+        "granted_by_id": grant.granted_by_id,
+        "amounts": grant.amounts_dict,
+        "users": rows,
+        "total_users": len(rows),
+        "total_tickets": sum(row["tickets"] for row in rows),
+        "total_points": sum(row["points"] for row in rows),
+    }
+
+
+def grant_event_character_points(event_id, amounts, granted_by_id):
+    """
+    Award character points to everyone holding a ticket for an event, in one transaction.
+
+    Each ticket earns the points set for its ticket type, and a user holding several tickets
+    receives the sum. The audit entries are inserted from one SELECT over the tickets, and
+    every user's points are then raised by one UPDATE reading those entries. The grant record
+    is unique per event, so an event's points are only ever awarded once, even when two
+    grants are made at the same time.
+
+    Args:
+        event_id: Event whose ticket holders are awarded points
+        amounts: Ticket type value -> points per ticket, as returned by ``parse_amounts``
+        granted_by_id: User making the grant
+
+    Returns:
+        dict: The grant report
+
+    Raises:
+        ValueError: If no points are set or the event's points were already granted
+    """
+    if not amounts:
+        raise ValueError("No character points to grant")
+    if CharacterPointGrant.query.filter_by(event_id=event_id).first():
+        raise ValueError("Character points for this event were already granted")
+
+    try:
+        grant = CharacterPointGrant(
+            event_id=event_id, amounts=json.dumps(amounts), granted_by_id=granted_by_id
+        )
+        db.session.add(grant)
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        raise ValueError("Character points for this event were already granted")
+
+    try:
+        entries = CharacterPointGrantEntry.__table__
+        awards = _awards(event_id, amounts).add_columns(literal(grant.id)).subquery()
+        db.session.execute(
+            insert(entries).from_select(
+                ["user_id", "tickets", "points", "grant_id"], select(awards)
+            )
+        )
+
+        users = User.__table__
+        awarded = (
+            select(entries.c.points)
+            .where(entries.c.grant_id == grant.id, entries.c.user_id == users.c.id)
+            .scalar_subquery()
+        )
+        db.session.execute(
+            update(users)
+            .where(users.c.id.in_(select(entries.c.user_id).where(entries.c.grant_id == grant.id)))
+            .values(character_points=users.c.character_points + awarded)
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return grant_report(grant)
@@ -0,0 +1,202 @@
+from collections import defaultdict
+
+from sqlalchemy import bindparam, insert, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models.database.conditions import Condition, ConditionStage
+from models.enums import CharacterAuditAction
+from models.extensions import db
+from models.tools.character import CharacterAuditLog, CharacterCondition
+from models.tools.condition_progression_run import ConditionProgressionRun
+from models.tools.downtime import DowntimePeriod
+from models.tools.event_ticket import EventTicket
+
+
+class ConditionProgression:
+    """
+    Progress characters' conditions by one event each, in bulk.
+
+    The stages of every condition involved are loaded in one query and indexed by
+    ``(condition_id, stage_number)``, so finding a condition's current and next stage is a
+    dictionary lookup rather than a scan of the condition's stages. New stages and durations of
+    stored conditions are kept aside and written back by ``write`` in one UPDATE, together with
+    one condition change audit entry per character.
+    """
+
+    def __init__(self, editor_user_id, character_conditions):
+        self.editor_user_id = editor_user_id
+        self.durations = {}
+        self.names = {}
+        self.updates = {}
+        self.changes = defaultdict(list)
+
+        condition_ids = {cc.condition_id for cc in character_conditions}
+        if condition_ids:
+            rows = db.session.execute(
+                select(
+                    Condition.id,
+                    Condition.name,
+                    ConditionStage.stage_number,
+                    ConditionStage.duration,
+                )
+                .outerjoin(ConditionStage, ConditionStage.condition_id == Condition.id)
+                .where(Condition.id.in_(condition_ids))
+            )
+            for condition_id, name, stage_number, duration in rows:
+                self.names[condition_id] = name
+                if stage_number is not None:
+                    self.durations[(condition_id, stage_number)] = duration
+
+    @classmethod
+    def for_characters(cls, character_ids, editor_user_id):
+        """Progression of every condition of the characters that has not concluded yet."""
+        character_conditions = (
+            CharacterCondition.query.filter(
+                CharacterCondition.character_id.in_(character_ids),
+                CharacterCondition.current_stage.isnot(None),
+            )
+            .order_by(CharacterCondition.character_id, CharacterCondition.id)
+            .all()
+        )
+        return cls(editor_user_id, character_conditions), character_conditions
+
+    def _set(self, character_condition, stage, duration):
+        if inspect(character_condition).persistent:
+            set_committed_value(character_condition, "current_stage", stage)
+            set_committed_value(character_condition, "current_duration", duration)
+            self.updates[character_condition.id] = (stage, duration)
+        else:
+            character_condition.current_stage = stage
+            character_condition.current_duration = duration
+
+    def progress(self, character_condition):
+        """
+        Progress one condition by one event.
+
+        Returns:
+            dict: Contains 'progressed' (bool), 'message' (str), and 'completed' (bool)
+        """
+        condition_id = character_condition.condition_id
+        name = self.names.get(condition_id, f"#{condition_id}")
+        stage = character_condition.current_stage
+
+        if (condition_id, stage) not in self.durations:
+            return {
+                "progressed": False,
+                "message": f"Invalid stage {stage} for condition {name}",
+                "completed": False,
+            }
+
+        duration = character_condition.current_duration - 1
+        completed = False
+        if duration > 0:
+            message = f"Condition {name} stage {stage} has {duration} events remaining"
+        elif (condition_id, stage + 1) in self.durations:
+            stage += 1
+            duration = self.durations[(condition_id, stage)]
+            message = f"Condition {name} progressed to stage {stage}"
+        else:
+            # No more stages - condition has reached its conclusion
+            stage, duration, completed = None, 0, True
+            message = f"Condition {name} has reached its conclusion"
+
+        self._set(character_condition, stage, duration)
+        self.changes[character_condition.character_id].append(message)
+        return {"progressed": True, "message": message, "completed": completed}
+
+    def write(self):
+        """Write the new stages and durations in one statement and add the audit entries."""
+        if self.updates:
+            table = CharacterCondition.__table__
+            db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values(current_stage=bindparam("stage"), current_duration=bindparam("duration")),
+                [
+                    {"row_id": row_id, "stage": stage, "duration": duration}
+                    for row_id, (stage, duration) in self.updates.items()
+                ],
+            )
+            self.updates.clear()
+
+        if self.changes:
+            db.session.execute(
+                insert(CharacterAuditLog.__table__),
+                [
+                    {
+                        "character_id": character_id,
+                        "editor_user_id": self.editor_user_id,
+                        "action": CharacterAuditAction.CONDITION_CHANGE.value,
+                        "changes": "; ".join(messages),
+                    }
+                    for character_id, messages in self.changes.items()
+                ],
+            )
+            self.changes.clear()
+
+
+def progress_event_conditions(event_id, editor_user_id):
+    """
+    Progress the conditions of every character attending an event, in one transaction.
+
+    For events without a downtime period; processing a downtime period progresses the
+    conditions of its characters itself. The run is recorded, one per event, so a second
+    request for the same event is refused rather than aging the conditions again.
+
+    Args:
+        event_id: Event the characters attended
+        editor_user_id: User recorded on the audit entries
+
+    Returns:
+        Summary dictionary with a row per progressed condition
+
+    Raises:
+        ValueError: If the event has a downtime period or its conditions were already progressed
+    """
+    if DowntimePeriod.query.filter_by(event_id=event_id).first():
+        raise ValueError("Conditions for this event are progressed by its downtime period")
+    if ConditionProgressionRun.query.filter_by(event_id=event_id).first():
+        raise ValueError("Conditions for this event were already progressed")
+
+    try:
+        db.session.add(ConditionProgressionRun(event_id=event_id, progressed_by_id=editor_user_id))
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        raise ValueError("Conditions for this event were already progressed")
+
+    attending = select(EventTicket.character_id).where(
+        EventTicket.event_id == event_id, EventTicket.character_id.isnot(None)
+    )
+    progression, character_conditions = ConditionProgression.for_characters(
+        attending, editor_user_id
+    )
+
+    try:
+        results = []
+        for character_condition in character_conditions:
+            outcome = progression.progress(character_condition)
+            results.append(
+                {
+                    "character_id": character_condition.character_id,
+                    "character_condition_id": character_condition.id,
+                    "current_stage": character_condition.current_stage,
+                    "current_duration": character_condition.current_duration,
+                    **outcome,
+                }
+            )
+        progression.write()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {
+        "event_id": event_id,
+        "conditions": results,
+        "total_conditions": len(results),
+        "total_characters": len({result["character_id"] for result in results}),
+        "total_completed": sum(result["completed"] for result in results),
+        "total_errors": sum(not result["progressed"] for result in results),
+    }
@@ -0,0 +1,235 @@
+import logging
+import re
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    JSON,
+    and_,
+    case,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.orm import contains_eager
+
+from models.enums import DowntimeStatus, DowntimeTaskStatus, PackOwnerType
+from models.extensions import db
+from models.tools.character import Character
+from models.tools.downtime import DowntimePack, DowntimePeriod
+from models.tools.event_ticket import EventTicket
+from models.tools.group import Group
+from models.tools.pack import LIST_FIELDS
+from models.tools.pack_change import PackChange
+from models.tools.pack_entry import PackEntry
+
+logger = logging.getLogger(__name__)
+
+PLAYER_REFERENCE = re.compile(r"^(\d+)(?:\.(\d*))?$")
+
+# Pack fields of a cleared pack, as sent to pack change feeds
+CLEARED_PACK = {**{name: [] for name in LIST_FIELDS}, "energy_chits": 0, "completion": {}}
+
+
+def _has_pack_contents(column):
+    """SQL condition matching stored pack JSON with any contents, energy chits or completion."""
+    conditions = [func.json_array_length(column, f"$.{name}") > 0 for name in LIST_FIELDS]
+    conditions.append(func.json_extract(column, "$.energy_chits") > 0)
+    conditions.append(func.json_extract(column, "$.completion") != "{}")
+    # Only inspect valid JSON, anything else already loads as an empty pack
+    return case((func.json_valid(column) == 1, or_(*conditions)), else_=false())
+
+
+def _emptied_pack(column):
+    """SQL expression clearing pack contents, keeping any other keys stored with the pack."""
+    arguments = []
+    for name in LIST_FIELDS:
+        arguments += [f"$.{name}", func.json("[]")]
+    arguments += ["$.energy_chits", 0, "$.completion", func.json("{}")]
+    return func.json_set(column, *arguments)
+
+
+def reset_packs(model, owner_type, event_id=None):
+    """
+    Clear every non-empty character or group pack with set-based UPDATEs.
+
+    Pack index entries for the cleared packs are brought in line in the same way: content
+    rows are removed and completion flags unset. If an event is given, a replaced change is
+    recorded on its pack change feed for every cleared pack, with a single INSERT ... SELECT.
+
+    Returns:
+        Number of packs cleared
+    """
+    table = model.__table__
+    column = table.c[model.pack_column]
+    has_contents = _has_pack_contents(column)
+    owners = select(table.c.id).where(has_contents)
+
+    entries = PackEntry.__table__
+    owned_entries = (entries.c.owner_type == owner_type) & entries.c.owner_id.in_(owners)
+    db.session.execute(
+        delete(entries).where(
+            owned_entries, or_(entries.c.ref_id.isnot(None), entries.c.kind == "energy_chits")
+        )
+    )
+    db.session.execute(update(entries).where(owned_entries).values(completed=False))
+
+    if event_id is not None:
+        changes = PackChange.__table__
+        db.session.execute(
+            insert(changes).from_select(
+                [
+                    changes.c.event_id,
+                    changes.c.owner_type,
+                    changes.c.owner_id,
+                    changes.c.changes,
+                    changes.c.replaced,
+                    changes.c.is_completed,
+                    changes.c.pack_version,
+                    changes.c.timestamp,
+                ],
+                select(
+                    literal(event_id),
+                    literal(owner_type.value),
+                    table.c.id,
+                    literal(CLEARED_PACK, JSON),
+                    true(),
+                    false(),
+                    table.c.pack_version + 1,
+                    literal(datetime.now(timezone.utc)),
+                )
+                .where(has_contents)
+                .order_by(table.c.id),
+            )
+        )
+
+    result = db.session.execute(
+        update(table)
+        .where(has_contents)
+        .values(
+            {
+                column: _emptied_pack(column),
+                table.c.pack_complete: False,
+                table.c.pack_version: table.c.pack_version + 1,
+            }
+        )
+    )
+    return result.rowcount
+
+
+def start_downtime_period(event):
+    """
+    Open a downtime period for an event.
+
+    Character and group packs from the previous event are cleared, and a downtime pack is
+    created for every character with a ticket to the event.
+
+    Returns:
+        Tuple of the new DowntimePeriod and a report of rows touched and elapsed time
+    """
+    started = time.perf_counter()
+
+    period = DowntimePeriod(status=DowntimeStatus.PENDING, event_id=event.id)
+    db.session.add(period)
+    db.session.flush()
+
+    characters_reset = reset_packs(Character, PackOwnerType.CHARACTER, event.id)
+    groups_reset = reset_packs(Group, PackOwnerType.GROUP, event.id)
+
+    character_ids = (
+        db.session.execute(
+            select(EventTicket.character_id)
+            .where(EventTicket.event_id == event.id, EventTicket.character_id.isnot(None))
+            .distinct()
+            .order_by(EventTicket.character_id)
+        )
+        .scalars()
+        .all()
+    )
+    if character_ids:
+        db.session.execute(
+            insert(DowntimePack),
+            [
+                {
+                    "period_id": period.id,
+                    "character_id": character_id,
+                    "status": DowntimeTaskStatus.ENTER_PACK,
+                }
+                for character_id in character_ids
+            ],
+        )
+
+    # Packs changed underneath any characters or groups already loaded in this session
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, (Character, Group)):
+            db.session.expire(obj)
+
+    report = {
+        "characters_reset": characters_reset,
+        "groups_reset": groups_reset,
+        "downtime_packs": len(character_ids),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info("Started downtime period %s for event %s: %s", period.id, event.id, report)
+    return period, report
+
+
+def pack_status_counts(period_id):
+    """
+    Count a period's downtime packs in each status with a single GROUP BY.
+
+    Returns:
+        Dict of DowntimeTaskStatus value to pack count, for statuses with any packs
+    """
+    rows = db.session.execute(
+        select(DowntimePack.status, func.count())
+        .where(DowntimePack.period_id == period_id)
+        .group_by(DowntimePack.status)
+    )
+    return {status.value: count for status, count in rows}
+
+
+def pack_search_query(period_id, status, search=None):
+    """
+    Select a period's downtime packs in one status, with their characters loaded.
+
+    Args:
+        period_id: DowntimePeriod to list packs for
+        status: DowntimeTaskStatus to list
+        search: Optional part of a character name, or a player reference such as
+            ``12.3``, ``12.`` or ``12``
+
+    Returns:
+        Select ordered by character name, ready to paginate
+    """
+    query = (
+        select(DowntimePack)
+        .join(DowntimePack.character)
+        .where(DowntimePack.period_id == period_id, DowntimePack.status == status)
+        .options(contains_eager(DowntimePack.character))
+        .order_by(Character.name, DowntimePack.id)
+    )
+
+    search = (search or "").strip()
+    if search:
+        conditions = [Character.name.icontains(search, autoescape=True)]
+        reference = PLAYER_REFERENCE.match(search)
+        if reference:
+            user_id, character_id = reference.groups()
+            if character_id:
+                conditions.append(
+                    and_(
+                        Character.user_id == int(user_id),
+                        Character.character_id == int(character_id),
+                    )
+                )
+            else:
+                conditions.append(Character.user_id == int(user_id))
+        query = query.where(or_(*conditions))
+    return query
@@ -0,0 +1,1127 @@
+import json
+import logging
+import random
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from threading import Thread
+from typing import Dict, List
+
+from flask import current_app
+from sqlalchemy import func, insert, or_, select, tuple_, update
+from sqlalchemy.orm import selectinload
+
+from models.database.exotic_substances import ExoticSubstance
+from models.database.faction import Faction
+from models.database.item import Item, item_mods_applied
+from models.database.item_blueprint import ItemBlueprint
+from models.database.mods import Mod
+from models.database.sample import Sample
+from models.enums import (
+    DowntimeJobStatus,
+    DowntimeStatus,
+    ResearchRequirementType,
+    ResearchType,
+    ScienceType,
+)
+from models.extensions import db
+from models.tools.character import Character
+from models.tools.downtime import DowntimeJob, DowntimePack, utcnow
+from models.tools.research import (
+    CharacterResearch,
+    CharacterResearchStage,
+    CharacterResearchStageRequirement,
+    Research,
+    ResearchStage,
+    ResearchStageRequirement,
+)
+from utils.condition_progression import ConditionProgression
+from utils.email import send_downtime_completed_notification
+from utils.research_matcher import (
+    RequirementMatcher,
+    exotic_keys,
+    item_keys,
+    sample_keys,
+    science_keys,
+)
+
+logger = logging.getLogger(__name__)
+
+PHASES = (
+    "modifications",
+    "purchases",
+    "engineering",
+    "science",
+    "research",
+    "manual_entries",
+    "conditions",
+)
+
+# Purchased and maintained items last this many events past the downtime's event
+ITEM_LIFETIME_EVENTS = 4
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _value(value):
+    """Plain value of an enum column, which may still hold a string on unflushed rows."""
+    return getattr(value, "value", value)
+
+
+def _entries(values):
+    """Activity entries saved on a downtime pack, flattening lists submitted by one form card."""
+    for value in values or []:
+        if isinstance(value, list):
+            yield from (entry for entry in value if isinstance(entry, dict))
+        elif isinstance(value, dict):
+            yield value
+
+
+def _item_expiry(event):
+    """Expiry event number for items purchased or maintained in this event's downtime."""
+    match = re.search(r"(\d+)$", event.event_number or "")
+    return int(match.group(1)) + ITEM_LIFETIME_EVENTS if match else None
+
+
+@dataclass
+class PackState:
+    """Working state of one downtime pack while the period is processed."""
+
+    pack: DowntimePack
+    character: Character
+    items: List[int] = field(default_factory=list)
+    exotics: Dict[int, int] = field(default_factory=dict)
+    samples: List[int] = field(default_factory=list)
+    purchased: Dict[int, List[Item]] = field(default_factory=dict)
+    results: List[Dict] = field(default_factory=list)
+    messages: List[Dict] = field(default_factory=list)
+    rng: random.Random = field(default_factory=random.Random)
+
+
+class DowntimeProcessor:
+    """
+    Apply the activities entered on every pack of a downtime period.
+
+    Everything the period's packs refer to (characters, mods, blueprints, items, samples,
+    exotics, research with its stages and requirements, and character research progress) is
+    loaded up front into maps keyed by id, and research also by public id. Each phase in
+    ``PHASES`` then runs over every pack against those objects in memory, and nothing is sent
+    to the database until the single flush at the end of ``run``.
+
+    ``pack_ids`` limits a run to some of the period's packs, so a period can be processed in
+    batches. Synthesis draws come from a generator seeded per pack, so the same seed gives the
+    same results however the packs are batched.
+    """
+
+    def __init__(self, period, editor_user_id, seed=None, pack_ids=None):
+        self.period = period
+        self.editor_user_id = editor_user_id
+        self.seed = seed
+        self.pack_ids = pack_ids
+        self.expiry = _item_expiry(period.event)
+        self.timings = {}
+        self.phase = None
+
+    def _timed(self, name, func):
+        started = time.perf_counter()
+        func()
+        self.timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def run(self):
+        """
+        Preload, run every phase and flush.
+
+        Returns:
+            Report with the results, messages and resulting pack contents of every pack, and
+            the time taken by each phase
+        """
+        started = time.perf_counter()
+        self._timed("preload", self.load)
+        for name in PHASES:
+            self.phase = name
+            self._timed(name, getattr(self, f"_phase_{name}"))
+        self.phase = None
+        self._timed("flush", self._flush)
+
+        return {
+            "period_id": self.period.id,
+            "event_id": self.period.event_id,
+            "seed": self.seed,
+            "packs": [self._pack_report(state) for state in self.states],
+            "timings": self.timings,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    # Preloading
+
+    def load(self):
+        """Load the period's packs and everything their activities refer to."""
+        query = DowntimePack.query.filter_by(period_id=self.period.id)
+        if self.pack_ids is not None:
+            query = query.filter(DowntimePack.id.in_(self.pack_ids))
+        packs = (
+            query.options(
+                selectinload(DowntimePack.character).selectinload(Character.group),
+                selectinload(DowntimePack.character).selectinload(Character.user),
+                selectinload(DowntimePack.character).selectinload(Character.active_conditions),
+            )
+            .order_by(DowntimePack.id)
+            .all()
+        )
+        self.states = [
+            PackState(
+                pack=pack,
+                character=pack.character,
+                items=[i for i in (_int(i) for i in pack.items or []) if i is not None],
+                samples=[s for s in (_int(s) for s in pack.samples or []) if s is not None],
+                rng=random.Random(f"{self.seed}:{pack.id}"),
+            )
+            for pack in packs
+        ]
+        for state in self.states:
+            for exotic in state.pack.exotic_substances or []:
+                exotic_id = _int(exotic.get("id"))
+                amount = _int(exotic.get("amount")) or 0
+                if exotic_id is not None and amount > 0:
+                    state.exotics[exotic_id] = state.exotics.get(exotic_id, 0) + amount
+        self.states_by_character = {state.character.id: state for state in self.states}
+        self.conditions = ConditionProgression(
+            self.editor_user_id,
+            [cc for state in self.states for cc in state.character.active_conditions],
+        )
+
+        mod_ids, blueprint_ids, item_ids, sample_ids = set(), set(), set(), set()
+        public_ids, research_ids, character_refs, faction_ids = set(), set(), set(), set()
+        for state in self.states:
+            pack = state.pack
+            item_ids.update(state.items)
+            sample_ids.update(state.samples)
+            mod_ids.update(_int(entry.get("mod_id")) for entry in _entries(pack.modifications))
+            blueprint_ids.update(
+                _int(entry.get("blueprint_id")) for entry in _entries(pack.purchases)
+            )
+            for entry in _entries(pack.engineering):
+                item_ids.add(_int(entry.get("item_id")))
+                mod_ids.add(_int(entry.get("mod_id")))
+            for entry in _entries(pack.science):
+                sample_ids.add(_int(entry.get("sample_id")))
+                public_ids.add(entry.get("project_id"))
+                character_refs.update((entry.get("research_for_id"), entry.get("teach_to_id")))
+            for entry in _entries(pack.research):
+                public_ids.add(entry.get("project_id"))
+                character_refs.add(entry.get("support_target_id"))
+                item_ids.update(_int(i) for i in entry.get("contributed_items") or [])
+                sample_ids.update(_int(s) for s in entry.get("contributed_samples") or [])
+            research_ids.add(_int((pack.review_data or {}).get("existing_invention")))
+            faction_ids.update(_int(entry.get("faction_id")) for entry in _entries(pack.reputation))
+
+        self._load_characters(character_refs)
+        self.mods = self._by_id(Mod, mod_ids)
+        self.factions = self._by_id(Faction, faction_ids)
+        self.samples = self._by_id(Sample, sample_ids, selectinload(Sample.tags))
+        self.items = self._by_id(
+            Item, item_ids, selectinload(Item.blueprint).selectinload(ItemBlueprint.item_type)
+        )
+        self.blueprints = self._by_id(
+            ItemBlueprint, blueprint_ids, selectinload(ItemBlueprint.item_type)
+        )
+        self.exotics = ExoticSubstance.query.order_by(ExoticSubstance.id).all()
+        self.exotics_by_id = {exotic.id: exotic for exotic in self.exotics}
+
+        # Balances left after the charges of this run, and the charges themselves
+        self.balances = {}
+        self.charges = []
+
+        # Applied mod counts, and the last item number issued for each purchased blueprint
+        self.applied_mods = {}
+        self.new_mods = defaultdict(int)
+        item_ids = set(self.items)
+        if item_ids:
+            rows = db.session.execute(
+                select(
+                    item_mods_applied.c.item_id,
+                    item_mods_applied.c.mod_id,
+                    item_mods_applied.c.count,
+                ).where(item_mods_applied.c.item_id.in_(item_ids))
+            )
+            self.applied_mods = {(row.item_id, row.mod_id): row.count for row in rows}
+        self.item_numbers = {}
+        if self.blueprints:
+            self.item_numbers = dict(
+                db.session.execute(
+                    select(Item.blueprint_id, func.max(Item.item_id))
+                    .where(Item.blueprint_id.in_(self.blueprints))
+                    .group_by(Item.blueprint_id)
+                ).all()
+            )
+
+        self._load_research({p for p in public_ids if isinstance(p, str) and p}, research_ids)
+
+    @staticmethod
+    def _by_id(model, ids, *options):
+        ids = {i for i in ids if i is not None}
+        if not ids:
+            return {}
+        query = model.query.filter(model.id.in_(ids))
+        if options:
+            query = query.options(*options)
+        return {obj.id: obj for obj in query.all()}
+
+    def _load_characters(self, refs):
+        """Load characters referred to by id or by player reference ("user_id.character_id")."""
+        self.characters = {state.character.id: state.character for state in self.states}
+        self.characters_by_reference = {}
+
+        ids, pairs = set(), set()
+        for ref in refs:
+            if ref is None:
+                continue
+            ref = str(ref).strip()
+            if "." in ref:
+                user_id, _, character_id = ref.partition(".")
+                if _int(user_id) is not None and _int(character_id) is not None:
+                    pairs.add((_int(user_id), _int(character_id)))
+            elif _int(ref) is not None and _int(ref) not in self.characters:
+                ids.add(_int(ref))
+
+        conditions = []
+        if ids:
+            conditions.append(Character.id.in_(ids))
+        if pairs:
+            conditions.append(tuple_(Character.user_id, Character.character_id).in_(pairs))
+        if conditions:
+            query = Character.query.filter(or_(*conditions)).options(selectinload(Character.group))
+            for character in query.all():
+                self.characters[character.id] = character
+        for character in self.characters.values():
+            if character.character_id is not None:
+                reference = f"{character.user_id}.{character.character_id}"
+                self.characters_by_reference[reference] = character
+
+    def _load_research(self, public_ids, research_ids):
+        """Load research projects and all research progress of the characters involved."""
+        stages = selectinload(Research.stages).selectinload(ResearchStage.unlock_requirements)
+        research_ids = {i for i in research_ids if i is not None}
+        research = []
+        if public_ids or research_ids:
+            research = (
+                Research.query.filter(
+                    or_(Research.public_id.in_(public_ids), Research.id.in_(research_ids))
+                )
+                .options(stages)
+                .all()
+            )
+
+        progress = selectinload(CharacterResearch.progress)
+        character_research = (
+            CharacterResearch.query.filter(CharacterResearch.character_id.in_(self.characters))
+            .options(
+                selectinload(CharacterResearch.research).options(stages),
+                selectinload(CharacterResearch.current_stage),
+                progress.selectinload(CharacterResearchStage.stage),
+                progress.selectinload(CharacterResearchStage.requirement_progress),
+            )
+            .order_by(CharacterResearch.id)
+            .all()
+        )
+
+        self.research_by_id = {project.id: project for project in research}
+        self.research_by_id.update({cr.research.id: cr.research for cr in character_research})
+        self.research_by_public_id = {
+            project.public_id: project for project in self.research_by_id.values()
+        }
+        # Keyed by research object rather than id so projects created in this run fit in
+        self.character_research = {(cr.character_id, cr.research): cr for cr in character_research}
+        self.touched_research = {}
+        self.requirements = RequirementMatcher()
+
+    # Helpers
+
+    def _result(self, state, message):
+        state.results.append({"phase": self.phase, "message": message})
+
+    def _message(self, state, message_type, message):
+        state.messages.append({"type": message_type, "message": message})
+
+    def _character(self, ref, default=None):
+        if ref is None or ref == "":
+            return default
+        ref = str(ref).strip()
+        if "." in ref:
+            return self.characters_by_reference.get(ref)
+        return self.characters.get(_int(ref))
+
+    def _balance(self, account):
+        if account not in self.balances:
+            self.balances[account] = account.bank_account
+        return self.balances[account]
+
+    def _charge(self, character, cost, reason):
+        """
+        Charge a character for an activity if they can afford it, the part their own balance
+        does not cover coming from their group's, as Character.remove_funds takes it. Balances
+        here only track the charges; the funds are taken in the ledger by ``_flush``.
+        """
+        if not cost:
+            return True
+        group = character.group
+        own = self._balance(character)
+        shared = self._balance(group) if group else 0
+        if own + shared < cost:
+            return False
+        self.balances[character] = own - min(own, cost)
+        if group:
+            self.balances[group] = shared - (cost - min(own, cost))
+        self.charges.append((character, cost, reason))
+        return True
+
+    @staticmethod
+    def _item_name(item):
+        return f"{item.blueprint.name} ({item.full_code})"
+
+    def _mod_count(self, item):
+        count = sum(n for (item_id, _), n in self.applied_mods.items() if item_id == item.id)
+        return count + sum(n for (pending, _), n in self.new_mods.items() if pending is item)
+
+    def _known_mods(self, character):
+        return {_int(mod_id) for mod_id in character.known_modifications or []}
+
+    def _current_progress(self, character_research):
+        """Progress row for a character's current stage, or None once the project is complete."""
+        stage = character_research.current_stage
+        if stage is None:
+            return None
+        return next((p for p in character_research.progress if p.stage is stage), None)
+
+    @staticmethod
+    def _stage_progress(stage):
+        return CharacterResearchStage(
+            stage=stage,
+            stage_completed=False,
+            requirement_progress=[
+                CharacterResearchStageRequirement(requirement=requirement, progress=0)
+                for requirement in stage.unlock_requirements
+            ],
+        )
+
+    def _assign(self, research, character):
+        """Start a character on a research project at its first stage."""
+        character_research = CharacterResearch(character_id=character.id, research=research)
+        if research.stages:
+            first_stage = research.stages[0]
+            character_research.progress.append(self._stage_progress(first_stage))
+            character_research.current_stage = first_stage
+        db.session.add(character_research)
+        self.character_research[(character.id, research)] = character_research
+        return character_research
+
+    def _research_target(self, state, project_id, target_ref):
+        """Research, target character and their research progress for a project reference."""
+        research = self.research_by_public_id.get(project_id)
+        target = self._character(target_ref, default=state.character)
+        if research is None or target is None:
+            return research, target, None
+        return research, target, self.character_research.get((target.id, research))
+
+    @staticmethod
+    def _build_stage(data, stage_number):
+        stage = ResearchStage(
+            stage_number=stage_number,
+            name=data.get("name") or f"Stage {stage_number}",
+            description=data.get("description", ""),
+        )
+        for req_data in data.get("unlock_requirements") or []:
+            requirement = ResearchStageRequirement(
+                requirement_type=ResearchRequirementType(req_data["requirement_type"]),
+                amount=_int(req_data.get("amount")) or 1,
+                requires_researched=False,
+            )
+            if requirement.requirement_type == ResearchRequirementType.SCIENCE:
+                requirement.science_type = ScienceType(req_data["science_type"])
+            elif requirement.requirement_type == ResearchRequirementType.ITEM:
+                requirement.item_type = req_data.get("item_type")
+            elif requirement.requirement_type == ResearchRequirementType.EXOTIC:
+                requirement.exotic_substance_id = _int(
+                    req_data.get("exotic_type") or req_data.get("exotic_substance_id")
+                )
+            elif requirement.requirement_type == ResearchRequirementType.SAMPLE:
+                requirement.sample_tag = req_data.get("sample_tag")
+                requirement.requires_researched = bool(req_data.get("requires_researched"))
+            stage.unlock_requirements.append(requirement)
+        return stage
+
+    @staticmethod
+    def _stages_data(review):
+        try:
+            stages = json.loads(review.get("stages_json") or "[]")
+        except (TypeError, ValueError):
+            return []
+        stages = [stage for stage in stages if isinstance(stage, dict)]
+        return sorted(stages, key=lambda stage: _int(stage.get("stage_number")) or 0)
+
+    # Phases
+
+    def _phase_modifications(self):
+        for state in self.states:
+            character = state.character
+            known = list(character.known_modifications or [])
+            known_ids = self._known_mods(character)
+            for entry in _entries(state.pack.modifications):
+                mod = self.mods.get(_int(entry.get("mod_id")))
+                if mod is None:
+                    continue
+                if entry.get("type") == "learning" and mod.id not in known_ids:
+                    known.append(mod.id)
+                    known_ids.add(mod.id)
+                    self._result(state, f"Learned modification: {mod.name}")
+                elif entry.get("type") == "forgetting" and mod.id in known_ids:
+                    known = [mod_id for mod_id in known if _int(mod_id) != mod.id]
+                    known_ids.discard(mod.id)
+                    self._result(state, f"Forgot modification: {mod.name}")
+            if known != list(character.known_modifications or []):
+                character.known_modifications = known
+
+    def _phase_purchases(self):
+        for state in self.states:
+            character = state.character
+            for entry in _entries(state.pack.purchases):
+                blueprint = self.blueprints.get(_int(entry.get("blueprint_id")))
+                if blueprint is None:
+                    self._result(state, f"Could not purchase {entry.get('name')} - not found")
+                    continue
+                cost = blueprint.base_cost or 0
+                if not self._charge(character, cost, f"Purchase: {blueprint.name}"):
+                    self._result(state, f"Could not purchase {blueprint.name} - insufficient funds")
+                    continue
+                number = self.item_numbers.get(blueprint.id, 0) + 1
+                self.item_numbers[blueprint.id] = number
+                item = Item(blueprint=blueprint, item_id=number, expiry=self.expiry)
+                db.session.add(item)
+                state.purchased.setdefault(blueprint.id, []).append(item)
+                self._result(state, f"Purchased: {blueprint.name}")
+
+    def _engineering_item(self, state, entry):
+        blueprint_id = _int(entry.get("blueprint_id"))
+        if blueprint_id is not None:
+            # Purchased this downtime, so only exists in memory so far
+            purchased = state.purchased.get(blueprint_id)
+            return purchased[0] if purchased else None
+        return self.items.get(_int(entry.get("item_id")))
+
+    def _phase_engineering(self):
+        for state in self.states:
+            entries = list(_entries(state.pack.engineering))
+            for entry in (e for e in entries if e.get("action") == "maintain"):
+                self._maintain(state, entry)
+            for entry in (e for e in entries if e.get("action") == "modify"):
+                self._modify(state, entry)
+
+    def _maintain(self, state, entry):
+        character = state.character
+        item = self._engineering_item(state, entry)
+        if item is None:
+            self._result(state, "Could not maintain item - item not found")
+            return
+        name = self._item_name(item)
+        cost = 0
+        if item.blueprint.base_cost is not None:
+            cost = item.blueprint.get_maintenance_cost(self._mod_count(item))
+        if not self._charge(character, cost, f"Maintenance: {name}"):
+            self._result(state, f"Could not maintain {name} - insufficient funds")
+            return
+        if self.expiry is not None:
+            item.expiry = self.expiry
+        self._result(state, f"Maintained {name} - new expiry: E{item.expiry}")
+
+    def _modify(self, state, entry):
+        character = state.character
+        item = self._engineering_item(state, entry)
+        mod = self.mods.get(_int(entry.get("mod_id")))
+        if item is None or mod is None:
+            self._result(state, "Could not apply modification - item or modification not found")
+            return
+        name = self._item_name(item)
+        if mod.id not in self._known_mods(character):
+            self._result(
+                state,
+                f"Could not apply {mod.name} to {name} - "
+                f"character does not know the modification",
+            )
+            return
+        cost = 0
+        if item.blueprint.base_cost is not None:
+            cost = item.blueprint.get_modification_cost(self._mod_count(item))
+        if not self._charge(character, cost, f"Modification: {mod.name} on {name}"):
+            self._result(state, f"Could not apply {mod.name} to {name} - insufficient funds")
+            return
+        self.new_mods[(item, mod.id)] += 1
+        self._result(state, f"Applied {mod.name} to {name}")
+
+    def _phase_science(self):
+        for state in self.states:
+            for entry in _entries(state.pack.science):
+                action = entry.get("action")
+                if action == "synthesize":
+                    self._synthesize(state, entry)
+                elif action == "research_sample":
+                    self._research_sample(state, entry)
+                elif action == "research_project":
+                    self._research_project(state, entry)
+                elif action == "teach_invention":
+                    self._teach_invention(state, entry)
+
+    def _synthesize(self, state, entry):
+        science_type = (
+            entry.get("synthesize_type") or entry.get("science_type") or ScienceType.GENERIC.value
+        )
+        candidates = self.exotics
+        if science_type != ScienceType.GENERIC.value:
+            candidates = [e for e in self.exotics if _value(e.type) == science_type]
+        if not candidates:
+            self._result(state, f"Could not synthesize - no {science_type} exotic substances")
+            return
+        exotic = state.rng.choice(candidates)
+        state.exotics[exotic.id] = state.exotics.get(exotic.id, 0) + 1
+        self._result(state, f"Synthesized {exotic.name}")
+
+    def _research_sample(self, state, entry):
+        sample = self.samples.get(_int(entry.get("sample_id")))
+        if sample is None:
+            return
+        if sample.is_researched:
+            self._result(state, f"Sample {sample.name} already researched")
+        else:
+            sample.is_researched = True
+            self._result(state, f"Researched sample: {sample.name}")
+
+    def _research_project(self, state, entry):
+        project_id = entry.get("project_id")
+        research, target, character_research = self._research_target(
+            state, project_id, entry.get("research_for_id")
+        )
+        if character_research is None:
+            self._result(state, f"No research found for {project_id}")
+            return
+        progress = self._current_progress(character_research)
+        if progress is None:
+            self._result(
+                state,
+                f"Research already complete for {research.project_name} for {target.name}",
+            )
+            return
+
+        science_type = (
+            entry.get("science_type_select") or entry.get("science_type") or ScienceType.GENERIC
+        )
+        requirement_progress = self.requirements.match(progress, science_keys(science_type))
+        if requirement_progress is None:
+            self._result(
+                state,
+                f"Failed to make progress on {research.project_name} for {target.name}",
+            )
+            return
+        self.requirements.add(requirement_progress, 1)
+        self.touched_research.setdefault(character_research, state)
+        self._result(state, f"Made progress on {research.project_name} for {target.name}")
+
+    def _teach_invention(self, state, entry):
+        project_id = entry.get("project_id")
+        research = self.research_by_public_id.get(project_id)
+        target = self._character(entry.get("teach_to_id"))
+        teacher = self.character_research.get((state.character.id, research)) if research else None
+        if teacher is None or target is None:
+            self._result(state, f"Failed to teach {project_id} - project or student not found")
+            return
+
+        student = self.character_research.get((target.id, research)) or self._assign(
+            research, target
+        )
+        progress = self._current_progress(student)
+        if progress is None:
+            self._result(
+                state,
+                f"Failed to teach {research.project_name} to {target.name} - "
+                f"target has completed this project",
+            )
+            return
+        if not any(p.stage is progress.stage and p.stage_completed for p in teacher.progress):
+            self._result(
+                state,
+                f"Failed to teach {research.project_name} to {target.name} - "
+                f"no stages to teach",
+            )
+            return
+
+        self.requirements.fill(progress)
+        progress.stage_completed = True
+        self.touched_research.setdefault(student, state)
+        self._result(state, f"Successfully taught {research.project_name} to {target.name}")
+
+    def _phase_research(self):
+        for state in self.states:
+            for entry in _entries(state.pack.research):
+                self._contribute(state, entry)
+        self._advance_research()
+
+    def _contribute(self, state, entry):
+        project_id = entry.get("project_id")
+        if not project_id:
+            return
+        target_ref = None
+        if entry.get("support_target") in ("group", "other"):
+            target_ref = entry.get("support_target_id")
+        research, target, character_research = self._research_target(state, project_id, target_ref)
+        progress = self._current_progress(character_research) if character_research else None
+        if progress is None:
+            self._result(state, f"No research in progress found for {project_id}")
+            return
+        for_text = f"{research.project_name} for {target.name}"
+
+        for contributed in entry.get("contributed_exotics") or []:
+            exotic = self.exotics_by_id.get(_int(contributed.get("id")))
+            quantity = min(
+                _int(contributed.get("quantity")) or 0,
+                state.exotics.get(exotic.id, 0) if exotic else 0,
+            )
+            requirement_progress = None
+            if quantity > 0:
+                requirement_progress = self.requirements.match(progress, exotic_keys(exotic))
+            if requirement_progress is None:
+                continue
+            quantity = min(quantity, self.requirements.remaining(requirement_progress))
+            self.requirements.add(requirement_progress, quantity)
+            state.exotics[exotic.id] -= quantity
+            self._result(state, f"Contributed {quantity} {exotic.name} to {for_text}")
+
+        for item_id in entry.get("contributed_items") or []:
+            item = self.items.get(_int(item_id))
+            if item is None or item.id not in state.items:
+                continue
+            requirement_progress = self.requirements.match(progress, item_keys(item))
+            if requirement_progress is None:
+                continue
+            self.requirements.add(requirement_progress, 1)
+            state.items.remove(item.id)
+            self._result(state, f"Contributed {item.blueprint.name} to {for_text}")
+
+        for sample_id in entry.get("contributed_samples") or []:
+            sample = self.samples.get(_int(sample_id))
+            if sample is None or sample.id not in state.samples:
+                continue
+            requirement_progress = self.requirements.match(progress, sample_keys(sample))
+            if requirement_progress is None:
+                continue
+            self.requirements.add(requirement_progress, 1)
+            state.samples.remove(sample.id)
+            self._result(state, f"Contributed {sample.name} to {for_text}")
+
+        self.touched_research.setdefault(character_research, state)
+
+    def _advance_research(self):
+        """Complete stages whose requirements are met and move on to the next stage."""
+        for (character_id, research), character_research in list(self.character_research.items()):
+            state = self.states_by_character.get(character_id) or self.touched_research.get(
+                character_research
+            )
+            progress = self._current_progress(character_research)
+            if state is None or progress is None:
+                continue
+
+            if not progress.stage_completed and progress.meets_requirements():
+                progress.stage_completed = True
+                self._result(
+                    state,
+                    f"Completed stage '{progress.stage.name}' of {research.project_name}",
+                )
+            if not progress.stage_completed:
+                continue
+
+            next_stage = next(
+                (s for s in research.stages if s.stage_number > progress.stage.stage_number),
+                None,
+            )
+            character_research.current_stage = next_stage
+            if next_stage is not None:
+                character_research.progress.append(self._stage_progress(next_stage))
+                self._result(
+                    state, f"Advanced to stage '{next_stage.name}' in {research.project_name}"
+                )
+            else:
+                self._result(state, f"Completed all stages of {research.project_name}")
+
+    def _phase_manual_entries(self):
+        for state in self.states:
+            review = state.pack.review_data or {}
+            theory = next(
+                (e for e in _entries(state.pack.science) if e.get("action") == "theorise"), {}
+            )
+            decision = review.get("invention_review")
+            if decision == "approve":
+                if review.get("invention_type", "new") == "new":
+                    self._create_invention(state, review, theory)
+                else:
+                    self._improve_invention(state, review)
+            elif decision == "decline":
+                name = review.get("invention_name") or theory.get("theorise_name")
+                self._message(
+                    state,
+                    "invention_declined",
+                    f"Invention '{name}' was declined: {review.get('invention_response', '')}",
+                )
+
+            for question in _entries(state.pack.reputation):
+                faction = self.factions.get(_int(question.get("faction_id")))
+                response = review.get(f"reputation_response_{question.get('faction_id')}")
+                if faction and response:
+                    self._message(
+                        state,
+                        "reputation_response",
+                        f"Reputation response for {faction.name}: {response}",
+                    )
+
+    def _create_invention(self, state, review, theory):
+        research = Research(
+            project_name=review.get("invention_name") or theory.get("theorise_name"),
+            description=review.get("invention_description") or theory.get("theorise_desc"),
+            type=ResearchType.INVENTION,
+        )
+        for number, stage_data in enumerate(self._stages_data(review), start=1):
+            research.stages.append(self._build_stage(stage_data, number))
+        db.session.add(research)
+        self.research_by_public_id[research.public_id] = research
+        self._assign(research, state.character)
+        self._result(state, f"New project confirmed: {research.project_name}")
+
+    def _improve_invention(self, state, review):
+        research = self.research_by_id.get(_int(review.get("existing_invention")))
+        character_research = (
+            self.character_research.get((state.character.id, research)) if research else None
+        )
+        if character_research is None or character_research.current_stage is not None:
+            self._result(state, "Could not improve invention - current stages are incomplete")
+            return
+        stages = self._stages_data(review)
+        if not stages:
+            return
+
+        # Only the first stage submitted is used for an improvement
+        number = max((stage.stage_number for stage in research.stages), default=0) + 1
+        stage = self._build_stage(stages[0], number)
+        research.stages.append(stage)
+        character_research.progress.append(self._stage_progress(stage))
+        character_research.current_stage = stage
+        self._result(state, f"Improved {research.project_name}")
+
+    def _phase_conditions(self):
+        for state in self.states:
+            for condition in state.character.active_conditions:
+                if condition.current_stage is None:
+                    # Already reached its conclusion
+                    continue
+                outcome = self.conditions.progress(condition)
+                if outcome["progressed"]:
+                    self._result(state, outcome["message"])
+                else:
+                    self._result(state, f"Error: {outcome['message']}")
+
+    # Writing
+
+    def _flush(self):
+        """Flush every change in one go, then hand the downtime results to character packs."""
+        db.session.flush()
+        self.requirements.write()
+        self.conditions.write()
+        for character, cost, reason in self.charges:
+            character.remove_funds(cost, self.editor_user_id, reason)
+
+        for (item, mod_id), added in self.new_mods.items():
+            key = (item.id, mod_id)
+            if key in self.applied_mods:
+                db.session.execute(
+                    update(item_mods_applied)
+                    .where(
+                        item_mods_applied.c.item_id == item.id,
+                        item_mods_applied.c.mod_id == mod_id,
+                    )
+                    .values(count=self.applied_mods[key] + added)
+                )
+            else:
+                db.session.execute(
+                    insert(item_mods_applied).values(item_id=item.id, mod_id=mod_id, count=added)
+                )
+
+        for state in self.states:
+            character = state.character
+            pack = character.pack
+            for item_id in state.items:
+                pack.add_item(item_id)
+            for items in state.purchased.values():
+                for item in items:
+                    pack.add_item(item.id)
+            for exotic_id, amount in sorted(state.exotics.items()):
+                pack.exotics.extend([exotic_id] * amount)
+            for sample_id in state.samples:
+                pack.add_sample(sample_id)
+            character.pack = pack
+
+            data = dict(character.character_pack)
+            downtime_results = dict(data.get("downtime_results") or {})
+            downtime_results[str(state.pack.id)] = state.results
+            data["downtime_results"] = downtime_results
+            data["messages"] = list(data.get("messages") or []) + state.messages
+            character.character_pack = data
+
+    def _pack_report(self, state):
+        pack = state.character.pack
+        return {
+            "pack_id": state.pack.id,
+            "character_id": state.character.id,
+            "character_name": state.character.name,
+            "results": state.results,
+            "messages": state.messages,
+            "items": list(pack.items),
+            "exotics": list(pack.exotics),
+            "samples": list(pack.samples),
+            "bank_account": state.character.bank_account,
+        }
+
+
+def _new_seed():
+    return random.SystemRandom().randrange(2**31)
+
+
+def preview_downtime_period(period, editor_user_id, seed=None):
+    """
+    Report what processing a downtime period would do, without committing anything.
+
+    Every phase runs inside a savepoint that is rolled back afterwards. The session is expired
+    too, since progress set as committed state is not reset by the rollback.
+
+    Args:
+        period: DowntimePeriod to preview
+        editor_user_id: User who would be recorded on fund audit logs
+        seed: Optional seed for synthesis draws; passing the same seed to
+            queue_downtime_job processes the period with the same draws
+
+    Returns:
+        Report from DowntimeProcessor.run
+    """
+    if seed is None:
+        seed = _new_seed()
+    savepoint = db.session.begin_nested()
+    try:
+        report = DowntimeProcessor(period, editor_user_id, seed=seed).run()
+    finally:
+        savepoint.rollback()
+        db.session.expire_all()
+    return {**report, "dry_run": True}
+
+
+def queue_downtime_job(period, editor_user_id, seed=None):
+    """
+    Create the job that processes a downtime period.
+
+    Raises:
+        ValueError: If the period already has a job
+    """
+    if period.job is not None:
+        raise ValueError("This downtime period is already being processed.")
+    job = DowntimeJob(
+        period_id=period.id,
+        status=DowntimeJobStatus.PENDING,
+        seed=_new_seed() if seed is None else seed,
+        started_by_user_id=editor_user_id,
+        total_packs=DowntimePack.query.filter_by(period_id=period.id).count(),
+        processed_pack_ids=[],
+        timings={},
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def resume_downtime_job(job):
+    """
+    Put a failed or stalled job back in the queue.
+
+    Returns:
+        True if the job was requeued, False if it is not resumable or another request
+        requeued it first
+    """
+    if not job.can_resume:
+        return False
+    table = DowntimeJob.__table__
+    claimable = table.c.status == DowntimeJobStatus.FAILED.value
+    if job.status == DowntimeJobStatus.RUNNING:
+        last_seen = (
+            table.c.heartbeat_at.is_(None)
+            if job.heartbeat_at is None
+            else table.c.heartbeat_at == job.heartbeat_at
+        )
+        claimable = (table.c.status == DowntimeJobStatus.RUNNING.value) & last_seen
+    result = db.session.execute(
+        update(table)
+        .where(table.c.id == job.id, claimable)
+        .values(status=DowntimeJobStatus.PENDING.value)
+    )
+    db.session.commit()
+    db.session.refresh(job)
+    return result.rowcount == 1
+
+
+def start_downtime_job(job):
+    """
+    Run a queued job in a background thread.
+
+    When DOWNTIME_JOBS_ASYNC is turned off the job runs before this returns instead.
+    """
+    app = current_app._get_current_object()
+    if not app.config.get("DOWNTIME_JOBS_ASYNC", True):
+        run_downtime_job(job.id)
+        return
+    Thread(target=_run_downtime_job_in_app, args=(app, job.id), daemon=True).start()
+
+
+def _run_downtime_job_in_app(app, job_id):
+    with app.app_context():
+        try:
+            run_downtime_job(job_id)
+        finally:
+            db.session.remove()
+
+
+def _checkpoint(job_id, heartbeat, **values):
+    """
+    Update a running job and its heartbeat, only if the heartbeat is still the one this runner
+    last wrote. The caller commits on success and rolls back otherwise.
+
+    Returns:
+        The new heartbeat, or None if the job was resumed and claimed by another runner
+    """
+    table = DowntimeJob.__table__
+    new_heartbeat = utcnow()
+    result = db.session.execute(
+        update(table)
+        .where(
+            table.c.id == job_id,
+            table.c.status == DowntimeJobStatus.RUNNING.value,
+            table.c.heartbeat_at == heartbeat,
+        )
+        .values(heartbeat_at=new_heartbeat, **values)
+    )
+    return new_heartbeat if result.rowcount == 1 else None
+
+
+def _lost(job_id):
+    """Roll back the work of a runner whose job another runner has taken over."""
+    db.session.rollback()
+    logger.warning("Downtime job %s was taken over by another runner, stopping", job_id)
+    return None
+
+
+def run_downtime_job(job_id, batch_size=None):
+    """
+    Process the remaining packs of a queued job, checkpointing after every batch.
+
+    Each batch's results are committed together with the ids of its packs. The period is
+    only marked completed, and players only emailed, once the final batch has committed.
+    A failure marks the job failed with the error, leaving earlier batches committed. If the
+    job was taken over by another runner, e.g. after being resumed as stale, the current
+    batch is rolled back and this runner stops.
+
+    Returns:
+        The job, or None if it was not queued or another runner claimed it first
+    """
+    batch_size = batch_size or current_app.config.get("DOWNTIME_JOB_BATCH_SIZE", 25)
+
+    # Claim the job so that two runners cannot process it at once
+    table = DowntimeJob.__table__
+    heartbeat = utcnow()
+    claimed = db.session.execute(
+        update(table)
+        .where(table.c.id == job_id, table.c.status == DowntimeJobStatus.PENDING.value)
+        .values(
+            status=DowntimeJobStatus.RUNNING.value,
+            heartbeat_at=heartbeat,
+            batch_size=batch_size,
+            error=None,
+        )
+    )
+    db.session.commit()
+    if claimed.rowcount != 1:
+        return None
+
+    job = db.session.get(DowntimeJob, job_id)
+    db.session.refresh(job)
+    period = job.period
+    try:
+        processed = set(job.processed_pack_ids or [])
+        remaining = [
+            pack_id
+            for pack_id in db.session.execute(
+                select(DowntimePack.id)
+                .where(DowntimePack.period_id == period.id)
+                .order_by(DowntimePack.id)
+            ).scalars()
+            if pack_id not in processed
+        ]
+        for start in range(0, len(remaining), batch_size):
+            batch = remaining[start : start + batch_size]
+            processor = DowntimeProcessor(
+                period, job.started_by_user_id, seed=job.seed, pack_ids=batch
+            )
+            report = processor.run()
+
+            timings = dict(job.timings or {})
+            for name, elapsed in report["timings"].items():
+                timings[name] = round(timings.get(name, 0) + elapsed, 1)
+            heartbeat = _checkpoint(
+                job_id,
+                heartbeat,
+                timings=timings,
+                processed_pack_ids=list(job.processed_pack_ids or []) + batch,
+            )
+            if heartbeat is None:
+                return _lost(job_id)
+            db.session.commit()
+
+        period.status = DowntimeStatus.COMPLETED
+        heartbeat = _checkpoint(
+            job_id, heartbeat, status=DowntimeJobStatus.COMPLETED.value, completed_at=utcnow()
+        )
+        if heartbeat is None:
+            return _lost(job_id)
+        db.session.commit()
+    except Exception as e:
+        logger.exception("Downtime job %s failed", job_id)
+        db.session.rollback()
+        failed = _checkpoint(
+            job_id,
+            heartbeat,
+            status=DowntimeJobStatus.FAILED.value,
+            error=f"{type(e).__name__}: {e}",
+        )
+        if failed is None:
+            return _lost(job_id)
+        db.session.commit()
+        return db.session.get(DowntimeJob, job_id)
+
+    job = db.session.get(DowntimeJob, job_id)
+
+    # Only tell players once every result is committed
+    packs = (
+        DowntimePack.query.filter_by(period_id=period.id)
+        .options(selectinload(DowntimePack.character).selectinload(Character.user))
+        .all()
+    )
+    for pack in packs:
+        send_downtime_completed_notification(pack.character.user, pack, pack.character)
+
+    logger.info("Processed downtime period %s: %s", period.id, job.timings)
+    return job
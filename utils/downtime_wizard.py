@@ -0,0 +1,232 @@
+import hashlib
+import json
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+
+from models.database.exotic_substances import ExoticSubstance
+from models.database.faction import Faction
+from models.database.item import Item
+from models.database.item_blueprint import ItemBlueprint
+from models.database.mods import Mod
+from models.database.sample import Sample
+from models.extensions import db
+from models.tools.character import Character, CharacterReputation
+from models.tools.downtime import DowntimePack
+from models.tools.research import CharacterResearch, Research
+
+WIZARD_STEPS = ("purchase", "modifications", "engineering", "science", "research", "reputation")
+
+
+def blueprint_catalog():
+    """Every item blueprint that can be purchased, ordered by name."""
+    rows = db.session.execute(
+        select(ItemBlueprint.id, ItemBlueprint.name, ItemBlueprint.base_cost).order_by(
+            ItemBlueprint.name
+        )
+    )
+    return [{"id": id, "name": name, "base_cost": base_cost} for id, name, base_cost in rows]
+
+
+def mod_catalog():
+    """Every modification, ordered by name."""
+    rows = db.session.execute(select(Mod.id, Mod.name).order_by(Mod.name))
+    return [{"id": id, "name": name} for id, name in rows]
+
+
+CATALOGS = {"blueprints": blueprint_catalog, "mods": mod_catalog}
+
+
+def catalog_etag(payload):
+    """Content hash of a catalog payload, so unchanged catalogs can be served as 304s."""
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _group_members(character):
+    """Other characters in the character's group, ordered by name."""
+    if not character.group_id:
+        return []
+    return (
+        Character.query.filter(
+            Character.group_id == character.group_id, Character.id != character.id
+        )
+        .order_by(Character.name)
+        .all()
+    )
+
+
+def _items(item_ids):
+    """Items by id with their blueprint and type, in one query, keeping the given order."""
+    ids = [int(item_id) for item_id in item_ids if str(item_id).isdigit()]
+    if not ids:
+        return []
+    items = {
+        item.id: item
+        for item in Item.query.filter(Item.id.in_(ids)).options(
+            joinedload(Item.blueprint).joinedload(ItemBlueprint.item_type)
+        )
+    }
+    return [
+        {
+            "id": item.id,
+            "name": item.blueprint.name,
+            "type": item.blueprint.item_type.id,
+            "full_code": item.full_code,
+        }
+        for item in (items.get(item_id) for item_id in ids)
+        if item is not None
+    ]
+
+
+def _group_item_ids(period_id, members):
+    """Item ids from the downtime packs of the given group members."""
+    if not members:
+        return []
+    packs = db.session.execute(
+        select(DowntimePack.items).where(
+            DowntimePack.period_id == period_id,
+            DowntimePack.character_id.in_([member.id for member in members]),
+        )
+    ).scalars()
+    return [item_id for items in packs for item_id in items or []]
+
+
+def _samples(character, pack):
+    """Samples the character can work with: the group's, or those in their own pack."""
+    query = Sample.query.options(selectinload(Sample.tags)).order_by(Sample.name)
+    if character.group_id:
+        samples = query.filter(Sample.group_id == character.group_id).all()
+    elif pack.samples:
+        samples = query.filter(Sample.id.in_(pack.samples)).all()
+    else:
+        samples = []
+    return [
+        {
+            "id": sample.id,
+            "name": sample.name,
+            "type": sample.type.value,
+            "tags": [tag.name for tag in sample.tags],
+            "is_researched": sample.is_researched,
+        }
+        for sample in samples
+    ]
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _exotics(pack):
+    """
+    Exotic substances in the pack, with their names looked up in one query.
+
+    Entries without a usable id are skipped rather than failing the whole step.
+    """
+    entries = [
+        (entry, _int(entry.get("id")))
+        for entry in pack.exotic_substances or []
+        if isinstance(entry, dict)
+    ]
+    entries = [(entry, exotic_id) for entry, exotic_id in entries if exotic_id is not None]
+    ids = {exotic_id for _, exotic_id in entries}
+    names = dict(
+        db.session.execute(
+            select(ExoticSubstance.id, ExoticSubstance.name).where(ExoticSubstance.id.in_(ids))
+        ).all()
+    )
+    return [
+        {"id": entry["id"], "name": names.get(exotic_id), "amount": entry.get("amount")}
+        for entry, exotic_id in entries
+    ]
+
+
+def _projects(character_ids):
+    """Research projects assigned to any of the characters, in one joined query."""
+    if not character_ids:
+        return []
+    rows = db.session.execute(
+        select(Research.public_id, Research.project_name, Character.name)
+        .select_from(CharacterResearch)
+        .join(Research, CharacterResearch.research_id == Research.id)
+        .join(Character, CharacterResearch.character_id == Character.id)
+        .where(CharacterResearch.character_id.in_(character_ids))
+        .order_by(Research.project_name, Character.name)
+    )
+    return [
+        {"research_id": public_id, "project_name": project_name, "character_name": name}
+        for public_id, project_name, name in rows
+    ]
+
+
+def _members_payload(members):
+    return [{"id": member.id, "user_id": member.user_id, "name": member.name} for member in members]
+
+
+def _research_context(character, pack, members):
+    return {
+        "samples": _samples(character, pack),
+        "my_projects": _projects([character.id]),
+        "group_projects": (
+            _projects([character.id] + [member.id for member in members])
+            if character.group_id
+            else []
+        ),
+        "group_members": _members_payload(members),
+    }
+
+
+def step_data(step, character, pack):
+    """
+    Data one step of the downtime entry wizard needs, beyond the shared catalogs.
+
+    Each step only loads its own data, with a fixed number of queries however large the
+    pack or group is. Blueprints and modifications are served separately by CATALOGS.
+
+    Raises:
+        KeyError: If the step is not one of WIZARD_STEPS
+    """
+    if step == "purchase":
+        return {
+            "catalogs": ["blueprints"],
+            "bank_balance": character.bank_account,
+            "group_bank_balance": character.group.bank_account if character.group else None,
+        }
+    if step == "modifications":
+        known_mod_ids = [int(mod_id) for mod_id in character.known_modifications or []]
+        return {
+            "catalogs": ["mods"],
+            "known_mod_ids": known_mod_ids,
+            "learning_slots": max(
+                character.get_available_engineering_mod_slots() - len(known_mod_ids), 0
+            ),
+        }
+    if step == "engineering":
+        members = _group_members(character)
+        return {
+            "catalogs": ["mods"],
+            "pack_items": _items(pack.items or []),
+            "group_items": _items(_group_item_ids(pack.period_id, members)),
+        }
+    if step == "science":
+        members = _group_members(character)
+        return {"catalogs": [], **_research_context(character, pack, members)}
+    if step == "research":
+        members = _group_members(character)
+        return {
+            "catalogs": [],
+            "pack_items": _items(pack.items or []),
+            "exotics": _exotics(pack),
+            **_research_context(character, pack, members),
+        }
+    if step == "reputation":
+        rows = db.session.execute(
+            select(Faction.id, Faction.name)
+            .join(CharacterReputation, CharacterReputation.faction_id == Faction.id)
+            .where(CharacterReputation.character_id == character.id, CharacterReputation.value > 0)
+            .order_by(Faction.name)
+        )
+        return {"catalogs": [], "factions": [{"id": id, "name": name} for id, name in rows]}
+    raise KeyError(step)
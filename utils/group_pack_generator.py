@@ -0,0 +1,241 @@
+import random
+
+from sqlalchemy.orm import selectinload
+
+from models.database.exotic_substances import ExoticSubstance
+from models.database.global_settings import GlobalSettings
+from models.database.item_blueprint import ItemBlueprint
+from models.database.medicaments import Medicament
+from models.database.species import Species
+from models.enums import AbilityType, PackOwnerType
+from models.extensions import db
+from models.tools.character import Character
+from models.tools.event_ticket import EventTicket
+from models.tools.group import Group
+from models.tools.pack import Pack
+from models.tools.pack_change import PackChange
+
+
+class GroupPackGenerator:
+    """
+    Generate group pack contents from group type income settings.
+
+    Global settings and the blueprint, exotic and medicament catalogues are loaded once and
+    shared by every group generated with the same instance. Allocations are drawn from a
+    ``random.Random`` seeded with ``seed``, and catalogues are kept in id order, so the same
+    seed and data always produce the same packs.
+    """
+
+    def __init__(self, settings, blueprints, exotics, medicaments, seed=None):
+        self.settings = settings
+        self.blueprints = blueprints
+        self.exotics = exotics
+        self.medicaments = medicaments
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def load(cls, groups, seed=None):
+        """
+        Preload the catalogues needed to generate packs for the given groups.
+
+        Returns:
+            GroupPackGenerator, or None if global settings have not been created
+        """
+        settings = GlobalSettings.query.first()
+        if not settings:
+            return None
+
+        blueprint_ids = set()
+        for group in groups:
+            if group.group_type and group.group_type.income_items_list:
+                blueprint_ids.update(group.group_type.income_items_list)
+            blueprint_ids.update(group.pack.items)
+        blueprints = {}
+        if blueprint_ids:
+            blueprints = {
+                bp.id: bp
+                for bp in ItemBlueprint.query.filter(ItemBlueprint.id.in_(blueprint_ids)).all()
+            }
+
+        return cls(
+            settings,
+            blueprints,
+            ExoticSubstance.query.order_by(ExoticSubstance.id).all(),
+            Medicament.query.order_by(Medicament.id).all(),
+            seed=seed,
+        )
+
+    @staticmethod
+    def attending_characters(event_id, group_id=None):
+        """
+        Characters attending an event who belong to a group, keyed by group id.
+
+        Species abilities, groups and group types are loaded with the characters.
+        """
+        query = (
+            Character.query.join(EventTicket, EventTicket.character_id == Character.id)
+            .filter(EventTicket.event_id == event_id, Character.group_id.isnot(None))
+            .options(
+                selectinload(Character.species).selectinload(Species.abilities),
+                selectinload(Character.group).selectinload(Group.group_type),
+            )
+            .order_by(Character.id)
+        )
+        if group_id is not None:
+            query = query.filter(Character.group_id == group_id)
+
+        by_group = {}
+        for character in query.distinct().all():
+            by_group.setdefault(character.group_id, []).append(character)
+        return by_group
+
+    def character_income(self, character):
+        """Base character income plus any additional group income from species abilities."""
+        income = self.settings.character_income_ec
+        if character.species:
+            for ability in character.species.abilities:
+                if ability.type == AbilityType.GROUP_INCOME and ability.additional_group_income:
+                    income += ability.additional_group_income
+        return income
+
+    def _shuffled(self, values):
+        values = list(values)
+        self.rng.shuffle(values)
+        return values
+
+    def generate(self, group, characters):
+        """
+        Fill a group's pack from the income of its attending characters.
+
+        Items are added on top of those already in the pack, whose cost counts against the
+        items budget. Exotics and medicaments are drawn afresh. Whatever budget is left over
+        is given as energy chits.
+
+        Returns:
+            Summary dictionary for the group
+        """
+        group_type = group.group_type
+        pack = group.pack or Pack()
+        pack.is_generated = True
+
+        ec_pool = sum(self.character_income(character) for character in characters)
+        added_items = []
+
+        if group_type and group_type.income_distribution_dict:
+            distribution = group_type.income_distribution_dict
+
+            # Calculate budget for each category
+            items_budget = int(ec_pool * (distribution.get("items", 0) / 100))
+            exotics_budget = int(ec_pool * (distribution.get("exotics", 0) / 100))
+            medicaments_budget = int(ec_pool * (distribution.get("medicaments", 0) / 100))
+            chits_budget = int(ec_pool * (distribution.get("chits", 0) / 100))
+
+            # Add items randomly until budget is exhausted
+            if items_budget > 0 and group_type.income_items_list:
+                discount = group_type.income_items_discount
+
+                # Count the cost of existing items in the pack
+                for item in pack.items:
+                    blueprint = self.blueprints.get(item)
+                    if blueprint:
+                        items_budget -= int(blueprint.base_cost * (1 - discount))
+
+                available_blueprints = [
+                    self.blueprints[blueprint_id]
+                    for blueprint_id in sorted(set(group_type.income_items_list))
+                    if blueprint_id in self.blueprints
+                    and self.blueprints[blueprint_id].purchaseable
+                ]
+                if available_blueprints and items_budget > 0:
+                    for blueprint in self._shuffled(available_blueprints):
+                        discounted_cost = int(blueprint.base_cost * (1 - discount))
+                        if discounted_cost > items_budget:
+                            # Can't afford this item, stop adding items
+                            break
+                        added_items.append(blueprint.id)
+                        items_budget -= discounted_cost
+                pack.items.extend(added_items)
+
+            # Clear exotics and add them randomly
+            exotics = []
+            if exotics_budget > 0 and group_type.income_substances:
+                for exotic in self._shuffled(self.exotics):
+                    if group_type.income_substance_cost > exotics_budget:
+                        break
+                    exotics.append(exotic.id)
+                    exotics_budget -= group_type.income_substance_cost
+            pack.exotics = exotics
+
+            # Clear medicaments and add them randomly
+            medicaments = []
+            if medicaments_budget > 0 and group_type.income_medicaments:
+                for medicament in self._shuffled(self.medicaments):
+                    if group_type.income_medicament_cost > medicaments_budget:
+                        break
+                    medicaments.append(medicament.id)
+                    medicaments_budget -= group_type.income_medicament_cost
+            pack.medicaments = medicaments
+
+            # Add remaining EC to the pack
+            pack.energy_chits = items_budget + exotics_budget + medicaments_budget + chits_budget
+
+        group.pack = pack
+
+        return {
+            "group_id": group.id,
+            "group_name": group.name,
+            "characters": len(characters),
+            "ec_pool": ec_pool,
+            "items_added": len(added_items),
+            "exotics": len(pack.exotics),
+            "medicaments": len(pack.medicaments),
+            "energy_chits": pack.energy_chits,
+        }
+
+
+def generate_event_group_packs(event_id, seed=None, user_id=None):
+    """
+    Generate packs for every group with characters attending an event, in one transaction.
+
+    Each generated pack is recorded on the event's pack change feed.
+
+    Args:
+        event_id: Event to generate group packs for
+        seed: Optional seed for reproducible allocations; a random one is chosen if omitted
+        user_id: User recorded on the pack changes
+
+    Returns:
+        Summary dictionary with the seed used and a row per generated group
+
+    Raises:
+        ValueError: If global settings have not been created
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+
+    characters_by_group = GroupPackGenerator.attending_characters(event_id)
+    groups = [characters[0].group for _, characters in sorted(characters_by_group.items())]
+
+    generator = GroupPackGenerator.load(groups, seed=seed)
+    if generator is None:
+        raise ValueError("Global settings not found")
+
+    try:
+        results = []
+        for group in groups:
+            results.append(generator.generate(group, characters_by_group[group.id]))
+            PackChange.record_contents(event_id, PackOwnerType.GROUP, group, user_id=user_id)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {
+        "seed": seed,
+        "groups": results,
+        "total_groups": len(results),
+        "total_characters": sum(result["characters"] for result in results),
+        "total_items_added": sum(result["items_added"] for result in results),
+        "total_energy_chits": sum(result["energy_chits"] for result in results),
+    }
@@ -0,0 +1,166 @@
+from sqlalchemy.orm import selectinload
+
+from models.database.exotic_substances import ExoticSubstance
+from models.database.item import Item
+from models.database.item_blueprint import ItemBlueprint
+from models.database.medicaments import Medicament
+from models.database.sample import Sample
+from models.tools.character import Character
+from models.tools.event_ticket import EventTicket
+from models.tools.group import Group
+from models.tools.pack import Pack
+
+
+class EventPackResolver:
+    """
+    Load every attendee pack for an event, plus the catalogue entries those packs reference.
+
+    Attendees, their users, factions, species and groups are loaded with selectinload, and
+    each catalogue table is queried once with an IN over the ids the packs actually use.
+    """
+
+    def __init__(self, event_id):
+        self.event_id = event_id
+
+        self.tickets = (
+            EventTicket.query.filter(
+                EventTicket.event_id == event_id, EventTicket.character_id.isnot(None)
+            )
+            .options(
+                selectinload(EventTicket.character).options(
+                    selectinload(Character.user),
+                    selectinload(Character.faction),
+                    selectinload(Character.species),
+                    selectinload(Character.group).selectinload(Group.group_type),
+                )
+            )
+            .all()
+        )
+
+        # Each pack is deserialized once and reused by every caller
+        self.character_packs = []
+        groups = {}
+        group_characters = {}
+        for ticket in self.tickets:
+            character = ticket.character
+            if not character:
+                continue
+            self.character_packs.append(
+                {
+                    "character": character,
+                    "ticket": ticket,
+                    "pack": character.pack or Pack(),
+                    "user": character.user,
+                    "faction": character.faction,
+                }
+            )
+            if character.group:
+                groups[character.group.id] = character.group
+                group_characters.setdefault(character.group.id, []).append(character)
+
+        self.group_packs = [
+            {
+                "group": group,
+                "pack": group.pack or Pack(),
+                "characters": [
+                    {
+                        "user": {
+                            "id": character.user.id,
+                            "first_name": character.user.first_name,
+                            "surname": character.user.surname,
+                        },
+                        "character": {"id": character.id, "name": character.name},
+                        "species": {"name": character.species.name if character.species else ""},
+                    }
+                    for character in group_characters[group_id]
+                ],
+            }
+            for group_id, group in groups.items()
+        ]
+
+        self._items = None
+        self._item_blueprints = None
+        self._exotics = None
+        self._medicaments = None
+        self._samples = None
+
+    @property
+    def packs(self):
+        """All character and group packs for the event."""
+        return [entry["pack"] for entry in self.character_packs + self.group_packs]
+
+    def referenced_ids(self, kind):
+        """Union of ids of one kind (items, samples, exotics, medicaments) across all packs."""
+        ids = set()
+        for pack in self.packs:
+            ids.update(getattr(pack, kind))
+        return ids
+
+    @staticmethod
+    def _load(model, ids, *options):
+        if not ids:
+            return {}
+        query = model.query.filter(model.id.in_(ids))
+        if options:
+            query = query.options(*options)
+        return {obj.id: obj for obj in query.all()}
+
+    @property
+    def items(self):
+        """Referenced items keyed by id, with blueprints preloaded."""
+        if self._items is None:
+            self._items = self._load(
+                Item, self.referenced_ids("items"), selectinload(Item.blueprint)
+            )
+        return self._items
+
+    @property
+    def item_blueprints(self):
+        """Blueprints of referenced items, plus blueprint ids stored directly in group packs."""
+        if self._item_blueprints is None:
+            blueprints = {
+                item.blueprint.id: item.blueprint for item in self.items.values() if item.blueprint
+            }
+            missing = self.referenced_ids("items") - set(blueprints)
+            blueprints.update(self._load(ItemBlueprint, missing))
+            self._item_blueprints = blueprints
+        return self._item_blueprints
+
+    @property
+    def exotics(self):
+        """Referenced exotic substances keyed by id."""
+        if self._exotics is None:
+            self._exotics = self._load(ExoticSubstance, self.referenced_ids("exotics"))
+        return self._exotics
+
+    @property
+    def medicaments(self):
+        """Referenced medicaments keyed by id."""
+        if self._medicaments is None:
+            self._medicaments = self._load(Medicament, self.referenced_ids("medicaments"))
+        return self._medicaments
+
+    @property
+    def samples(self):
+        """Referenced samples keyed by id."""
+        if self._samples is None:
+            self._samples = self._load(Sample, self.referenced_ids("samples"))
+        return self._samples
+
+    def incomplete(self, kind):
+        """
+        Resolve the objects of one kind from packs whose completion flag for it is not set.
+
+        Args:
+            kind: Pack attribute to collect, "items" or "medicaments"
+
+        Returns:
+            List of objects in pack order, one per pack entry
+        """
+        lookup = getattr(self, kind)
+        resolved = []
+        for pack in self.packs:
+            if pack.completion.get(kind, False):
+                continue
+            resolved.extend(lookup[ref_id] for ref_id in getattr(pack, kind) if ref_id in lookup)
+        return resolved
@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+from flask import current_app
+
+# Template columns that affect where and how items are placed on the sheet
+LAYOUT_FIELDS = (
+    "width_mm",
+    "height_mm",
+    "is_landscape",
+    "has_back_side",
+    "items_per_row",
+    "items_per_column",
+    "margin_top_mm",
+    "margin_bottom_mm",
+    "margin_left_mm",
+    "margin_right_mm",
+    "gap_horizontal_mm",
+    "gap_vertical_mm",
+)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_cache_key(template, items, double_sided):
+    """
+    Build a content-addressed cache key for a print job.
+
+    Args:
+        template: PrintTemplate used for the job (its version and layout settings are hashed)
+        items: List of item dictionaries with rendered front_html, back_html and css
+        double_sided: Whether the PDF is double-sided
+
+    Returns:
+        Hex digest identifying the rendered PDF
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{template.id}|{template.updated_at}|{double_sided}".encode())
+    for field in LAYOUT_FIELDS:
+        digest.update(f"|{getattr(template, field, None)}".encode())
+    for item in items:
+        for field in ("width_mm", "height_mm", "front_html", "back_html", "css"):
+            value = item.get(field)
+            digest.update(b"\x00" + ("" if value is None else str(value)).encode())
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+class PdfCache:
+    """Size-bounded, least-recently-used disk cache of rendered PDFs."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file_path(self, key):
+        return os.path.join(self.path, f"{key}.pdf")
+
+    def get(self, key):
+        """Return the cached PDF bytes for a key, or None on a miss."""
+        file_path = self._file_path(key)
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            # Mark as recently used for eviction
+            os.utime(file_path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store PDF bytes under a key and evict the least recently used entries if needed."""
+        if len(data) > self.max_bytes:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._file_path(key))
+        except OSError:
+            # A failed cache write should never fail the print job itself
+            logger.warning("Could not write print cache entry %s", key, exc_info=True)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".pdf"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, file_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    continue
+                total -= size
+
+    def clear(self):
+        """Remove every cached PDF and reset the hit counters."""
+        with self._lock:
+            for _, _, file_path in self._entries():
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counts, hit rate and disk usage for this cache."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+def get_pdf_cache():
+    """Return the PDF cache for the current app, or None if it is disabled."""
+    cache = current_app.extensions.get("pdf_cache")
+    if cache is None:
+        path = current_app.config.get("PRINT_CACHE_PATH")
+        if not path:
+            return None
+        try:
+            cache = PdfCache(
+                path, current_app.config.get("PRINT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+            )
+        except OSError:
+            logger.warning("Print cache disabled, cannot use %s", path, exc_info=True)
+            return None
+        current_app.extensions["pdf_cache"] = cache
+    return cache
@@ -1,23 +1,85 @@
+import logging
 import math
+import threading
+import time
+from collections import OrderedDict
 from io import BytesIO
 from typing import Dict, List
 
-from weasyprint import HTML
+from weasyprint import HTML, default_url_fetcher
+from weasyprint.text.fonts import FontConfiguration
 
 from models.enums import PrintTemplateType
+from models.tools.character_stats import load_character_stats
 from models.tools.print_template import PrintTemplate
 from utils import generate_qr_code, generate_web_qr_code
+from utils.pdf_cache import pdf_cache_key
 
 # A4 dimensions in millimeters
 A4_WIDTH_MM = 210
 A4_HEIGHT_MM = 297
 CUT_GUIDE_WIDTH_MM = 0.2  # Width of cut guide lines
 
+# Limits for the render resources kept between PDF renders in a worker
+IMAGE_CACHE_MAX_ENTRIES = 512
+URL_FETCH_CACHE_MAX_ENTRIES = 128
+URL_FETCH_CACHE_MAX_BYTES = 5 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+# WeasyPrint resources are not shared between threads, so each worker thread keeps its own
+_render_resources = threading.local()
+
+
+def _get_render_resources():
+    """Return the font configuration, image cache and fetch cache for the current worker."""
+    if not hasattr(_render_resources, "font_config"):
+        _render_resources.font_config = FontConfiguration()
+        _render_resources.image_cache = {}
+        _render_resources.url_cache = OrderedDict()
+    return _render_resources
+
+
+def _cached_url_fetcher(url, timeout=10, ssl_context=None):
+    """URL fetcher that keeps fetched stylesheets, fonts and images for later renders."""
+    if url.startswith("data:"):
+        return default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+
+    url_cache = _get_render_resources().url_cache
+    if url in url_cache:
+        url_cache.move_to_end(url)
+        return dict(url_cache[url])
+
+    result = default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+    file_obj = result.pop("file_obj", None)
+    if file_obj is not None:
+        try:
+            result["string"] = file_obj.read()
+        finally:
+            file_obj.close()
+
+    if len(result.get("string") or b"") <= URL_FETCH_CACHE_MAX_BYTES:
+        url_cache[url] = result
+        while len(url_cache) > URL_FETCH_CACHE_MAX_ENTRIES:
+            url_cache.popitem(last=False)
+    return dict(result)
+
+
+def _peak_rss_kb():
+    """Return the peak resident set size of this process in KB, if available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
 
 class PrintLayout:
-    def __init__(self):
+    def __init__(self, pdf_cache=None):
         self.page_width = A4_WIDTH_MM
         self.page_height = A4_HEIGHT_MM
+        # Optional PdfCache; when set, identical print jobs are served from disk
+        self.pdf_cache = pdf_cache
 
     def calculate_layout(
         self,
@@ -144,6 +206,13 @@ class PrintLayout:
         if not items:
             raise ValueError("No items provided for layout calculation")
 
+        cache_key = None
+        if self.pdf_cache is not None:
+            cache_key = pdf_cache_key(template, items, double_sided)
+            cached_pdf = self.pdf_cache.get(cache_key)
+            if cached_pdf is not None:
+                return BytesIO(cached_pdf)
+
         # Get width and height from first item or template
         width = float(items[0].get("width_mm", template.width_mm))
         height = float(items[0].get("height_mm", template.height_mm))
@@ -228,11 +297,31 @@ class PrintLayout:
         # Generate the HTML
         html_content = self._generate_print_html(arranged_pages, template.type)
 
-        # Create PDF using WeasyPrint with minimal options
+        # Create PDF using WeasyPrint, reusing fonts and fetched resources from earlier renders
+        resources = _get_render_resources()
+        start = time.perf_counter()
         pdf_buffer = BytesIO()
-        html = HTML(string=html_content)
-        html.write_pdf(target=pdf_buffer)
+        html = HTML(string=html_content, url_fetcher=_cached_url_fetcher)
+        html.write_pdf(
+            target=pdf_buffer, font_config=resources.font_config, cache=resources.image_cache
+        )
         pdf_buffer.seek(0)
+
+        # Images are only dropped between renders, as the PDF references them lazily while writing
+        if len(resources.image_cache) > IMAGE_CACHE_MAX_ENTRIES:
+            resources.image_cache.clear()
+
+        if cache_key is not None:
+            self.pdf_cache.put(cache_key, pdf_buffer.getvalue())
+
+        logger.debug(
+            "Rendered %d items to PDF: html=%d bytes, pdf=%d bytes, %.3fs, peak rss=%s KB",
+            len(items),
+            len(html_content),
+            pdf_buffer.getbuffer().nbytes,
+            time.perf_counter() - start,
+            _peak_rss_kb(),
+        )
         return pdf_buffer
 
     def _generate_print_html(self, pages: List[List[Dict]], template_type: str) -> str:
@@ -290,6 +379,26 @@ class PrintLayout:
             </style>
         """
         )
+
+        # Each distinct item size and stylesheet is emitted once, rather than once per item
+        item_sizes = {}
+        stylesheets = {}
+        for page_items in pages:
+            for item in page_items:
+                item_sizes.setdefault((item["width_mm"], item["height_mm"]), len(item_sizes))
+                stylesheets.setdefault(item.get("css", ""), None)
+
+        html.append("<style>")
+        html.append("/* Base styles for the template content */")
+        for (width_mm, height_mm), size_index in item_sizes.items():
+            html.append(
+                f".item-size-{size_index} .template-content {{ position: relative; "
+                f"width: {width_mm}mm; height: {height_mm}mm; }}"
+            )
+        html.append("</style>")
+        for css in stylesheets:
+            if css:
+                html.append(f"<style>\n/* Template-specific styles */\n{css}\n</style>")
         html.append("</head>")
         html.append("<body>")
 
@@ -299,25 +408,16 @@ class PrintLayout:
             for item in page_items:
                 x, y = item["position"]
                 item_html = item.get("html", "")
+                size_index = item_sizes[(item["width_mm"], item["height_mm"])]
                 html.append(
                     f"""
-                <div class="item" style="
+                <div class="item item-size-{size_index}" style="
                     left: {x}mm;
                     top: {y}mm;
                     width: {item['width_mm']}mm;
                     height: {item['height_mm']}mm;
                     overflow: visible;
                 ">
-                    <style>
-                        /* Base styles for the template content */
-                        .template-content {{
-                            position: relative;
-                            width: {item['width_mm']}mm;
-                            height: {item['height_mm']}mm;
-                        }}
-                        /* Template-specific styles */
-                        {item.get('css', '')}
-                    </style>
                     <div class="template-content">
                         {item_html}
                     </div>
@@ -353,6 +453,14 @@ class PrintLayout:
         if not template:
             raise ValueError("Character sheet template not found")
 
+        items_to_print = self.render_character_sheet_items(characters, template)
+        return self.generate_pdf(items_to_print, template, template.has_back_side)
+
+    def render_character_sheet_items(self, characters: List, template: PrintTemplate) -> List:
+        """Render the character sheet HTML for each character, without building a PDF."""
+        css = template.get_css_render()
+        # Sheets read skill costs, reputation and sheet values, load them all at once
+        load_character_stats(characters)
         items_to_print = []
         for character in characters:
             template_context = {
@@ -370,11 +478,11 @@ class PrintLayout:
                         if template.has_back_side
                         else None
                     ),
-                    "css": template.get_css_render(),
+                    "css": css,
                 }
             )
 
-        return self.generate_pdf(items_to_print, template, template.has_back_side)
+        return items_to_print
 
     def generate_character_id_pdf(
         self, characters: List, template: PrintTemplate = None
@@ -387,6 +495,7 @@ class PrintLayout:
         if not template:
             raise ValueError("Character ID template not found")
 
+        css = template.get_css_render()
         items_to_print = []
         for character in characters:
             template_context = {
@@ -400,7 +509,7 @@ class PrintLayout:
                     "height_mm": template.height_mm,
                     "front_html": template.get_front_page_render(template_context),
                     "back_html": None,
-                    "css": template.get_css_render(),
+                    "css": css,
                 }
             )
 
@@ -413,6 +522,7 @@ class PrintLayout:
         if not template:
             raise ValueError("Item card template not found")
 
+        css = template.get_css_render()
         items_to_print = []
         for item in items:
             template_context = {
@@ -430,7 +540,7 @@ class PrintLayout:
                         if template.has_back_side
                         else None
                     ),
-                    "css": template.get_css_render(),
+                    "css": css,
                 }
             )
 
@@ -447,6 +557,7 @@ class PrintLayout:
         if not template:
             raise ValueError("Exotic substance label template not found")
 
+        css = template.get_css_render()
         items_to_print = []
         for item in items:  # Default to 160 (8x20 grid)
             template_context = {
@@ -460,7 +571,7 @@ class PrintLayout:
                     "height_mm": template.height_mm,
                     "front_html": template.get_front_page_render(template_context),
                     "back_html": None,  # Labels are single-sided
-                    "css": template.get_css_render(),
+                    "css": css,
                 }
             )
 
@@ -475,6 +586,7 @@ class PrintLayout:
         if not template:
             raise ValueError("Condition card template not found")
 
+        css = template.get_css_render()
         items_to_print = []
         for item in items:  # Default to 9 (3x3 grid)
             template_context = {
@@ -492,7 +604,7 @@ class PrintLayout:
                         if template.has_back_side
                         else None
                     ),
-                    "css": template.get_css_render(),
+                    "css": css,
                 }
             )
 
@@ -507,6 +619,7 @@ class PrintLayout:
         if not template:
             raise ValueError("Medicament card template not found")
 
+        css = template.get_css_render()
         items_to_print = []
         for item in items:  # Default to 9 (3x3 grid)
             template_context = {
@@ -524,7 +637,7 @@ class PrintLayout:
                         if template.has_back_side
                         else None
                     ),
-                    "css": template.get_css_render(),
+                    "css": css,
                 }
             )
 
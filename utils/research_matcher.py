@@ -0,0 +1,122 @@
+from collections import defaultdict
+
+from sqlalchemy import bindparam, inspect, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models.enums import ResearchRequirementType
+from models.extensions import db
+from models.tools.research import CharacterResearchStageRequirement
+
+
+def _value(value):
+    return getattr(value, "value", value)
+
+
+def requirement_key(requirement):
+    """What a contribution has to match to count towards a requirement."""
+    requirement_type = _value(requirement.requirement_type)
+    if requirement_type == ResearchRequirementType.SCIENCE.value:
+        return (requirement_type, _value(requirement.science_type))
+    if requirement_type == ResearchRequirementType.ITEM.value:
+        return (requirement_type, str(requirement.item_type))
+    if requirement_type == ResearchRequirementType.EXOTIC.value:
+        return (requirement_type, requirement.exotic_substance_id)
+    return (requirement_type, requirement.sample_tag, bool(requirement.requires_researched))
+
+
+def science_keys(science_type):
+    return [(ResearchRequirementType.SCIENCE.value, _value(science_type))]
+
+
+def item_keys(item):
+    return [(ResearchRequirementType.ITEM.value, str(item.blueprint.item_type_id))]
+
+
+def exotic_keys(exotic):
+    return [(ResearchRequirementType.EXOTIC.value, exotic.id)]
+
+
+def sample_keys(sample):
+    """Samples count for requirements on any of their tags, researched ones also for
+    requirements asking for researched samples."""
+    sample_type = ResearchRequirementType.SAMPLE.value
+    keys = []
+    for tag in sample.tags:
+        keys.append((sample_type, tag.name, False))
+        if sample.is_researched:
+            keys.append((sample_type, tag.name, True))
+    return keys
+
+
+class RequirementMatcher:
+    """
+    Open requirements of research stages, indexed by what a contribution has to match.
+
+    A stage's requirements are indexed the first time a contribution is matched against it,
+    so each contribution is a few dictionary lookups rather than a scan of the stage. Progress
+    added to stored requirement rows is kept as deltas and written back by ``write`` in one
+    UPDATE, instead of one UPDATE per row when the session is flushed.
+    """
+
+    def __init__(self):
+        self._open = {}
+        self.deltas = defaultdict(int)
+
+    @staticmethod
+    def remaining(requirement_progress):
+        return requirement_progress.requirement.amount - requirement_progress.progress
+
+    def _index(self, stage_progress):
+        index = self._open.get(stage_progress)
+        if index is None:
+            index = defaultdict(list)
+            for position, requirement_progress in enumerate(stage_progress.requirement_progress):
+                key = requirement_key(requirement_progress.requirement)
+                index[key].append((position, requirement_progress))
+            self._open[stage_progress] = index
+        return index
+
+    def match(self, stage_progress, keys):
+        """First requirement of the stage, in stage order, still open for any of the keys."""
+        index = self._index(stage_progress)
+        found = None
+        for key in keys:
+            candidates = index.get(key)
+            # Requirements are dropped from the index once they are met
+            while candidates and self.remaining(candidates[0][1]) <= 0:
+                candidates.pop(0)
+            if candidates and (found is None or candidates[0][0] < found[0]):
+                found = candidates[0]
+        return found[1] if found else None
+
+    def add(self, requirement_progress, amount):
+        """Add progress to a requirement, recording it for the bulk write if it is stored."""
+        if amount <= 0:
+            return
+        progress = requirement_progress.progress + amount
+        if inspect(requirement_progress).persistent:
+            set_committed_value(requirement_progress, "progress", progress)
+            self.deltas[requirement_progress] += amount
+        else:
+            requirement_progress.progress = progress
+
+    def fill(self, stage_progress):
+        """Meet every requirement of a stage."""
+        for requirement_progress in stage_progress.requirement_progress:
+            self.add(requirement_progress, self.remaining(requirement_progress))
+
+    def write(self):
+        """Add the recorded progress to the stored requirement rows in one statement."""
+        if not self.deltas:
+            return
+        table = CharacterResearchStageRequirement.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values(progress=table.c.progress + bindparam("delta")),
+            [
+                {"row_id": requirement_progress.id, "delta": delta}
+                for requirement_progress, delta in self.deltas.items()
+            ],
+        )
+        self.deltas.clear()
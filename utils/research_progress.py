@@ -0,0 +1,169 @@
+from collections import defaultdict
+
+from sqlalchemy import Integer, and_, case, cast, exists, func, select
+from sqlalchemy.orm import contains_eager
+
+from models.database.exotic_substances import ExoticSubstance
+from models.database.item_type import ItemType
+from models.enums import ResearchRequirementType, ScienceType
+from models.extensions import db
+from models.tools.character import Character
+from models.tools.research import (
+    CharacterResearch,
+    CharacterResearchStage,
+    CharacterResearchStageRequirement,
+    Research,
+    ResearchStage,
+    ResearchStageRequirement,
+)
+
+
+def overview_query(science_type=None):
+    """
+    Every character research assignment with its project, character and current stage,
+    ordered by project then character name.
+
+    With a science type, only projects with a requirement of that science type at any stage
+    are included.
+    """
+    query = (
+        select(CharacterResearch)
+        .join(CharacterResearch.research)
+        .join(CharacterResearch.character)
+        .outerjoin(CharacterResearch.current_stage)
+        .options(
+            contains_eager(CharacterResearch.research),
+            contains_eager(CharacterResearch.character),
+            contains_eager(CharacterResearch.current_stage),
+        )
+        .order_by(Research.project_name, Character.name, CharacterResearch.id)
+    )
+    if science_type:
+        query = query.where(
+            exists()
+            .where(
+                ResearchStage.research_id == Research.id,
+                ResearchStageRequirement.stage_id == ResearchStage.id,
+                ResearchStageRequirement.science_type == ScienceType(science_type),
+            )
+            .correlate(Research)
+        )
+    return query
+
+
+def _current_stage_requirements(character_research_ids):
+    """Requirement progress rows of the current stage of each of the assignments."""
+    return (
+        select(CharacterResearchStage.character_research_id)
+        .select_from(CharacterResearchStageRequirement)
+        .join(
+            CharacterResearchStage,
+            CharacterResearchStageRequirement.character_research_stage_id
+            == CharacterResearchStage.id,
+        )
+        .join(
+            CharacterResearch,
+            and_(
+                CharacterResearch.id == CharacterResearchStage.character_research_id,
+                CharacterResearch.current_stage_id == CharacterResearchStage.stage_id,
+            ),
+        )
+        .join(
+            ResearchStageRequirement,
+            ResearchStageRequirement.id == CharacterResearchStageRequirement.requirement_id,
+        )
+        .where(CharacterResearch.id.in_(character_research_ids))
+    )
+
+
+def _requirement_label(requirement_type, science_type, item_type, exotic, sample_tag, researched):
+    if requirement_type == ResearchRequirementType.SCIENCE:
+        science = ScienceType.descriptions()[science_type.value] if science_type else "Any"
+        return f"{science} science"
+    if requirement_type == ResearchRequirementType.ITEM:
+        return f"Item: {item_type or 'Unknown type'}"
+    if requirement_type == ResearchRequirementType.EXOTIC:
+        return f"Exotic: {exotic or 'Unknown substance'}"
+    return f"{'Researched sample' if researched else 'Sample'}: {sample_tag}"
+
+
+def progress_overview(assignments):
+    """
+    Stage numbers, percent complete and unmet requirements for a page of assignments.
+
+    Runs three queries however many assignments there are: stage counts per project, summed
+    progress of each current stage, and the current stages' unmet requirements.
+
+    Returns:
+        dict: Character research id -> stage_number, stage_count, percent and blocking
+    """
+    ids = [assignment.id for assignment in assignments]
+    research_ids = {assignment.research_id for assignment in assignments}
+    if not ids:
+        return {}
+
+    stage_counts = dict(
+        db.session.execute(
+            select(ResearchStage.research_id, func.count(ResearchStage.id))
+            .where(ResearchStage.research_id.in_(research_ids))
+            .group_by(ResearchStage.research_id)
+        ).all()
+    )
+
+    capped = case(
+        (
+            CharacterResearchStageRequirement.progress < ResearchStageRequirement.amount,
+            CharacterResearchStageRequirement.progress,
+        ),
+        else_=ResearchStageRequirement.amount,
+    )
+    totals = {
+        character_research_id: (done or 0, total or 0)
+        for character_research_id, done, total in db.session.execute(
+            _current_stage_requirements(ids)
+            .add_columns(func.sum(capped), func.sum(ResearchStageRequirement.amount))
+            .group_by(CharacterResearchStage.character_research_id)
+        )
+    }
+
+    blocking = defaultdict(list)
+    for row in db.session.execute(
+        _current_stage_requirements(ids)
+        .add_columns(
+            ResearchStageRequirement.requirement_type,
+            ResearchStageRequirement.science_type,
+            ItemType.name,
+            ExoticSubstance.name,
+            ResearchStageRequirement.sample_tag,
+            ResearchStageRequirement.requires_researched,
+            ResearchStageRequirement.amount,
+            CharacterResearchStageRequirement.progress,
+        )
+        .outerjoin(ItemType, ItemType.id == cast(ResearchStageRequirement.item_type, Integer))
+        .outerjoin(
+            ExoticSubstance, ExoticSubstance.id == ResearchStageRequirement.exotic_substance_id
+        )
+        .where(CharacterResearchStageRequirement.progress < ResearchStageRequirement.amount)
+        .order_by(CharacterResearchStageRequirement.id)
+    ):
+        character_research_id, *label, amount, progress = row
+        blocking[character_research_id].append(
+            {"label": _requirement_label(*label), "progress": progress, "amount": amount}
+        )
+
+    overview = {}
+    for assignment in assignments:
+        done, total = totals.get(assignment.id, (0, 0))
+        if assignment.current_stage_id is None:
+            percent = 100
+        else:
+            percent = int(done / total * 100) if total else 0
+        overview[assignment.id] = {
+            "stage_number": (
+                assignment.current_stage.stage_number if assignment.current_stage else None
+            ),
+            "stage_count": stage_counts.get(assignment.research_id, 0),
+            "percent": percent,
+            "blocking": blocking.get(assignment.id, []),
+        }
+    return overview
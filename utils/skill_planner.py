@@ -0,0 +1,198 @@
+import heapq
+import json
+from collections import Counter, defaultdict
+
+from sqlalchemy import select
+
+from models.database.skills import Skill
+from models.database.species import Ability
+from models.enums import AbilityType, CharacterStatus
+from models.extensions import db
+from models.tools.character import CharacterSkill, character_tags
+
+
+def skill_graph():
+    """
+    Every skill keyed by id, and the ids of the skills each skill is the prerequisite of.
+
+    Returns:
+        tuple: (skills, unlocks)
+    """
+    skills = {skill.id: skill for skill in Skill.query.order_by(Skill.name)}
+    unlocks = defaultdict(list)
+    for skill in skills.values():
+        if skill.required_skill_id in skills:
+            unlocks[skill.required_skill_id].append(skill.id)
+    return skills, dict(unlocks)
+
+
+class SkillPlanner:
+    """
+    Evaluates candidate skill purchases for a character without saving anything.
+
+    Everything a plan depends on is loaded up front: the prerequisite graph, the character's
+    current skills and tags, and their species' skill discounts. Evaluating a plan then needs
+    no further queries, and the cost of each rank of each skill is worked out only once.
+    """
+
+    def __init__(self, character, graph=None):
+        self.character = character
+        self.skills, self.unlocks = graph or skill_graph()
+        self.owned = dict(
+            db.session.execute(
+                select(CharacterSkill.skill_id, CharacterSkill.times_purchased).where(
+                    CharacterSkill.character_id == character.id
+                )
+            ).all()
+        )
+        self.tag_ids = set(
+            db.session.execute(
+                select(character_tags.c.tag_id).where(character_tags.c.character_id == character.id)
+            ).scalars()
+        )
+        self.discounts = defaultdict(list)
+        if character.species_id:
+            for (skill_discounts,) in db.session.execute(
+                select(Ability.skill_discounts).where(
+                    Ability.species_id == character.species_id,
+                    Ability.type == AbilityType.SKILL_DISCOUNTS,
+                    Ability.skill_discounts.is_not(None),
+                )
+            ):
+                for skill_id, discount in json.loads(skill_discounts).items():
+                    self.discounts[int(skill_id)].append(discount)
+        self._costs = {}
+        self._allowed = {}
+
+    def cost(self, skill_id, rank):
+        """Cost of the rank-th purchase of a skill, after species discounts."""
+        key = (skill_id, rank)
+        if key not in self._costs:
+            skill = self.skills[skill_id]
+            cost = skill.base_cost + (rank - 1 if skill.cost_increases else 0)
+            for discount in self.discounts[skill_id]:
+                cost = max(0, cost - discount)
+            self._costs[key] = cost
+        return self._costs[key]
+
+    def allowed(self, skill_id):
+        """Whether the character's faction, species and tags allow the skill. Prerequisites
+        depend on the purchase order, so plan() checks those itself."""
+        if skill_id not in self._allowed:
+            skill = self.skills[skill_id]
+            self._allowed[skill_id] = skill.meets_requirements(
+                self.character.faction_id,
+                self.character.species_id,
+                self.tag_ids,
+                {skill.required_skill_id},
+            )
+        return self._allowed[skill_id]
+
+    def _rejection(self, skill_id, count):
+        skill = self.skills.get(skill_id)
+        if skill is None:
+            return "Unknown skill"
+        if not skill.can_purchase_multiple and self.owned.get(skill_id, 0) + count > 1:
+            return "This skill can only be purchased once"
+        if not self.allowed(skill_id):
+            return "Faction, species or tag requirements not met"
+        return None
+
+    def _order(self, requested):
+        """
+        Order the purchases so every prerequisite comes first, buying the cheapest purchase
+        available at each point. Costs depend only on how often a skill was bought, so every
+        valid order costs the same in total and this one spends the least up front.
+        """
+        ranks = Counter(self.owned)
+        remaining = Counter(requested)
+        available = []
+
+        def offer(skill_id):
+            skill = self.skills[skill_id]
+            heapq.heappush(
+                available, (self.cost(skill_id, ranks[skill_id] + 1), skill.name, skill_id)
+            )
+
+        for skill_id in remaining:
+            required = self.skills[skill_id].required_skill_id
+            if required not in self.skills or ranks[required]:
+                offer(skill_id)
+
+        steps = []
+        while available:
+            cost, name, skill_id = heapq.heappop(available)
+            ranks[skill_id] += 1
+            remaining[skill_id] -= 1
+            steps.append(
+                {"skill_id": skill_id, "name": name, "rank": ranks[skill_id], "cost": cost}
+            )
+            if remaining[skill_id]:
+                offer(skill_id)
+            if ranks[skill_id] == 1:
+                for unlocked_id in self.unlocks.get(skill_id, []):
+                    if remaining[unlocked_id]:
+                        offer(unlocked_id)
+        return steps, +remaining
+
+    def plan(self, skill_ids):
+        """
+        Evaluate purchasing the given skills, a skill listed twice being bought twice.
+
+        Returns:
+            dict: The purchase order with the cost of each step, the CP spent from the
+            character's base points and from the player's pool, the balances left, the skills
+            each planned skill unlocks, and any purchases that cannot be made
+        """
+        errors = []
+        requested = Counter()
+        for skill_id, count in Counter(skill_ids).items():
+            reason = self._rejection(skill_id, count)
+            if reason:
+                errors.append({"skill_id": skill_id, "reason": reason})
+            else:
+                requested[skill_id] = count
+
+        steps, unreachable = self._order(requested)
+        for skill_id in unreachable:
+            required = self.skills[self.skills[skill_id].required_skill_id]
+            errors.append({"skill_id": skill_id, "reason": f"Requires {required.name}"})
+
+        character = self.character
+        spent_before = character.get_total_skill_cost()
+        total_cost = sum(step["cost"] for step in steps)
+        base_points = character.base_character_points
+        user_cp_used = max(0, spent_before + total_cost - base_points) - max(
+            0, spent_before - base_points
+        )
+        # Only active characters draw on the player's pool, as in Character.purchase_skill
+        if character.status != CharacterStatus.ACTIVE.value:
+            user_cp_used = 0
+        user_cp_remaining = character.user.character_points - user_cp_used
+
+        planned = [step["skill_id"] for step in steps if step["rank"] == 1]
+        unlocks = [
+            {
+                "skill_id": skill_id,
+                "name": self.skills[skill_id].name,
+                "unlocks": [
+                    {"skill_id": unlocked_id, "name": self.skills[unlocked_id].name}
+                    for unlocked_id in self.unlocks.get(skill_id, [])
+                    if self.allowed(unlocked_id)
+                ],
+            }
+            for skill_id in planned
+        ]
+
+        return {
+            "steps": steps,
+            "total_cost": total_cost,
+            "base_cp_used": total_cost - user_cp_used,
+            "user_cp_used": user_cp_used,
+            "base_cp_remaining": max(0, base_points - spent_before - total_cost),
+            "user_cp_remaining": user_cp_remaining,
+            "can_afford": user_cp_remaining >= 0,
+            "unlocks": [entry for entry in unlocks if entry["unlocks"]],
+            "errors": errors,
+            "valid": not errors and user_cp_remaining >= 0,
+        }